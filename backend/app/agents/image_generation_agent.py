@@ -10,10 +10,9 @@ Features:
 - Generate variations
 """
 
-import base64
 import re
 import uuid
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
 from app.agents.prompt_fidelity import (
     GARMENT_REFERENCE_LOCK,
@@ -31,12 +30,10 @@ from app.core.config import settings
 from app.core.image_executor import run_image_op
 from app.services.ai_provider_service import AIProviderService, ChatMessage
 from app.services.ai_settings_service import AISettingsService
+from app.services.remote_image_fetcher import get_remote_image_fetcher
 from app.services.storage_service import StorageService
-from app.utils.background_removal import (
-    STATUS_MATTED,
-    MatteResult,
-    remove_white_background,
-)
+from app.utils.background_removal import STATUS_MATTED
+from app.utils.image_handle import ImageHandle
 from app.utils.image_processing import (
     EXTENSION_BY_MIME,
     sniff_image_mime,
@@ -119,24 +116,41 @@ def _resolve_background(background: Optional[str], *, matte_ready: bool) -> str:
 
 
 class GeneratedImage:
-    """Result of an image generation operation."""
+    """Result of an image generation operation.
+
+    Holds the image as an ``ImageHandle`` (decoded bytes) so matting, storage
+    normalization and uploads work on one binary copy; ``image_base64`` is
+    encoded only when a caller actually puts it on a wire. A base64 string
+    (bare or data URL) is accepted for ``image`` and decoded once here.
+
+    ``storage_ready`` marks bytes that are already the storage-profile
+    encoding (a matted image, produced in the same decode pass as the matte);
+    uploads store them without normalizing again.
+    """
 
     def __init__(
         self,
-        image_base64: str,
+        image: Union[ImageHandle, str],
         prompt: str,
         model: str,
         provider: str,
         image_url: Optional[str] = None,
         storage_path: Optional[str] = None,
+        storage_ready: bool = False,
     ):
-        self.image_base64 = image_base64
+        self.image = image if isinstance(image, ImageHandle) else ImageHandle.from_base64(image)
+        self.storage_ready = storage_ready
         self.prompt = prompt
         self.model = model
         self.provider = provider
         self.image_url = image_url
         self.storage_path = storage_path
 
+    @property
+    def image_base64(self) -> str:
+        """Bare base64 of the image, encoded per access (see ``ImageHandle``)."""
+        return self.image.base64
+
     def to_dict(self) -> Dict[str, Any]:
         return {
             "image_base64": self.image_base64,
@@ -182,6 +196,19 @@ class ImageGenerationAgent:
         """
         return image_base64
 
+    @staticmethod
+    async def _response_image(image: str) -> ImageHandle:
+        """The handle for a provider's ``response.images`` entry.
+
+        OpenAI-compatible providers may answer with a hosted http(s) URL
+        instead of inline data; that one is downloaded through the shared
+        fetcher (SSRF guard, size cap) rather than base64-decoded.
+        """
+        if image.startswith(("http://", "https://")):
+            data, content_type = await get_remote_image_fetcher().fetch(image)
+            return ImageHandle(data, content_type)
+        return ImageHandle.from_base64(image)
+
     @staticmethod
     async def _matte(generated: "GeneratedImage", *, context: str) -> "GeneratedImage":
         """Cut the white backdrop out of a freshly generated image.
@@ -196,17 +223,18 @@ class ImageGenerationAgent:
 
         Runs on the bounded image executor: the matte is ~110ms of GIL-held C
         work and must not sit on the event loop while a batch SSE stream is
-        being served. Never raises - on any failure the original image is
-        returned untouched.
+        being served. The matte runs inside the storage rendition pass, so the
+        matted WebP is decoded once and is already the stored encoding
+        (``storage_ready``). Never raises - on any failure the original image
+        is returned untouched.
         """
-        def _run() -> tuple[str, MatteResult]:
-            result = remove_white_background(base64.b64decode(generated.image_base64))
-            if result.status != STATUS_MATTED:
-                return generated.image_base64, result
-            return base64.b64encode(result.image_bytes).decode("utf-8"), result
-
         try:
-            image_base64, result = await run_image_op(_run)
+            result = await run_image_op(
+                StorageService._storage_renditions,
+                generated.image.data,
+                thumbnail=False,
+                matte=True,
+            )
         except Exception as e:
             logger.warning(
                 "Background matte failed",
@@ -219,24 +247,25 @@ class ImageGenerationAgent:
         logger.info(
             "Background matte finished",
             context=context,
-            status=result.status,
+            status=result.matte_status,
             transparent_fraction=round(result.transparent_fraction, 4),
             center_opacity=round(result.center_opacity, 4),
             content_type=result.content_type,
-            base64_len_before=len(generated.image_base64),
-            base64_len_after=len(image_base64),
+            bytes_before=len(generated.image),
+            bytes_after=len(result.image_bytes),
         )
 
-        if result.status != STATUS_MATTED:
+        if result.matte_status != STATUS_MATTED:
             return generated
 
         return GeneratedImage(
-            image_base64=image_base64,
+            image=ImageHandle(result.image_bytes, result.content_type),
             prompt=generated.prompt,
             model=generated.model,
             provider=generated.provider,
             image_url=generated.image_url,
             storage_path=generated.storage_path,
+            storage_ready=True,
         )
 
     @staticmethod
@@ -926,7 +955,7 @@ Specs:
                 )
 
             return GeneratedImage(
-                image_base64=response.images[0],
+                image=await self._response_image(response.images[0]),
                 prompt=prompt,
                 model=response.model,
                 provider=response.provider,
@@ -971,7 +1000,7 @@ Specs:
                 raise AIServiceError("AI generated no images", retryable=True)
 
             return GeneratedImage(
-                image_base64=response.images[0],
+                image=await self._response_image(response.images[0]),
                 prompt=prompt,
                 model=response.model,
                 provider=response.provider,
@@ -1074,7 +1103,7 @@ Output one cohesive image of THIS same person wearing that exact garment."""
                 raise AIServiceError("AI generated no images for try-on", retryable=True)
 
             return GeneratedImage(
-                image_base64=response.images[0],
+                image=await self._response_image(response.images[0]),
                 prompt=prompt,
                 model=response.model,
                 provider=response.provider,
@@ -1129,16 +1158,17 @@ async def save_generated_image(
         return {"image_url": "", "storage_path": ""}
 
     try:
-        # Decode base64 image
-        image_data = base64.b64decode(generated.image_base64)
+        image_data = generated.image.data
 
         # Normalize to the storage compression profile (WebP q82 @ 2048px,
         # keep-smaller) so user-saved renders cost the same per byte as every
         # other stored image. Pillow decode is CPU-bound; runs on the bounded
-        # image executor. Best-effort: unchanged bytes on failure.
-        image_data = await run_image_op(
-            StorageService._normalize_upload_bytes, image_data
-        )
+        # image executor. Best-effort: unchanged bytes on failure. A matted
+        # image was already encoded to the profile in the matte pass.
+        if not getattr(generated, "storage_ready", False):
+            image_data = await run_image_op(
+                StorageService._normalize_upload_bytes, image_data
+            )
 
         # Sniffed, not assumed: a matted image is WebP, an unmatted one is
         # whatever the provider returned. Hardcoding .png/image/png here served
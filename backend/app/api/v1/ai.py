@@ -40,13 +40,13 @@ from app.agents.image_generation_agent import (
     save_generated_image,
 )
 from app.services.ai_service import EmbeddingService
+from app.services.avatar_reference_service import AvatarReferenceService
 from app.services.item_reference_service import (
     resolve_outfit_item_references,
     resolve_outfit_source_reference,
 )
 from app.services.storage_service import StorageService
 from app.services.vector_service import get_vector_service
-from app.utils.image_processing import downscale_base64_image
 
 logger = get_context_logger(__name__)
 
@@ -102,24 +102,12 @@ async def _provider_ready_avatar_url(avatar_url: str) -> str:
 
 
 async def _fetch_user_avatar_base64(user_id: str, db: Client) -> Optional[str]:
-    """Best-effort avatar fetch for profile-aware extraction and generation."""
-    try:
-        user_result = await asyncio.to_thread(db.table("users").select("avatar_url").eq("id", user_id).single().execute)
-        if not user_result or not user_result.data:
-            return None
+    """Best-effort avatar fetch for profile-aware extraction and generation.
 
-        avatar_url = user_result.data.get("avatar_url")
-        if not avatar_url:
-            return None
-
-        return await StorageService.download_to_base64(avatar_url, timeout=30.0)
-    except Exception as e:
-        logger.warning(
-            "Failed to fetch user avatar for extraction",
-            user_id=user_id,
-            error=str(e),
-        )
-        return None
+    Returns the prepared (downscaled, cached) reference - see
+    AvatarReferenceService - or None.
+    """
+    return await AvatarReferenceService.get_reference_base64(user_id, db)
 
 
 # =============================================================================
@@ -275,24 +263,13 @@ async def generate_outfit(
                 )
 
                 if user_result.data and user_result.data.get("avatar_url"):
-                    avatar_url = user_result.data["avatar_url"]
-                    try:
-                        avatar_base64 = await StorageService.download_to_base64(
-                            avatar_url, timeout=30.0
-                        )
-                        if avatar_base64:
-                            # Downscale: a raw full-res phone avatar can be
-                            # bigger than every garment reference combined.
-                            user_avatar_base64 = await asyncio.to_thread(
-                                downscale_base64_image,
-                                avatar_base64,
-                            )
-                    except Exception as e:
-                        logger.warning(
-                            "Failed to fetch user avatar, falling back to generic model",
-                            user_id=user_id,
-                            error=str(e),
-                        )
+                    # Prepared reference: already downscaled (a raw full-res
+                    # phone avatar can be bigger than every garment reference
+                    # combined) and cached across calls. None on failure ->
+                    # generic model.
+                    user_avatar_base64 = await AvatarReferenceService.get_reference_base64(
+                        user_id, avatar_url=user_result.data["avatar_url"]
+                    )
 
                 # Fetch body profile if available and requested
                 if request.use_body_profile:
@@ -555,12 +532,18 @@ async def generate_try_on(
                 raise HTTPException(status_code=403, detail="Avatar storage path is not owned by the current user")
             avatar_url = await StorageService.get_public_url(request.avatar_storage_path)
         elif avatar_url:  # pragma: no cover - the AVATAR_REQUIRED guard above ensures this is truthy
-            # Stored avatar URLs expire (OBJECT_STORAGE_PRESIGN_TTL); reduce to
-            # the bucket key and re-materialize so providers get a fresh URL.
-            avatar_url = await _provider_ready_avatar_url(avatar_url)
+            # Prefer the prepared (downscaled, cached) avatar so the provider
+            # call does not re-download the full-size original on every
+            # try-on. Otherwise: stored avatar URLs expire
+            # (OBJECT_STORAGE_PRESIGN_TTL); reduce to the bucket key and
+            # re-materialize so providers get a fresh URL.
+            avatar_url = (
+                await AvatarReferenceService.get_reference_base64(user_id, avatar_url=avatar_url)
+                or await _provider_ready_avatar_url(avatar_url)
+            )
 
         async with rate_limited_operation(user_id, OperationType.GENERATION, db):
-            # Providers receive the URL directly; legacy base64 clients remain accepted for clothing input.
+            # Providers receive the prepared avatar or a fresh URL; legacy base64 clients remain accepted for clothing input.
             avatar_base64 = avatar_url
             if not avatar_base64:
                 raise HTTPException(
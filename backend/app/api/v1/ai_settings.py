@@ -383,9 +383,12 @@ async def reset_provider_config(
             del provider_configs[provider]
 
             # Update settings
-            await asyncio.to_thread(db.table("user_ai_settings").update({
-                "provider_configs": provider_configs,
-            }).eq("user_id", user_id).execute)
+            try:
+                await asyncio.to_thread(db.table("user_ai_settings").update({
+                    "provider_configs": provider_configs,
+                }).eq("user_id", user_id).execute)
+            finally:
+                AISettingsService.invalidate_settings(user_id)
 
         return {
             "data": {"provider": provider, "reset": True},
@@ -8,10 +8,11 @@ and admin-only write access.
 import asyncio
 from typing import Any, Dict, Literal
 
-from fastapi import APIRouter, Depends, Query, Response, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 from supabase import Client
 
 from app.api.v1.deps import get_current_user, get_db
+from app.core.config import settings
 from app.core.exceptions import NotFoundError, PermissionDeniedError, ValidationError
 from app.core.logging_config import get_context_logger
 from app.models.blog import (
@@ -24,6 +25,7 @@ from app.models.blog import (
 )
 from app.utils import maybe_single_data
 from app.utils.db import safe_search_term
+from app.utils.response_cache import CachedResponse, ResponseCache, etag_matches
 
 logger = get_context_logger(__name__)
 
@@ -61,12 +63,41 @@ def verify_admin(user: Dict[str, Any]) -> None:
 # 3.4 s on the mobile critical path.
 BLOG_CACHE_CONTROL = "public, max-age=300, stale-while-revalidate=600"
 
+# List views never render the article body; projecting the summary columns
+# keeps full markdown content out of every list round trip.
+BLOG_SUMMARY_COLUMNS = ",".join(BlogPostSummary.model_fields)
+
+# Server-side cache of the public payloads (lists, categories, posts). The
+# Cache-Control header above only helps clients that keep their own cache;
+# crawlers mostly do not, so without this every anonymous hit was a Supabase
+# round trip. Admin writes clear it (invalidate_blog_cache), and the TTL
+# bounds staleness for anything written outside this API (SQL console).
+_blog_cache = ResponseCache(settings.BLOG_CACHE_TTL_SECONDS, settings.BLOG_CACHE_MAX_ENTRIES)
+
+
+def invalidate_blog_cache() -> None:
+    """Drop every cached public blog response (call after any post write)."""
+    _blog_cache.clear()
+
+
+def _serve_cached(entry: CachedResponse, request: Request, response: Response):
+    """Attach Cache-Control + ETag; a matching If-None-Match becomes a 304.
+
+    Success path only, like the header itself: errors never reach here.
+    """
+    headers = {"Cache-Control": BLOG_CACHE_CONTROL, "ETag": entry.etag}
+    if request is not None and etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return entry.payload
+
 
 @router.get("/posts", response_model=Dict[str, Any])
 async def list_posts(
     params: BlogPostListParams = Depends(),
     db: Client = Depends(get_db),
     response: Response = None,
+    request: Request = None,
 ):
     """
     List all published blog posts with pagination.
@@ -74,9 +105,19 @@ async def list_posts(
     Returns paginated list of blog post summaries.
     Supports filtering by category and searching by title/excerpt.
     """
+    cache_key = ("list", params.category, params.search, params.page, params.page_size)
+    cached = _blog_cache.get(cache_key)
+    if cached is not None:
+        return _serve_cached(cached, request, response)
+    generation = _blog_cache.generation
+
     try:
-        # Build base query for published posts
-        query = db.table("blog_posts").select("*", count="exact").eq("is_published", True)
+        # Build base query for published posts (summary columns only)
+        query = (
+            db.table("blog_posts")
+            .select(BLOG_SUMMARY_COLUMNS, count="exact")
+            .eq("is_published", True)
+        )
 
         # Apply category filter
         if params.category:
@@ -121,11 +162,12 @@ async def list_posts(
         # Success path only: error responses must never inherit a cacheable
         # header (a cached 404 would linger for max-age after a post is
         # published).
-        response.headers["Cache-Control"] = BLOG_CACHE_CONTROL
-        return {
-            "data": response_data.model_dump(mode="json"),
-            "message": "OK",
-        }
+        entry = _blog_cache.put(
+            cache_key,
+            {"data": response_data.model_dump(mode="json"), "message": "OK"},
+            generation=generation,
+        )
+        return _serve_cached(entry, request, response)
 
     except Exception as e:
         logger.error(f"Error listing blog posts: {e}")
@@ -137,6 +179,7 @@ async def get_post(
     slug: str,
     db: Client = Depends(get_db),
     response: Response = None,
+    request: Request = None,
 ):
     """
     Get a single blog post by slug.
@@ -144,6 +187,12 @@ async def get_post(
     Returns the full blog post including content.
     Only returns published posts for public access.
     """
+    cache_key = ("post", slug)
+    cached = _blog_cache.get(cache_key)
+    if cached is not None:
+        return _serve_cached(cached, request, response)
+    generation = _blog_cache.generation
+
     try:
         result = await asyncio.to_thread(
             db.table("blog_posts")
@@ -164,12 +213,13 @@ async def get_post(
         post = BlogPost(**result.data)
 
         # Success path only — a NotFound 404 must not carry the cache header
-        # (see list_posts).
-        response.headers["Cache-Control"] = BLOG_CACHE_CONTROL
-        return {
-            "data": post.model_dump(mode="json"),
-            "message": "OK",
-        }
+        # (see list_posts), and is not cached server-side either.
+        entry = _blog_cache.put(
+            cache_key,
+            {"data": post.model_dump(mode="json"), "message": "OK"},
+            generation=generation,
+        )
+        return _serve_cached(entry, request, response)
 
     except NotFoundError:
         raise
@@ -182,12 +232,18 @@ async def get_post(
 async def get_categories(
     db: Client = Depends(get_db),
     response: Response = None,
+    request: Request = None,
 ):
     """
     Get all unique categories from published blog posts.
 
     Returns a sorted list of category names.
     """
+    cached = _blog_cache.get(("categories",))
+    if cached is not None:
+        return _serve_cached(cached, request, response)
+    generation = _blog_cache.generation
+
     try:
         # Get distinct categories from published posts
         result = await asyncio.to_thread(
@@ -200,11 +256,12 @@ async def get_categories(
         categories = sorted(list(set(row["category"] for row in (result.data or []))))
 
         # Success path only (see list_posts).
-        response.headers["Cache-Control"] = BLOG_CACHE_CONTROL
-        return {
-            "data": {"categories": categories},
-            "message": "OK",
-        }
+        entry = _blog_cache.put(
+            ("categories",),
+            {"data": {"categories": categories}, "message": "OK"},
+            generation=generation,
+        )
+        return _serve_cached(entry, request, response)
 
     except Exception as e:
         logger.error(f"Error fetching blog categories: {e}")
@@ -254,6 +311,7 @@ async def create_post(
             raise Exception("Failed to create blog post")
 
         created_post = BlogPost(**result.data[0])
+        invalidate_blog_cache()
 
         logger.info(f"Admin {user.get('id')} created blog post: {post_data.slug}")
 
@@ -334,6 +392,7 @@ async def update_post(
             raise Exception("Failed to update blog post")
 
         updated_post = BlogPost(**result.data[0])
+        invalidate_blog_cache()
 
         logger.info(f"Admin {user.get('id')} updated blog post: {slug}")
 
@@ -382,6 +441,7 @@ async def delete_post(
 
         # Delete the post
         await asyncio.to_thread(db.table("blog_posts").delete().eq("slug", slug).execute)
+        invalidate_blog_cache()
 
         logger.info(f"Admin {user.get('id')} deleted blog post: {slug}")
 
@@ -20,8 +20,10 @@ from supabase import Client
 from app.core.logging_config import get_context_logger
 from app.core.exceptions import (
     AIServiceError,
+    InvalidInputError,
     ItemNotFoundError,
     ImageNotFoundError,
+    PermissionDeniedError,
     ValidationError,
     StorageServiceError,
     DatabaseError,
@@ -41,11 +43,16 @@ from app.models.item import (
 )
 from app.services.ai_service import AIService
 from app.services.ai_settings_service import AISettingsService
+from app.services.image_hash_index import get_image_hash_index
 from app.services.storage_service import MAX_FILE_SIZE, StorageService
 from app.services.vector_service import get_vector_service
 from app.utils.db import execute_with_reconnect, jsonb_contains, safe_search_term
+from app.core.image_executor import run_image_op
+from app.utils.image_hash import IMAGE_HASH_PATTERN, hex_to_hash
+from app.utils.image_pipeline import hash_image_bytes
+from app.utils.image_processing import decode_and_validate_base64_image
 from app.utils.parallel import parallel_with_retry
-from app.api.v1.images import materialize_parent_images
+from app.api.v1.images import _is_owned_by_user, materialize_parent_images
 
 logger = get_context_logger(__name__)
 
@@ -160,6 +167,7 @@ async def upload_item_images(
                 "image_url": res.get("image_url"),
                 "thumbnail_url": res.get("thumbnail_url"),
                 "storage_path": res.get("storage_path"),
+                "image_hash": res.get("image_hash"),
                 "filename": file.filename,
             }
 
@@ -297,6 +305,7 @@ async def create_item(
                     "is_primary": bool(img.is_primary),
                     "width": img.width,
                     "height": img.height,
+                    "image_hash": img.image_hash,
                     "created_at": now,
                 }
                 image_rows.append(img_row)
@@ -309,6 +318,7 @@ async def create_item(
                 max_retries=1,
             )
             images = image_rows
+            get_image_hash_index().invalidate(user_id)
 
         # Generate embedding + upsert to Pinecone (best-effort)
         reserved = False
@@ -814,6 +824,7 @@ async def upload_item_image(
             "is_primary": bool(is_primary),
             "width": upload.get("width"),
             "height": upload.get("height"),
+            "image_hash": upload.get("image_hash"),
             "created_at": now,
         }
 
@@ -821,6 +832,7 @@ async def upload_item_image(
         # This minimizes the race window where no primary exists
         insert_result = await asyncio.to_thread(db.table("item_images").insert(img_row).execute)
         new_image_id = insert_result.data[0]["id"] if insert_result.data else None
+        get_image_hash_index().invalidate(user_id)
 
         if is_primary and new_image_id:
             # Clear is_primary on all OTHER images for this item
@@ -871,6 +883,7 @@ async def delete_item_image(
                 logger.warning("Failed to delete image from storage", storage_path=storage_path, error=str(e))
 
         await asyncio.to_thread(db.table("item_images").delete().eq("id", image_id_str).eq("item_id", item_id_str).execute)
+        get_image_hash_index().invalidate(user_id)
         return {"data": {"deleted": True}, "message": "OK"}
     except (ItemNotFoundError, ImageNotFoundError, ValidationError, StorageServiceError, DatabaseError):
         raise
@@ -1233,6 +1246,14 @@ class DuplicateCheckRequest(BaseModel):
     sub_category: Optional[str] = None
     material: Optional[str] = None
     tags: List[str] = Field(default_factory=list)
+    # The new item's photo, for the image-hash tier: near-identical stored
+    # photos are matched locally before the embedding path (no quota spent).
+    # One of: the hash POST /items/upload returned, an owned storage key (or
+    # our bucket URL for one, e.g. a batch's temp studio image), or the photo
+    # inline (base64 / data URL) - the server hashes the latter two.
+    image_hash: Optional[str] = Field(None, pattern=IMAGE_HASH_PATTERN)
+    image_storage_path: Optional[str] = None
+    image_base64: Optional[str] = Field(None, max_length=15_000_000)
 
 
 class DuplicateItem(BaseModel):
@@ -1265,8 +1286,11 @@ async def check_duplicates(
 ):
     """Check for potential duplicate items in the user's wardrobe.
 
-    Uses AI embeddings to find items with similar attributes.
-    Called before creating a new item to warn about potential duplicates.
+    When the request carries the new photo (its ``image_hash``, storage key
+    or inline bytes), near-identical stored photos are matched first from the
+    per-user hash index (no quota). Otherwise, or when that finds nothing,
+    uses AI embeddings to find items with similar attributes. Called before
+    creating a new item to warn about potential duplicates.
 
     Args:
         request: Item attributes to check for duplicates
@@ -1302,6 +1326,21 @@ async def check_duplicates(
                 "message": "No duplicates found",
             }
 
+        # Hash tier: a near-identical photo of a stored item is answered
+        # locally, before any embedding quota or vector round trip is spent.
+        # No match (or no hash) falls through to the embedding path.
+        image_hash = await _candidate_image_hash(request, user_id)
+        if image_hash is not None:
+            hash_matches = await get_image_hash_index().find_similar(
+                db, user_id, image_hash, min_score=threshold
+            )
+            if hash_matches:
+                response = await _duplicate_check_response(
+                    db, user_id, request, hash_matches, threshold, limit, tier="image_hash"
+                )
+                if response["data"]["has_duplicates"]:
+                    return response
+
         # If embedding quota is exhausted, fall back to text-based matching
         reserved = await AISettingsService.reserve_usage(
             user_id=user_id,
@@ -1362,90 +1401,147 @@ async def check_duplicates(
                 "message": "No duplicates found"
             }
 
-        # Fetch full item details for matches (read-only; rebuild + retry once
-        # on a dead pooled connection - the 2026-08-03 /items/check-duplicates
-        # 500s happened during the same gateway-restart window as the other
-        # ConnectionTerminated bursts).
-        item_ids = [item["item_id"] for item in similar_items]
-        items_result = await execute_with_reconnect(
-            lambda d: d.table("items")
-            .select("*, item_images(*)")
-            .in_("id", item_ids)
-            .eq("user_id", user_id)
-            .execute(),
-            db,
-            extra={"operation": "check_duplicates_items", "user_id": user_id},
+        return await _duplicate_check_response(
+            db, user_id, request, similar_items, threshold, limit, tier="embedding"
         )
 
-        normalized_items = [
-            _normalize_item_images(item) for item in (items_result.data or [])
-        ]
-        # Private buckets: materialize fresh presigned URLs at read time.
-        await materialize_parent_images(normalized_items)
-        items_by_id = {item["id"]: item for item in normalized_items}
+    except (ValidationError, PermissionDeniedError, DatabaseError, AIServiceError):
+        raise
+    except Exception as e:
+        logger.error(
+            "Duplicate check error",
+            user_id=user_id,
+            item_name=request.name,
+            error=str(e),
+        )
+        raise DatabaseError("Failed to check for duplicates", operation="select")
 
-        # Build duplicate response with details
-        duplicates = []
-        for match in similar_items[:limit]:
-            item_id = match["item_id"]
-            if item_id not in items_by_id:
-                continue
 
-            item = items_by_id[item_id]
-            score = match["score"]
+def _hash_inline_image(value: str) -> Optional[int]:
+    try:
+        raw = decode_and_validate_base64_image(value, max_bytes=MAX_FILE_SIZE)
+    except ValueError as error:
+        raise InvalidInputError("image_base64", f"Image is invalid: {error}") from error
+    return hash_image_bytes(raw)
 
-            # Get primary image URL
-            images = item.get("images", [])
-            primary_image = next(
-                (img for img in images if img.get("is_primary")),
-                images[0] if images else None
-            )
-            image_url = primary_image.get("image_url") if primary_image else None
 
-            # Generate reasons for similarity
-            reasons = _generate_duplicate_reasons(request, item, score)
+async def _candidate_image_hash(
+    request: DuplicateCheckRequest, user_id: str
+) -> Optional[int]:
+    """The new photo's dHash for the hash tier, or None (embedding path only).
 
-            duplicates.append({
-                "id": item_id,
-                "name": item.get("name", ""),
-                "category": item.get("category", ""),
-                "sub_category": item.get("sub_category"),
-                "colors": item.get("colors", []),
-                "brand": item.get("brand"),
-                "similarity_score": round(score, 3),
-                "image_url": image_url,
-                "reasons": reasons,
-            })
+    A client-supplied hash wins; otherwise the photo is hashed here, from an
+    owned storage object or the inline payload. A stored object that cannot
+    be read or decoded only skips the tier.
+    """
+    if request.image_hash:
+        return hex_to_hash(request.image_hash)
+    if request.image_storage_path:
+        key = StorageService.key_from_path(request.image_storage_path)
+        if not key or not _is_owned_by_user(key, user_id):
+            raise PermissionDeniedError(
+                "Image storage path is not owned by the current user",
+                resource_type="image",
+            )
+        return await StorageService.hash_stored_image(key)
+    if request.image_base64:
+        return await run_image_op(_hash_inline_image, request.image_base64)
+    return None
 
-        has_duplicates = len(duplicates) > 0
 
-        logger.info(
-            "Duplicate check completed",
-            user_id=user_id,
-            item_name=request.name,
-            duplicates_found=len(duplicates),
-            threshold=threshold,
+async def _duplicate_check_response(
+    db: Client,
+    user_id: str,
+    request: DuplicateCheckRequest,
+    matches: List[Dict[str, Any]],
+    threshold: float,
+    limit: int,
+    *,
+    tier: str,
+) -> Dict[str, Any]:
+    """Build the check-duplicates response from ``{"item_id", "score"}`` matches.
+
+    Shared by the image-hash tier and the embedding path. Deleted items are
+    dropped here: the hash index and the vector index can both briefly lag a
+    delete.
+    """
+    # Fetch full item details for matches (read-only; rebuild + retry once
+    # on a dead pooled connection - the 2026-08-03 /items/check-duplicates
+    # 500s happened during the same gateway-restart window as the other
+    # ConnectionTerminated bursts).
+    item_ids = [item["item_id"] for item in matches]
+    items_result = await execute_with_reconnect(
+        lambda d: d.table("items")
+        .select("*, item_images(*)")
+        .in_("id", item_ids)
+        .eq("user_id", user_id)
+        .eq("is_deleted", False)
+        .execute(),
+        db,
+        extra={"operation": "check_duplicates_items", "user_id": user_id},
+    )
+
+    normalized_items = [
+        _normalize_item_images(item) for item in (items_result.data or [])
+    ]
+    # Private buckets: materialize fresh presigned URLs at read time.
+    await materialize_parent_images(normalized_items)
+    items_by_id = {item["id"]: item for item in normalized_items}
+
+    # Build duplicate response with details
+    duplicates = []
+    for match in matches[:limit]:
+        item_id = match["item_id"]
+        if item_id not in items_by_id:
+            continue
+
+        item = items_by_id[item_id]
+        score = match["score"]
+
+        # Get primary image URL
+        images = item.get("images", [])
+        primary_image = next(
+            (img for img in images if img.get("is_primary")),
+            images[0] if images else None
         )
+        image_url = primary_image.get("image_url") if primary_image else None
 
-        return {
-            "data": {
-                "has_duplicates": has_duplicates,
-                "duplicates": duplicates,
-                "threshold": threshold,
-            },
-            "message": f"Found {len(duplicates)} potential duplicate(s)" if has_duplicates else "No duplicates found"
-        }
+        # Generate reasons for similarity
+        reasons = _generate_duplicate_reasons(request, item, score)
+        if tier == "image_hash":
+            reasons.insert(0, "Near-identical photo")
 
-    except (ValidationError, DatabaseError, AIServiceError):
-        raise
-    except Exception as e:
-        logger.error(
-            "Duplicate check error",
-            user_id=user_id,
-            item_name=request.name,
-            error=str(e),
-        )
-        raise DatabaseError("Failed to check for duplicates", operation="select")
+        duplicates.append({
+            "id": item_id,
+            "name": item.get("name", ""),
+            "category": item.get("category", ""),
+            "sub_category": item.get("sub_category"),
+            "colors": item.get("colors", []),
+            "brand": item.get("brand"),
+            "similarity_score": round(score, 3),
+            "image_url": image_url,
+            "reasons": reasons,
+        })
+
+    has_duplicates = len(duplicates) > 0
+
+    logger.info(
+        "Duplicate check completed",
+        user_id=user_id,
+        item_name=request.name,
+        duplicates_found=len(duplicates),
+        threshold=threshold,
+        tier=tier,
+    )
+
+    return {
+        "data": {
+            "has_duplicates": has_duplicates,
+            "duplicates": duplicates,
+            "threshold": threshold,
+        },
+        "message": f"Found {len(duplicates)} potential duplicate(s)" if has_duplicates else "No duplicates found"
+    }
 
 
 @router.get("/{item_id}/similar", response_model=Dict[str, Any])
@@ -0,0 +1,34 @@
+"""
+Metrics API route.
+
+GET /metrics serves every metric in app.utils.metrics.REGISTRY in the
+Prometheus text format: per-route request latency, AI semaphore waits, image
+pool queue depth, SSE backlog, extraction cache hit/miss and DB latency.
+Mounted at the root next to /health, outside OpenAPI, and answers 404 unless
+METRICS_TOKEN is configured; scrapers send it as a bearer token.
+"""
+
+import hmac
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import PlainTextResponse
+
+# Imported for its metric registrations: the cache module is otherwise only
+# loaded on first extraction, and a scrape before that would omit its series.
+import app.services.extraction_cache_service  # noqa: F401
+from app.core.config import settings
+from app.utils.metrics import CONTENT_TYPE_LATEST, render_latest
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics(request: Request) -> PlainTextResponse:
+    """Prometheus text exposition of the in-process metrics registry."""
+    token = settings.METRICS_TOKEN
+    if not token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    supplied = request.headers.get("Authorization", "")
+    if not hmac.compare_digest(supplied.encode(), f"Bearer {token}".encode()):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return PlainTextResponse(render_latest(), media_type=CONTENT_TYPE_LATEST)
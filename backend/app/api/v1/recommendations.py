@@ -351,9 +351,14 @@ async def _materialize_item_images(items: List[Dict]) -> List[Dict]:
     path that surfaces ``image_url`` must materialize at read time (same
     contract as the items/outfits list endpoints). Legacy rows without
     ``storage_path`` keep their stored URL.
+
+    One flattened call, not one per row: ``materialize_image_urls`` mints its
+    URLs concurrently and updates the dicts in place, so a 500-row candidate
+    pool costs one round of URL minting instead of 500 sequential ones.
     """
-    for item in items or []:
-        await materialize_image_urls(item.get("item_images") or [])
+    await materialize_image_urls(
+        [image for item in items or [] for image in (item.get("item_images") or [])]
+    )
     return items
 
 
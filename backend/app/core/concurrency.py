@@ -6,6 +6,21 @@ concurrent batch jobs (batch_extraction_service.py) and the outfit-variation
 fan-out (image_generation_agent.generate_variations). Caps are configurable via
 AI_EXTRACTION_CONCURRENCY / AI_GENERATION_CONCURRENCY (see app/core/config.py).
 
+Photoshoot image generations additionally go through ``PHOTOSHOOT_SCHEDULER``,
+a fair (round-robin by user, then by job) permit pool capped by
+PHOTOSHOOT_GLOBAL_CONCURRENCY, so concurrent photoshoots share a fixed budget
+instead of each bringing its own PHOTOSHOOT_CONCURRENCY_LIMIT fan-out.
+
+EXTRACTION_SEMAPHORE and GENERATION_SEMAPHORE are ``AdaptiveLimiter``s:
+semaphore-shaped permit pools whose effective limit moves between
+AI_ADAPTIVE_CONCURRENCY_MIN and the configured cap (AIMD). The provider layer
+reports each call's latency and overload signals (429 / 5xx / timeouts) via
+``record_provider_call``; the report goes to the limiters the calling task
+holds, so a throttling provider shrinks the fan-out instead of feeding a
+retry storm, and a healthy one grows it back. Only calls made with a system
+API key are reported: a BYOK user's quota says nothing about the shared
+capacity, and must not shrink everyone else's fan-out.
+
 Built eagerly at import. On Python 3.10+ asyncio.Semaphore() no longer
 requires a running event loop, so importing this module outside an asyncio
 context (e.g. at FastAPI startup) is safe. Floors at 1 so a misconfigured
@@ -13,21 +28,448 @@ env (0/negative) cannot deadlock the pipeline by yielding a zero-cap semaphore.
 """
 
 import asyncio
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
 from contextvars import ContextVar
+from typing import AsyncIterator, Deque, Dict, Optional, Tuple, Union
 
 from app.core.config import settings
+from app.utils.metrics import Gauge, Histogram
 
-EXTRACTION_SEMAPHORE: asyncio.Semaphore = asyncio.Semaphore(
-    max(1, settings.AI_EXTRACTION_CONCURRENCY)
-)
-GENERATION_SEMAPHORE: asyncio.Semaphore = asyncio.Semaphore(
-    max(1, settings.AI_GENERATION_CONCURRENCY)
-)
+
+class AdaptiveLimiter:
+    """Drop-in for ``asyncio.Semaphore`` whose limit adapts to provider feedback.
+
+    AIMD: an overload report (429 / transient 5xx / timeout) multiplies the
+    limit by AI_ADAPTIVE_CONCURRENCY_BACKOFF, at most once per congestion
+    window - calls that started before the last cut were admitted under the
+    old limit and say nothing new. A successful call adds ``1 / limit`` (one
+    permit per limit's worth of successes) while the pool is saturated and
+    the smoothed latency stays within AI_ADAPTIVE_CONCURRENCY_LATENCY_TOLERANCE
+    of its baseline; inflated latency holds the limit where it is. The
+    configured cap stays the ceiling (memory bound, see TD-044) and the
+    limit starts there, so a healthy provider sees today's behavior.
+
+    Shrinking never revokes held permits: new acquisitions simply wait until
+    enough holders release. Waiters are woken FIFO with direct handoff.
+    Single event loop, no awaits between reads and writes: no lock needed.
+    """
+
+    def __init__(self, max_limit: int, name: str) -> None:
+        self.name = name
+        self.max_limit = max(1, max_limit)
+        self.limit = float(self.max_limit)
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._latency_ewma: Optional[float] = None
+        self._latency_baseline: Optional[float] = None
+        self._last_decrease = float("-inf")
+
+    @property
+    def min_limit(self) -> int:
+        return max(1, min(self.max_limit, settings.AI_ADAPTIVE_CONCURRENCY_MIN))
+
+    @property
+    def _value(self) -> int:
+        # asyncio.Semaphore's name for free permits (gauges read it).
+        return max(0, int(self.limit) - self.in_flight)
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for future in self._waiters if not future.done())
+
+    def locked(self) -> bool:
+        return self._value == 0
+
+    async def acquire(self) -> bool:
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            return True
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted in the same tick we were cancelled: pass it on.
+                self.release()
+            elif future in self._waiters:
+                self._waiters.remove(future)
+            raise
+        return True
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < int(self.limit):
+            future = self._waiters.popleft()
+            if not future.done():
+                self.in_flight += 1
+                future.set_result(None)
+
+    def record(self, latency_seconds: float, overloaded: bool = False) -> None:
+        """Adjust the limit from one provider call made under this limiter."""
+        if not settings.AI_ADAPTIVE_CONCURRENCY_ENABLED:
+            return
+        now = time.monotonic()
+        if overloaded:
+            if now - latency_seconds < self._last_decrease:
+                return
+            backoff = min(max(settings.AI_ADAPTIVE_CONCURRENCY_BACKOFF, 0.1), 0.95)
+            self.limit = max(float(self.min_limit), self.limit * backoff)
+            self._last_decrease = now
+            return
+
+        if self._latency_ewma is None:
+            self._latency_ewma = self._latency_baseline = latency_seconds
+        else:
+            self._latency_ewma += 0.2 * (latency_seconds - self._latency_ewma)
+            # Baseline follows improvements at once and regressions slowly,
+            # so a provider that is permanently slower does not pin growth.
+            if latency_seconds < self._latency_baseline:
+                self._latency_baseline = latency_seconds
+            else:
+                self._latency_baseline += 0.01 * (latency_seconds - self._latency_baseline)
+        tolerance = settings.AI_ADAPTIVE_CONCURRENCY_LATENCY_TOLERANCE
+        if self._latency_ewma > self._latency_baseline * tolerance:
+            return
+        if self.in_flight + self.waiting >= int(self.limit):
+            self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+            self._wake()
+
+
+EXTRACTION_SEMAPHORE = AdaptiveLimiter(settings.AI_EXTRACTION_CONCURRENCY, "extraction")
+GENERATION_SEMAPHORE = AdaptiveLimiter(settings.AI_GENERATION_CONCURRENCY, "generation")
 REFERENCE_DOWNLOAD_SEMAPHORE: asyncio.Semaphore = asyncio.Semaphore(
     max(1, settings.AI_OUTFIT_ITEM_REFERENCE_DOWNLOAD_CONCURRENCY)
 )
 
 
+# Wait-time telemetry (GET /metrics): time from asking for a permit to
+# holding it, and how many tasks are queued right now. A batch that is slow
+# because it queues here is a capacity problem; one that is slow after
+# acquiring is provider latency.
+SEMAPHORE_WAIT_SECONDS = Histogram(
+    "fitcheck_semaphore_wait_seconds",
+    "Time spent waiting for an AI concurrency permit.",
+    ("semaphore",),
+)
+_waiting: Dict[str, int] = {"extraction": 0, "generation": 0, "photoshoot": 0}
+
+
+_Permits = Union[asyncio.Semaphore, AdaptiveLimiter]
+
+# Adaptive limiters whose permit the current task holds; provider calls made
+# under them report back through record_provider_call. Child tasks copy the
+# context, so work fanned out under a held permit reports to it as well.
+_HELD_LIMITERS: ContextVar[Tuple[AdaptiveLimiter, ...]] = ContextVar(
+    "held_adaptive_limiters", default=()
+)
+
+
+# Settings holding the system API keys; calls made with any other key (BYOK)
+# are not fed to the shared limiters.
+_SYSTEM_API_KEY_SETTINGS = (
+    "AI_CHAT_API_KEY",
+    "AI_VISION_API_KEY",
+    "AI_VISION_FALLBACK_API_KEY",
+    "AI_IMAGE_API_KEY",
+    "AI_IMAGE_FALLBACK_API_KEY",
+    "AI_OPENAI_API_KEY",
+    "AI_GEMINI_API_KEY",
+)
+
+
+def _is_system_api_key(api_key: Optional[str]) -> bool:
+    # Read per call: tests and config reloads swap the settings.
+    return bool(api_key) and any(
+        getattr(settings, name, None) == api_key for name in _SYSTEM_API_KEY_SETTINGS
+    )
+
+
+def record_provider_call(
+    latency_seconds: float, *, api_key: Optional[str], overloaded: bool = False
+) -> None:
+    """Feed one AI provider call outcome to the limiters the caller holds.
+
+    ``overloaded`` is a throttling/overload signal (429, transient 5xx,
+    timeout); otherwise ``latency_seconds`` is a successful call's latency.
+    ``api_key`` is the key the call was made with; only system keys are
+    reported. A no-op outside a held limiter.
+    """
+    if not _is_system_api_key(api_key):
+        return
+    for limiter in _HELD_LIMITERS.get():
+        limiter.record(latency_seconds, overloaded)
+
+
+def _semaphores() -> Dict[str, _Permits]:
+    # Read at render time: tests reload this module and swap the globals.
+    return {"extraction": EXTRACTION_SEMAPHORE, "generation": GENERATION_SEMAPHORE}
+
+
+Gauge(
+    "fitcheck_semaphore_waiting",
+    "Tasks currently queued for an AI concurrency permit.",
+    ("semaphore",),
+    callback=lambda: {(name,): count for name, count in _waiting.items()},
+)
+Gauge(
+    "fitcheck_semaphore_available",
+    "Free permits on an AI concurrency semaphore.",
+    ("semaphore",),
+    callback=lambda: {
+        **{(name,): sem._value for name, sem in _semaphores().items()},
+        ("photoshoot",): PHOTOSHOOT_SCHEDULER.available,
+    },
+)
+Gauge(
+    "fitcheck_concurrency_limit",
+    "Current effective limit of an adaptive AI concurrency limiter.",
+    ("semaphore",),
+    callback=lambda: {
+        (name,): sem.limit
+        for name, sem in _semaphores().items()
+        if isinstance(sem, AdaptiveLimiter)
+    },
+)
+
+
+def _hold(semaphore: _Permits):
+    """Register ``semaphore`` as held by this task; returns the reset token."""
+    if not isinstance(semaphore, AdaptiveLimiter):
+        return None
+    return _HELD_LIMITERS.set(_HELD_LIMITERS.get() + (semaphore,))
+
+
+async def _acquire_timed(semaphore: _Permits, name: str) -> None:
+    started = time.perf_counter()
+    _waiting[name] = _waiting.get(name, 0) + 1
+    try:
+        await semaphore.acquire()
+    finally:
+        _waiting[name] -= 1
+    SEMAPHORE_WAIT_SECONDS.observe(time.perf_counter() - started, semaphore=name)
+
+
+@asynccontextmanager
+async def timed_acquire(semaphore: _Permits, name: str) -> AsyncIterator[None]:
+    """``async with semaphore`` that also records the wait under ``name``."""
+    await _acquire_timed(semaphore, name)
+    token = _hold(semaphore)
+    try:
+        yield
+    finally:
+        if token is not None:
+            _HELD_LIMITERS.reset(token)
+        semaphore.release()
+
+
+class FairScheduler:
+    """Bounded permit pool handed out round-robin across users, then jobs.
+
+    A plain semaphore wakes waiters FIFO, so a 10-image photoshoot queued a
+    moment earlier takes every freed permit before a second user's job gets
+    one. Here each waiter queues under ``(user_id, job_id)``; a freed permit
+    goes to the next *user* in rotation, and within that user to the next
+    *job*, so two users with one job each split the pool evenly and a user
+    running three jobs does not get three times the share.
+
+    Permits are handed over directly to the chosen waiter (never returned to
+    the pool in between), so a new arrival cannot barge past the queue.
+    Single event loop, no awaits between reads and writes: no lock needed.
+    """
+
+    def __init__(self, capacity: int, name: str) -> None:
+        self.capacity = max(1, capacity)
+        self.name = name
+        self.active = 0
+        self._queues: "OrderedDict[str, OrderedDict[str, Deque[asyncio.Future]]]" = OrderedDict()
+
+    @property
+    def available(self) -> int:
+        return max(0, self.capacity - self.active)
+
+    @property
+    def waiting(self) -> int:
+        return sum(len(q) for jobs in self._queues.values() for q in jobs.values())
+
+    async def acquire(self, user_id: str, job_id: str) -> None:
+        started = time.perf_counter()
+        if self.active < self.capacity and not self._queues:
+            self.active += 1
+            SEMAPHORE_WAIT_SECONDS.observe(time.perf_counter() - started, semaphore=self.name)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(user_id, OrderedDict()).setdefault(job_id, deque()).append(future)
+        _waiting[self.name] = _waiting.get(self.name, 0) + 1
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted in the same tick we were cancelled: pass it on.
+                self.release()
+            else:
+                self._discard(user_id, job_id, future)
+            raise
+        finally:
+            _waiting[self.name] -= 1
+        SEMAPHORE_WAIT_SECONDS.observe(time.perf_counter() - started, semaphore=self.name)
+
+    def release(self) -> None:
+        while self._queues:
+            user_id, jobs = next(iter(self._queues.items()))
+            job_id, queue = next(iter(jobs.items()))
+            future = queue.popleft()
+            # Rotate: this job goes behind the user's other jobs, this user
+            # behind the other users.
+            del jobs[job_id]
+            if queue:
+                jobs[job_id] = queue
+            del self._queues[user_id]
+            if jobs:
+                self._queues[user_id] = jobs
+            if not future.done():
+                future.set_result(None)
+                return
+        self.active -= 1
+
+    def _discard(self, user_id: str, job_id: str, future: asyncio.Future) -> None:
+        jobs = self._queues.get(user_id)
+        queue = jobs.get(job_id) if jobs else None
+        if queue is None or future not in queue:
+            return
+        queue.remove(future)
+        if not queue:
+            del jobs[job_id]
+        if not jobs:
+            del self._queues[user_id]
+
+    @asynccontextmanager
+    async def slot(self, user_id: str, job_id: str) -> AsyncIterator[None]:
+        """Hold one permit for ``job_id`` (owned by ``user_id``)."""
+        await self.acquire(user_id, job_id)
+        try:
+            yield
+        finally:
+            self.release()
+
+
+PHOTOSHOOT_SCHEDULER = FairScheduler(settings.PHOTOSHOOT_GLOBAL_CONCURRENCY, "photoshoot")
+
+
+class FairRatePacer:
+    """Token bucket (``rate`` per second, ``burst`` deep) with fair queueing.
+
+    Where FairScheduler bounds how many calls run at once, this bounds how
+    many *start* per second - the shape of a provider's RPM quota. A caller
+    that finds a token and no queue goes straight through; everyone else
+    queues under a fairness key (the user) and tokens are handed out
+    round-robin across keys as they refill, so one user's batch job cannot
+    take every slot while a second user's single request waits behind it.
+
+    ``pause_until`` drains the bucket until a provider-advised reset (a
+    per-minute quota 429 with ``retryDelay``); callers consult
+    ``paused_for()`` to fail over instead of queueing behind it.
+
+    ``rate`` <= 0 disables pacing (acquire returns at once). Single event
+    loop, no awaits between reads and writes: no lock needed.
+    """
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._queues: "OrderedDict[str, Deque[asyncio.Future]]" = OrderedDict()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for q in self._queues.values() for f in q if not f.done())
+
+    def paused_for(self) -> float:
+        """Seconds left on a provider-advised pause (0 when not paused)."""
+        return max(0.0, self._paused_until - time.monotonic())
+
+    def pause_until(self, deadline: float) -> None:
+        """Hold every token until ``deadline`` (``time.monotonic()`` clock)."""
+        self._refill()
+        self._paused_until = max(self._paused_until, deadline)
+        self.tokens = 0.0
+        self._updated = max(self._updated, self._paused_until)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        if now > self._updated:
+            self.tokens = min(float(self.burst), self.tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    async def acquire(self, key: str) -> None:
+        if self.rate <= 0:
+            return
+        self._refill()
+        if not self._queues and self.tokens >= 1:
+            self.tokens -= 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(key, deque()).append(future)
+        self._schedule()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted in the same tick we were cancelled: hand it back.
+                self.tokens += 1
+                self._dispatch()
+            else:
+                self._discard(key, future)
+            raise
+
+    def _schedule(self) -> None:
+        if self._timer is not None or not self._queues:
+            return
+        self._refill()
+        if self.rate > 0:
+            delay = max(0.0, self._updated - time.monotonic()) + max(0.0, 1 - self.tokens) / self.rate
+        else:
+            delay = 0.0
+        self._timer = asyncio.get_running_loop().call_later(delay, self._on_timer)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._refill()
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        while self._queues and (self.tokens >= 1 or self.rate <= 0):
+            key, queue = next(iter(self._queues.items()))
+            future = queue.popleft()
+            # Rotate: this key goes behind the others.
+            del self._queues[key]
+            if queue:
+                self._queues[key] = queue
+            if not future.done():
+                if self.rate > 0:
+                    self.tokens -= 1
+                future.set_result(None)
+        self._schedule()
+
+    def _discard(self, key: str, future: asyncio.Future) -> None:
+        queue = self._queues.get(key)
+        if queue is None or future not in queue:
+            return
+        queue.remove(future)
+        if not queue:
+            del self._queues[key]
+
+
 _IMAGE_GEN_SLOT_HELD: ContextVar[bool] = ContextVar(
     "image_gen_slot_held", default=False
 )
@@ -57,19 +499,26 @@ class ImageGenSlot:
 
     def __init__(self) -> None:
         self._token = None
+        self._held_token = None
+        self._semaphore: Optional[_Permits] = None
 
     async def __aenter__(self) -> "ImageGenSlot":
         if _IMAGE_GEN_SLOT_HELD.get():
             self._token = None
             return self
-        await GENERATION_SEMAPHORE.acquire()
+        # Pinned: the limiter released on exit must be the one acquired.
+        self._semaphore = GENERATION_SEMAPHORE
+        await _acquire_timed(self._semaphore, "generation")
         self._token = _IMAGE_GEN_SLOT_HELD.set(True)
+        self._held_token = _hold(self._semaphore)
         return self
 
     async def __aexit__(self, exc_type, exc, tb) -> None:
         if self._token is not None:
+            if self._held_token is not None:
+                _HELD_LIMITERS.reset(self._held_token)
             _IMAGE_GEN_SLOT_HELD.reset(self._token)
-            GENERATION_SEMAPHORE.release()
+            self._semaphore.release()
 
 
 def image_gen_slot() -> ImageGenSlot:
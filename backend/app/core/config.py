@@ -194,10 +194,16 @@ class Settings(BaseSettings):
     # Per-provider rate control for the NATIVE Gemini leg. 0 = unlimited.
     # Free-tier Gemini keys are limited to ~5 requests/minute/model; bursts of
     # concurrent extractions exhaust the quota in one second (observed
-    # 2026-08-01: 8 parallel 429 RESOURCE_EXHAUSTED). Setting this spaces
-    # Gemini calls so the hybrid vision leg falls back to Agnes while the
-    # bucket refills instead of hammering the quota with retries.
+    # 2026-08-01: 8 parallel 429 RESOURCE_EXHAUSTED). Setting this paces
+    # Gemini calls through one process-wide token bucket per API key + model
+    # (fair across users) instead of hammering the quota with retries.
     AI_GEMINI_MAX_REQUESTS_PER_MINUTE: int = 0
+    # Bucket depth: how many calls may start back-to-back after an idle
+    # period. 1 = strictly evenly spaced.
+    AI_GEMINI_RATE_BURST: int = 1
+    # Shared pacers kept (one per API key + model, LRU; only idle, unpaused
+    # ones are evicted).
+    AI_GEMINI_RATE_PACER_MAX_ENTRIES: int = 256
 
     # OpenAI Provider Defaults
     AI_OPENAI_API_URL: str = "https://api.openai.com/v1"
@@ -259,6 +265,22 @@ class Settings(BaseSettings):
     # Encryption key for storing user API keys (generate with: openssl rand -hex 32)
     AI_ENCRYPTION_KEY: Optional[str] = None
 
+    # Resolved BYOK credentials (AISettingsService): every AI call needs the
+    # user's provider config, which used to cost a user_ai_settings read plus
+    # a Fernet decrypt (two for keys still in the legacy format). Cached per
+    # user for this TTL; writes through AISettingsService invalidate at once,
+    # other workers pick the change up within the TTL. 0 disables.
+    AI_CREDENTIAL_CACHE_TTL_SECONDS: int = 60
+    AI_CREDENTIAL_CACHE_MAX_ENTRIES: int = 2048
+    # Per-user user_ai_settings snapshot (settings + daily usage counters)
+    # behind get_user_settings / check_rate_limit / usage stats, and the
+    # "row exists" check before each reservation. Reservations and releases
+    # update the cached counters from the RPC result; counters written by
+    # other workers show up within the TTL (admission itself stays atomic in
+    # reserve_ai_usage). 0 disables.
+    AI_SETTINGS_SNAPSHOT_TTL_SECONDS: int = 60
+    AI_SETTINGS_SNAPSHOT_MAX_ENTRIES: int = 2048
+
     # ==========================================================================
     # Subscription Plan Configuration
     # ==========================================================================
@@ -352,6 +374,19 @@ class Settings(BaseSettings):
     # cap (image_gen_slot) and per-image durable-URL upload + payload release
     # bound worst-case memory (2 jobs x 4 = 8 in-flight generations).
     PHOTOSHOOT_CONCURRENCY_LIMIT: int = 4
+    # Process-wide cap on in-flight photoshoot generations across ALL jobs,
+    # handed out round-robin by user then job (app/core/concurrency
+    # PHOTOSHOOT_SCHEDULER). PHOTOSHOOT_CONCURRENCY_LIMIT still caps a single
+    # job; this keeps two or three simultaneous photoshoots from multiplying
+    # in-flight generations (and their base64 buffers) past the 512MB budget.
+    PHOTOSHOOT_GLOBAL_CONCURRENCY: int = 6
+    # Scene-plan cache for PhotoshootService.generate_prompts, keyed by use
+    # case, image count, normalized custom prompt, reference-photo digest and
+    # PROMPT_TEMPLATE_VERSION. Re-running the same photo + preset within the
+    # TTL reuses the plan instead of paying the planning LLM call again (it
+    # sits before the first image can start). 0 disables.
+    PHOTOSHOOT_PROMPT_CACHE_TTL_SECONDS: int = 900
+    PHOTOSHOOT_PROMPT_CACHE_MAX_ENTRIES: int = 256
 
     # Process-wide asyncio.Semaphore caps for the batch extract+generate
     # pipeline (batch_extraction_service.py) and the variation fan-out
@@ -361,6 +396,15 @@ class Settings(BaseSettings):
     # under high parallelism, so raise cautiously.
     AI_EXTRACTION_CONCURRENCY: int = 30
     AI_GENERATION_CONCURRENCY: int = 30
+    # The two caps above are ceilings: the effective limit adapts (AIMD,
+    # app/core/concurrency.AdaptiveLimiter) to provider 429s / timeouts and
+    # latency. Each overload cuts it by BACKOFF (once per congestion window,
+    # never below MIN); successes add it back while smoothed latency stays
+    # within LATENCY_TOLERANCE x baseline. Disabled = fixed caps.
+    AI_ADAPTIVE_CONCURRENCY_ENABLED: bool = True
+    AI_ADAPTIVE_CONCURRENCY_MIN: int = 2
+    AI_ADAPTIVE_CONCURRENCY_BACKOFF: float = 0.7
+    AI_ADAPTIVE_CONCURRENCY_LATENCY_TOLERANCE: float = 2.0
     AI_OUTFIT_ITEM_REFERENCE_MAX_IMAGES: int = 12
     # Hard cap on TOTAL inline input images per image-generation call. The
     # Agnes image gateway (agnes-image-2.1-flash) rejects requests with more
@@ -413,6 +457,13 @@ class Settings(BaseSettings):
     SOCIAL_IMPORT_MAX_PHOTOS_PER_JOB: int = 2000
     SOCIAL_IMPORT_AUTH_SESSION_TTL_MINUTES: int = 120
     SOCIAL_IMPORT_DISCOVERY_PAGE_SIZE: int = 50
+    # Photo downloads one import job keeps in flight (see ScraperSession).
+    SOCIAL_IMPORT_DOWNLOAD_CONCURRENCY: int = 4
+    # A photo left in processing this long is taken for an abandoned claim
+    # (its run died) and requeued when the next run starts. Well above one
+    # claimed batch's processing time, so a live runner on another worker
+    # keeps its claims.
+    SOCIAL_IMPORT_STALE_CLAIM_MINUTES: int = 30
 
     # Meta OAuth (optional for social import)
     META_OAUTH_CLIENT_ID: Optional[str] = None
@@ -450,10 +501,65 @@ class Settings(BaseSettings):
     # pin 100 x 5 MB = 500 MB. Crossing this budget drops the subscriber with
     # the existing stream_overflow terminal event (client reconnects + replays).
     SSE_QUEUE_MAX_BUFFERED_BYTES: int = 16 * 1024 * 1024
+    # Extraction result cache (extraction_cache_service.py). The memory tier
+    # is an LRU bounded by entry count AND payload bytes. "sqlite" adds an
+    # on-disk tier behind it (EXTRACTION_CACHE_SQLITE_PATH, relative to
+    # backend/) that every worker on the host shares and that survives
+    # restarts, so a deploy or a second worker does not start cold and re-run
+    # paid vision extractions. Expired entries are swept on a timer.
+    EXTRACTION_CACHE_BACKEND: str = "memory"  # "memory" | "sqlite"
+    EXTRACTION_CACHE_MAX_ENTRIES: int = 200
+    EXTRACTION_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    EXTRACTION_CACHE_SQLITE_PATH: str = "cache/extraction_cache.sqlite3"
+    EXTRACTION_CACHE_SQLITE_MAX_BYTES: int = 256 * 1024 * 1024
+    EXTRACTION_CACHE_SWEEP_INTERVAL_SECONDS: int = 600
+    # Prepared avatar references (avatar_reference_service.py): in-process
+    # LRU of the downscaled avatar JPEG sent to AI providers, bounded by
+    # entry count AND base64 bytes. A miss reads the persisted ``_ref_v{N}``
+    # sibling before falling back to downloading the original.
+    AVATAR_REFERENCE_CACHE_MAX_ENTRIES: int = 128
+    AVATAR_REFERENCE_CACHE_MAX_BYTES: int = 16 * 1024 * 1024
+    # Remote image URLs downloaded at the Gemini boundary
+    # (remote_image_fetcher.py): one pooled client, at most
+    # REMOTE_IMAGE_FETCH_CONCURRENCY downloads at once, and a short-TTL LRU
+    # keyed by the full (signed) URL, bounded by entries AND bytes, so
+    # retries and repeated references in one call skip the re-download.
+    # Keep the TTL well under OBJECT_STORAGE_PRESIGN_TTL. 0 disables caching.
+    REMOTE_IMAGE_FETCH_CONCURRENCY: int = 8
+    REMOTE_IMAGE_CACHE_TTL_SECONDS: int = 300
+    REMOTE_IMAGE_CACHE_MAX_ENTRIES: int = 64
+    REMOTE_IMAGE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    # Perceptual-hash tier of /items/check-duplicates (image_hash_index.py):
+    # a photo within DUPLICATE_IMAGE_HASH_MAX_DISTANCE bits (of 64) of a stored
+    # item image is reported without spending embedding quota. Each user's
+    # hashes are loaded once into a BK-tree, cached for the TTL and dropped on
+    # this worker's item/image writes. 0 TTL disables caching (every check
+    # reloads); a negative distance disables the tier.
+    DUPLICATE_IMAGE_HASH_MAX_DISTANCE: int = 6
+    DUPLICATE_HASH_INDEX_TTL_SECONDS: int = 300
+    DUPLICATE_HASH_INDEX_MAX_USERS: int = 256
+    # Server-side cache of the public blog payloads (app/api/v1/blog.py).
+    # Admin writes invalidate it; the TTL only bounds edits made outside the
+    # API. Matches the max-age the endpoints advertise. 0 disables.
+    BLOG_CACHE_TTL_SECONDS: int = 300
+    BLOG_CACHE_MAX_ENTRIES: int = 256
 
     # Logging
     LOG_LEVEL: str = "INFO"
     LOG_DIR: str = "logs"
+    # Records buffered between callers and the log-writer thread. When the
+    # writer falls behind (slow stdout pipe), further records are dropped
+    # and counted instead of blocking the event loop.
+    LOG_QUEUE_MAX_RECORDS: int = 10000
+    # DEBUG floods only: per call site, the first BURST records each second
+    # are kept, then one in EVERY (1 = keep all). INFO+ is never sampled.
+    LOG_DEBUG_SAMPLE_BURST: int = 20
+    LOG_DEBUG_SAMPLE_EVERY: int = 10
+    # Bearer token for GET /metrics (Prometheus text format, app/api/v1/metrics.py).
+    # Empty = the endpoint answers 404: route latencies, queue depths and
+    # cache sizes are operator data, so nothing is exposed until a scraper
+    # is configured with the token.
+    METRICS_TOKEN: str = ""
 
     @field_validator("AI_GENERATION_CONCURRENCY", "AI_EXTRACTION_CONCURRENCY", mode="after")
     @classmethod
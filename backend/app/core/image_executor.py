@@ -22,16 +22,51 @@ Everything else keeps `asyncio.to_thread`.
 
 import asyncio
 import threading
+import time
 from concurrent.futures import ThreadPoolExecutor
 from typing import Awaitable, Callable, Optional, TypeVar
 
 from app.core.config import settings
+from app.utils.metrics import Gauge, Histogram
 
 T = TypeVar("T")
 
 _lock = threading.Lock()
 _executor: Optional[ThreadPoolExecutor] = None
 
+# Queue telemetry (GET /metrics). Submitted-but-not-started ops are the
+# image pool's queue depth; a high wait with low run time means the pool is
+# the bottleneck, not the decode itself.
+_stats_lock = threading.Lock()
+_queued = 0
+_running = 0
+
+Gauge(
+    "fitcheck_image_op_queue_depth",
+    "run_image_op calls waiting for a free image worker.",
+    callback=lambda: _queued,
+)
+Gauge(
+    "fitcheck_image_op_running",
+    "run_image_op calls executing on the image workers.",
+    callback=lambda: _running,
+)
+IMAGE_OP_WAIT_SECONDS = Histogram(
+    "fitcheck_image_op_wait_seconds",
+    "Time a run_image_op call queued before a worker picked it up.",
+)
+IMAGE_OP_DURATION_SECONDS = Histogram(
+    "fitcheck_image_op_duration_seconds",
+    "Time a run_image_op call spent executing.",
+)
+
+
+def _adjust(queued: int = 0, running: int = 0) -> None:
+    global _queued, _running
+    with _stats_lock:
+        _queued += queued
+        _running += running
+
 
 def _get_executor() -> ThreadPoolExecutor:
     """Return the shared executor, re-creating it if it was shut down.
@@ -60,7 +95,33 @@ def run_image_op(fn: Callable[..., T], *args, **kwargs) -> Awaitable[T]:
     Must be called from a running event loop (like asyncio.to_thread).
     """
     loop = asyncio.get_running_loop()
-    return loop.run_in_executor(_get_executor(), lambda: fn(*args, **kwargs))
+    submitted = time.perf_counter()
+    started = threading.Event()
+
+    def _run() -> T:
+        began = time.perf_counter()
+        started.set()
+        _adjust(queued=-1, running=1)
+        IMAGE_OP_WAIT_SECONDS.observe(began - submitted)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _adjust(running=-1)
+            IMAGE_OP_DURATION_SECONDS.observe(time.perf_counter() - began)
+
+    def _on_done(_future) -> None:
+        # Cancelled before a worker took it (executor shutdown): still queued.
+        if not started.is_set():
+            _adjust(queued=-1)
+
+    _adjust(queued=1)
+    try:
+        future = loop.run_in_executor(_get_executor(), _run)
+    except BaseException:  # pragma: no cover - submit refused (executor torn down mid-call)
+        _adjust(queued=-1)
+        raise
+    future.add_done_callback(_on_done)
+    return future
 
 
 def shutdown() -> None:
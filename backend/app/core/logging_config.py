@@ -6,16 +6,24 @@ Creates a new log file for each server session with:
 - Pretty console format for development
 - Correlation ID support for request tracing
 - ContextLogger for structured logging with automatic context
+- Off-loop output: the root logger only enqueues; a QueueListener thread
+  formats and writes (see setup_session_logging)
 """
 
+import atexit
 import json
 import logging
+import queue
 import sys
+import threading
+import time
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
 
 from app.core.config import settings
+from app.utils.metrics import Counter
 
 
 class ContextLogger:
@@ -265,6 +273,119 @@ class PrettyFormatter(logging.Formatter):
         return message
 
 
+# Records the pipeline discarded instead of blocking the caller (GET /metrics).
+LOG_RECORDS_DROPPED = Counter(
+    "fitcheck_log_records_dropped_total",
+    "Log records discarded: queue_full (writer thread behind) or sampled (debug flood).",
+    ("reason",),
+)
+
+
+class DebugSampler(logging.Filter):
+    """Thin out DEBUG floods per call site; INFO and above always pass.
+
+    Within each ``window`` seconds a call site (``pathname:lineno``) logs its
+    first ``burst`` DEBUG records, then one in ``every``. Keyed by location,
+    not message, so f-string messages cannot grow the table without bound.
+    """
+
+    def __init__(self, burst: int, every: int, window: float = 1.0):
+        super().__init__()
+        self.burst = max(0, burst)
+        self.every = max(1, every)
+        self.window = window
+        self._lock = threading.Lock()
+        self._sites: Dict[Tuple[str, int], Tuple[float, int]] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or self.every == 1:
+            return True
+        key = (record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            started, count = self._sites.get(key, (now, 0))
+            if now - started >= self.window:
+                started, count = now, 0
+            count += 1
+            self._sites[key] = (started, count)
+        if count <= self.burst or (count - self.burst) % self.every == 0:
+            return True
+        LOG_RECORDS_DROPPED.inc(reason="sampled")
+        return False
+
+
+class DroppingQueueHandler(QueueHandler):
+    """Enqueue-only root handler: never blocks, drops and counts when full.
+
+    Runs on the logging thread (the event loop for most calls), so it does
+    the minimum: filters (correlation context is a contextvar and must be
+    read here), resolve ``msg % args`` (args may be mutated after the call)
+    and a non-blocking put. Formatting, tracebacks and I/O happen on the
+    listener thread. Drops are reported by one WARNING record once the queue
+    has room again.
+    """
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]"):
+        super().__init__(log_queue)
+        self._dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Unlike the stdlib default, do not format here: exc_info is kept for
+        # the formatter on the listener thread.
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        with self._dropped_lock:
+            dropped, self._dropped = self._dropped, 0
+        try:
+            if dropped:
+                self.queue.put_nowait(self._drop_notice(dropped))
+                dropped = 0
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self._dropped += dropped + 1
+            LOG_RECORDS_DROPPED.inc(reason="queue_full")
+
+    @staticmethod
+    def _drop_notice(dropped: int) -> logging.LogRecord:
+        message = f"Log queue full: dropped {dropped} record(s) while the writer was behind"
+        return logging.LogRecord(__name__, logging.WARNING, __file__, 0, message, None, None)
+
+
+class _LogListener(QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # The stdlib uses put_nowait, which raises on a full bounded queue;
+        # wait for the writer to make room instead (shutdown path only).
+        self.queue.put(self._sentinel, timeout=5)
+
+
+_listener: Optional[QueueListener] = None
+_atexit_registered = False
+
+
+def shutdown_logging() -> None:
+    """Drain queued records and stop the writer thread (idempotent).
+
+    Registered with atexit by setup_session_logging so the last lines before
+    exit (shutdown messages, tracebacks) are written, not dropped with the
+    daemon thread.
+    """
+    global _listener
+    listener, _listener = _listener, None
+    if listener is not None:
+        try:
+            listener.stop()
+        except queue.Full:  # pragma: no cover - writer wedged for 5s at exit
+            pass
+        for handler in listener.handlers:
+            handler.close()
+
+
 def setup_session_logging() -> str:
     """Configure logging for this server session.
 
@@ -272,10 +393,20 @@ def setup_session_logging() -> str:
     platform log drain captures everything. Local DEBUG: also write a
     session file under LOG_DIR for easier grepping.
 
+    The root logger gets one DroppingQueueHandler; the file/stdout handlers
+    run on a QueueListener thread. A slow stdout pipe (Railway's log drain
+    under a batch burst) used to block whichever coroutine was logging —
+    i.e. the event loop. Now it fills a bounded queue
+    (LOG_QUEUE_MAX_RECORDS) and, past that, records are dropped and counted
+    (``fitcheck_log_records_dropped_total``) rather than stalling requests.
+
     Returns:
         Path to the log file for this session, or empty string when file
         logging is disabled.
     """
+    global _atexit_registered
+    shutdown_logging()
+
     # Railway sets RAILWAY_ENVIRONMENT; also treat non-DEBUG as production.
     # Definition centralized in Settings.is_production so this stays in step
     # with the boot config checks (config_health).
@@ -294,6 +425,7 @@ def setup_session_logging() -> str:
     correlation_filter = CorrelationIdLogFilter()
 
     log_file_path = ""
+    sinks = []
 
     # File handler only in local/dev — container disk is ephemeral and
     # Railway already captures stdout.
@@ -307,8 +439,7 @@ def setup_session_logging() -> str:
         file_handler = logging.FileHandler(log_file)
         file_handler.setLevel(log_level)
         file_handler.setFormatter(JsonFormatter())
-        file_handler.addFilter(correlation_filter)
-        root_logger.addHandler(file_handler)
+        sinks.append(file_handler)
 
     # Console: JSON in production (parseable), pretty in development
     console_handler = logging.StreamHandler(sys.stdout)
@@ -317,8 +448,24 @@ def setup_session_logging() -> str:
         console_handler.setFormatter(JsonFormatter())
     else:
         console_handler.setFormatter(PrettyFormatter())
-    console_handler.addFilter(correlation_filter)
-    root_logger.addHandler(console_handler)
+    sinks.append(console_handler)
+
+    # Filters run on the caller's thread, where the request's contextvars
+    # (correlation id, user id) are visible; the listener thread cannot see them.
+    queue_handler = DroppingQueueHandler(queue.Queue(maxsize=max(1, settings.LOG_QUEUE_MAX_RECORDS)))
+    queue_handler.setLevel(log_level)
+    queue_handler.addFilter(correlation_filter)
+    queue_handler.addFilter(
+        DebugSampler(settings.LOG_DEBUG_SAMPLE_BURST, settings.LOG_DEBUG_SAMPLE_EVERY)
+    )
+    root_logger.addHandler(queue_handler)
+
+    global _listener
+    _listener = _LogListener(queue_handler.queue, *sinks, respect_handler_level=True)
+    _listener.start()
+    if not _atexit_registered:
+        atexit.register(shutdown_logging)
+        _atexit_registered = True
 
     # Reduce noise from third-party libraries
     logging.getLogger("httpx").setLevel(logging.WARNING)
@@ -9,13 +9,30 @@ import logging
 import time
 import uuid
 from contextvars import ContextVar
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Dict, Optional
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.security import bind_request_token
+from app.utils.metrics import Histogram
 
 logger = logging.getLogger(__name__)
 
+# Per-route latency (GET /metrics). Labelled with the route TEMPLATE
+# ("/api/v1/items/{item_id}"), never the raw path, so ids cannot explode the
+# series count; requests no route matched share "unmatched".
+REQUEST_DURATION_SECONDS = Histogram(
+    "fitcheck_http_request_duration_seconds",
+    "HTTP request latency by route template, method and status.",
+    ("method", "route", "status"),
+)
+
+
+def _route_template(scope: Scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
 # Context variables for async-safe request context
 _correlation_id: ContextVar[Optional[str]] = ContextVar("correlation_id", default=None)
 _log_context: ContextVar[Dict[str, Any]] = ContextVar("log_context", default={})
@@ -55,86 +72,76 @@ def clear_log_context() -> None:
     _log_context.set({})
 
 
-class CorrelationIdMiddleware(BaseHTTPMiddleware):
+class CorrelationIdMiddleware:
     """Middleware to add correlation IDs to all requests.
 
     - Generates a UUID for each request
     - Adds it to the response headers as X-Correlation-ID
     - Makes it available to the logging context via contextvars
     - Extracts user_id from JWT for logging context (best effort)
+
+    Pure ASGI (no BaseHTTPMiddleware): the app runs in the caller's task, so
+    contextvars set here are visible to handlers without copying, and
+    streaming/SSE bodies pass through untouched — only the response-start
+    message is rewritten to carry the header.
     """
 
     CORRELATION_ID_HEADER = "X-Correlation-ID"
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        # Check if correlation ID was provided in request headers (from upstream)
-        correlation_id = request.headers.get(self.CORRELATION_ID_HEADER)
+    def __init__(self, app: ASGIApp):
+        self.app = app
 
-        if not correlation_id:
-            # Generate a new correlation ID
-            correlation_id = str(uuid.uuid4())
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        # Store in context for logging (contextvars are automatically scoped per-request)
-        set_correlation_id(correlation_id)
+        headers = Headers(scope=scope)
+        # Check if correlation ID was provided in request headers (from upstream)
+        correlation_id = headers.get(self.CORRELATION_ID_HEADER) or str(uuid.uuid4())
 
-        # Add to request state for handler access
-        request.state.correlation_id = correlation_id
+        # Store in context for logging and in request.state for handler access
+        set_correlation_id(correlation_id)
+        scope.setdefault("state", {})["correlation_id"] = correlation_id
 
         # Extract user_id from JWT if present (best effort, no failure on invalid token)
-        self._extract_user_context(request)
-
-        try:
-            response = await call_next(request)
+        self._extract_user_context(headers.get("Authorization", ""))
 
-            # Add correlation ID to response headers
-            response.headers[self.CORRELATION_ID_HEADER] = correlation_id
+        async def send_with_correlation_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[self.CORRELATION_ID_HEADER] = correlation_id
+            await send(message)
 
-            return response
+        try:
+            await self.app(scope, receive, send_with_correlation_id)
         finally:
             # Clear log context at end of request
             clear_log_context()
 
-    def _extract_user_context(self, request: Request) -> None:
+    def _extract_user_context(self, auth_header: str) -> None:
         """Extract user_id from JWT and add to logging context.
 
-        This is best-effort - invalid tokens are silently ignored.
-        Actual auth validation happens in the route dependencies.
+        This is best-effort - invalid tokens are silently ignored. The parse
+        is bound to the request so verify_token reuses it instead of decoding
+        the token a second time; actual verification happens there.
         """
-        auth_header = request.headers.get("Authorization", "")
         if not auth_header.startswith("Bearer "):
             return
 
-        try:
-            import jwt as pyjwt
-
-            token = auth_header[7:]
-            # Decode without verification — only for log context user_id.
-            # Actual verification happens in app.core.security.verify_token.
-            # Support both legacy HS256 and Supabase JWT Signing Keys (ES256/RS256).
-            payload = pyjwt.decode(
-                token,
-                options={
-                    "verify_signature": False,
-                    "verify_exp": False,
-                    "verify_aud": False,
-                },
-                algorithms=["HS256", "ES256", "RS256"],
-            )
-            user_id = payload.get("sub")
-            if user_id:
-                set_log_context(user_id=user_id)
-        except Exception:
-            # Silently ignore any token parsing errors
-            pass
+        parsed = bind_request_token(auth_header[7:])
+        user_id = parsed.claims.get("sub") if parsed is not None else None
+        if user_id:
+            set_log_context(user_id=user_id)
 
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
+class RequestLoggingMiddleware:
     """Middleware to log all incoming requests and their responses.
     
     Logs:
     - Request method, path, and query parameters
     - Response status code
-    - Request duration
+    - Request duration (time to response start, so an SSE stream logs when
+      it opens rather than when the client disconnects)
     - Correlation ID for tracing
     """
     
@@ -147,29 +154,36 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
         "/api/v1/docs",
         "/api/v1/redoc",
         "/api/v1/openapi.json",
+        "/metrics",
     }
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         # CORS preflights are browser transport noise, not application calls.
-        # They are answered identically by Starlette's CORSMiddleware (which
-        # sits OUTSIDE this middleware in the stack) and logging them as
+        # They are answered by Starlette's CORSMiddleware (which sits INSIDE
+        # this middleware in the stack) and logging them as
         # request/response entries made every web API call look duplicated in
         # logs. Correlation ID and CORS behavior are unchanged.
-        if request.method == "OPTIONS":
-            return await call_next(request)
+        if scope["type"] != "http" or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
 
         # Skip logging for certain paths
-        if request.url.path in self.SKIP_PATHS:
-            return await call_next(request)
+        if scope["path"] in self.SKIP_PATHS:
+            await self.app(scope, receive, send)
+            return
 
         # Get correlation ID (set by CorrelationIdMiddleware)
-        correlation_id = getattr(request.state, "correlation_id", "unknown")
+        correlation_id = scope.get("state", {}).get("correlation_id", "unknown")
         
         # Capture request info
-        method = request.method
-        path = request.url.path
-        query = str(request.query_params) if request.query_params else ""
-        client_ip = request.client.host if request.client else "unknown"
+        method = scope["method"]
+        path = scope["path"]
+        query = scope.get("query_string", b"").decode("latin-1")
+        client = scope.get("client")
+        client_ip = client[0] if client else "unknown"
         
         # Log request start
         logger.info(
@@ -180,30 +194,44 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
         
         # Time the request
         start_time = time.perf_counter()
-        
+        responded = False
+
+        async def send_with_logging(message: Message) -> None:
+            nonlocal responded
+            if message["type"] == "http.response.start" and not responded:
+                responded = True
+                # Calculate duration
+                duration_ms = (time.perf_counter() - start_time) * 1000
+                
+                # Log response
+                status_code = message["status"]
+                log_level = logging.INFO if status_code < 400 else logging.WARNING if status_code < 500 else logging.ERROR
+                
+                logger.log(
+                    log_level,
+                    f"[{correlation_id}] <-- {method} {path} | {status_code} | {duration_ms:.2f}ms"
+                )
+                REQUEST_DURATION_SECONDS.observe(
+                    duration_ms / 1000, method=method, route=_route_template(scope), status=str(status_code)
+                )
+            await send(message)
+
         try:
-            response = await call_next(request)
-            
-            # Calculate duration
-            duration_ms = (time.perf_counter() - start_time) * 1000
-            
-            # Log response
-            status_code = response.status_code
-            log_level = logging.INFO if status_code < 400 else logging.WARNING if status_code < 500 else logging.ERROR
-            
-            logger.log(
-                log_level,
-                f"[{correlation_id}] <-- {method} {path} | {status_code} | {duration_ms:.2f}ms"
-            )
-            
-            return response
-            
+            await self.app(scope, receive, send_with_logging)
         except Exception as e:
+            if responded:
+                # Failed mid-body (e.g. a stream generator raised): the status
+                # line is already logged and observed; the traceback is
+                # reported by the server.
+                raise
             # Log exception
             duration_ms = (time.perf_counter() - start_time) * 1000
             logger.error(
                 f"[{correlation_id}] <-- {method} {path} | EXCEPTION | {duration_ms:.2f}ms | {type(e).__name__}: {str(e)}"
             )
+            REQUEST_DURATION_SECONDS.observe(
+                duration_ms / 1000, method=method, route=_route_template(scope), status="exception"
+            )
             raise
 
 
@@ -9,6 +9,8 @@ Supports:
 from __future__ import annotations
 
 import logging
+from contextvars import ContextVar
+from dataclasses import dataclass
 from typing import Any, Dict, Optional, Set
 
 import jwt
@@ -41,6 +43,52 @@ class TokenData:
         self.email: Optional[str] = None
 
 
+@dataclass(frozen=True)
+class UnverifiedToken:
+    """Header and claims of a bearer token, decoded WITHOUT signature checks.
+
+    Good for routing (alg/kid) and log context only — never for authorization.
+    """
+
+    raw: str
+    header: Dict[str, Any]
+    claims: Dict[str, Any]
+
+
+# The request's bearer token, parsed once by CorrelationIdMiddleware and
+# reused by verify_token (same task, so the contextvar is visible).
+_request_token: ContextVar[Optional[UnverifiedToken]] = ContextVar("request_token", default=None)
+
+
+def parse_bearer_token(token: str) -> Optional[UnverifiedToken]:
+    """Decode ``token`` without verification; None when it is not a JWT.
+
+    Returns the request's already-parsed token when it is the same string.
+    """
+    cached = _request_token.get()
+    if cached is not None and cached.raw == token:
+        return cached
+    try:
+        decoded = jwt.decode_complete(
+            token,
+            options={
+                "verify_signature": False,
+                "verify_exp": False,
+                "verify_aud": False,
+            },
+        )
+    except jwt.PyJWTError:
+        return None
+    return UnverifiedToken(raw=token, header=decoded["header"], claims=decoded["payload"])
+
+
+def bind_request_token(token: str) -> Optional[UnverifiedToken]:
+    """Parse ``token`` and remember it for the rest of the current request."""
+    parsed = parse_bearer_token(token)
+    _request_token.set(parsed)
+    return parsed
+
+
 def _jwks_url() -> str:
     """Build Supabase Auth JWKS URL from configured project URL."""
     base = (settings.SUPABASE_URL or "").rstrip("/")
@@ -88,17 +136,19 @@ def _unauthorized(detail: str = "Invalid token") -> HTTPException:
     )
 
 
-def _decode_payload(token: str) -> Dict[str, Any]:
+def _decode_payload(token: str, header: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """Decode and verify a Supabase access token.
 
     Prefer asymmetric verification via JWKS when the token header says ES256/RS256
     (current Supabase JWT Signing Keys). Fall back to HS256 + SUPABASE_JWT_SECRET
-    for legacy projects and unit tests.
+    for legacy projects and unit tests. ``header`` skips re-parsing when the
+    caller already has it (see parse_bearer_token).
     """
-    try:
-        header = jwt.get_unverified_header(token)
-    except jwt.exceptions.DecodeError as e:
-        raise _unauthorized() from e
+    if header is None:
+        try:
+            header = jwt.get_unverified_header(token)
+        except jwt.exceptions.DecodeError as e:
+            raise _unauthorized() from e
 
     alg = header.get("alg")
     kid = header.get("kid")
@@ -179,16 +229,16 @@ async def verify_token(
     token_kid: Optional[str] = None
 
     try:
-        try:
-            header = jwt.get_unverified_header(token)
+        # Usually already parsed by CorrelationIdMiddleware for this request.
+        parsed = parse_bearer_token(token)
+        header = parsed.header if parsed is not None else None
+        if header is not None:
             token_alg = header.get("alg")
             token_kid = header.get("kid")
-        except Exception:
-            pass
 
         # Local verification only — no network call to Supabase Auth per request
         # when JWKS is cached. Login still uses Supabase Auth for password checks.
-        payload = _decode_payload(token)
+        payload = _decode_payload(token, header)
 
         user_id = payload.get("sub")
         if not user_id:
@@ -24,12 +24,62 @@ authenticated request, without changing the client architecture.
 
 from supabase import create_client, Client
 from app.core.config import settings
-from typing import Optional
+from app.utils.metrics import Histogram
+from typing import Any, Optional
 import logging
 import threading
+import time
 
 logger = logging.getLogger(__name__)
 
+# PostgREST round-trip latency (GET /metrics), by table or ``rpc/<name>``.
+# Measured with httpx event hooks on the client's PostgREST session so every
+# ``.execute()`` is covered without touching the ~300 call sites; the clock
+# stops when response headers arrive (the query has run by then).
+DB_REQUEST_SECONDS = Histogram(
+    "fitcheck_db_request_duration_seconds",
+    "Supabase PostgREST request latency, by table or RPC.",
+    ("target",),
+)
+_DB_STARTED_AT = "fitcheck_db_started_at"
+
+
+def _db_target(path: str) -> str:
+    """``/rest/v1/items`` -> ``items``; ``/rest/v1/rpc/fn`` -> ``rpc/fn``."""
+    _, _, rest = path.partition("/rest/v1/")
+    return rest.strip("/") or "other"
+
+
+def _on_db_request(request: Any) -> None:
+    request.extensions[_DB_STARTED_AT] = time.perf_counter()
+
+
+def _on_db_response(response: Any) -> None:
+    started = response.request.extensions.get(_DB_STARTED_AT)
+    if started is not None:
+        DB_REQUEST_SECONDS.observe(
+            time.perf_counter() - started, target=_db_target(response.request.url.path)
+        )
+
+
+def _instrument(client: Client) -> Client:
+    """Attach the latency hooks to ``client``'s PostgREST session (idempotent).
+
+    Re-checked on every accessor call, not only at creation: supabase-py
+    drops and rebuilds its PostgREST client on auth state changes.
+    """
+    try:
+        session = client.postgrest.session
+        hooks = session.event_hooks
+        if _on_db_request not in hooks["request"]:
+            session.event_hooks = {
+                "request": [*hooks["request"], _on_db_request],
+                "response": [*hooks["response"], _on_db_response],
+            }
+    except Exception:  # telemetry must never break DB access (mocked clients in tests)
+        pass
+    return client
+
 # Guards creation/rebuild of the singleton clients. supabase-py's sync client
 # owns ONE httpx HTTP/2 connection pool; when the Supabase gateway drops that
 # connection every concurrent request detects it. Without a lock, each one
@@ -61,7 +111,7 @@ class SupabaseDB:
 
                     cls._instance = create_client(settings.SUPABASE_URL, settings.SUPABASE_PUBLISHABLE_KEY)
                     logger.info("Supabase client initialized")
-        return cls._instance
+        return _instrument(cls._instance)
 
     @classmethod
     def get_service_client(cls) -> Client:
@@ -77,7 +127,7 @@ class SupabaseDB:
 
                     cls._service_instance = create_client(settings.SUPABASE_URL, settings.SUPABASE_SECRET_KEY)
                     logger.info("Supabase service client initialized")
-        return cls._service_instance
+        return _instrument(cls._service_instance)
 
     @classmethod
     def reset(cls):
@@ -120,7 +170,7 @@ class SupabaseDB:
                 raise ValueError("SUPABASE_URL and SUPABASE_SECRET_KEY must be set for service client")
             cls._service_instance = create_client(settings.SUPABASE_URL, settings.SUPABASE_SECRET_KEY)
             logger.info("Supabase service client rebuilt (pooled connection recovery)")
-            return cls._service_instance
+            return _instrument(cls._service_instance)
 
 
 async def get_db() -> Client:
@@ -3,6 +3,7 @@ FitCheck AI - Main Application Entry Point
 """
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
 from app.utils.datetime_util import utcnow
 from fastapi import FastAPI, Request
@@ -16,9 +17,14 @@ from app.core.config import settings
 from app.core.logging_config import setup_session_logging
 from app.core.exceptions import FitCheckException
 from app.core.middleware import CorrelationIdMiddleware, RequestLoggingMiddleware, get_correlation_id
-from app.api.v1 import auth, items, outfits, recommendations, users, calendar, weather, gamification, shared_outfits, ai, ai_settings, waitlist, demo, batch_processing, subscription, iap, referral, feedback, photoshoot, social_import, blog, promo, images, admin, health
+from app.api.v1 import auth, items, outfits, recommendations, users, calendar, weather, gamification, shared_outfits, ai, ai_settings, waitlist, demo, batch_processing, subscription, iap, referral, feedback, photoshoot, social_import, blog, promo, images, admin, health, metrics
 from app.db.connection import SupabaseDB
-from app.utils.db import missing_quota_rpcs, missing_referral_rpcs, probe_valid_batch_size_bound
+from app.utils.db import (
+    missing_quota_rpcs,
+    missing_referral_rpcs,
+    missing_social_import_rpcs,
+    probe_valid_batch_size_bound,
+)
 from postgrest.exceptions import APIError as PostgrestAPIError
 
 REQUIRED_TABLES = (
@@ -101,6 +107,10 @@ REQUIRED_COLUMNS = (
     # POST /photoshoot/generate fails with PGRST204 at request time
     # (observed 2026-08-07), so readiness fails closed until 035 is applied.
     ("photoshoot_jobs", "image_failures"),
+    # Perceptual hash for the duplicate check (migration 044): item creation
+    # and image uploads always write it, so without the column every
+    # item-image insert fails with PGRST204.
+    ("item_images", "image_hash"),
 )
 
 REQUIRED_COLUMN_ALTERNATIVES = {
@@ -118,6 +128,38 @@ REQUIRED_COLUMN_ALTERNATIVES = {
 # wearing a schema failure's clothes.
 _SCHEMA_ABSENT_CODES = {"PGRST205", "PGRST204", "42703"}
 
+# Probes per schema check run concurrently: each is one PostgREST round trip
+# (~40 of them), so a sequential pass spent most of its ~2-4s in latency.
+# Bounded so a check never opens more connections than the sync client's pool
+# comfortably holds.
+_SCHEMA_PROBE_WORKERS = 8
+
+
+def _table_exists(db, table: str) -> bool:
+    """Report whether a table is present; same fail-closed logging as _column_exists."""
+    log = logging.getLogger(__name__)
+    try:
+        db.table(table).select("*").limit(1).execute()
+        return True
+    except PostgrestAPIError as e:
+        if getattr(e, "code", None) in _SCHEMA_ABSENT_CODES:
+            log.info("Schema check: table %s is absent from the schema", table)
+        else:
+            log.warning(
+                "Schema check for table %s failed for a non-schema reason "
+                "(code=%s): %s. Reporting as missing, but the cause is not "
+                "a missing table.",
+                table, getattr(e, "code", None), e,
+            )
+        return False
+    except Exception as e:
+        log.warning(
+            "Schema check for table %s failed before reaching PostgREST: "
+            "%s. Reporting as missing, but the cause is not a missing table.",
+            table, e,
+        )
+        return False
+
 
 def _column_exists(db, table: str, column: str) -> bool:
     """Report whether a column is present, logging *why* when it is not.
@@ -158,33 +200,23 @@ def _schema_missing(db) -> list[str]:
     if settings.ENABLE_SOCIAL_IMPORT:
         required_tables.extend(SOCIAL_IMPORT_TABLES)
 
+    # Every table and column probe in one concurrent pass. Both map() calls
+    # submit eagerly, so column probes do not wait for the table batch.
+    with ThreadPoolExecutor(
+        max_workers=_SCHEMA_PROBE_WORKERS, thread_name_prefix="schema-probe"
+    ) as pool:
+        tables_present = pool.map(lambda table: _table_exists(db, table), required_tables)
+        columns_present = pool.map(lambda pair: _column_exists(db, *pair), REQUIRED_COLUMNS)
+        table_results = list(tables_present)
+        column_results = list(columns_present)
+
     # Required tables
-    log = logging.getLogger(__name__)
-    for table in required_tables:
-        try:
-            db.table(table).select("*").limit(1).execute()
-        except PostgrestAPIError as e:
-            if getattr(e, "code", None) in _SCHEMA_ABSENT_CODES:
-                log.info("Schema check: table %s is absent from the schema", table)
-            else:
-                log.warning(
-                    "Schema check for table %s failed for a non-schema reason "
-                    "(code=%s): %s. Reporting as missing, but the cause is not "
-                    "a missing table.",
-                    table, getattr(e, "code", None), e,
-                )
-            missing.append(table)
-        except Exception as e:
-            log.warning(
-                "Schema check for table %s failed before reaching PostgREST: "
-                "%s. Reporting as missing, but the cause is not a missing table.",
-                table, e,
-            )
-            missing.append(table)
+    missing.extend(table for table, ok in zip(required_tables, table_results) if not ok)
 
-    # Required columns (guarding against partial migrations)
-    for table, column in REQUIRED_COLUMNS:
-        if _column_exists(db, table, column):
+    # Required columns (guarding against partial migrations). Alternatives are
+    # only probed for a missing column - rare, so sequentially.
+    for (table, column), ok in zip(REQUIRED_COLUMNS, column_results):
+        if ok:
             continue
 
         alternatives = REQUIRED_COLUMN_ALTERNATIVES.get((table, column), ())
@@ -213,8 +245,8 @@ def _get_cached_schema_status() -> tuple[bool, list[str]]:
     """Schema readiness, refreshed at most every _SCHEMA_STATUS_TTL.
 
     Used by GET /ready and startup seeding. /health is pure liveness and does
-    not call this. Cache avoids re-running ~30-40 sequential table/column
-    existence queries on every readiness poll.
+    not call this. Cache avoids re-running ~30-40 table/column existence
+    queries on every readiness poll.
     """
     now = utcnow()
     cached_at = _SCHEMA_STATUS_CACHE["checked_at"]
@@ -249,7 +281,7 @@ async def _seed_schema_status_in_thread() -> None:
     connections: Railway health probes /health as soon as the port binds.
 
     Also probes the hosted DB for the quota reservation RPCs (migrations
-    022/024/026) and the extraction_jobs.valid_batch_size CHECK bound
+    022/024/026), the social-import claim RPC (migration 043) and the extraction_jobs.valid_batch_size CHECK bound
     (migrations 023/029) the deployed backend requires. Gaps are logged with
     the runbook hint at boot - the deferred-debt follow-ups from the
     2026-07-31 batch-quota outage and the 2026-08-01 single-extract outage -
@@ -258,19 +290,29 @@ async def _seed_schema_status_in_thread() -> None:
     """
     import asyncio
 
+    from app.utils.process_metrics import startup_phase
+
     def _check():
         db = SupabaseDB.get_service_client()
-        return (
-            _schema_missing(db),
-            missing_quota_rpcs(db),
-            missing_referral_rpcs(db),
-            probe_valid_batch_size_bound(db),
-        )
+        with startup_phase("schema_probe"):
+            missing = _schema_missing(db)
+        with startup_phase("rpc_probes"):
+            return (
+                missing,
+                missing_quota_rpcs(db),
+                missing_referral_rpcs(db),
+                missing_social_import_rpcs(db),
+                probe_valid_batch_size_bound(db),
+            )
 
     try:
-        missing, missing_rpcs, missing_referral_rpcs_list, (bound_level, bound_message) = await asyncio.to_thread(
-            _check
-        )
+        (
+            missing,
+            missing_rpcs,
+            missing_referral_rpcs_list,
+            missing_social_import_rpcs_list,
+            (bound_level, bound_message),
+        ) = await asyncio.to_thread(_check)
         _SCHEMA_STATUS_CACHE["missing"] = missing
         _SCHEMA_STATUS_CACHE["checked_at"] = utcnow()
         log = logging.getLogger(__name__)
@@ -290,6 +332,13 @@ async def _seed_schema_status_in_thread() -> None:
                 "restore referral grants (every redemption fails silently and "
                 "the user + referrer stay on free until then)."
             )
+        if missing_social_import_rpcs_list:
+            log.error(
+                "Social import RPCs missing from hosted Supabase: "
+                f"{', '.join(sorted(missing_social_import_rpcs_list))}. Apply migration "
+                "043_social_import_batch_claim.sql to restore social imports "
+                "(every import run fails until then)."
+            )
         if bound_level == "critical":
             log.error(f"AI job persistence will fail for every job: {bound_message}")
         elif bound_level == "warn":
@@ -323,8 +372,11 @@ async def _init_pinecone_in_thread() -> None:
     try:
         from app.services.vector_service import get_vector_service
 
+        from app.utils.process_metrics import startup_phase
+
         def _init():
-            get_vector_service().create_index()
+            with startup_phase("pinecone_init"):
+                get_vector_service().create_index()
 
         await asyncio.to_thread(_init)
         logging.getLogger(__name__).info("Pinecone index init complete")
@@ -339,7 +391,9 @@ async def _background_startup(logger: logging.Logger) -> None:
     leave a "Task exception was never retrieved" on the event loop.
     """
     import asyncio
+    import time
 
+    started = time.perf_counter()
     try:
         results = await asyncio.gather(
             _seed_schema_status_in_thread(),
@@ -356,8 +410,21 @@ async def _background_startup(logger: logging.Logger) -> None:
                     result,
                 )
         try:
-            from app.utils.process_metrics import log_memory
+            from app.utils.process_metrics import (
+                get_startup_timings,
+                log_memory,
+                record_startup_phase,
+            )
             log_memory("background_startup_complete", force=True)
+            record_startup_phase("background_startup", time.perf_counter() - started)
+            timings = get_startup_timings()
+            # Phases in the message text as well: Railway's plain-text drain
+            # does not render `extra`.
+            logger.info(
+                "Startup timings: "
+                + ", ".join(f"{phase}={seconds:.2f}s" for phase, seconds in timings.items()),
+                extra={"startup_timings": timings},
+            )
         except Exception:  # pragma: no cover - best-effort telemetry
             pass
         # One full collection after the import-time + startup churn settles:
@@ -387,6 +454,9 @@ async def lifespan(app: FastAPI):
     task so a slow Supabase/Pinecone call cannot delay deploy healthchecks.
     """
     import asyncio
+    import time
+
+    lifespan_started = time.perf_counter()
 
     # GC tuning for the single-worker memory budget (512 MB Railway):
     # - gc.freeze() moves import-time objects into the permanent generation so
@@ -416,8 +486,10 @@ async def lifespan(app: FastAPI):
     logger.info(f"Debug mode: {settings.DEBUG}")
 
     try:
-        from app.utils.process_metrics import log_memory
+        from app.utils.process_metrics import log_memory, process_uptime_seconds, record_startup_phase
         log_memory("startup", force=True)
+        # Interpreter start + imports + router registration, up to lifespan.
+        record_startup_phase("boot_to_lifespan", process_uptime_seconds())
     except Exception:  # pragma: no cover - best-effort telemetry
         pass
 
@@ -448,6 +520,12 @@ async def lifespan(app: FastAPI):
         name="background_startup",
     )
 
+    try:
+        from app.utils.process_metrics import record_startup_phase
+        record_startup_phase("lifespan_setup", time.perf_counter() - lifespan_started)
+    except Exception:  # pragma: no cover - best-effort telemetry
+        pass
+
     logger.info("Accepting traffic; background init scheduled")
     yield
 
@@ -476,6 +554,27 @@ async def lifespan(app: FastAPI):
     except Exception:  # pragma: no cover - defensive teardown
         pass
 
+    # Release the shared AI provider health-probe client.
+    try:
+        from app.services.ai_provider_health_service import get_health_service
+        await get_health_service().close()
+    except Exception:  # pragma: no cover - defensive teardown
+        pass
+
+    # Release the pooled remote-image fetch client (remote_image_fetcher.py).
+    try:
+        from app.services.remote_image_fetcher import get_remote_image_fetcher
+        await get_remote_image_fetcher().close()
+    except Exception:  # pragma: no cover - defensive teardown
+        pass
+
+    # Stop the extraction-cache sweeper and close its disk tier, if any.
+    try:
+        from app.services.extraction_cache_service import close_extraction_cache
+        await close_extraction_cache()
+    except Exception:  # pragma: no cover - defensive teardown
+        pass
+
     # Always retrieve the task result so a failed background init cannot
     # leave "Task exception was never retrieved" on the loop at process exit.
     if not bg_task.done():
@@ -500,7 +599,7 @@ app = FastAPI(
 )
 
 # ============================================================================
-# MIDDLEWARE (order matters - first added = outermost)
+# MIDDLEWARE (order matters - last added = outermost)
 # ============================================================================
 
 # CORS middleware
@@ -622,6 +721,9 @@ app.include_router(images.router, prefix="/api/v1/images", tags=["Images"])
 # The routes carry full paths, so no prefix is applied here.
 app.include_router(health.router, tags=["Health"])
 
+# Prometheus-style metrics (bearer METRICS_TOKEN; 404 when unset, not in OpenAPI)
+app.include_router(metrics.router, tags=["Health"])
+
 
 # ============================================================================
 # ROOT & READINESS ENDPOINTS
@@ -7,6 +7,8 @@ from typing import Any, Optional, List
 from uuid import UUID
 from datetime import datetime
 
+from app.utils.image_hash import IMAGE_HASH_PATTERN
+
 
 # Valid categories for items
 VALID_CATEGORIES = [
@@ -56,6 +58,9 @@ class ItemImageBase(BaseModel):
     is_primary: bool = False
     width: Optional[int] = None
     height: Optional[int] = None
+    # Perceptual hash returned by POST /items/upload (app/utils/image_hash.py);
+    # feeds the duplicate check's hash tier.
+    image_hash: Optional[str] = Field(None, pattern=IMAGE_HASH_PATTERN)
 
 
 class ItemImage(ItemImageBase):
@@ -9,6 +9,15 @@ Key features:
 - Cache health status for 60 seconds (avoid checking on every request)
 - Circuit breaker: After 3 consecutive failures, mark provider unavailable for 2 minutes
 - Fail fast with clear error messages instead of retrying unavailable providers
+- Passive feed: real chat/image call outcomes (record_success/record_failure)
+  drive the same breaker, so a degraded provider opens the circuit without
+  waiting for the next /models probe; once the reset timeout passes, the next
+  check_provider_health is the half-open probe. Passive failures are counted
+  apart from probe results: a host whose /models answers while its real
+  calls fail still trips, and only a successful real call resets the count
+- One shared probe client (no TLS handshake per probe) and one lock per
+  host, so a probe against a slow host never blocks checks of another and
+  concurrent checks of one host share a single probe
 """
 
 import asyncio
@@ -59,7 +68,55 @@ class AIProviderHealthService:
 
     def __init__(self):
         self._health_cache: Dict[str, HealthStatus] = {}
-        self._lock = asyncio.Lock()
+        # Consecutive failed real calls per base URL; probes never reset it.
+        self._passive_failures: Dict[str, int] = {}
+        self._host_locks: Dict[str, asyncio.Lock] = {}
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _lock_for(self, base_url: str) -> asyncio.Lock:
+        host = (urlparse(base_url).netloc or base_url).lower()
+        lock = self._host_locks.get(host)
+        if lock is None:
+            lock = self._host_locks[host] = asyncio.Lock()
+        return lock
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(HEALTH_CHECK_TIMEOUT),
+                follow_redirects=False,
+            )
+        return self._client
+
+    async def close(self) -> None:
+        """Close the shared probe client (application shutdown)."""
+        client, self._client = self._client, None
+        if client is not None:
+            await client.aclose()
+
+    def _cached_status(self, base_url: str) -> Optional[HealthStatus]:
+        """Cached status still authoritative (within TTL, or circuit open)."""
+        cached = self._health_cache.get(base_url)
+        if cached is None:
+            return None
+        age = time.time() - cached.last_check
+
+        # Return cached if within TTL
+        if age < HEALTH_CHECK_TTL_SECONDS:
+            return cached
+
+        # Circuit breaker: if too many failures, wait longer before retry
+        if cached.consecutive_failures >= CIRCUIT_BREAKER_THRESHOLD:
+            if age < CIRCUIT_BREAKER_RESET_TIMEOUT:
+                logger.warning(
+                    f"Circuit breaker OPEN for {base_url}",
+                    extra={
+                        "consecutive_failures": cached.consecutive_failures,
+                        "retry_in_seconds": CIRCUIT_BREAKER_RESET_TIMEOUT - age,
+                    },
+                )
+                return cached  # Return cached failure status
+        return None
 
     async def check_provider_health(
         self,
@@ -81,27 +138,24 @@ class AIProviderHealthService:
         """
         cache_key = base_url
 
-        # Check cache first
-        async with self._lock:
-            if cache_key in self._health_cache:
-                cached = self._health_cache[cache_key]
-                age = time.time() - cached.last_check
-
-                # Return cached if within TTL
-                if age < HEALTH_CHECK_TTL_SECONDS:
-                    return cached
-
-                # Circuit breaker: if too many failures, wait longer before retry
-                if cached.consecutive_failures >= CIRCUIT_BREAKER_THRESHOLD:
-                    if age < CIRCUIT_BREAKER_RESET_TIMEOUT:
-                        logger.warning(
-                            f"Circuit breaker OPEN for {base_url}",
-                            extra={
-                                "consecutive_failures": cached.consecutive_failures,
-                                "retry_in_seconds": CIRCUIT_BREAKER_RESET_TIMEOUT - age,
-                            },
-                        )
-                        return cached  # Return cached failure status
+        cached = self._cached_status(cache_key)
+        if cached is not None:
+            return cached
+
+        # One probe per host at a time; callers that queued behind it reuse
+        # its result instead of probing again.
+        async with self._lock_for(base_url):
+            cached = self._cached_status(cache_key)
+            if cached is not None:
+                return cached
+            status = await self._probe(base_url, api_key, timeout_seconds)
+            self._health_cache[cache_key] = status
+        return status
+
+    async def _probe(
+        self, base_url: str, api_key: str, timeout_seconds: float
+    ) -> HealthStatus:
+        cache_key = base_url
 
         # Perform actual health check
         start_time = time.time()
@@ -110,72 +164,70 @@ class AIProviderHealthService:
             health_url = f"{base_url.rstrip('/')}/models"
             is_non_openai = _is_non_openai_host(base_url)
 
-            async with httpx.AsyncClient(
-                timeout=httpx.Timeout(timeout_seconds),
-                follow_redirects=False,
-            ) as client:
-                headers = {}
-                # Non-OpenAI hosts (e.g. Google Generative Language API) do not
-                # accept Bearer auth tokens. Sending Bearer auth always fails with
-                # 401, which marks the provider unavailable and forces a fallback
-                # to the Agnes gateway on every vision call, adding ~5s latency.
-                # For these hosts we skip the Authorization header and rely on
-                # the actual request error handling instead.
-                if not is_non_openai:
-                    headers["Authorization"] = f"Bearer {api_key}"
-
-                response = await client.get(
-                    health_url,
-                    headers=headers,
-                )
+            client = self._get_client()
+            headers = {}
+            # Non-OpenAI hosts (e.g. Google Generative Language API) do not
+            # accept Bearer auth tokens. Sending Bearer auth always fails with
+            # 401, which marks the provider unavailable and forces a fallback
+            # to the Agnes gateway on every vision call, adding ~5s latency.
+            # For these hosts we skip the Authorization header and rely on
+            # the actual request error handling instead.
+            if not is_non_openai:
+                headers["Authorization"] = f"Bearer {api_key}"
+
+            response = await client.get(
+                health_url,
+                headers=headers,
+                timeout=timeout_seconds,
+            )
 
-                latency = (time.time() - start_time) * 1000
-
-                # Accept 2xx or 404 (404 means API is up but endpoint may vary)
-                is_healthy = response.status_code in (200, 404)
-
-                # 401/403 from the /models probe almost always means the
-                # bearer key (AI_CHAT_API_KEY / AI_VISION_API_KEY / per-leg
-                # override) was rejected or expired. Surface that explicitly
-                # so the downstream AIServiceError message points at the key
-                # instead of the generic "Status 401 / service not running".
-                if not is_healthy and response.status_code in (401, 403):
-                    error_msg = (
-                        f"Auth rejected (HTTP {response.status_code}) at {base_url}: "
-                        "API key is missing, invalid, or expired. Check the matching "
-                        "AI_CHAT_API_KEY / AI_VISION_API_KEY / per-leg key."
-                    )
-                else:
-                    error_msg = f"Status {response.status_code}"
-
-                status = HealthStatus(
-                    available=is_healthy,
-                    last_check=time.time(),
-                    consecutive_failures=0 if is_healthy else 1,
-                    latency_ms=latency,
-                    error=None if is_healthy else error_msg,
+            latency = (time.time() - start_time) * 1000
+
+            # Accept 2xx or 404 (404 means API is up but endpoint may vary)
+            is_healthy = response.status_code in (200, 404)
+
+            # 401/403 from the /models probe almost always means the
+            # bearer key (AI_CHAT_API_KEY / AI_VISION_API_KEY / per-leg
+            # override) was rejected or expired. Surface that explicitly
+            # so the downstream AIServiceError message points at the key
+            # instead of the generic "Status 401 / service not running".
+            if not is_healthy and response.status_code in (401, 403):
+                error_msg = (
+                    f"Auth rejected (HTTP {response.status_code}) at {base_url}: "
+                    "API key is missing, invalid, or expired. Check the matching "
+                    "AI_CHAT_API_KEY / AI_VISION_API_KEY / per-leg key."
                 )
+            else:
+                error_msg = f"Status {response.status_code}"
+
+            status = HealthStatus(
+                available=is_healthy,
+                last_check=time.time(),
+                consecutive_failures=0 if is_healthy else 1,
+                latency_ms=latency,
+                error=None if is_healthy else error_msg,
+            )
 
-                if is_healthy:
-                    logger.info(
-                        f"Provider {base_url} is healthy",
-                        extra={"latency_ms": round(latency, 2)},
-                    )
-                elif response.status_code in (401, 403):
-                    # Auth failures are operator-actionable; log at error so
-                    # they stand out from routine transient gateway 5xx.
-                    logger.error(
-                        f"Provider {base_url} rejected auth (HTTP {response.status_code})",
-                        extra={
-                            "latency_ms": round(latency, 2),
-                            "status_code": response.status_code,
-                        },
-                    )
-                else:
-                    logger.warning(
-                        f"Provider {base_url} returned {response.status_code}",
-                        extra={"latency_ms": round(latency, 2)},
-                    )
+            if is_healthy:
+                logger.info(
+                    f"Provider {base_url} is healthy",
+                    extra={"latency_ms": round(latency, 2)},
+                )
+            elif response.status_code in (401, 403):
+                # Auth failures are operator-actionable; log at error so
+                # they stand out from routine transient gateway 5xx.
+                logger.error(
+                    f"Provider {base_url} rejected auth (HTTP {response.status_code})",
+                    extra={
+                        "latency_ms": round(latency, 2),
+                        "status_code": response.status_code,
+                    },
+                )
+            else:
+                logger.warning(
+                    f"Provider {base_url} returned {response.status_code}",
+                    extra={"latency_ms": round(latency, 2)},
+                )
 
         except (httpx.ConnectError, httpx.ConnectTimeout) as e:
             # Connection refused or timeout - provider is down
@@ -219,12 +271,58 @@ class AIProviderHealthService:
                 },
             )
 
-        # Update cache
-        async with self._lock:
-            self._health_cache[cache_key] = status
-
         return status
 
+    def allow_request(self, base_url: str) -> bool:
+        """False while the circuit for ``base_url`` is open.
+
+        Cheap, no I/O: checked before every provider POST so retries against
+        a host that just tripped the breaker fail over immediately instead of
+        waiting out another timeout. The circuit closes again only through a
+        successful check_provider_health probe (half-open) or call.
+        """
+        status = self._health_cache.get(base_url)
+        return (
+            status is None
+            or status.available
+            or status.consecutive_failures < CIRCUIT_BREAKER_THRESHOLD
+        )
+
+    def record_success(self, base_url: str, latency_ms: Optional[float] = None) -> None:
+        """Feed a completed provider call: the host answered, close the circuit."""
+        self._passive_failures.pop(base_url, None)
+        self._health_cache[base_url] = HealthStatus(
+            available=True,
+            last_check=time.time(),
+            consecutive_failures=0,
+            latency_ms=latency_ms,
+        )
+
+    def record_failure(self, base_url: str, error: str) -> None:
+        """Feed a failed provider call (transport error or 5xx; not throttling).
+
+        Opens the circuit once CIRCUIT_BREAKER_THRESHOLD consecutive failed
+        calls are seen, across calls and whatever the /models probe says in
+        between. Below the threshold the cached status is left alone, so the
+        next call does not pay an extra probe.
+        """
+        failures = self._passive_failures.get(base_url, 0) + 1
+        self._passive_failures[base_url] = failures
+        if failures < CIRCUIT_BREAKER_THRESHOLD:
+            return
+        previous = self._health_cache.get(base_url)
+        if previous is None or previous.available:
+            logger.warning(
+                f"Circuit breaker tripped for {base_url}",
+                extra={"consecutive_failures": failures, "error": error},
+            )
+        self._health_cache[base_url] = HealthStatus(
+            available=False,
+            last_check=time.time(),
+            consecutive_failures=failures,
+            error=error,
+        )
+
     def clear_cache(self, base_url: Optional[str] = None) -> None:
         """
         Clear health cache for specific provider or all providers.
@@ -234,8 +332,10 @@ class AIProviderHealthService:
         """
         if base_url:
             self._health_cache.pop(base_url, None)
+            self._passive_failures.pop(base_url, None)
         else:
             self._health_cache.clear()
+            self._passive_failures.clear()
 
 
 # Global singleton
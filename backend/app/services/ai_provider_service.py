@@ -33,6 +33,7 @@ from urllib.parse import urlparse
 
 import httpx
 
+from app.core.concurrency import record_provider_call
 from app.core.config import settings
 from app.core.logging_config import get_context_logger
 from app.core.exceptions import AIServiceError
@@ -472,6 +473,13 @@ class AIProviderService:
             super().__init__(message)
             self.retry_after_seconds = retry_after_seconds
 
+    class _ProviderCircuitOpen(Exception):
+        """The provider's circuit breaker is open (ai_provider_health_service).
+
+        Deliberately not retryable: the attempt is abandoned without a POST so
+        the caller moves to its fallback immediately.
+        """
+
     _TRANSIENT_TRANSPORT_ERRORS = (
         httpx.ReadError,
         httpx.ConnectError,
@@ -502,6 +510,32 @@ class AIProviderService:
     def _is_transient_http_status(cls, status_code: int) -> bool:
         return status_code in cls._TRANSIENT_HTTP_STATUS_CODES
 
+    @staticmethod
+    def _status_counts_against_provider(status_code: int) -> bool:
+        """Whether a transient HTTP status says the provider is unhealthy.
+
+        Only 5xx do. A 429/408 is the host throttling us: it is up, the AIMD
+        limiter already backs off for it, and counting it would let a burst
+        of rate limits open the circuit (blocking chat on the same host too)
+        for the whole reset timeout.
+        """
+        return status_code >= 500
+
+    @classmethod
+    def _counts_against_provider(cls, exc: Exception) -> bool:
+        """Whether a transport error says something about the provider's health.
+
+        A pool timeout is our own connection limit and a protocol error is a
+        poisoned pooled connection (recovered by rebuilding the client); only
+        connect/read/write failures feed the circuit breaker.
+        """
+        return not isinstance(exc, (httpx.PoolTimeout,) + cls._PROTOCOL_TRANSPORT_ERRORS)
+
+    @staticmethod
+    def _is_provider_timeout(exc: Exception) -> bool:
+        """A provider-side timeout (an overload signal for the adaptive limiter)."""
+        return isinstance(exc, httpx.TimeoutException) and not isinstance(exc, httpx.PoolTimeout)
+
     @classmethod
     def _is_content_policy_rejection(cls, status_code: int, error_detail: str) -> bool:
         """True for a provider content-policy refusal of the prompt.
@@ -572,28 +606,40 @@ class AIProviderService:
         api_key = attempt["api_key"]
         base_url = attempt["base_url"]
 
+        # Real outcomes feed the shared circuit breaker; once it opens, the
+        # remaining retries skip the POST (and its timeout) entirely.
+        from app.services.ai_provider_health_service import get_health_service
+        health_service = get_health_service()
+        if not health_service.allow_request(base_url):
+            raise self._ProviderCircuitOpen(base_url)
+
+        started_at = time.monotonic()
         try:
             response = await client.post(
                 url,
                 json=req_payload,
                 headers={"Authorization": f"Bearer {api_key}"},
             )
-        except httpx.ConnectError:
-            # Connection refused - mark provider as unhealthy before re-raise
-            # so with_retry's retry attempt sees a cleared cache.
-            from app.services.ai_provider_health_service import get_health_service
-            get_health_service().clear_cache(base_url)
-            raise
         except self._PROTOCOL_TRANSPORT_ERRORS:
             # Pooled connection is poisoned (peer GOAWAY / local framing error).
             # Drop it so the next retry gets a fresh client.
             await self.close()
             attempt["client"] = await self._get_client()
             raise
-        except self._TRANSIENT_TRANSPORT_ERRORS:
+        except self._TRANSIENT_TRANSPORT_ERRORS as e:
+            if self._counts_against_provider(e):
+                health_service.record_failure(base_url, type(e).__name__)
+            if self._is_provider_timeout(e):
+                record_provider_call(
+                    time.monotonic() - started_at, api_key=api_key, overloaded=True
+                )
             raise
 
+        latency = time.monotonic() - started_at
         if self._is_transient_http_status(response.status_code):
+            if self._status_counts_against_provider(response.status_code):
+                health_service.record_failure(base_url, f"Status {response.status_code}")
+            record_provider_call(latency, api_key=api_key, overloaded=True)
             headers = getattr(response, "headers", {}) or {}
             raise self._TransientChatAPIOverload(
                 f"status={response.status_code}: {self._http_error_detail(response)}",
@@ -603,6 +649,11 @@ class AIProviderService:
                     else None
                 ),
             )
+        # Any non-transient answer (including a permanent 4xx) proves the
+        # host is up.
+        health_service.record_success(base_url, latency * 1000)
+        if response.status_code < 400:
+            record_provider_call(latency, api_key=api_key)
         response.raise_for_status()
         return response.json(), response.status_code
 
@@ -618,6 +669,7 @@ class AIProviderService:
         - transient HTTP statuses and transient transport errors retry
         - permanent HTTP statuses propagate as AIServiceError(retryable=False)
         - exhausted transient failures fall through to the next attempt if any
+        - an open provider circuit skips the attempt without a POST
         """
         last_exc: Optional[AIServiceError] = None
 
@@ -644,6 +696,20 @@ class AIProviderService:
                 )
             except AIServiceError:
                 raise
+            except self._ProviderCircuitOpen:
+                last_exc = AIServiceError(
+                    f"AI provider {attempt['base_url']} is unavailable (circuit open)",
+                    retryable=True,
+                )
+                logger.warning(
+                    "AI chat attempt skipped, provider circuit open",
+                    attempt_index=index,
+                    total_attempts=len(attempts),
+                    provider_url=attempt["base_url"],
+                )
+                if index < len(attempts) - 1:
+                    continue
+                raise last_exc
             except self._TransientChatAPIOverload as e:
                 error_message = str(e)
                 last_exc = AIServiceError(
@@ -1459,6 +1525,10 @@ class AIProviderService:
 
         async def _post_image_request() -> httpx.Response:
             nonlocal client
+            # Same passive circuit-breaker feed as _execute_chat_attempt.
+            if not health_service.allow_request(image_url):
+                raise self._ProviderCircuitOpen(image_url)
+            request_started = time.monotonic()
             try:
                 response = await client.post(
                     url,
@@ -1471,7 +1541,21 @@ class AIProviderService:
                 await self.close()
                 client = await self._get_client()
                 raise
+            except self._TRANSIENT_TRANSPORT_ERRORS as e:
+                if self._counts_against_provider(e):
+                    health_service.record_failure(image_url, type(e).__name__)
+                if self._is_provider_timeout(e):
+                    record_provider_call(
+                        time.monotonic() - request_started,
+                        api_key=image_key,
+                        overloaded=True,
+                    )
+                raise
+            request_latency = time.monotonic() - request_started
             if self._is_transient_http_status(response.status_code):
+                if self._status_counts_against_provider(response.status_code):
+                    health_service.record_failure(image_url, f"Status {response.status_code}")
+                record_provider_call(request_latency, api_key=image_key, overloaded=True)
                 # Agnes free-tier gateway 429/503 (queue full / rate limit /
                 # memory overloaded) is common under concurrent image gen —
                 # same transient set as chat(). Permanent 4xx fail via
@@ -1485,6 +1569,9 @@ class AIProviderService:
                         else None
                     ),
                 )
+            health_service.record_success(image_url, request_latency * 1000)
+            if response.status_code < 400:
+                record_provider_call(request_latency, api_key=image_key)
             response.raise_for_status()
             return response
 
@@ -1500,6 +1587,13 @@ class AIProviderService:
                 retryable_exceptions=self._TRANSIENT_TRANSPORT_ERRORS + (self._TransientImageAPIOverload,),
             )
             data = response.json()
+        except self._ProviderCircuitOpen:
+            # Tripped by an earlier call or by this one's first attempt: go to
+            # the image-fallback host now instead of waiting out the retry.
+            raise AIServiceError(
+                f"AI image provider {image_url} is unavailable (circuit open)",
+                retryable=True,
+            )
         except self._TransientImageAPIOverload as e:
             # Transient gateway status after exhausting retries: fallback-worthy.
             logger.warning(
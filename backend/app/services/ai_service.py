@@ -10,23 +10,28 @@ Following the server-side architecture:
 @see https://docs.fitcheck.ai/technical/architecture
 """
 
-from typing import Any, Dict, List
+from typing import TYPE_CHECKING, Any, Dict, List
 
-from google import genai
-from google.genai import types
 from app.core.config import settings
 from app.core.logging_config import get_context_logger
 from app.core.exceptions import AIServiceError
 from app.utils.parallel import parallel_with_retry
 
+if TYPE_CHECKING:  # pragma: no cover - annotations only
+    from google import genai
+
 logger = get_context_logger(__name__)
 
-def _create_genai_client() -> genai.Client | None:
+def _create_genai_client() -> "genai.Client | None":
     if not settings.AI_GEMINI_API_KEY:
         logger.info("AI_GEMINI_API_KEY is not set; server-side embeddings are disabled.")
         return None
 
     try:
+        # Imported here, not at module load: google.genai costs ~1.1s of
+        # cold start and this module is imported by the items/ai routers.
+        from google import genai
+
         return genai.Client(api_key=settings.AI_GEMINI_API_KEY)
     except Exception as e:
         logger.error(
@@ -36,7 +41,17 @@ def _create_genai_client() -> genai.Client | None:
         raise AIServiceError(f"Failed to initialize AI client: {str(e)}")
 
 
-_client = _create_genai_client()
+_UNSET: Any = object()
+# Built on the first embedding call (see _get_client); None once resolved
+# means "no key configured".
+_client: Any = _UNSET
+
+
+def _get_client() -> "genai.Client | None":
+    global _client
+    if _client is _UNSET:
+        _client = _create_genai_client()
+    return _client
 
 
 # ============================================================================
@@ -66,15 +81,18 @@ class EmbeddingService:
         Raises:
             AIServiceError: If client not configured or embedding generation fails
         """
-        if _client is None:
+        client = _get_client()
+        if client is None:
             logger.error(
                 "AI client not initialized",
                 text_length=len(text),
             )
             raise AIServiceError("AI service not configured. AI_GEMINI_API_KEY is required.")
 
+        from google.genai import types
+
         try:
-            result = _client.models.embed_content(
+            result = client.models.embed_content(
                 model=settings.AI_GEMINI_EMBEDDING_MODEL,
                 contents=text,
                 config=types.EmbedContentConfig(
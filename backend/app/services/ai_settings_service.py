@@ -4,14 +4,19 @@ AI Settings Service - Manages per-user AI provider configuration.
 This service handles:
 - Get effective config (user override or system default)
 - Encrypt/decrypt user API keys
+- Cache resolved per-user provider credentials for the AI call path
 - Validate provider configurations
 - Rate limit checking and tracking
 - Reset rate limits daily
 """
 
 import asyncio
+import copy
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from datetime import date
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 from cryptography.fernet import Fernet, InvalidToken
 
@@ -85,6 +90,31 @@ def _get_legacy_encryption_key() -> Optional[bytes]:
         return None
 
 
+# (AI_ENCRYPTION_KEY, current Fernet, legacy Fernet). HKDF derivation and
+# Fernet construction used to run on every encrypt/decrypt; the pair is built
+# once per process and rebuilt only when the configured secret changes.
+_fernets: Optional[Tuple[str, Optional[Fernet], Optional[Fernet]]] = None
+
+
+def _get_fernets() -> Tuple[Optional[Fernet], Optional[Fernet]]:
+    """Return the (current, legacy) Fernet instances, or (None, None) when the
+    encryption key is not configured."""
+    global _fernets
+    secret = settings.AI_ENCRYPTION_KEY
+    if not secret:
+        return None, None
+    if _fernets is None or _fernets[0] != secret:
+        built = []
+        for key in (_get_encryption_key(), _get_legacy_encryption_key()):
+            try:
+                built.append(Fernet(key) if key else None)
+            except Exception as e:
+                logger.error("Failed to build Fernet instance", error=str(e))
+                built.append(None)
+        _fernets = (secret, built[0], built[1])
+    return _fernets[1], _fernets[2]
+
+
 def encrypt_api_key(api_key: str) -> Optional[str]:
     """
     Encrypt an API key for storage.
@@ -95,8 +125,8 @@ def encrypt_api_key(api_key: str) -> Optional[str]:
     Returns:
         Encrypted, base64-encoded string or None if encryption unavailable
     """
-    fernet_key = _get_encryption_key()
-    if not fernet_key:
+    fernet, _legacy = _get_fernets()
+    if fernet is None:
         if not settings.DEBUG:
             # In production, encryption key is required for API key storage
             raise AIServiceError(
@@ -107,7 +137,6 @@ def encrypt_api_key(api_key: str) -> Optional[str]:
         return f"__PLAINTEXT__{api_key}"
 
     try:
-        fernet = Fernet(fernet_key)
         encrypted = fernet.encrypt(api_key.encode())
         return encrypted.decode()
     except Exception as e:
@@ -129,18 +158,18 @@ def decrypt_api_key(encrypted_key: str) -> Optional[str]:
     if encrypted_key.startswith("__PLAINTEXT__"):
         return encrypted_key[13:]
 
-    fernet_key = _get_encryption_key()
-    if not fernet_key:
+    fernet, legacy_fernet = _get_fernets()
+    if fernet is None:
         logger.error("Cannot decrypt: encryption key not configured")
         return None
 
     # Try the current purpose-scoped key first, then the legacy
     # (pre-domain-separation) key for API keys encrypted before this change.
-    for key in (fernet_key, _get_legacy_encryption_key()):
-        if not key:
+    for candidate in (fernet, legacy_fernet):
+        if candidate is None:
             continue
         try:
-            decrypted = Fernet(key).decrypt(encrypted_key.encode())
+            decrypted = candidate.decrypt(encrypted_key.encode())
             return decrypted.decode()
         except InvalidToken:
             continue
@@ -152,6 +181,157 @@ def decrypt_api_key(encrypted_key: str) -> Optional[str]:
     return None
 
 
+# =============================================================================
+# RESOLVED CREDENTIAL CACHE
+# =============================================================================
+
+
+@dataclass
+class _ResolvedCredentials:
+    """The part of a user's settings row the AI call path needs, plus the
+    provider configs already resolved (decrypted) from it."""
+
+    settings: Dict[str, Any]
+    # provider value -> resolved BYOK config, or None when the user has no
+    # usable override for that provider (the system config applies).
+    configs: Dict[str, Any] = field(default_factory=dict)
+
+    def user_config(self, provider: AIProvider) -> Any:
+        if provider.value not in self.configs:
+            self.configs[provider.value] = _resolve_user_provider_config(
+                self.settings, provider
+            )
+        config = self.configs[provider.value]
+        # Provider clients get their own copy of the (mutable) config object.
+        return copy.copy(config) if config is not None else None
+
+
+def _resolve_user_provider_config(user_settings: Dict[str, Any], provider: AIProvider) -> Any:
+    """Build the user's BYOK config for ``provider``, or None if unusable."""
+    user_config = (user_settings.get("provider_configs") or {}).get(provider.value, {})
+    # Completeness (e.g. an OpenAI-compatible config also needs api_url) is
+    # decided by config_cls.from_user_dict(), which returns None if incomplete -
+    # Gemini has no such requirement beyond the key.
+    if not user_config.get("api_key_encrypted"):
+        return None
+    api_key = decrypt_api_key(user_config["api_key_encrypted"])
+    if not api_key:
+        return None
+    return get_provider_class(provider).config_cls.from_user_dict(user_config, api_key=api_key)
+
+
+class _PerUserCache:
+    """TTL + LRU map of user_id -> cached value, sized by two settings names.
+
+    ``generation`` is a write clock: a fill reads it before loading, and every
+    write (invalidation or write-through) stamps the user with the next tick.
+    A fill is not stored if its user was written after it began; writes for
+    other users do not discard it (same idea as app/utils/response_cache.py,
+    keyed per user). Write stamps are kept for as many users as entries; a
+    forgotten stamp raises ``_floor``, so an older fill for that user is still
+    dropped. Settings are read on each call so tests and config changes apply
+    without a restart.
+
+    Single event loop, no awaits inside the methods: no lock needed.
+    """
+
+    def __init__(self, ttl_setting: str, max_entries_setting: str) -> None:
+        self._ttl_setting = ttl_setting
+        self._max_entries_setting = max_entries_setting
+        self.generation = 0
+        self._floor = 0
+        self._written: "OrderedDict[str, int]" = OrderedDict()
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, user_id: str) -> Any:
+        hit = self._entries.get(user_id)
+        if hit is None:
+            return None
+        expires_at, value = hit
+        if time.monotonic() >= expires_at:
+            del self._entries[user_id]
+            return None
+        self._entries.move_to_end(user_id)
+        return value
+
+    def put(self, user_id: str, value: Any, generation: int) -> None:
+        ttl = getattr(settings, self._ttl_setting)
+        if ttl <= 0 or generation < max(self._floor, self._written.get(user_id, 0)):
+            return
+        self._entries[user_id] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(user_id)
+        max_entries = self._max_entries()
+        while len(self._entries) > max_entries:
+            self._entries.popitem(last=False)
+
+    def bump(self, user_id: str) -> None:
+        """Record a write to ``user_id``: its fills that started before it
+        are not stored."""
+        self.generation += 1
+        self._written[user_id] = self.generation
+        self._written.move_to_end(user_id)
+        max_entries = self._max_entries()
+        while len(self._written) > max_entries:
+            _, stamp = self._written.popitem(last=False)
+            self._floor = max(self._floor, stamp)
+
+    def invalidate(self, user_id: str) -> None:
+        self.bump(user_id)
+        self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._floor = self.generation
+        self._written.clear()
+        self._entries.clear()
+
+    def _max_entries(self) -> int:
+        return max(1, getattr(settings, self._max_entries_setting))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_credential_cache = _PerUserCache(
+    "AI_CREDENTIAL_CACHE_TTL_SECONDS", "AI_CREDENTIAL_CACHE_MAX_ENTRIES"
+)
+# Full user_ai_settings rows (usage counters included). Reservations update
+# the cached counters from the RPC result, so admission and usage reads do not
+# re-read the row; another worker's reservations show up within the TTL.
+_settings_snapshots = _PerUserCache(
+    "AI_SETTINGS_SNAPSHOT_TTL_SECONDS", "AI_SETTINGS_SNAPSHOT_MAX_ENTRIES"
+)
+# Users whose row is known to exist, so reserve_usage can skip the
+# ensure_ai_settings_row select. Same TTL as the snapshots.
+_provisioned_rows = _PerUserCache(
+    "AI_SETTINGS_SNAPSHOT_TTL_SECONDS", "AI_SETTINGS_SNAPSHOT_MAX_ENTRIES"
+)
+
+_DAILY_COUNTERS = ("daily_extraction_count", "daily_generation_count", "daily_embedding_count")
+# operation -> (daily column, total column), as updated by reserve_ai_usage /
+# release_ai_usage (migration 024).
+_USAGE_COLUMNS = {
+    "extraction": ("daily_extraction_count", "total_extractions"),
+    "generation": ("daily_generation_count", "total_generations"),
+    "embedding": ("daily_embedding_count", "total_embeddings"),
+}
+
+
+def _needs_daily_reset(settings_row: Dict[str, Any]) -> bool:
+    last_reset = settings_row.get("last_reset_date")
+    if not last_reset:
+        return False
+    if isinstance(last_reset, str):
+        last_reset = date.fromisoformat(last_reset)
+    return last_reset < date.today()
+
+
+def _reset_daily_counters(settings_row: Dict[str, Any]) -> None:
+    for column in _DAILY_COUNTERS:
+        settings_row[column] = 0
+    settings_row["last_reset_date"] = date.today().isoformat()
+
+
 # =============================================================================
 # AI SETTINGS SERVICE
 # =============================================================================
@@ -182,13 +362,32 @@ class AISettingsService:
         """
         Get AI settings for a user.
 
+        Served from a per-user snapshot for ``AI_SETTINGS_SNAPSHOT_TTL_SECONDS``.
+        Daily counters are keyed by ``last_reset_date``: a snapshot from an
+        earlier day reads as zero usage, exactly like the lazy reset below.
+
         Args:
             user_id: The user's ID
             db: Supabase client
 
         Returns:
-            User's AI settings dict
+            User's AI settings dict (a copy; callers may mutate it)
         """
+        snapshot = _settings_snapshots.get(user_id)
+        if snapshot is None:
+            generation = _settings_snapshots.generation
+            snapshot = await AISettingsService._load_user_settings(user_id, db)
+            _settings_snapshots.put(user_id, snapshot, generation)
+            _provisioned_rows.put(user_id, True, _provisioned_rows.generation)
+        elif _needs_daily_reset(snapshot):
+            # The next reserve_ai_usage resets the row under its lock.
+            _reset_daily_counters(snapshot)
+        return copy.deepcopy(snapshot)
+
+    @staticmethod
+    async def _load_user_settings(user_id: str, db) -> Dict[str, Any]:
+        """Read (or provision) the user's settings row, applying the lazy
+        daily reset."""
         try:
             result = await execute_with_reconnect(
                 lambda d: d.table("user_ai_settings").select("*").eq("user_id", user_id).execute(),
@@ -200,25 +399,19 @@ class AISettingsService:
                 settings_row = result.data[0]
 
                 # Check if daily reset is needed
-                last_reset = settings_row.get("last_reset_date")
-                if last_reset:
-                    if isinstance(last_reset, str):
-                        last_reset = date.fromisoformat(last_reset)
-                    if last_reset < date.today():
-                        # Reset daily counts
-                        await execute_with_reconnect(
-                            lambda d: d.table("user_ai_settings").update({
-                                "daily_extraction_count": 0,
-                                "daily_generation_count": 0,
-                                "daily_embedding_count": 0,
-                                "last_reset_date": date.today().isoformat(),
-                            }).eq("user_id", user_id).execute(),
-                            db,
-                            extra={"operation": "get_user_ai_settings.reset", "user_id": user_id},
-                        )
-                        settings_row["daily_extraction_count"] = 0
-                        settings_row["daily_generation_count"] = 0
-                        settings_row["daily_embedding_count"] = 0
+                if _needs_daily_reset(settings_row):
+                    # Reset daily counts
+                    await execute_with_reconnect(
+                        lambda d: d.table("user_ai_settings").update({
+                            "daily_extraction_count": 0,
+                            "daily_generation_count": 0,
+                            "daily_embedding_count": 0,
+                            "last_reset_date": date.today().isoformat(),
+                        }).eq("user_id", user_id).execute(),
+                        db,
+                        extra={"operation": "get_user_ai_settings.reset", "user_id": user_id},
+                    )
+                    _reset_daily_counters(settings_row)
 
                 return settings_row
 
@@ -304,7 +497,11 @@ class AISettingsService:
                 updates["provider_configs"] = current_configs
 
             # Update in database
-            result = await asyncio.to_thread(db.table("user_ai_settings").update(updates).eq("user_id", user_id).execute)
+            try:
+                result = await asyncio.to_thread(db.table("user_ai_settings").update(updates).eq("user_id", user_id).execute)
+            finally:
+                # Even a failed write may have committed server-side.
+                AISettingsService.invalidate_settings(user_id)
 
             if result.data and len(result.data) > 0:
                 return result.data[0]
@@ -324,6 +521,9 @@ class AISettingsService:
         """
         Get the effective provider configuration (user override or system default).
 
+        The user's override is resolved (decrypted) at most once per
+        ``AI_CREDENTIAL_CACHE_TTL_SECONDS``; settings writes invalidate it.
+
         Args:
             user_id: The user's ID
             provider: Which provider to get config for
@@ -338,22 +538,10 @@ class AISettingsService:
         Raises:
             AIServiceError: If no valid configuration is available
         """
-        # Get user settings
-        user_settings = await AISettingsService.get_user_settings(user_id, db)
-        provider_configs = user_settings.get("provider_configs", {})
-        user_config = provider_configs.get(provider.value, {})
-        provider_cls = get_provider_class(provider)
-
-        # Check for user-level override. Completeness (e.g. an OpenAI-
-        # compatible config also needs api_url) is decided by
-        # config_cls.from_user_dict(), which returns None if incomplete -
-        # Gemini has no such requirement beyond the key.
-        if user_config.get("api_key_encrypted"):
-            api_key = decrypt_api_key(user_config["api_key_encrypted"])
-            if api_key:
-                config = provider_cls.config_cls.from_user_dict(user_config, api_key=api_key)
-                if config:
-                    return config
+        credentials = await AISettingsService._get_credentials(user_id, db)
+        config = credentials.user_config(provider)
+        if config:
+            return config
 
         # Fall back to system configuration
         system_config = get_system_provider_config(provider)
@@ -365,6 +553,52 @@ class AISettingsService:
 
         return system_config
 
+    @staticmethod
+    async def _get_credentials(user_id: str, db) -> _ResolvedCredentials:
+        """The user's provider settings for the AI call path, cached per user.
+
+        Only ``default_provider`` and ``provider_configs`` are kept: quota
+        counters are never served from here (reservations go through
+        ``reserve_ai_usage``).
+        """
+        cached = _credential_cache.get(user_id)
+        if cached is not None:
+            return cached
+        generation = _credential_cache.generation
+        user_settings = await AISettingsService.get_user_settings(user_id, db)
+        credentials = _ResolvedCredentials(
+            settings={
+                key: copy.deepcopy(user_settings[key])
+                for key in ("default_provider", "provider_configs")
+                if key in user_settings
+            }
+        )
+        _credential_cache.put(user_id, credentials, generation)
+        return credentials
+
+    @staticmethod
+    def invalidate_settings(user_id: str) -> None:
+        """Drop the cached settings snapshot and credentials after a write to
+        the user's settings row."""
+        _settings_snapshots.invalidate(user_id)
+        _credential_cache.invalidate(user_id)
+
+    @staticmethod
+    def _apply_usage(user_id: str, operation: str, delta: int) -> None:
+        """Mirror a committed reserve/release onto the cached snapshot.
+
+        Same arithmetic as the RPCs: roll a stale day over first, then move
+        the daily and total counters together, never below zero.
+        """
+        _settings_snapshots.bump(user_id)
+        snapshot = _settings_snapshots.get(user_id)
+        if snapshot is None or operation not in _USAGE_COLUMNS:
+            return
+        if _needs_daily_reset(snapshot):
+            _reset_daily_counters(snapshot)
+        for column in _USAGE_COLUMNS[operation]:
+            snapshot[column] = max(0, (snapshot.get(column) or 0) + delta)
+
     @staticmethod
     def has_stored_byok_key(user_settings: dict, provider: AIProvider) -> bool:
         """True when the user stored their OWN key for ``provider``.
@@ -399,8 +633,9 @@ class AISettingsService:
         Returns:
             Configured provider instance (AIProviderClient)
         """
-        # Get user settings to determine default provider
-        user_settings = await AISettingsService.get_user_settings(user_id, db)
+        # Settings determine the default provider (cached with the credentials,
+        # so this and get_effective_provider_config share one read).
+        user_settings = (await AISettingsService._get_credentials(user_id, db)).settings
 
         if provider is None:
             provider_str = user_settings.get("default_provider", "custom")
@@ -496,7 +731,13 @@ class AISettingsService:
         exist for the RPC's UPDATE to match. Selects ``user_id`` (the table's
         primary key) only - the full-row ``get_user_settings`` read (which also
         returns encrypted provider keys) is for read paths, not admission.
+
+        A row seen within ``AI_SETTINGS_SNAPSHOT_TTL_SECONDS`` is not selected
+        again: a batch reserves per image.
         """
+        if _provisioned_rows.get(user_id):
+            return
+        generation = _provisioned_rows.generation
         try:
             result = await execute_with_reconnect(
                 lambda d: d.table("user_ai_settings")
@@ -508,6 +749,7 @@ class AISettingsService:
                 extra={"operation": "ensure_ai_settings_row.select", "user_id": user_id},
             )
             if result and result.data:
+                _provisioned_rows.put(user_id, True, generation)
                 return
             # Upsert on the PK: extraction + generation reservations run
             # concurrently, so a user's very first admission can race two
@@ -519,6 +761,7 @@ class AISettingsService:
                 db,
                 extra={"operation": "ensure_ai_settings_row.upsert", "user_id": user_id},
             )
+            _provisioned_rows.put(user_id, True, generation)
         except Exception as e:
             if "23503" in str(e) or "users_id_fkey" in str(e):
                 # user_ai_settings.user_id references public.users(id); a brand-
@@ -588,6 +831,8 @@ class AISettingsService:
                 ).execute
             )
         except Exception as error:
+            # A lost response may hide a committed reservation.
+            _settings_snapshots.invalidate(user_id)
             if is_pgrst202_missing_rpc(error):
                 # Migration gap, not a transient provider hiccup: log the
                 # actionable hint (function + migrations) for operators. The
@@ -608,7 +853,15 @@ class AISettingsService:
 
         # `reserve_ai_usage` returns a scalar BOOLEAN, so PostgREST keys the
         # result by the function name rather than a column name.
-        return unwrap_rpc_bool(result, "reserve_ai_usage")
+        reserved = unwrap_rpc_bool(result, "reserve_ai_usage")
+        if reserved:
+            AISettingsService._apply_usage(user_id, operation, count)
+        else:
+            # Over the limit by the row's own count, or the row is gone: the
+            # cached counters are stale either way.
+            _settings_snapshots.invalidate(user_id)
+            _provisioned_rows.invalidate(user_id)
+        return reserved
 
     @staticmethod
     async def release_usage(
@@ -633,6 +886,8 @@ class AISettingsService:
                 extra={"operation": "release_ai_usage", "user_id": user_id},
             )
         except Exception as error:
+            # The release may still have committed: re-read next time.
+            _settings_snapshots.invalidate(user_id)
             if is_pgrst202_missing_rpc(error):
                 logger.error(
                     missing_rpc_log_hint("release_ai_usage"),
@@ -651,6 +906,7 @@ class AISettingsService:
                 QUOTA_UNAVAILABLE_CLIENT_MESSAGE,
                 retryable=True,
             ) from error
+        AISettingsService._apply_usage(user_id, operation, -count)
 
     @staticmethod
     async def get_usage_stats(user_id: str, db) -> Dict[str, Any]:
@@ -20,9 +20,12 @@ matched the configured bundle ID + product map.
 from __future__ import annotations
 
 import base64
+import functools
+import hashlib
 import json
 import time
-from typing import Any, Dict, Optional, Tuple
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
 
 import httpx
 from cryptography import x509
@@ -65,6 +68,35 @@ at+qIxUCMG1mihDK1A3UT82NQz60imOlM27jbdoXt2QfyFMm+YhidDkLF1vLUagM
 -----END CERTIFICATE-----"""
 
 
+# Validated x5c chains: renewal storms deliver bursts of notifications signed
+# by the same leaf/intermediate, so the X.509 chain walk runs once per chain
+# instead of once per JWS. Keyed by the SHA-256 fingerprints of every chain
+# certificate plus the trust roots; an entry lives until the first
+# certificate in the chain expires. Only successful validations are stored,
+# and the per-JWS signature + leaf validity checks always run.
+_VERIFIED_CHAIN_CACHE_MAX = 32
+
+
+@dataclass(frozen=True)
+class _VerifiedChain:
+    leaf: x509.Certificate
+    valid_from: float
+    valid_until: float
+
+
+_verified_chains: Dict[Tuple[Tuple[str, ...], Tuple[str, ...]], _VerifiedChain] = {}
+
+
+def reset_verified_chain_cache() -> None:
+    """Forget validated certificate chains (for tests / root rotation)."""
+    _verified_chains.clear()
+
+
+@functools.lru_cache(maxsize=4)
+def _load_root_pem(pem: str) -> x509.Certificate:
+    return x509.load_pem_x509_certificate(pem.encode("utf-8"))
+
+
 class AppleIAPError(ServiceError):
     """Base error for Apple IAP failures."""
 
@@ -168,14 +200,21 @@ class AppleIAPService:
         return header, _b64url_decode(parts[1]), _b64url_decode(parts[2])
 
     @classmethod
-    def _load_x5c_chain(cls, header: Dict[str, Any]) -> list:
+    def _x5c_der_chain(cls, header: Dict[str, Any]) -> List[bytes]:
         raw_certs = header.get("x5c")
         if not isinstance(raw_certs, list) or not raw_certs:
             raise AppleIAPSignatureError("JWS header has no x5c certificate chain")
+        try:
+            return [base64.b64decode(der_b64) for der_b64 in raw_certs]
+        except ValueError as exc:
+            raise AppleIAPSignatureError("Invalid certificate in x5c chain") from exc
+
+    @classmethod
+    def _load_x5c_chain(cls, header: Dict[str, Any], ders: Optional[List[bytes]] = None) -> list:
         certs = []
-        for der_b64 in raw_certs:
+        for der in ders if ders is not None else cls._x5c_der_chain(header):
             try:
-                certs.append(x509.load_der_x509_certificate(base64.b64decode(der_b64)))
+                certs.append(x509.load_der_x509_certificate(der))
             except ValueError as exc:
                 raise AppleIAPSignatureError("Invalid certificate in x5c chain") from exc
         return certs
@@ -227,7 +266,9 @@ class AppleIAPService:
 
         Checks: ES256 signature over the signing input (header.payload) using
         the leaf certificate's public key, the leaf's validity window, and the
-        x5c chain anchored at Apple Root CA - G3.
+        x5c chain anchored at Apple Root CA - G3. The chain check is skipped
+        for a chain already validated against the same roots and still inside
+        every certificate's validity window (see ``_verified_chains``).
         """
         check_at = now if now is not None else time.time()
         header, payload, signature = cls.parse_jws(jws)
@@ -235,8 +276,20 @@ class AppleIAPService:
             raise AppleIAPSignatureError(f"Unsupported JWS algorithm: {header.get('alg')}")
 
         signing_input = jws.rsplit(".", 1)[0].encode("ascii")
-        certs = cls._load_x5c_chain(header)
-        leaf = certs[0]
+        if trust_roots is None:
+            trust_roots = (_load_root_pem(APPLE_ROOT_CA_G3_PEM),)
+        ders = cls._x5c_der_chain(header)
+        chain_key = (
+            tuple(hashlib.sha256(der).hexdigest() for der in ders),
+            tuple(root.fingerprint(hashes.SHA256()).hex() for root in trust_roots),
+        )
+        verified = _verified_chains.get(chain_key)
+        if verified is not None and verified.valid_from <= check_at <= verified.valid_until:
+            certs = None
+            leaf = verified.leaf
+        else:
+            certs = cls._load_x5c_chain(header, ders)
+            leaf = certs[0]
 
         if check_at < leaf.not_valid_before_utc.timestamp() or check_at > leaf.not_valid_after_utc.timestamp():
             raise AppleIAPSignatureError("JWS leaf certificate is not yet valid or has expired")
@@ -252,11 +305,15 @@ class AppleIAPService:
         except (ValueError, InvalidSignature) as exc:
             raise AppleIAPSignatureError("JWS signature verification failed") from exc
 
-        if trust_roots is None:
-            trust_roots = (
-                x509.load_pem_x509_certificate(APPLE_ROOT_CA_G3_PEM.encode("utf-8")),
+        if certs is not None:
+            cls._verify_cert_chain(certs, trust_roots, check_at)
+            if len(_verified_chains) >= _VERIFIED_CHAIN_CACHE_MAX:
+                _verified_chains.pop(next(iter(_verified_chains)))
+            _verified_chains[chain_key] = _VerifiedChain(
+                leaf=leaf,
+                valid_from=max(cert.not_valid_before_utc.timestamp() for cert in certs),
+                valid_until=min(cert.not_valid_after_utc.timestamp() for cert in certs),
             )
-        cls._verify_cert_chain(certs, trust_roots, check_at)
 
         try:
             return json.loads(payload.decode("utf-8"))
@@ -0,0 +1,192 @@
+"""
+Prepared avatar references for profile-aware extraction and generation.
+
+Extraction (single + batch), outfit generation and try-on all send the
+user's avatar to the AI provider. Each call used to read ``users.avatar_url``
+and then download (and, for generation, re-downscale) the full-size avatar;
+a batch job or a run of try-ons repeats that for the same image dozens of
+times. This module keeps one provider-ready derivative per avatar:
+
+- the derivative is the downscaled JPEG the providers get anyway
+  (``downscale_image_bytes_to_base64`` defaults), keyed by the avatar's
+  bucket key plus ``AVATAR_REFERENCE_VERSION`` (storage_service). Avatar
+  keys are minted fresh for every upload, so a new avatar is a new key and
+  nothing needs invalidating;
+- a bounded in-process LRU (entries AND bytes) serves repeat calls with no
+  I/O beyond the ``users`` read;
+- on a memory miss the derivative is read from its sibling object
+  (``StorageService.avatar_reference_key_for``: ``{stem}_ref_v{N}.jpg`` next
+  to the original), so other workers and restarts skip the full download;
+- on a full miss the original is downloaded + downscaled once and the
+  derivative written back (best-effort). Concurrent misses for one key
+  share a single preparation.
+
+Only keys under the user's own ``avatars/`` folder are cached or persisted;
+anything else (legacy or external avatar URLs) takes the old uncached
+download path. Every failure degrades to ``None`` - callers continue
+without the avatar, exactly as before.
+"""
+
+import asyncio
+import base64
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from supabase import Client
+
+from app.core.config import settings
+from app.core.logging_config import get_context_logger
+from app.services.object_storage import get_storage_backend
+from app.services.storage_service import (
+    AVATAR_REFERENCE_VERSION,
+    DEFAULT_CACHE_CONTROL,
+    StorageService,
+)
+
+logger = get_context_logger(__name__)
+
+_JPEG_MAGIC = b"\xff\xd8"
+
+
+class _AvatarReferenceCache:
+    """Process-local LRU of avatar key -> prepared base64, bounded by count and bytes.
+
+    Single event loop, no awaits inside the methods: no lock needed.
+    """
+
+    def __init__(self) -> None:
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self.total_bytes = 0
+
+    def get(self, key: str) -> Optional[str]:
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: str) -> None:
+        max_bytes = max(1, settings.AVATAR_REFERENCE_CACHE_MAX_BYTES)
+        if len(value) > max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.total_bytes -= len(previous)
+        self._entries[key] = value
+        self.total_bytes += len(value)
+        max_entries = max(1, settings.AVATAR_REFERENCE_CACHE_MAX_ENTRIES)
+        while len(self._entries) > max_entries or self.total_bytes > max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.total_bytes -= len(evicted)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.total_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class AvatarReferenceService:
+    """Resolve a user's avatar to a cached, provider-ready base64 JPEG."""
+
+    _cache = _AvatarReferenceCache()
+    _inflight: Dict[str, "asyncio.Task[Optional[str]]"] = {}
+
+    @classmethod
+    async def get_reference_base64(
+        cls,
+        user_id: str,
+        db: Optional[Client] = None,
+        *,
+        avatar_url: Optional[str] = None,
+    ) -> Optional[str]:
+        """Return the prepared avatar (base64, no data: prefix) or None.
+
+        Pass ``avatar_url`` when the caller already read the ``users`` row;
+        otherwise it is read from ``db``. Never raises.
+        """
+        try:
+            if avatar_url is None:
+                if db is None:
+                    return None
+                result = await asyncio.to_thread(
+                    db.table("users").select("avatar_url").eq("id", user_id).single().execute
+                )
+                avatar_url = (result.data or {}).get("avatar_url") if result else None
+            if not avatar_url:
+                return None
+
+            key = StorageService.key_from_path(avatar_url)
+            if not key or not key.startswith(f"{user_id}/avatars/"):
+                return await StorageService.download_and_downscale_to_base64(avatar_url)
+
+            cache_key = f"{key}#v{AVATAR_REFERENCE_VERSION}"
+            cached = cls._cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+            task = cls._inflight.get(cache_key)
+            if task is None:
+                task = asyncio.create_task(cls._prepare(key))
+                cls._inflight[cache_key] = task
+                task.add_done_callback(
+                    lambda done, k=cache_key: cls._on_prepared(k, done)
+                )
+            # Shielded: one caller being cancelled must not cancel the
+            # preparation the other callers are waiting on.
+            return await asyncio.shield(task)
+        except Exception as e:
+            logger.warning(
+                "Failed to resolve avatar reference",
+                user_id=user_id,
+                error=str(e),
+            )
+            return None
+
+    @classmethod
+    def _on_prepared(cls, cache_key: str, task: "asyncio.Task[Optional[str]]") -> None:
+        if cls._inflight.get(cache_key) is task:
+            del cls._inflight[cache_key]
+        if task.cancelled() or task.exception() is not None:
+            return
+        prepared = task.result()
+        if prepared:
+            cls._cache.put(cache_key, prepared)
+
+    @classmethod
+    async def _prepare(cls, key: str) -> Optional[str]:
+        ref_key = StorageService.avatar_reference_key_for(key)
+        backend = None
+        if ref_key:
+            try:
+                backend = get_storage_backend()
+                stored = await backend.download(ref_key)
+                if stored:
+                    return base64.b64encode(stored).decode("utf-8")
+            except Exception:
+                # Not prepared yet (or unreadable): build it below.
+                pass
+
+        prepared = await StorageService.download_and_downscale_to_base64(key)
+        if not prepared or not ref_key or backend is None:
+            return prepared
+
+        # The downscaler hands back the original bytes when re-encoding would
+        # not shrink them (already small, or a cutout); those are served from
+        # memory but not persisted under a .jpg key.
+        try:
+            data = base64.b64decode(prepared)
+            if data.startswith(_JPEG_MAGIC):
+                await backend.upload(
+                    key=ref_key,
+                    data=data,
+                    content_type="image/jpeg",
+                    cache_control=DEFAULT_CACHE_CONTROL,
+                )
+        except Exception as e:
+            logger.warning(
+                "Failed to persist avatar reference",
+                ref_key=ref_key,
+                error=str(e),
+            )
+        return prepared
@@ -12,14 +12,13 @@ import logging
 from app.utils.datetime_util import utcnow_iso
 from typing import Any, Awaitable, Callable, Dict, List, Optional
 
-import httpx
-
 from app.agents.item_extraction_agent import get_item_extraction_agent
 from app.agents.image_generation_agent import get_image_generation_agent
-from app.core.concurrency import EXTRACTION_SEMAPHORE, image_gen_slot
+from app.core.concurrency import EXTRACTION_SEMAPHORE, image_gen_slot, timed_acquire
 from app.core.config import settings
 from app.core.exceptions import AIServiceError
 from app.core.image_executor import run_image_op
+from app.services.avatar_reference_service import AvatarReferenceService
 from app.services.batch_job_service import (
     BatchJob,
     BatchJobService,
@@ -285,7 +284,7 @@ class BatchExtractionService:
             # burning VLM quota on images whose items can never be generated.
             raise RuntimeError("Generation consumer failed; aborting extraction")
 
-        async with EXTRACTION_SEMAPHORE:
+        async with timed_acquire(EXTRACTION_SEMAPHORE, "extraction"):
             if job.is_cancelled():
                 return []
             if await self._skip_due_to_capacity(job, image_id):
@@ -448,42 +447,20 @@ class BatchExtractionService:
 
         Non-blocking with aggressive 5-second timeout - if avatar fetch is slow,
         skip it and continue without avatar. Don't block extraction pipeline.
+        The prepared reference is cached (AvatarReferenceService), so only the
+        first job after an avatar change pays the download.
         """
         try:
-            user_result = await asyncio.to_thread(
-                self.db.table("users")
-                .select("avatar_url")
-                .eq("id", self.user_id)
-                .single()
-                .execute
+            return await asyncio.wait_for(
+                AvatarReferenceService.get_reference_base64(self.user_id, self.db),
+                timeout=5.0,
             )
-            if not user_result or not user_result.data:
-                return None
-
-            avatar_url = user_result.data.get("avatar_url")
-            if not avatar_url:
-                return None
-
-            async with httpx.AsyncClient(
-                timeout=httpx.Timeout(5.0),
-                limits=httpx.Limits(max_connections=10),
-            ) as client:
-                response = await client.get(avatar_url)
-                response.raise_for_status()
-                return base64.b64encode(response.content).decode("utf-8")
-
         except asyncio.TimeoutError:
             logger.info(
                 "Avatar fetch timed out (5s) - continuing without avatar",
                 extra={"user_id": self.user_id},
             )
             return None
-        except Exception as e:
-            logger.info(
-                "Failed to fetch user avatar - continuing without it",
-                extra={"user_id": self.user_id, "error": str(e)},
-            )
-            return None
 
     async def _persist_source_image(
         self,
@@ -772,6 +749,8 @@ class BatchExtractionService:
                     ),
                 )
 
+                # Encoded once here for the job record and the SSE event; the
+                # upload below takes the handle's bytes directly.
                 image_base64 = result.image_base64
 
                 # Persist a durable URL so the item's base64 can be freed at
@@ -782,16 +761,12 @@ class BatchExtractionService:
                 image_url = None
                 if getattr(job, "persistence_db", None) is not None:
                     try:
-                        raw = (
-                            image_base64.split("base64,", 1)[-1]
-                            if "base64," in image_base64
-                            else image_base64
-                        )
                         upload = await StorageService.upload_temp_generated_image(
                             db=job.persistence_db,
                             user_id=job.user_id,
-                            file_data=base64.b64decode(raw),
+                            file_data=result.image.data,
                             source="batch",
+                            storage_ready=result.storage_ready,
                         )
                         image_url = upload.get("image_url")
                     except Exception as upload_error:
@@ -2,34 +2,322 @@
 Extraction Result Caching Service.
 
 Caches extraction results by image hash to avoid redundant AI processing.
-Uses SHA256 hash of image content as cache key with 24-hour TTL.
+Uses SHA256 hash of image content (scoped per user) as cache key with a
+24-hour TTL.
+
+Storage is pluggable (``ExtractionCacheBackend``):
+
+- ``MemoryCacheBackend`` — process-local LRU on an ``OrderedDict``: O(1)
+  get/set/evict, bounded by entry count AND approximate payload bytes.
+- ``SqliteCacheBackend`` — on-disk tier (WAL mode) shared by every worker on
+  the host and surviving restarts. With ``EXTRACTION_CACHE_BACKEND=sqlite`` it
+  sits behind the memory tier (``TieredCacheBackend``), so hot entries never
+  touch disk and a cold worker is warm after its first disk hit.
+
+Every miss re-runs a paid vision extraction. Expired entries are dropped by a
+sweeper task every ``EXTRACTION_CACHE_SWEEP_INTERVAL_SECONDS`` (reads still
+refuse an expired entry in between).
 """
 
 import asyncio
 import hashlib
-from datetime import datetime, timedelta, timezone
-from app.utils.datetime_util import utcnow, utcnow_iso
+import json
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import timedelta
+from pathlib import Path
 from typing import Any, Dict, Optional
 
+from app.core.config import settings
 from app.core.logging_config import get_context_logger
+from app.utils.datetime_util import utcnow
+from app.utils.metrics import Counter, Gauge
 
 logger = get_context_logger(__name__)
 
-# In-memory cache (in production, use Redis for multi-instance deployments)
-_cache: Dict[str, Dict[str, Any]] = {}
+_BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+
+@dataclass
+class CacheEntry:
+    """One cached extraction result plus its expiry and accounted size."""
+
+    result: Dict[str, Any]
+    expires_at: float  # POSIX timestamp (UTC)
+    size_bytes: int
+
+
+class ExtractionCacheBackend(ABC):
+    """Storage tier for extraction results. Keys are ``{user_id}:{sha256}``."""
+
+    @abstractmethod
+    async def get(self, key: str, now: float) -> Optional[CacheEntry]:
+        """Return the live entry for ``key`` (refreshing its recency), else None."""
+
+    @abstractmethod
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        """Store ``entry``, evicting least-recently-used entries over the caps."""
+
+    @abstractmethod
+    async def sweep(self, now: float) -> int:
+        """Drop every entry expired at ``now``; return how many were removed."""
+
+    async def close(self) -> None:
+        """Release backend resources (idempotent)."""
+
+
+class MemoryCacheBackend(ExtractionCacheBackend):
+    """Process-local LRU bounded by entry count and total payload bytes."""
+
+    def __init__(self, max_entries: int, max_bytes: int) -> None:
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max(1, max_bytes)
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self.total_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def _discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry.size_bytes
+
+    async def get(self, key: str, now: float) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= now:
+            self._discard(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        self._discard(key)
+        self._entries[key] = entry
+        self.total_bytes += entry.size_bytes
+        # The newest entry always survives, even if it alone exceeds the
+        # byte budget: refusing it would make that image permanently uncacheable.
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes
+        ):
+            _, evicted = self._entries.popitem(last=False)
+            self.total_bytes -= evicted.size_bytes
+
+    async def sweep(self, now: float) -> int:
+        expired = [key for key, entry in self._entries.items() if entry.expires_at <= now]
+        for key in expired:
+            self._discard(key)
+        return len(expired)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.total_bytes = 0
+
+
+class SqliteCacheBackend(ExtractionCacheBackend):
+    """On-disk tier shared across workers on the same host.
+
+    WAL mode lets several processes read while one writes. Every call runs
+    in a worker thread (``asyncio.to_thread``) so disk I/O never blocks the
+    event loop; a lock serializes this process's use of its one connection.
+    """
+
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS extraction_cache ("
+        " key TEXT PRIMARY KEY,"
+        " payload TEXT NOT NULL,"
+        " size_bytes INTEGER NOT NULL,"
+        " expires_at REAL NOT NULL,"
+        " accessed_at REAL NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS extraction_cache_accessed"
+        " ON extraction_cache (accessed_at)",
+        "CREATE INDEX IF NOT EXISTS extraction_cache_expires"
+        " ON extraction_cache (expires_at)",
+    )
+
+    def __init__(self, path: str, max_bytes: int) -> None:
+        self.path = path
+        self.max_bytes = max(1, max_bytes)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                self.path, timeout=5.0, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            for statement in self._SCHEMA:
+                conn.execute(statement)
+            self._conn = conn
+        return self._conn
+
+    def _get_sync(self, key: str, now: float) -> Optional[CacheEntry]:
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT payload, size_bytes, expires_at FROM extraction_cache WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            payload, size_bytes, expires_at = row
+            if expires_at <= now:
+                conn.execute("DELETE FROM extraction_cache WHERE key = ?", (key,))
+                return None
+            conn.execute(
+                "UPDATE extraction_cache SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+        return CacheEntry(json.loads(payload), expires_at, size_bytes)
+
+    def _set_sync(self, key: str, payload: str, entry: CacheEntry, now: float) -> None:
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO extraction_cache"
+                " (key, payload, size_bytes, expires_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, payload, entry.size_bytes, entry.expires_at, now),
+            )
+            # Evict least-recently-accessed rows past the byte budget; the
+            # newest row (rank 1) is always kept, as in the memory tier.
+            conn.execute(
+                "DELETE FROM extraction_cache WHERE key IN ("
+                " SELECT key FROM ("
+                "  SELECT key,"
+                "   SUM(size_bytes) OVER (ORDER BY accessed_at DESC, key) AS running,"
+                "   ROW_NUMBER() OVER (ORDER BY accessed_at DESC, key) AS rank"
+                "  FROM extraction_cache)"
+                " WHERE running > ? AND rank > 1)",
+                (self.max_bytes,),
+            )
+
+    def _sweep_sync(self, now: float) -> int:
+        with self._lock:
+            cursor = self._connection().execute(
+                "DELETE FROM extraction_cache WHERE expires_at <= ?", (now,)
+            )
+            return cursor.rowcount
+
+    def _close_sync(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    async def get(self, key: str, now: float) -> Optional[CacheEntry]:
+        return await asyncio.to_thread(self._get_sync, key, now)
+
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        payload = json.dumps(entry.result, default=str)
+        await asyncio.to_thread(self._set_sync, key, payload, entry, utcnow().timestamp())
+
+    async def sweep(self, now: float) -> int:
+        return await asyncio.to_thread(self._sweep_sync, now)
+
+    async def close(self) -> None:
+        await asyncio.to_thread(self._close_sync)
+
+
+class TieredCacheBackend(ExtractionCacheBackend):
+    """Memory LRU in front of a shared (disk) tier; disk hits are promoted."""
+
+    def __init__(self, memory: MemoryCacheBackend, shared: ExtractionCacheBackend) -> None:
+        self.memory = memory
+        self.shared = shared
+
+    async def get(self, key: str, now: float) -> Optional[CacheEntry]:
+        entry = await self.memory.get(key, now)
+        if entry is not None:
+            return entry
+        entry = await self.shared.get(key, now)
+        if entry is not None:
+            await self.memory.set(key, entry)
+        return entry
+
+    async def set(self, key: str, entry: CacheEntry) -> None:
+        await self.memory.set(key, entry)
+        await self.shared.set(key, entry)
+
+    async def sweep(self, now: float) -> int:
+        return await self.memory.sweep(now) + await self.shared.sweep(now)
+
+    async def close(self) -> None:
+        await self.shared.close()
+
+
+def _sqlite_path() -> str:
+    path = Path(settings.EXTRACTION_CACHE_SQLITE_PATH)
+    return str(path if path.is_absolute() else _BACKEND_DIR / path)
+
+
+def _build_backend() -> ExtractionCacheBackend:
+    memory = MemoryCacheBackend(
+        ExtractionCacheService.MAX_ENTRIES, ExtractionCacheService.MAX_BYTES
+    )
+    if settings.EXTRACTION_CACHE_BACKEND.strip().lower() == "sqlite":
+        return TieredCacheBackend(
+            memory,
+            SqliteCacheBackend(_sqlite_path(), settings.EXTRACTION_CACHE_SQLITE_MAX_BYTES),
+        )
+    return memory
+
+
+def _memory_tier(backend: Optional[ExtractionCacheBackend]) -> Optional[MemoryCacheBackend]:
+    if isinstance(backend, TieredCacheBackend):
+        return backend.memory
+    return backend if isinstance(backend, MemoryCacheBackend) else None
+
+
+_backend: Optional[ExtractionCacheBackend] = None
+_sweeper_task: Optional[asyncio.Task] = None
+
+
+def get_cache_backend() -> ExtractionCacheBackend:
+    """Return the process-wide cache backend (created lazily from settings)."""
+    global _backend
+    if _backend is None:
+        _backend = _build_backend()
+    return _backend
+
+
+async def close_extraction_cache() -> None:
+    """Stop the sweeper and release the backend at shutdown (idempotent)."""
+    global _backend, _sweeper_task
+    task, backend = _sweeper_task, _backend
+    _sweeper_task, _backend = None, None
+    if task is not None and not task.done():
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    if backend is not None:
+        await backend.close()
 
 
 class ExtractionCacheService:
     """Service for caching extraction results by image hash."""
 
-    # Cache TTL: 24 hours. Enforced lazily on read only (get_cached_result drops
-    # an entry it finds expired); nothing sweeps the dict on a timer.
     CACHE_TTL_HOURS = 24
-    # Hard cap so the process-local dict cannot grow without bound under
-    # heavy wardrobe import traffic (each result may hold large item lists).
-    # This overflow eviction in set_cached_result is the real bound on cache
-    # size - an entry that is never read again is only ever freed by this cap.
-    MAX_ENTRIES = 200
+    # Memory-tier caps. Each result may hold large item lists, so the tier is
+    # bounded by bytes as well as by count; the LRU entry goes first.
+    MAX_ENTRIES = settings.EXTRACTION_CACHE_MAX_ENTRIES
+    MAX_BYTES = settings.EXTRACTION_CACHE_MAX_BYTES
+
+    # Hit/miss counters since process start (cache effectiveness telemetry).
+    hits = 0
+    misses = 0
 
     @staticmethod
     async def _hash_image(image_base64: str) -> str:
@@ -84,34 +372,21 @@ class ExtractionCacheService:
             image_hash = await cls._hash_image(image_base64)
             cache_key = f"{user_id}:{image_hash}"
 
-            cached = _cache.get(cache_key)
-            if not cached:
-                return None
-
-            # Check expiry
-            expiry = datetime.fromisoformat(cached["expiry"])
-            # Stale entries from before the UTC migration store naive ISO
-            # strings; coerce to aware so comparison doesn't raise TypeError.
-            if expiry.tzinfo is None:
-                expiry = expiry.replace(tzinfo=timezone.utc)
-            if utcnow() > expiry:
-                # Expired - remove from cache
-                del _cache[cache_key]
-                logger.info(
-                    "Cache expired",
-                    extra={"image_hash": image_hash[:16], "user_id": user_id},
-                )
+            entry = await get_cache_backend().get(cache_key, utcnow().timestamp())
+            if entry is None:
+                cls.misses += 1
                 return None
 
+            cls.hits += 1
             logger.info(
                 "Cache hit",
                 extra={
                     "image_hash": image_hash[:16],
                     "user_id": user_id,
-                    "item_count": len(cached["result"].get("items", [])),
+                    "item_count": len(entry.result.get("items", [])),
                 },
             )
-            return cached["result"]
+            return entry.result
 
         except Exception as e:
             logger.error("Cache get failed", extra={"error": str(e)})
@@ -137,23 +412,12 @@ class ExtractionCacheService:
             cache_key = f"{user_id}:{image_hash}"
 
             expiry = utcnow() + timedelta(hours=cls.CACHE_TTL_HOURS)
+            size_bytes = len(json.dumps(result, default=str).encode("utf-8"))
+            backend = get_cache_backend()
+            await backend.set(cache_key, CacheEntry(result, expiry.timestamp(), size_bytes))
+            cls._ensure_sweeper_task()
 
-            _cache[cache_key] = {
-                "result": result,
-                "expiry": expiry.isoformat(),
-                "cached_at": utcnow_iso(),
-            }
-
-            # Evict oldest entries when over the hard cap (simple LRU-by-age).
-            if len(_cache) > cls.MAX_ENTRIES:
-                ordered = sorted(
-                    _cache.items(),
-                    key=lambda kv: kv[1].get("cached_at", ""),
-                )
-                overflow = len(_cache) - cls.MAX_ENTRIES
-                for key, _ in ordered[:overflow]:
-                    _cache.pop(key, None)
-
+            tier = _memory_tier(backend)
             logger.info(
                 "Cache set",
                 extra={
@@ -161,9 +425,67 @@ class ExtractionCacheService:
                     "user_id": user_id,
                     "item_count": len(result.get("items", [])),
                     "expiry": expiry.isoformat(),
-                    "cache_size": len(_cache),
+                    "size_bytes": size_bytes,
+                    "cache_size": len(tier) if tier is not None else None,
+                    "cache_bytes": tier.total_bytes if tier is not None else None,
                 },
             )
 
         except Exception as e:
             logger.error("Cache set failed", extra={"error": str(e)})
+
+    @classmethod
+    def _ensure_sweeper_task(cls) -> None:
+        """Ensure the expiry sweeper is running (started on first write)."""
+        global _sweeper_task
+        if _sweeper_task is None or _sweeper_task.done():
+            _sweeper_task = asyncio.create_task(cls._sweep_loop())
+
+    @classmethod
+    async def _sweep_loop(cls) -> None:
+        """Periodically drop expired entries so unread results free their memory."""
+        while True:
+            try:
+                await asyncio.sleep(settings.EXTRACTION_CACHE_SWEEP_INTERVAL_SECONDS)
+                removed = await get_cache_backend().sweep(utcnow().timestamp())
+                if removed:
+                    logger.info("Extraction cache sweep", extra={"removed": removed})
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Extraction cache sweep error: {e}")
+
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        """Hit/miss counters plus the memory tier's current size."""
+        tier = _memory_tier(_backend)
+        return {
+            "hits": cls.hits,
+            "misses": cls.misses,
+            "entries": len(tier) if tier is not None else 0,
+            "bytes": tier.total_bytes if tier is not None else 0,
+        }
+
+
+# Exposed on GET /metrics straight from stats(); hit rate is
+# hits / (hits + misses) over any scrape window.
+Counter(
+    "fitcheck_extraction_cache_hits_total",
+    "Extraction cache lookups served from cache.",
+    callback=lambda: ExtractionCacheService.stats()["hits"],
+)
+Counter(
+    "fitcheck_extraction_cache_misses_total",
+    "Extraction cache lookups that fell through to a paid extraction.",
+    callback=lambda: ExtractionCacheService.stats()["misses"],
+)
+Gauge(
+    "fitcheck_extraction_cache_entries",
+    "Entries in the extraction cache memory tier.",
+    callback=lambda: ExtractionCacheService.stats()["entries"],
+)
+Gauge(
+    "fitcheck_extraction_cache_bytes",
+    "Bytes held by the extraction cache memory tier.",
+    callback=lambda: ExtractionCacheService.stats()["bytes"],
+)
@@ -12,30 +12,34 @@ Bearer-auth /v1/chat/completions contract. A prior attempt at "Gemini support"
 OpenAI-shaped HTTP client and never really worked because of exactly this
 mismatch. This implementation talks to Google's SDK directly and satisfies the
 same AIProviderClient interface every other provider does.
+
+The SDK itself is imported on first use, not at module load: ``google.genai``
+is ~1.1s and tens of MB of pydantic models, and this module is pulled in by
+ai_provider_service (i.e. by nearly every router) whether or not Gemini is
+configured.
 """
 
+from __future__ import annotations
+
 import asyncio
 import base64
 import hashlib
-import ipaddress
 import re
 import time
 from urllib.parse import urlparse
-
-import httpx
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional, Tuple
-
-from google import genai
-from google.genai import errors as genai_errors
-from google.genai import types
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
+from app.core.concurrency import FairRatePacer, record_provider_call
 from app.core.exceptions import AIServiceError
 from app.core.logging_config import get_context_logger
 from app.core.config import settings
+from app.core.middleware import get_log_context
 from app.models.ai import HealthCheckResult
-from app.utils.image_processing import ensure_provider_safe_base64, sniff_image_mime_from_magic
+from app.services.remote_image_fetcher import get_remote_image_fetcher, is_safe_remote_url
+from app.utils.image_processing import ensure_provider_safe_bytes, sniff_image_mime_from_magic
 from app.services.ai_provider_interface import (
     AIProvider,
     AIResponse,
@@ -44,60 +48,17 @@ from app.services.ai_provider_interface import (
     register_provider,
 )
 
+if TYPE_CHECKING:  # pragma: no cover - annotations only; imported lazily below
+    from google import genai
+    from google.genai import types
+
 logger = get_context_logger(__name__)
 
 # Remote image references are downloaded only at this provider boundary because
 # google-genai's Part.from_uri accepts provider-managed file URIs (for example
-# gs://), not arbitrary presigned HTTPS URLs. Keep this bounded so a malformed
-# or hostile URL cannot make a request consume unbounded memory.
-_MAX_REMOTE_IMAGE_BYTES = 10 * 1024 * 1024
-_REMOTE_IMAGE_TIMEOUT = httpx.Timeout(20.0, connect=5.0)
-
-# Host suffixes that must never be fetched from the backend: cloud metadata
-# (``*.internal``), mDNS (``*.local``) and the loopback name itself.
-_PRIVATE_URL_HOST_SUFFIX_RE = re.compile(r"(?:^|\.)(?:local|internal|localhost)$", re.IGNORECASE)
-
-
-def _is_safe_remote_url(url: str) -> bool:
-    """Refuse provider fetches of URLs that could target internal networks.
-
-    This boundary downloads http(s) image URLs (avatars, chat image parts).
-    A caller-supplied URL must never make the backend reach loopback,
-    link-local (``169.254.x``), RFC1918 private ranges, multicast or cloud
-    metadata hosts. Literal IP addresses are range-checked; bare hostnames are
-    allowed (DNS-rebinding protection is out of scope for this guard). The
-    configured object-storage endpoint is always allowed: it serves our own
-    presigned URLs, and local development points it at a private MinIO-like
-    endpoint.
-    """
-    parsed = urlparse(url)
-    if parsed.scheme not in ("http", "https") or not parsed.netloc:
-        return False
-    host = parsed.hostname or ""
-    if not host:
-        return False
-    # The configured object-storage endpoint is always allowed: it serves our
-    # own presigned URLs, and local development points it at a private
-    # MinIO-like endpoint. Compared on full netloc (host[:port]) so a
-    # look-alike on another port of the same host is still refused.
-    storage_netloc = urlparse(settings.OBJECT_STORAGE_ENDPOINT).netloc
-    if storage_netloc and parsed.netloc == storage_netloc:
-        return True
-    if _PRIVATE_URL_HOST_SUFFIX_RE.search(host):
-        return False
-    try:
-        ip = ipaddress.ip_address(host)
-    except ValueError:
-        # A DNS name, not a literal address.
-        return True
-    return not (
-        ip.is_private
-        or ip.is_loopback
-        or ip.is_link_local
-        or ip.is_multicast
-        or ip.is_reserved
-        or ip.is_unspecified
-    )
+# gs://), not arbitrary presigned HTTPS URLs. The download itself (SSRF guard,
+# size cap, pooled client, cache) lives in remote_image_fetcher.
+_is_safe_remote_url = is_safe_remote_url
 
 
 # =============================================================================
@@ -179,6 +140,82 @@ def clear_daily_quota_latch(api_key: Optional[str] = None) -> None:
     _daily_quota_reset_at.pop(_hash_api_key(api_key), None)
 
 
+# =============================================================================
+# Process-wide request pacing
+# =============================================================================
+# Provider instances are built per request (get_ai_service_for_user), so
+# pacing state kept on the instance never saw the other requests: concurrent
+# batch jobs each spaced their own calls and together burst past the key's
+# RPM into 429s + backoff. One FairRatePacer per (API-key hash, model) -
+# Gemini's free-tier quotas are per project AND model - shared by every
+# instance in the process, queueing fairly by user.
+#
+# The same pacer carries the per-minute quota latch: a 429 with a retryDelay
+# pauses the bucket until then, and every other caller on that key/model
+# fails over at once (retryable, with the remaining delay) instead of each
+# spending a request to learn the same thing.
+#
+# Every BYOK key and model would otherwise add an entry for the life of the
+# process: a key/model with no RPM limit and no pause gets no pacer at all,
+# and the map is an LRU bounded by AI_GEMINI_RATE_PACER_MAX_ENTRIES that
+# evicts idle, unpaused pacers (one with waiters or a pause is kept).
+_pacers: "OrderedDict[Tuple[str, str], FairRatePacer]" = OrderedDict()
+
+# Pause applied when a per-minute quota 429 carries no retryDelay.
+_DEFAULT_QUOTA_PAUSE_SECONDS = 30.0
+
+
+def _pacer_is_idle(pacer: FairRatePacer) -> bool:
+    return pacer.waiting == 0 and pacer.paused_for() <= 0
+
+
+def _pacer_for(
+    api_key: str, model: str, max_requests_per_minute: int, *, pausing: bool = False
+) -> Optional[FairRatePacer]:
+    """The shared pacer for this key/model, tracking the configured RPM.
+
+    None when there is nothing to pace or hold: no RPM limit and no pause in
+    effect. ``pausing`` (a per-minute quota 429) always gets one.
+    """
+    key = (_hash_api_key(api_key), model)
+    rate = max_requests_per_minute / 60.0 if max_requests_per_minute > 0 else 0.0
+    pacer = _pacers.get(key)
+    if pacer is None:
+        if rate <= 0 and not pausing:
+            return None
+        pacer = _pacers[key] = FairRatePacer(rate, settings.AI_GEMINI_RATE_BURST)
+        _evict_idle_pacers()
+        return pacer
+    pacer.rate = rate
+    if rate <= 0 and not pausing and _pacer_is_idle(pacer):
+        del _pacers[key]
+        return None
+    _pacers.move_to_end(key)
+    return pacer
+
+
+def _evict_idle_pacers() -> None:
+    """Drop least recently used idle pacers while over the cap (never the
+    newest entry, which the caller is about to use)."""
+    max_entries = max(1, settings.AI_GEMINI_RATE_PACER_MAX_ENTRIES)
+    for key in list(_pacers)[:-1]:
+        if len(_pacers) <= max_entries:
+            break
+        if _pacer_is_idle(_pacers[key]):
+            del _pacers[key]
+
+
+def _fairness_key() -> str:
+    """The caller's user id (request log context; copied into background
+    jobs), so pacing queues fairly between users."""
+    return str(get_log_context().get("user_id") or "anonymous")
+
+
+def clear_rate_pacers() -> None:
+    """Drop all pacers and per-minute pauses. Exposed for tests."""
+    _pacers.clear()
+
+
 # Default Gemini model names. Referenced from the GeminiConfig field defaults
 # AND the from_settings/from_user_dict fallbacks, so a model bump is one edit
 # instead of a find-and-replace across three sites each.
@@ -205,12 +242,12 @@ class GeminiConfig:
     image_gen_model: str = DEFAULT_GEMINI_IMAGE_MODEL
     image_fallback_model: Optional[str] = None
     max_tokens: int = DEFAULT_MAX_OUTPUT_TOKENS
-    # Requests per minute allowed through this provider instance; 0 = unlimited.
-    # Free-tier Gemini keys are limited to ~5 rpm per model - bursts of
-    # concurrent extractions exhaust the quota in one second (observed
-    # 2026-08-01: 8 parallel 429 RESOURCE_EXHAUSTED). When set, chat() spaces
-    # requests so the hybrid vision leg falls back to Agnes while the bucket
-    # refills instead of hammering the quota with retries.
+    # Requests per minute allowed per API key and model, across every
+    # provider instance in the process; 0 = unlimited. Free-tier Gemini keys
+    # are limited to ~5 rpm per model - bursts of concurrent extractions
+    # exhaust the quota in one second (observed 2026-08-01: 8 parallel 429
+    # RESOURCE_EXHAUSTED). When set, chat() paces requests through the shared
+    # token bucket instead of hammering the quota with retries.
     max_requests_per_minute: int = 0
 
     def get_vision_model(self) -> str:
@@ -335,12 +372,14 @@ def classify_gemini_error(e: Exception) -> Tuple[bool, Optional[str], Optional[f
 
 
 # finish_reason values that mean the response was blocked, not just short.
+# Names rather than types.FinishReason members so the SDK stays unimported
+# until the first call; FinishReason is a str enum, so members compare equal.
 _BLOCKED_FINISH_REASONS = (
-    types.FinishReason.SAFETY,
-    types.FinishReason.PROHIBITED_CONTENT,
-    types.FinishReason.RECITATION,
-    types.FinishReason.BLOCKLIST,
-    types.FinishReason.SPII,
+    "SAFETY",
+    "PROHIBITED_CONTENT",
+    "RECITATION",
+    "BLOCKLIST",
+    "SPII",
 )
 
 
@@ -358,33 +397,33 @@ class GeminiProvider:
         # across instances would get torn down by one caller while another is
         # still using it.
         self._client: Optional[genai.Client] = None
-        # Rate-limiting state (see _wait_for_rate_slot). Lock is created
-        # lazily so provider construction never binds to an event loop.
-        self._rate_lock: Optional[asyncio.Lock] = None
-        self._next_allowed_at: float = 0.0
-
-    async def _wait_for_rate_slot(self) -> None:
-        """Space requests to `max_requests_per_minute` when configured
-        (0 = unlimited). The wait happens BEFORE the request is sent, so a
-        burst of concurrent extractions cannot slam a free-tier quota in one
-        second (observed 2026-08-01: 8 parallel 429 RESOURCE_EXHAUSTED);
-        callers that exceed the bucket simply back off and the hybrid vision
-        leg falls back to Agnes while they wait."""
-        rpm = self.config.max_requests_per_minute
-        if rpm <= 0:
+
+    async def _wait_for_rate_slot(self, model: str) -> None:
+        """Take a slot from the process-wide pacer for this key/model.
+
+        Fails fast (retryable ``upstream_quota``, with the remaining delay)
+        while a per-minute quota pause is in effect, so the hybrid vision leg
+        falls back to Agnes instead of queueing behind the reset. Otherwise
+        waits BEFORE the request is sent until the shared bucket has a token
+        (no wait when ``max_requests_per_minute`` is 0).
+        """
+        pacer = _pacer_for(self.config.api_key, model, self.config.max_requests_per_minute)
+        if pacer is None:
             return
-        interval = 60.0 / rpm
-        if self._rate_lock is None:
-            self._rate_lock = asyncio.Lock()
-        async with self._rate_lock:
-            now = time.monotonic()
-            wait = self._next_allowed_at - now
-            if wait > 0:
-                await asyncio.sleep(wait)
-            self._next_allowed_at = max(now, self._next_allowed_at) + interval
+        remaining = pacer.paused_for()
+        if remaining > 0:
+            raise AIServiceError(
+                "Gemini per-minute quota exhausted; retry after the advised delay",
+                retryable=True,
+                error_kind="upstream_quota",
+                retry_after_seconds=remaining,
+            )
+        await pacer.acquire(_fairness_key())
 
     def _get_client(self) -> genai.Client:
         if self._client is None:
+            from google import genai
+
             self._client = genai.Client(api_key=self.config.api_key)
         return self._client
 
@@ -396,45 +435,23 @@ class GeminiProvider:
         it does not fetch arbitrary presigned HTTPS URLs. Download those here,
         asynchronously and with a hard byte limit, then send inline bytes.
         """
+        from google.genai import types
+
         parsed = urlparse(img)
         if parsed.scheme in ("http", "https") and parsed.netloc:
-            if not _is_safe_remote_url(img):
-                raise ValueError("Remote image URL is not fetchable by the provider boundary")
-            data = bytearray()
-            async with httpx.AsyncClient(timeout=_REMOTE_IMAGE_TIMEOUT, follow_redirects=True) as client:
-                async with client.stream("GET", img) as response:
-                    response.raise_for_status()
-                    content_length = response.headers.get("content-length")
-                    if content_length and int(content_length) > _MAX_REMOTE_IMAGE_BYTES:
-                        raise ValueError("Remote image exceeds Gemini provider size limit")
-                    async for chunk in response.aiter_bytes():
-                        data.extend(chunk)
-                        if len(data) > _MAX_REMOTE_IMAGE_BYTES:
-                            raise ValueError("Remote image exceeds Gemini provider size limit")
-            raw = bytes(data)
-            mime_type = sniff_image_mime_from_magic(raw[:96]) or response.headers.get("content-type", "").split(";", 1)[0] or "image/jpeg"
-            # Keep the existing AVIF/HEIF provider safety behavior. This path
-            # necessarily makes transient base64 copies only for those formats.
-            if mime_type in ("image/avif", "image/heif", "image/heic"):
-                safe = ensure_provider_safe_base64(base64.b64encode(raw).decode())
-                raw = base64.b64decode(safe.partition(",")[-1] if safe.startswith("data:") else safe)
-                mime_type = "image/jpeg"
+            raw, content_type = await get_remote_image_fetcher().fetch(img)
+            mime_type = sniff_image_mime_from_magic(raw[:96]) or content_type or "image/jpeg"
+            # AVIF/HEIF re-encode works on the bytes directly: no base64
+            # round trip on the way to an inline part.
+            raw, mime_type = ensure_provider_safe_bytes(raw, mime_type)
             return types.Part.from_bytes(data=raw, mime_type=mime_type)
 
-        img = ensure_provider_safe_base64(img)
+        mime_type = None
+        b64_data = img
         if img.startswith("data:"):
             header, _, b64_data = img.partition(",")
             mime_type = header[5:].split(";")[0] or "image/jpeg"
-        else:
-            b64_data = img
-            mime_type = None
-        data = base64.b64decode(b64_data)
-        if mime_type is None:
-            try:
-                head = base64.b64decode(b64_data[:96])
-                mime_type = sniff_image_mime_from_magic(head) or "image/jpeg"
-            except Exception:
-                mime_type = "image/jpeg"
+        data, mime_type = ensure_provider_safe_bytes(base64.b64decode(b64_data), mime_type)
         return types.Part.from_bytes(data=data, mime_type=mime_type)
 
     @classmethod
@@ -446,6 +463,8 @@ class GeminiProvider:
         `contents` list plus an optional `system_instruction` string - Gemini
         has no "system" role inside `contents`, and uses "model" rather than
         "assistant" for the model's own turns."""
+        from google.genai import types
+
         system_parts: List[str] = []
         contents: List[types.Content] = []
 
@@ -492,8 +511,8 @@ class GeminiProvider:
         # Fail fast (before building a request) when this key's DAILY quota is
         # known-exhausted: the call is guaranteed to 429, and the hybrid
         # vision leg will fall back to Agnes with zero wasted Gemini calls.
-        # Per-minute quota is NOT latched - it clears in seconds and the rate
-        # limiter + retry metadata already handle it.
+        # Per-minute quota is not latched for the day - it pauses the shared
+        # pacer until the advised retryDelay instead (_wait_for_rate_slot).
         if await _is_daily_quota_latched(self.config.api_key):
             raise AIServiceError(
                 "Gemini daily quota exhausted; using the configured fallback "
@@ -501,9 +520,9 @@ class GeminiProvider:
                 retryable=False,
                 error_kind="upstream_quota",
             )
-        await self._wait_for_rate_slot()
-        client = self._get_client()
         use_model = model or self.config.chat_model
+        await self._wait_for_rate_slot(use_model)
+        client = self._get_client()
         system_instruction, contents = await self._messages_to_contents(messages)
 
         is_image_request = bool(response_modalities and "IMAGE" in response_modalities)
@@ -539,6 +558,10 @@ class GeminiProvider:
             has_response_format=bool(response_format),
         )
 
+        from google.genai import errors as genai_errors
+        from google.genai import types
+
+        started_at = time.monotonic()
         try:
             response = await client.aio.models.generate_content(
                 model=use_model,
@@ -547,11 +570,31 @@ class GeminiProvider:
             )
         except genai_errors.APIError as e:
             retryable, error_kind, retry_after = classify_gemini_error(e)
+            # Per-minute quota / 5xx overload is congestion the adaptive
+            # limiter should back off from; a latched daily cap is not (the
+            # fallback provider takes over instead).
+            if retryable:
+                record_provider_call(
+                    time.monotonic() - started_at,
+                    api_key=self.config.api_key,
+                    overloaded=True,
+                )
             # A DAILY-quota failure (non-retryable upstream_quota) means every
             # subsequent call this day will also 429: latch it so later calls
             # fail fast without touching the network (see module docstring).
             if error_kind == "upstream_quota" and not retryable:
                 await _latch_daily_quota(self.config.api_key)
+            elif error_kind == "upstream_quota":
+                # Per-minute quota: every caller on this key/model would get
+                # the same 429 until the advised reset - pause them all.
+                _pacer_for(
+                    self.config.api_key,
+                    use_model,
+                    self.config.max_requests_per_minute,
+                    pausing=True,
+                ).pause_until(
+                    time.monotonic() + (retry_after or _DEFAULT_QUOTA_PAUSE_SECONDS)
+                )
             # Handled upstream failures (quota 429 / 5xx overload) that the
             # hybrid vision leg will absorb via the Agnes fallback are WARN
             # level - error-level logging here turned every free-tier burst
@@ -576,6 +619,7 @@ class GeminiProvider:
                 retry_after_seconds=retry_after,
             )
 
+        record_provider_call(time.monotonic() - started_at, api_key=self.config.api_key)
         return self._parse_response(response, use_model, structured_output_requested=wants_json)
 
     def _parse_response(
@@ -599,7 +643,7 @@ class GeminiProvider:
             # Mirrors ai_provider_service.py's finish_reason=="length" guard.
             # Only for structured-output callers: a plain-text vision answer
             # can legitimately stop at MAX_TOKENS without being "broken".
-            if finish_reason == types.FinishReason.MAX_TOKENS and structured_output_requested:
+            if finish_reason == "MAX_TOKENS" and structured_output_requested:
                 raise AIServiceError(
                     f"Gemini response truncated at max_output_tokens="
                     f"{self.config.max_tokens} (finish_reason=MAX_TOKENS); "
@@ -21,10 +21,12 @@ configured subscription.
 """
 from __future__ import annotations
 
+import asyncio
 import base64
 import json
+import re
 import time
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Awaitable, Callable, Dict, Generic, Optional, Tuple, TypeVar
 
 import httpx
 from jose import jwt
@@ -42,6 +44,18 @@ GOOGLE_OAUTH_SCOPE = "https://www.googleapis.com/auth/androidpublisher"
 GOOGLE_PUBLISHER_API_URL = "https://androidpublisher.googleapis.com/androidpublisher/v3"
 GOOGLE_OIDC_CERTS_URL = "https://www.googleapis.com/oauth2/v1/certs"
 
+# Refresh a cached credential in the background once it is this close to
+# expiry, so callers keep being served the current one meanwhile.
+_REFRESH_AHEAD_SECONDS = 300
+# OIDC cert lifetime when the certs response carries no max-age.
+_DEFAULT_CERTS_TTL_SECONDS = 3600
+# A token with an unknown kid forces a cert re-fetch (key rotation), but at
+# most this often so junk kids cannot turn into a fetch per request.
+_MIN_FORCED_REFRESH_SECONDS = 60
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+_T = TypeVar("_T")
+
 # RTDN notificationType values (subscriptionNotification.notificationType).
 _GOOGLE_NOTIFICATION_TYPES = {
     1: "SUBSCRIPTION_RECOVERED",
@@ -75,13 +89,76 @@ class GooglePlayVerificationError(GooglePlayError):
     error_code = "GOOGLE_PLAY_VERIFICATION_ERROR"
 
 
+class _CachedCredential(Generic[_T]):
+    """A fetched credential served until it expires.
+
+    - Concurrent misses share one fetch (a webhook burst on a cold process
+      makes one token exchange, not one per request).
+    - Inside the refresh-ahead window the current value is returned and a
+      background refresh starts, so requests never wait on Google for a
+      rollover. A failed background refresh is logged and the current value
+      keeps being served until it actually expires.
+    """
+
+    def __init__(self, name: str, fetch: Callable[[], Awaitable[Tuple[_T, float]]]):
+        self.name = name
+        self._fetch = fetch
+        self.value: Optional[_T] = None
+        self.expires_at = 0.0
+        self.fetched_at = 0.0
+        self._inflight: Optional[asyncio.Task] = None
+
+    def reset(self) -> None:
+        self.value = None
+        self.expires_at = 0.0
+        self.fetched_at = 0.0
+        self._inflight = None
+
+    async def get(self, *, force_refresh: bool = False) -> _T:
+        now = time.time()
+        if self.value is not None and now < self.expires_at and not force_refresh:
+            if self.expires_at - now <= _REFRESH_AHEAD_SECONDS:
+                self._refresh()
+            return self.value
+        # Shielded: a caller that is cancelled must not cancel the fetch the
+        # other waiters share.
+        return await asyncio.shield(self._refresh())
+
+    def _refresh(self) -> "asyncio.Task[_T]":
+        task = self._inflight
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.create_task(self._run())
+            task.add_done_callback(self._on_done)
+            self._inflight = task
+        return task
+
+    async def _run(self) -> _T:
+        value, expires_at = await self._fetch()
+        self.value, self.expires_at, self.fetched_at = value, expires_at, time.time()
+        return value
+
+    def _on_done(self, task: asyncio.Task) -> None:
+        if self._inflight is task:
+            self._inflight = None
+        # Retrieve the exception so a background failure nobody awaited is
+        # logged here rather than as "Task exception was never retrieved".
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Google {self.name} refresh failed: {task.exception()}")
+
+
 class GooglePlayService:
     """Google Play Developer API verification helpers."""
 
-    # Cached OAuth access token: (token, expires_at_epoch).
-    _token_cache: Optional[Tuple[str, float]] = None
-    # Cached OIDC verification certs: {kid: pem}.
-    _certs_cache: Optional[Tuple[Dict[str, str], float]] = None
+    # Cached OAuth access token and OIDC verification certs ({kid: pem});
+    # assigned below the class (they wrap its fetch classmethods).
+    _token_cache: "_CachedCredential[str]"
+    _certs_cache: "_CachedCredential[Dict[str, str]]"
+
+    @classmethod
+    def reset_credential_caches(cls) -> None:
+        """Drop cached Google credentials (for tests / key revocation)."""
+        cls._token_cache.reset()
+        cls._certs_cache.reset()
 
     # ------------------------------------------------------------------
     # Configuration
@@ -175,12 +252,7 @@ class GooglePlayService:
     @classmethod
     async def get_access_token(cls) -> str:
         """Return a cached (or freshly minted) OAuth access token."""
-        cached = cls._token_cache
-        if cached and cached[1] > time.time():
-            return cached[0]
-        token, expires_at = await cls._fetch_access_token()
-        cls._token_cache = (token, expires_at)
-        return token
+        return await cls._token_cache.get()
 
     # ------------------------------------------------------------------
     # Play Developer API
@@ -259,17 +331,20 @@ class GooglePlayService:
         return message_id, notification
 
     @classmethod
-    async def _fetch_oidc_certs(cls) -> Dict[str, str]:
-        cached = cls._certs_cache
-        if cached and cached[1] > time.time():
-            return cached[0]
+    async def _download_oidc_certs(cls) -> Tuple[Dict[str, str], float]:
         async with httpx.AsyncClient(timeout=15) as client:
             response = await client.get(GOOGLE_OIDC_CERTS_URL)
         if response.status_code != 200:
             raise GooglePlayVerificationError("Could not fetch Google OIDC certificates")
-        certs = response.json()
-        cls._certs_cache = (certs, time.time() + 3600)
-        return certs
+        # Google publishes how long the cert set is valid (Cache-Control).
+        match = _MAX_AGE_RE.search(response.headers.get("cache-control", ""))
+        ttl = int(match.group(1)) if match else _DEFAULT_CERTS_TTL_SECONDS
+        return response.json(), time.time() + ttl
+
+    @classmethod
+    async def _fetch_oidc_certs(cls, force_refresh: bool = False) -> Dict[str, str]:
+        """Return the cached Google OIDC certs ({kid: pem})."""
+        return await cls._certs_cache.get(force_refresh=force_refresh)
 
     @classmethod
     async def verify_rtdn_authorization(cls, authorization: Optional[str]) -> Dict[str, Any]:
@@ -294,6 +369,10 @@ class GooglePlayService:
         # the token header selects the matching cert.
         header = jwt.get_unverified_header(token)
         pem = certs.get(header.get("kid"))
+        if not pem and time.time() - cls._certs_cache.fetched_at >= _MIN_FORCED_REFRESH_SECONDS:
+            # Google rotated its keys since the certs were cached.
+            certs = await cls._fetch_oidc_certs(force_refresh=True)
+            pem = certs.get(header.get("kid"))
         if not pem:
             raise GooglePlayVerificationError("No Google OIDC cert matches the token kid")
         try:
@@ -410,3 +489,12 @@ class GooglePlayService:
         return _GOOGLE_NOTIFICATION_TYPES.get(
             sub_notification.get("notificationType"), "UNKNOWN"
         )
+
+
+# Looked up per fetch (not bound here) so the fetch classmethods stay patchable.
+GooglePlayService._token_cache = _CachedCredential(
+    "OAuth token", lambda: GooglePlayService._fetch_access_token()
+)
+GooglePlayService._certs_cache = _CachedCredential(
+    "OIDC certs", lambda: GooglePlayService._download_oidc_certs()
+)
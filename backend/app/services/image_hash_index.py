@@ -0,0 +1,150 @@
+"""
+Per-user perceptual-hash index for the duplicate check's first tier.
+
+``/items/check-duplicates`` spends one embedding (paid quota) and one vector
+query per call. Most real duplicates are the same photo uploaded again, and
+those are found by comparing ``item_images.image_hash`` (64-bit dHash, see
+``app/utils/image_hash.py``) in microseconds. This module owns that lookup:
+
+- a user's hashes are loaded in one paginated read of their non-deleted
+  items and kept as a ``HashBKTree``;
+- trees are cached per user (TTL + LRU by user count), and concurrent misses
+  for one user share a single load;
+- ``invalidate(user_id)`` drops a user's tree on item/image writes made by
+  this worker. Every invalidation bumps a generation, so a load that read
+  the DB before the write is not stored. Writes on other workers show up
+  within ``DUPLICATE_HASH_INDEX_TTL_SECONDS``; a miss there only means the
+  check falls through to the embedding path, and deleted items are filtered
+  when the matches are fetched.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
+
+from app.core.config import settings
+from app.core.logging_config import get_context_logger
+from app.utils.db import execute_with_reconnect
+from app.utils.image_hash import HASH_BITS, HashBKTree, hex_to_hash
+
+logger = get_context_logger(__name__)
+
+# PostgREST caps a response at 1000 rows by default.
+_PAGE_SIZE = 1000
+
+
+class ImageHashIndex:
+    """Cached per-user BK-trees of item image hashes."""
+
+    def __init__(self) -> None:
+        self._trees: "OrderedDict[str, Tuple[float, HashBKTree]]" = OrderedDict()
+        self._inflight: Dict[str, "asyncio.Task[HashBKTree]"] = {}
+        self.generation = 0
+
+    def invalidate(self, user_id: str) -> None:
+        """Drop a user's tree after an item or item-image write."""
+        self.generation += 1
+        self._trees.pop(user_id, None)
+        self._inflight.pop(user_id, None)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._trees.clear()
+        self._inflight.clear()
+
+    async def find_similar(
+        self,
+        db: Any,
+        user_id: str,
+        image_hash: int,
+        *,
+        min_score: float,
+    ) -> List[Dict[str, Any]]:
+        """Items with an image within the configured distance of ``image_hash``.
+
+        Returns ``{"item_id", "score", "distance"}`` dicts, nearest first, in
+        the shape the embedding path's vector matches use; ``score`` is
+        ``1 - distance / 64`` and never below ``min_score``.
+        """
+        max_distance = min(
+            settings.DUPLICATE_IMAGE_HASH_MAX_DISTANCE,
+            int((1.0 - min_score) * HASH_BITS),
+        )
+        if max_distance < 0:
+            return []
+        tree = await self._get_tree(db, user_id)
+        return [
+            {"item_id": item_id, "score": 1.0 - distance / HASH_BITS, "distance": distance}
+            for item_id, distance in tree.search(image_hash, max_distance)
+        ]
+
+    async def _get_tree(self, db: Any, user_id: str) -> HashBKTree:
+        hit = self._trees.get(user_id)
+        if hit is not None:
+            expires_at, tree = hit
+            if time.monotonic() < expires_at:
+                self._trees.move_to_end(user_id)
+                return tree
+            del self._trees[user_id]
+
+        task = self._inflight.get(user_id)
+        if task is None:
+            task = asyncio.create_task(self._load(db, user_id))
+            self._inflight[user_id] = task
+            task.add_done_callback(
+                lambda done, u=user_id, g=self.generation: self._on_loaded(u, g, done)
+            )
+        # Shielded: one cancelled check must not cancel the shared load.
+        return await asyncio.shield(task)
+
+    def _on_loaded(self, user_id: str, generation: int, task: "asyncio.Task[HashBKTree]") -> None:
+        if self._inflight.get(user_id) is task:
+            del self._inflight[user_id]
+        if task.cancelled() or task.exception() is not None:
+            return
+        ttl = settings.DUPLICATE_HASH_INDEX_TTL_SECONDS
+        if ttl <= 0 or generation != self.generation:
+            return
+        self._trees[user_id] = (time.monotonic() + ttl, task.result())
+        self._trees.move_to_end(user_id)
+        max_users = max(1, settings.DUPLICATE_HASH_INDEX_MAX_USERS)
+        while len(self._trees) > max_users:
+            self._trees.popitem(last=False)
+
+    async def _load(self, db: Any, user_id: str) -> HashBKTree:
+        tree = HashBKTree()
+        offset = 0
+        while True:
+            end = offset + _PAGE_SIZE - 1
+            result = await execute_with_reconnect(
+                lambda d, start=offset, stop=end: d.table("items")
+                .select("id, item_images(image_hash)")
+                .eq("user_id", user_id)
+                .eq("is_deleted", False)
+                .order("id")
+                .range(start, stop)
+                .execute(),
+                db,
+                extra={"operation": "image_hash_index.load", "user_id": user_id},
+            )
+            rows = result.data or []
+            for row in rows:
+                for image in row.get("item_images") or []:
+                    value = hex_to_hash(image.get("image_hash"))
+                    if value is not None:
+                        tree.add(value, row["id"])
+            if len(rows) < _PAGE_SIZE:
+                break
+            offset += _PAGE_SIZE
+        logger.debug("Loaded image hash index", user_id=user_id, hashes=len(tree))
+        return tree
+
+
+# Global singleton
+_index = ImageHashIndex()
+
+
+def get_image_hash_index() -> ImageHashIndex:
+    """Get the global image hash index singleton."""
+    return _index
@@ -7,13 +7,16 @@ and usage tracking for daily limits.
 
 import asyncio
 import base64
+import hashlib
 import json
+import time
 import uuid
+from collections import OrderedDict
 from datetime import datetime, date, timedelta, timezone
 from app.utils.datetime_util import utcnow, utcnow_iso, utc_today
 from app.utils.db import execute_with_reconnect, unwrap_rpc_bool
 from app.utils.json_utils import extract_json_block
-from app.core.concurrency import image_gen_slot
+from app.core.concurrency import PHOTOSHOOT_SCHEDULER, image_gen_slot
 from app.utils.image_processing import to_data_url
 from typing import Any, List, Optional, Tuple
 
@@ -192,6 +195,88 @@ Do not invent a different face or idealized beauty look
 }
 
 
+# Bump when the scene-planning prompt in generate_prompts or the
+# USE_CASE_TEMPLATES guidance changes: the version is part of every prompt
+# plan cache key, so plans written for the old wording stop being served.
+PROMPT_TEMPLATE_VERSION = 1
+
+
+class _PromptPlanCache:
+    """TTL + LRU map of normalized planning inputs -> generated scene plans.
+
+    Only plans the model produced are stored (never the template fallback),
+    so a provider blip is not pinned for a whole TTL. TTL and size are read
+    from settings on each call; ``PHOTOSHOOT_PROMPT_CACHE_TTL_SECONDS <= 0``
+    disables the cache. Single event loop, no awaits inside: no lock needed.
+    """
+
+    def __init__(self) -> None:
+        self._entries: "OrderedDict[Tuple[Any, ...], Tuple[float, List[PhotoshootPrompt]]]" = (
+            OrderedDict()
+        )
+
+    def get(self, key: Tuple[Any, ...]) -> Optional[List[PhotoshootPrompt]]:
+        if settings.PHOTOSHOOT_PROMPT_CACHE_TTL_SECONDS <= 0:
+            return None
+        hit = self._entries.get(key)
+        if hit is None:
+            return None
+        expires_at, prompts = hit
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return [p.model_copy(deep=True) for p in prompts]
+
+    def put(self, key: Tuple[Any, ...], prompts: List[PhotoshootPrompt]) -> None:
+        ttl = settings.PHOTOSHOOT_PROMPT_CACHE_TTL_SECONDS
+        if ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + ttl, [p.model_copy(deep=True) for p in prompts])
+        self._entries.move_to_end(key)
+        while len(self._entries) > max(1, settings.PHOTOSHOOT_PROMPT_CACHE_MAX_ENTRIES):
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_prompt_plan_cache = _PromptPlanCache()
+
+
+async def _prompt_plan_key(
+    use_case: PhotoshootUseCase,
+    num_prompts: int,
+    custom_prompt: Optional[str],
+    reference_photo: Optional[str],
+) -> Tuple[Any, ...]:
+    """Cache key for one planning call: everything that shapes the LLM input.
+
+    The custom prompt only counts for the CUSTOM use case (the other use
+    cases ignore it) and is whitespace/case-normalized. The reference photo
+    is reduced to a SHA-256 of its base64 payload; the subject lock is read
+    from that photo, so a plan is only ever reused for the same image.
+    """
+    custom = None
+    if use_case == PhotoshootUseCase.CUSTOM and custom_prompt:
+        custom = " ".join(custom_prompt.split()).casefold()
+
+    photo_digest = None
+    if reference_photo:
+        photo = reference_photo
+        if "," in photo and photo.strip().lower().startswith("data:"):
+            photo = photo.split(",", 1)[1]
+        # Multi-MB payload: hash off the event loop.
+        photo_digest = await asyncio.to_thread(
+            lambda: hashlib.sha256(photo.encode("utf-8")).hexdigest()
+        )
+
+    return (PROMPT_TEMPLATE_VERSION, use_case.value, num_prompts, custom, photo_digest)
+
+
 class PhotoshootService:
     """Service for managing photoshoot generation and usage tracking."""
 
@@ -442,9 +527,22 @@ class PhotoshootService:
         """Generate diverse prompts for photoshoot images using a single multimodal LLM call.
 
         This combines subject analysis and prompt generation into one API call for efficiency.
+        Plans the model produced are cached by normalized input (see
+        ``_prompt_plan_key``), so re-running the same photo and preset skips
+        the call.
         """
         from app.services.ai_provider_service import ChatMessage, get_ai_service
 
+        cache_key = await _prompt_plan_key(use_case, num_prompts, custom_prompt, reference_photo)
+        cached = _prompt_plan_cache.get(cache_key)
+        if cached is not None:
+            logger.info(
+                "Photoshoot prompt plan cache hit",
+                use_case=use_case.value,
+                num_prompts=num_prompts,
+            )
+            return cached
+
         # Get the prompt guidance for this use case
         if use_case == PhotoshootUseCase.CUSTOM and custom_prompt:
             guidance = (
@@ -655,6 +753,7 @@ RULES:
                 )
 
             if len(prompts) >= num_prompts:
+                _prompt_plan_cache.put(cache_key, prompts[:num_prompts])
                 return prompts[:num_prompts]
 
             # Fall back to templates if the model under-generated or returned invalid JSON entries
@@ -1411,14 +1510,21 @@ class PhotoshootStreamingService:
                 })
 
                 # Generate batch images concurrently. Local semaphore =
-                # photoshoot fan-out cap; shared image_gen_slot() = process-
-                # wide generation budget shared with try-on/outfit/batch
-                # (2026-08-03 container OOM - TD-044).
+                # per-job fan-out cap; PHOTOSHOOT_SCHEDULER = photoshoot
+                # budget across all jobs, shared fairly by user then job;
+                # image_gen_slot() = process-wide generation budget shared
+                # with try-on/outfit/batch (2026-08-03 container OOM - TD-044).
+                # Taken in that order so a job queued behind other jobs never
+                # sits on a shared generation permit.
                 concurrency_limit = settings.PHOTOSHOOT_CONCURRENCY_LIMIT
                 semaphore = asyncio.Semaphore(concurrency_limit)
 
                 async def generate_single(prompt: PhotoshootPrompt):
-                    async with image_gen_slot(), semaphore:
+                    async with (
+                        semaphore,
+                        PHOTOSHOOT_SCHEDULER.slot(job.user_id, job.job_id),
+                        image_gen_slot(),
+                    ):
                         if job.is_cancelled():
                             return None
                         return await self._generate_single_image(
@@ -1483,7 +1589,8 @@ class PhotoshootStreamingService:
                 raise ServiceError(f"No image generated for prompt {prompt.index}")
 
             image_id = f"img_{uuid.uuid4().hex[:8]}"
-            image_base64 = response.images[0]
+            image_base64: Optional[str] = response.images[0]
+            response = None  # only image_base64 references the payload now
 
             # Persist a durable URL when the job has a persistence DB so a
             # recovered job can still return generated images (base64 payloads
@@ -1495,12 +1602,14 @@ class PhotoshootStreamingService:
                     from app.services.storage_service import StorageService
 
                     raw = image_base64.split("base64,", 1)[-1] if "base64," in image_base64 else image_base64
+                    file_data = await asyncio.to_thread(base64.b64decode, raw)
                     upload = await StorageService.upload_temp_generated_image(
                         db=job.persistence_db,
                         user_id=job.user_id,
-                        file_data=base64.b64decode(raw),
+                        file_data=file_data,
                         source="photoshoot",
                     )
+                    del raw, file_data
                     image_url = upload.get("image_url")
                 except Exception as upload_error:
                     logger.warning(
@@ -1512,6 +1621,12 @@ class PhotoshootStreamingService:
                         },
                     )
 
+            if image_url:
+                # Persisted: clients render the URL (job, status and event
+                # payloads all carry it), so drop the multi-MB base64 now
+                # instead of holding it on the job until the run ends.
+                image_base64 = None
+
             # Add to job
             await PhotoshootJobService.add_generated_image(
                 job.job_id,
@@ -1541,6 +1656,7 @@ class PhotoshootStreamingService:
             return GeneratedImage(
                 id=image_id,
                 index=prompt.index,
+                image_url=image_url,
                 image_base64=image_base64,
             )
 
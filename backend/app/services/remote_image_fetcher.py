@@ -0,0 +1,243 @@
+"""
+Shared fetcher for remote image URLs sent to AI providers.
+
+``GeminiProvider._decode_image_part`` has to download http(s) image URLs
+itself (``Part.from_uri`` only understands provider-managed URIs). It used
+to open a fresh ``httpx.AsyncClient`` per image, so a try-on or outfit call
+with several references paid a TCP/TLS handshake for each one, and a retry
+round downloaded every reference again. This module owns that download:
+
+- one pooled client per process (``close()`` at shutdown);
+- an SSRF guard (``is_safe_remote_url``) checked before any request and
+  on every redirect hop: redirects are followed by hand, at most
+  ``MAX_REMOTE_IMAGE_REDIRECTS`` of them, so a public URL cannot bounce the
+  backend to an internal one;
+- streaming size cap: ``Content-Length`` is checked up front and the body
+  is aborted as soon as it passes ``MAX_REMOTE_IMAGE_BYTES``;
+- a process-wide cap on concurrent downloads
+  (``REMOTE_IMAGE_FETCH_CONCURRENCY``);
+- a TTL'd LRU of downloaded bytes keyed by the FULL URL, bounded by entries
+  AND bytes, with concurrent misses for one URL sharing a single download.
+
+The cache key deliberately includes the query string: for our presigned
+URLs the signature is the authorization, so two signatures for one object
+are two entries. The TTL is kept well under the presign lifetime so a cached
+entry never outlives the URL that fetched it.
+"""
+
+import asyncio
+import ipaddress
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+
+import httpx
+
+from app.core.config import settings
+
+# Bound on a single downloaded image, so a malformed or hostile URL cannot
+# make a request consume unbounded memory.
+MAX_REMOTE_IMAGE_BYTES = 10 * 1024 * 1024
+REMOTE_IMAGE_TIMEOUT = httpx.Timeout(20.0, connect=5.0)
+# CDNs and presigned storage URLs redirect once or twice at most.
+MAX_REMOTE_IMAGE_REDIRECTS = 3
+
+# Host suffixes that must never be fetched from the backend: cloud metadata
+# (``*.internal``), mDNS (``*.local``) and the loopback name itself.
+_PRIVATE_URL_HOST_SUFFIX_RE = re.compile(r"(?:^|\.)(?:local|internal|localhost)$", re.IGNORECASE)
+
+
+def is_safe_remote_url(url: str) -> bool:
+    """Refuse fetches of URLs that could target internal networks.
+
+    The fetcher downloads http(s) image URLs (avatars, chat image parts).
+    A caller-supplied URL must never make the backend reach loopback,
+    link-local (``169.254.x``), RFC1918 private ranges, multicast or cloud
+    metadata hosts. Literal IP addresses are range-checked; bare hostnames are
+    allowed (DNS-rebinding protection is out of scope for this guard). The
+    configured object-storage endpoint is always allowed: it serves our own
+    presigned URLs, and local development points it at a private MinIO-like
+    endpoint.
+    """
+    parsed = urlparse(url)
+    if parsed.scheme not in ("http", "https") or not parsed.netloc:
+        return False
+    host = parsed.hostname or ""
+    if not host:
+        return False
+    # Compared on full netloc (host[:port]) so a look-alike on another port
+    # of the same host is still refused.
+    storage_netloc = urlparse(settings.OBJECT_STORAGE_ENDPOINT).netloc
+    if storage_netloc and parsed.netloc == storage_netloc:
+        return True
+    if _PRIVATE_URL_HOST_SUFFIX_RE.search(host):
+        return False
+    try:
+        ip = ipaddress.ip_address(host)
+    except ValueError:
+        # A DNS name, not a literal address.
+        return True
+    return not (
+        ip.is_private
+        or ip.is_loopback
+        or ip.is_link_local
+        or ip.is_multicast
+        or ip.is_reserved
+        or ip.is_unspecified
+    )
+
+
+# (bytes, content type from the response header without parameters, or None)
+FetchedImage = Tuple[bytes, Optional[str]]
+
+
+class _FetchCache:
+    """Process-local TTL'd LRU of URL -> downloaded image, bounded by count and bytes.
+
+    Single event loop, no awaits inside the methods: no lock needed.
+    """
+
+    def __init__(self) -> None:
+        self._entries: "OrderedDict[str, Tuple[float, FetchedImage]]" = OrderedDict()
+        self.total_bytes = 0
+
+    def get(self, url: str) -> Optional[FetchedImage]:
+        entry = self._entries.get(url)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._remove(url)
+            return None
+        self._entries.move_to_end(url)
+        return value
+
+    def put(self, url: str, value: FetchedImage) -> None:
+        ttl = settings.REMOTE_IMAGE_CACHE_TTL_SECONDS
+        max_bytes = settings.REMOTE_IMAGE_CACHE_MAX_BYTES
+        size = len(value[0])
+        if ttl <= 0 or size > max_bytes:
+            return
+        self._remove(url)
+        self._entries[url] = (time.monotonic() + ttl, value)
+        self.total_bytes += size
+        max_entries = max(1, settings.REMOTE_IMAGE_CACHE_MAX_ENTRIES)
+        while len(self._entries) > max_entries or self.total_bytes > max_bytes:
+            _, (_, (evicted, _)) = self._entries.popitem(last=False)
+            self.total_bytes -= len(evicted)
+
+    def _remove(self, url: str) -> None:
+        entry = self._entries.pop(url, None)
+        if entry is not None:
+            self.total_bytes -= len(entry[1][0])
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.total_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RemoteImageFetcher:
+    """Pooled, bounded, caching downloader for provider-bound image URLs."""
+
+    def __init__(self) -> None:
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._cache = _FetchCache()
+        self._inflight: Dict[str, "asyncio.Task[FetchedImage]"] = {}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            concurrency = max(1, settings.REMOTE_IMAGE_FETCH_CONCURRENCY)
+            self._client = httpx.AsyncClient(
+                timeout=REMOTE_IMAGE_TIMEOUT,
+                follow_redirects=False,
+                limits=httpx.Limits(
+                    max_connections=concurrency,
+                    max_keepalive_connections=concurrency,
+                ),
+            )
+        return self._client
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(max(1, settings.REMOTE_IMAGE_FETCH_CONCURRENCY))
+        return self._semaphore
+
+    async def close(self) -> None:
+        """Close the pooled client (application shutdown)."""
+        client, self._client = self._client, None
+        if client is not None:
+            await client.aclose()
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
+
+    async def fetch(self, url: str) -> FetchedImage:
+        """Download ``url`` (or serve it from the cache).
+
+        Raises ``ValueError`` for a URL (or redirect target) the SSRF guard
+        refuses, more than ``MAX_REMOTE_IMAGE_REDIRECTS`` redirects or a body
+        over ``MAX_REMOTE_IMAGE_BYTES``, and ``httpx`` errors for transport/HTTP
+        failures. Failures are never cached.
+        """
+        if not is_safe_remote_url(url):
+            raise ValueError("Remote image URL is not fetchable by the provider boundary")
+
+        cached = self._cache.get(url)
+        if cached is not None:
+            return cached
+
+        task = self._inflight.get(url)
+        if task is None:
+            task = asyncio.create_task(self._download(url))
+            self._inflight[url] = task
+            task.add_done_callback(lambda done, u=url: self._on_downloaded(u, done))
+        # Shielded: one caller being cancelled must not cancel the download
+        # the other callers are waiting on.
+        return await asyncio.shield(task)
+
+    def _on_downloaded(self, url: str, task: "asyncio.Task[FetchedImage]") -> None:
+        if self._inflight.get(url) is task:
+            del self._inflight[url]
+        if task.cancelled() or task.exception() is not None:
+            return
+        self._cache.put(url, task.result())
+
+    async def _download(self, url: str) -> FetchedImage:
+        async with self._get_semaphore():
+            for _ in range(MAX_REMOTE_IMAGE_REDIRECTS + 1):
+                async with self._get_client().stream("GET", url) as response:
+                    if not response.is_redirect:
+                        return await self._read_body(response)
+                    url = urljoin(url, response.headers["location"])
+                if not is_safe_remote_url(url):
+                    raise ValueError("Remote image redirect is not fetchable by the provider boundary")
+        raise ValueError("Remote image exceeded the redirect limit")
+
+    @staticmethod
+    async def _read_body(response: httpx.Response) -> FetchedImage:
+        response.raise_for_status()
+        content_length = response.headers.get("content-length")
+        if content_length and int(content_length) > MAX_REMOTE_IMAGE_BYTES:
+            raise ValueError("Remote image exceeds provider size limit")
+        data = bytearray()
+        async for chunk in response.aiter_bytes():
+            data.extend(chunk)
+            if len(data) > MAX_REMOTE_IMAGE_BYTES:
+                raise ValueError("Remote image exceeds provider size limit")
+        content_type = response.headers.get("content-type", "").split(";", 1)[0].strip()
+        return bytes(data), content_type or None
+
+
+# Global singleton
+_fetcher = RemoteImageFetcher()
+
+
+def get_remote_image_fetcher() -> RemoteImageFetcher:
+    """Get the global remote image fetcher singleton."""
+    return _fetcher
@@ -242,40 +242,95 @@ class SocialImportJobStore:
         return rows[0] if rows else None
 
     @staticmethod
-    async def claim_next_queued_photo(
+    async def claim_queued_photos(
         db,
         *,
         job_id: str,
         user_id: str,
-    ) -> Optional[Dict[str, Any]]:
-        queued = await SocialImportJobStore.list_photos(
-            db,
-            job_id=job_id,
-            user_id=user_id,
-            statuses=[SocialImportPhotoStatus.QUEUED],
-            limit=1,
+        limit: int,
+    ) -> List[Dict[str, Any]]:
+        """Claim up to ``limit`` queued photos, lowest ordinal first.
+
+        One round trip through ``claim_social_import_photos`` (migration 043),
+        which flips the rows to processing under SKIP LOCKED so concurrent
+        runners never claim the same photo.
+        """
+        if limit <= 0:
+            return []
+        result = await asyncio.to_thread(
+            db.rpc(
+                "claim_social_import_photos",
+                {
+                    "p_job_id": job_id,
+                    "p_user_id": user_id,
+                    "p_limit": limit,
+                },
+            ).execute
         )
-        if not queued:
-            return None
+        rows = result.data or []
+        return sorted(rows, key=lambda row: row.get("ordinal") or 0)
 
-        candidate = queued[0]
+    @staticmethod
+    async def release_claimed_photos(
+        db,
+        *,
+        job_id: str,
+        user_id: str,
+        photo_ids: Iterable[str],
+    ) -> None:
+        """Return claimed-but-unstarted photos to the queue."""
+        ids = list(photo_ids)
+        if not ids:
+            return
+        await asyncio.to_thread(
+            db.table("social_import_photos")
+            .update(
+                {
+                    "status": SocialImportPhotoStatus.QUEUED.value,
+                    "processing_started_at": None,
+                    "updated_at": _utc_now_iso(),
+                }
+            )
+            .in_("id", ids)
+            .eq("job_id", job_id)
+            .eq("user_id", user_id)
+            .eq("status", SocialImportPhotoStatus.PROCESSING.value)
+            .execute
+        )
+
+    @staticmethod
+    async def requeue_processing_photos(
+        db,
+        *,
+        job_id: str,
+        user_id: str,
+        claimed_before: str,
+    ) -> int:
+        """Return the job's ``processing`` photos claimed before ``claimed_before``
+        to the queue.
+
+        For the start of a run: rows claimed that long ago belong to a run
+        that died before handing its claims back (OOM kill, SIGKILL on
+        deploy). The job lock is per process, so newer claims may be a live
+        runner's on another worker and are left alone. Returns the number
+        requeued.
+        """
         result = await asyncio.to_thread(
             db.table("social_import_photos")
             .update(
                 {
-                    "status": SocialImportPhotoStatus.PROCESSING.value,
-                    "processing_started_at": _utc_now_iso(),
+                    "status": SocialImportPhotoStatus.QUEUED.value,
+                    "processing_started_at": None,
                     "updated_at": _utc_now_iso(),
                 }
             )
-            .eq("id", candidate["id"])
             .eq("job_id", job_id)
             .eq("user_id", user_id)
-            .eq("status", SocialImportPhotoStatus.QUEUED.value)
+            .eq("status", SocialImportPhotoStatus.PROCESSING.value)
+            .lt("processing_started_at", claimed_before)
             .execute
         )
-        rows = result.data or []
-        return rows[0] if rows else None
+        return len(result.data or [])
 
     @staticmethod
     async def get_slots(
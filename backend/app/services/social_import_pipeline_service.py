@@ -6,13 +6,15 @@ from __future__ import annotations
 
 import asyncio
 import base64
-import httpx
+import time
 import uuid
-from app.utils.datetime_util import utcnow_iso
-from typing import Any, Dict, List, Optional
+from datetime import timedelta
+from app.utils.datetime_util import utcnow, utcnow_iso
+from typing import Any, Dict, List, Optional, Tuple
 
 from app.agents.image_generation_agent import get_image_generation_agent
 from app.agents.item_extraction_agent import get_item_extraction_agent
+from app.core.config import settings
 from app.core.exceptions import (
     SocialImportAuthRequiredError,
     SocialImportError,
@@ -31,7 +33,7 @@ from app.services.ai_settings_service import AISettingsService
 from app.services.social_auth_service import SocialAuthService
 from app.services.social_import_event_service import SocialImportEventService
 from app.services.social_import_job_store import SocialImportJobStore
-from app.services.social_scraper_service import SocialScraperService
+from app.services.social_scraper_service import SocialScraperService, scraper_session
 from app.services.storage_service import StorageService
 from app.services.vector_service import get_vector_service
 from app.utils.image_processing import resolve_product_reference_image
@@ -63,6 +65,12 @@ class SocialImportPipelineService:
     # exhaustion. One probe per delay keeps the job from grinding while still
     # resuming on its own once the provider recovers.
     CAPACITY_RETRY_DELAY_SECONDS = 300
+    # _run_queue orchestration: photos claimed per RPC once photos start
+    # failing, photos between job-row checkpoints, and the minimum spacing of
+    # coalesced counter syncs while photos are being processed.
+    QUEUE_CLAIM_BATCH_SIZE = 8
+    QUEUE_CHECKPOINT_INTERVAL_PHOTOS = 10
+    COUNTER_SYNC_INTERVAL_SECONDS = 2.0
 
     def __init__(self, *, user_id: str, db):
         self.user_id = user_id
@@ -71,6 +79,13 @@ class SocialImportPipelineService:
         # Agnes fallback both failed). Stops _run_queue from grinding through
         # every remaining photo. Per-instance == per-job run.
         self._capacity_exhausted = False
+        # Counter-sync coalescing state (see _sync_job_counters).
+        self._defer_counter_sync = False
+        self._counters_dirty = False
+        self._counters_synced_at = float("-inf")
+        # Photos _run_queue has claimed (status processing) but not started;
+        # _sync_job_counters does not count them as processed.
+        self._unstarted_claims: List[Dict[str, Any]] = []
 
     @classmethod
     def _job_lock(cls, job_id: str) -> asyncio.Lock:
@@ -152,7 +167,9 @@ class SocialImportPipelineService:
             user_id=self.user_id,
         )
         lock = self._job_lock(job_id)
-        async with lock:
+        # One ScraperSession per run: discovery pages and photo downloads
+        # reuse pooled connections instead of paying a handshake per request.
+        async with lock, scraper_session():
             job = await SocialImportJobStore.get_job(
                 self.db, job_id=job_id, user_id=self.user_id
             )
@@ -282,8 +299,7 @@ class SocialImportPipelineService:
         except (TypeError, ValueError):
             iteration_count = 0
 
-        while iteration_count < self.MAX_DISCOVERY_ITERATIONS:
-            iteration_count += 1
+        async def _fetch_page(page_cursor: Optional[str]) -> Tuple[Any, Any]:
             auth_session = await SocialAuthService.get_active_session(
                 self.db,
                 job_id=job_id,
@@ -294,7 +310,7 @@ class SocialImportPipelineService:
                     normalized_url=job["normalized_url"],
                     platform=SocialPlatform(job["platform"]),
                     auth_session=auth_session,
-                    cursor=cursor,
+                    cursor=page_cursor,
                 )
                 if discovered is None:
                     raise RuntimeError("Photo discovery returned no result")
@@ -339,175 +355,204 @@ class SocialImportPipelineService:
                 raise RuntimeError(
                     f"Photo discovery failed after retries: {discovery_error}"
                 )
+            return auth_session, result
 
-            await self._persist_scraper_session_from_payload(
-                job_id=job_id,
-                auth_session=auth_session,
-            )
+        # The next page is fetched while this one is being stored: its cursor
+        # is known as soon as the current page arrives, and the DB writes and
+        # events for a page are independent of the next fetch.
+        prefetch: Optional[asyncio.Task] = None
+        try:
+            while iteration_count < self.MAX_DISCOVERY_ITERATIONS:
+                iteration_count += 1
+                if prefetch is not None:
+                    auth_session, result = await prefetch
+                    prefetch = None
+                else:
+                    auth_session, result = await _fetch_page(cursor)
 
-            if result.requires_auth:
-                # Build auth required event with metadata
-                auth_metadata = result.metadata or {}
-                reason = auth_metadata.get("reason", "auth_required")
-                error_message = auth_metadata.get("message")
-                two_factor_identifier = auth_metadata.get("two_factor_identifier")
+                await self._persist_scraper_session_from_payload(
+                    job_id=job_id,
+                    auth_session=auth_session,
+                )
+
+                if result.requires_auth:
+                    # Build auth required event with metadata
+                    auth_metadata = result.metadata or {}
+                    reason = auth_metadata.get("reason", "auth_required")
+                    error_message = auth_metadata.get("message")
+                    two_factor_identifier = auth_metadata.get("two_factor_identifier")
+
+                    # Persist two-factor challenge state so OTP retries can resume login.
+                    session_payload = (auth_session or {}).get("session_payload") or {}
+                    if (
+                        two_factor_identifier
+                        and session_payload.get("username")
+                        and session_payload.get("password")
+                    ):
+                        try:
+                            await SocialAuthService.store_scraper_session(
+                                self.db,
+                                job_id=job_id,
+                                user_id=self.user_id,
+                                username=session_payload["username"],
+                                password=session_payload["password"],
+                                otp_code=session_payload.get("otp_code"),
+                                two_factor_identifier=two_factor_identifier,
+                                sessionid=session_payload.get("sessionid"),
+                                csrftoken=session_payload.get("csrftoken"),
+                                ds_user_id=session_payload.get("ds_user_id"),
+                            )
+                        except Exception as persist_error:
+                            logger.warning(
+                                "Failed to persist two-factor identifier",
+                                job_id=job_id,
+                                user_id=self.user_id,
+                                error=str(persist_error),
+                            )
+
+                    existing_metadata = dict(job_metadata)
+                    existing_metadata["discovery_iteration"] = iteration_count
+                    if cursor:
+                        existing_metadata["discovery_cursor"] = cursor
+                    else:
+                        existing_metadata.pop("discovery_cursor", None)
+                    existing_metadata.update(
+                        {
+                            "auth_reason": reason,
+                            "auth_message": error_message,
+                        }
+                    )
+                    if "two_factor_identifier" in auth_metadata:
+                        existing_metadata["two_factor_identifier"] = auth_metadata["two_factor_identifier"]
+                    else:
+                        existing_metadata.pop("two_factor_identifier", None)
+                    if "checkpoint_url" in auth_metadata:
+                        existing_metadata["checkpoint_url"] = auth_metadata["checkpoint_url"]
+                    else:
+                        existing_metadata.pop("checkpoint_url", None)
+
+                    await SocialImportJobStore.update_job(
+                        self.db,
+                        job_id=job_id,
+                        user_id=self.user_id,
+                        updates={
+                            "status": SocialImportJobStatus.AWAITING_AUTH.value,
+                            "auth_required": True,
+                            "error_message": error_message,
+                            "metadata": existing_metadata,
+                        },
+                    )
+
+                    event_payload = {
+                        "job_id": job_id,
+                        "status": SocialImportJobStatus.AWAITING_AUTH.value,
+                        "reason": reason,
+                        "message": error_message or "Login required to continue importing this profile",
+                    }
 
-                # Persist two-factor challenge state so OTP retries can resume login.
-                session_payload = (auth_session or {}).get("session_payload") or {}
+                    # Include additional metadata for specific auth flows
+                    if "two_factor_identifier" in auth_metadata:
+                        event_payload["two_factor_identifier"] = auth_metadata["two_factor_identifier"]
+                    if "checkpoint_url" in auth_metadata:
+                        event_payload["checkpoint_url"] = auth_metadata["checkpoint_url"]
+
+                    await self._publish_event(
+                        job_id,
+                        "auth_required",
+                        event_payload,
+                    )
+                    raise SocialImportAuthRequiredError()
+
+                discovery_metadata = result.metadata or {}
+                if discovery_metadata.get("error_type") in {
+                    "discovery_failure",
+                    "fetch_failure",
+                } or discovery_metadata.get("error"):
+                    failure_message = discovery_metadata.get("message") or discovery_metadata.get("error") or "Photo discovery failed"
+                    failure_metadata = dict(job_metadata)
+                    failure_metadata.update({
+                        "discovery_failure": True,
+                        "discovery_error": failure_message,
+                        "discovery_iteration": iteration_count,
+                    })
+                    await SocialImportJobStore.update_job(
+                        self.db,
+                        job_id=job_id,
+                        user_id=self.user_id,
+                        updates={
+                            "status": SocialImportJobStatus.FAILED.value,
+                            "error_message": failure_message,
+                            "metadata": failure_metadata,
+                        },
+                    )
+                    await self._publish_event(
+                        job_id,
+                        "job_failed",
+                        {"job_id": job_id, "error": failure_message, "retryable": True},
+                    )
+                    return
+
+                next_cursor = result.next_cursor
                 if (
-                    two_factor_identifier
-                    and session_payload.get("username")
-                    and session_payload.get("password")
+                    not result.exhausted
+                    and next_cursor
+                    and iteration_count < self.MAX_DISCOVERY_ITERATIONS
+                    and ordinal - 1 + len(result.photos) < self.MAX_DISCOVERY_PHOTOS
                 ):
-                    try:
-                        await SocialAuthService.store_scraper_session(
-                            self.db,
-                            job_id=job_id,
-                            user_id=self.user_id,
-                            username=session_payload["username"],
-                            password=session_payload["password"],
-                            otp_code=session_payload.get("otp_code"),
-                            two_factor_identifier=two_factor_identifier,
-                            sessionid=session_payload.get("sessionid"),
-                            csrftoken=session_payload.get("csrftoken"),
-                            ds_user_id=session_payload.get("ds_user_id"),
-                        )
-                    except Exception as persist_error:
-                        logger.warning(
-                            "Failed to persist two-factor identifier",
-                            job_id=job_id,
-                            user_id=self.user_id,
-                            error=str(persist_error),
-                        )
+                    prefetch = asyncio.create_task(_fetch_page(next_cursor))
 
-                existing_metadata = dict(job_metadata)
-                existing_metadata["discovery_iteration"] = iteration_count
-                if cursor:
-                    existing_metadata["discovery_cursor"] = cursor
-                else:
-                    existing_metadata.pop("discovery_cursor", None)
-                existing_metadata.update(
-                    {
-                        "auth_reason": reason,
-                        "auth_message": error_message,
-                    }
-                )
-                if "two_factor_identifier" in auth_metadata:
-                    existing_metadata["two_factor_identifier"] = auth_metadata["two_factor_identifier"]
-                else:
-                    existing_metadata.pop("two_factor_identifier", None)
-                if "checkpoint_url" in auth_metadata:
-                    existing_metadata["checkpoint_url"] = auth_metadata["checkpoint_url"]
-                else:
-                    existing_metadata.pop("checkpoint_url", None)
+                # Check if adding these photos would exceed the max limit
+                current_count = ordinal - 1
+                photos_to_add = result.photos
+                if current_count + len(photos_to_add) > self.MAX_DISCOVERY_PHOTOS:
+                    allowed_count = self.MAX_DISCOVERY_PHOTOS - current_count
+                    photos_to_add = photos_to_add[:allowed_count]
 
-                await SocialImportJobStore.update_job(
+                inserted = await SocialImportJobStore.add_discovered_photos(
                     self.db,
                     job_id=job_id,
                     user_id=self.user_id,
-                    updates={
-                        "status": SocialImportJobStatus.AWAITING_AUTH.value,
-                        "auth_required": True,
-                        "error_message": error_message,
-                        "metadata": existing_metadata,
-                    },
+                    start_ordinal=ordinal,
+                    photos=[photo.model_dump() for photo in photos_to_add],
                 )
+                ordinal += len(inserted)
 
-                event_payload = {
-                    "job_id": job_id,
-                    "status": SocialImportJobStatus.AWAITING_AUTH.value,
-                    "reason": reason,
-                    "message": error_message or "Login required to continue importing this profile",
-                }
+                # If we've hit the max photos limit, stop discovery
+                if ordinal > self.MAX_DISCOVERY_PHOTOS:
+                    break
 
-                # Include additional metadata for specific auth flows
-                if "two_factor_identifier" in auth_metadata:
-                    event_payload["two_factor_identifier"] = auth_metadata["two_factor_identifier"]
-                if "checkpoint_url" in auth_metadata:
-                    event_payload["checkpoint_url"] = auth_metadata["checkpoint_url"]
+                if inserted:
+                    await self._publish_event(
+                        job_id,
+                        "photo_discovered",
+                        {
+                            "job_id": job_id,
+                            "count": len(inserted),
+                            "discovered_photos": ordinal - 1,
+                        },
+                    )
 
-                await self._publish_event(
-                    job_id,
-                    "auth_required",
-                    event_payload,
-                )
-                raise SocialImportAuthRequiredError()
-
-            discovery_metadata = result.metadata or {}
-            if discovery_metadata.get("error_type") in {
-                "discovery_failure",
-                "fetch_failure",
-            } or discovery_metadata.get("error"):
-                failure_message = discovery_metadata.get("message") or discovery_metadata.get("error") or "Photo discovery failed"
-                failure_metadata = dict(job_metadata)
-                failure_metadata.update({
-                    "discovery_failure": True,
-                    "discovery_error": failure_message,
-                    "discovery_iteration": iteration_count,
-                })
+                if result.exhausted:
+                    break
+
+                cursor = next_cursor
+                if not cursor:
+                    break
+
+                job_metadata["discovery_cursor"] = cursor
+                job_metadata["discovery_iteration"] = iteration_count
                 await SocialImportJobStore.update_job(
                     self.db,
                     job_id=job_id,
                     user_id=self.user_id,
-                    updates={
-                        "status": SocialImportJobStatus.FAILED.value,
-                        "error_message": failure_message,
-                        "metadata": failure_metadata,
-                    },
-                )
-                await self._publish_event(
-                    job_id,
-                    "job_failed",
-                    {"job_id": job_id, "error": failure_message, "retryable": True},
+                    updates={"metadata": job_metadata},
                 )
-                return
-
-            # Check if adding these photos would exceed the max limit
-            current_count = ordinal - 1
-            photos_to_add = result.photos
-            if current_count + len(photos_to_add) > self.MAX_DISCOVERY_PHOTOS:
-                allowed_count = self.MAX_DISCOVERY_PHOTOS - current_count
-                photos_to_add = photos_to_add[:allowed_count]
-
-            inserted = await SocialImportJobStore.add_discovered_photos(
-                self.db,
-                job_id=job_id,
-                user_id=self.user_id,
-                start_ordinal=ordinal,
-                photos=[photo.model_dump() for photo in photos_to_add],
-            )
-            ordinal += len(inserted)
-
-            # If we've hit the max photos limit, stop discovery
-            if ordinal > self.MAX_DISCOVERY_PHOTOS:
-                break
-
-            if inserted:
-                await self._publish_event(
-                    job_id,
-                    "photo_discovered",
-                    {
-                        "job_id": job_id,
-                        "count": len(inserted),
-                        "discovered_photos": ordinal - 1,
-                    },
-                )
-
-            if result.exhausted:
-                break
-
-            cursor = result.next_cursor
-            if not cursor:
-                break
-
-            job_metadata["discovery_cursor"] = cursor
-            job_metadata["discovery_iteration"] = iteration_count
-            await SocialImportJobStore.update_job(
-                self.db,
-                job_id=job_id,
-                user_id=self.user_id,
-                updates={"metadata": job_metadata},
-            )
+        finally:
+            if prefetch is not None:
+                # Loop left early (limit reached, auth required, failure):
+                # the fetched-ahead page is not wanted.
+                prefetch.cancel()
+                await asyncio.gather(prefetch, return_exceptions=True)
 
         job_metadata.pop("discovery_cursor", None)
         job_metadata.pop("discovery_iteration", None)
@@ -534,6 +579,21 @@ class SocialImportPipelineService:
         )
 
     async def _run_queue(self, job_id: str) -> None:
+        """Pump queued photos until blocked on review/auth/limits or done.
+
+        The run holds the job lock, so nothing else in this process moves the
+        review slots while it pumps: the awaiting/buffered slots are tracked
+        locally from each photo's outcome instead of re-reading the job and
+        the slots per photo. For the same reason every photo still in
+        ``processing`` when the run starts was left by a run that died
+        mid-batch, and is put back in the queue first. Queued photos are
+        claimed in batches (one RPC), and the job row is re-read as a checkpoint every
+        ``QUEUE_CHECKPOINT_INTERVAL_PHOTOS`` photos - or right away after an
+        outcome the loop cannot account for locally (a rate-limit pause, an
+        unknown result) - to notice cancellation from another worker.
+        Counter syncs from ``_process_single_photo`` are coalesced (see
+        ``_sync_job_counters``) and flushed on every exit.
+        """
         await SocialImportJobStore.set_job_status(
             self.db,
             job_id=job_id,
@@ -541,100 +601,171 @@ class SocialImportPipelineService:
             status=SocialImportJobStatus.PROCESSING,
             error_message=None,
         )
-
-        # Keep pumping until we are blocked on user review/auth or completed.
-        while True:
-            if self._capacity_exhausted:
-                # Upstream AI capacity exhausted mid-run; don't claim more
-                # photos (each would just fail the same way). Leaving the job
-                # in `processing` with queued photos and no retry would strand
-                # it indefinitely, so schedule a bounded automatic retry.
-                await self._sync_job_counters(job_id)
-                # The task is strongly referenced (see _background_tasks) so it
-                # cannot be GC'd mid-sleep before the retry fires.
-                self._spawn_background(self._schedule_capacity_retry(job_id))
-                return
-            job = await SocialImportJobStore.get_job(
-                self.db, job_id=job_id, user_id=self.user_id
+        requeued = await SocialImportJobStore.requeue_processing_photos(
+            self.db,
+            job_id=job_id,
+            user_id=self.user_id,
+            claimed_before=(
+                utcnow() - timedelta(minutes=settings.SOCIAL_IMPORT_STALE_CLAIM_MINUTES)
+            ).isoformat(),
+        )
+        if requeued:
+            logger.info(
+                "Requeued stale social import claims",
+                job_id=job_id,
+                count=requeued,
             )
-            if not job:
-                return
 
-            if job.get("status") in {
-                SocialImportJobStatus.CANCELLED.value,
-                SocialImportJobStatus.FAILED.value,
-                SocialImportJobStatus.AWAITING_AUTH.value,
-                SocialImportJobStatus.PAUSED_RATE_LIMITED.value,
-            }:
-                return
+        claimed = self._unstarted_claims = []
+        awaiting: Optional[Dict[str, Any]] = None
+        buffered: Optional[Dict[str, Any]] = None
+        checkpoint_due = True
+        since_checkpoint = 0
+        claim_batch = 0
+        try:
+            # Keep pumping until we are blocked on user review/auth or completed.
+            while True:
+                if self._capacity_exhausted:
+                    # Upstream AI capacity exhausted mid-run; don't claim more
+                    # photos (each would just fail the same way). Leaving the job
+                    # in `processing` with queued photos and no retry would strand
+                    # it indefinitely, so schedule a bounded automatic retry.
+                    await self._sync_job_counters(job_id)
+                    # The task is strongly referenced (see _background_tasks) so it
+                    # cannot be GC'd mid-sleep before the retry fires.
+                    self._spawn_background(self._schedule_capacity_retry(job_id))
+                    return
 
-            slots = await SocialImportJobStore.get_slots(
-                self.db, job_id=job_id, user_id=self.user_id
-            )
-            awaiting = slots["awaiting"]
-            buffered = slots["buffered"]
-            processing = slots["processing"]
+                if checkpoint_due or since_checkpoint >= self.QUEUE_CHECKPOINT_INTERVAL_PHOTOS:
+                    job = await SocialImportJobStore.get_job(
+                        self.db, job_id=job_id, user_id=self.user_id
+                    )
+                    if not job:
+                        return
 
-            if processing:
-                await self._process_single_photo(job_id, processing)
-                continue
+                    if job.get("status") in {
+                        SocialImportJobStatus.CANCELLED.value,
+                        SocialImportJobStatus.FAILED.value,
+                        SocialImportJobStatus.AWAITING_AUTH.value,
+                        SocialImportJobStatus.PAUSED_RATE_LIMITED.value,
+                    }:
+                        return
 
-            if awaiting and buffered:
-                # Queue full: one awaiting, one preprocessed. Wait for user decision.
-                await self._sync_job_counters(job_id)
-                return
+                    if checkpoint_due:
+                        slots = await SocialImportJobStore.get_slots(
+                            self.db, job_id=job_id, user_id=self.user_id
+                        )
+                        awaiting = slots["awaiting"]
+                        buffered = slots["buffered"]
+                    checkpoint_due = False
+                    since_checkpoint = 0
+
+                if awaiting and buffered:
+                    # Queue full: one awaiting, one preprocessed. Wait for user decision.
+                    await self._sync_job_counters(job_id)
+                    return
+                else:
+                    if not awaiting and buffered:
+                        promoted = await SocialImportJobStore.update_photo(
+                            self.db,
+                            job_id=job_id,
+                            user_id=self.user_id,
+                            photo_id=buffered["id"],
+                            updates={
+                                "status": SocialImportPhotoStatus.AWAITING_REVIEW.value,
+                            },
+                        )
+                        promoted_full = await SocialImportJobStore.get_photo_with_items(
+                            self.db,
+                            job_id=job_id,
+                            photo=promoted,
+                            user_id=self.user_id,
+                        )
+                        await self._publish_event(
+                            job_id,
+                            "photo_ready_for_review",
+                            {"job_id": job_id, "photo": promoted_full},
+                        )
+                        awaiting = promoted or buffered
+                        buffered = None
+
+                    if not claimed:
+                        # Claim what the free review slots can absorb; once
+                        # photos start failing (no slot used), claim in full
+                        # batches.
+                        claimed.extend(
+                            await SocialImportJobStore.claim_queued_photos(
+                                self.db,
+                                job_id=job_id,
+                                user_id=self.user_id,
+                                limit=max(1 if awaiting else 2, claim_batch),
+                            )
+                        )
 
-            if not awaiting and buffered:
-                promoted = await SocialImportJobStore.update_photo(
-                    self.db,
-                    job_id=job_id,
-                    user_id=self.user_id,
-                    photo_id=buffered["id"],
-                    updates={
-                        "status": SocialImportPhotoStatus.AWAITING_REVIEW.value,
-                    },
-                )
-                promoted_full = await SocialImportJobStore.get_photo_with_items(
-                    self.db,
-                    job_id=job_id,
-                    photo=promoted,
-                    user_id=self.user_id,
-                )
-                await self._publish_event(
-                    job_id,
-                    "photo_ready_for_review",
-                    {"job_id": job_id, "photo": promoted_full},
-                )
-                awaiting = promoted
+                    if not claimed:
+                        done = await self._is_job_complete(job_id)
+                        if done:
+                            await self._complete_job(job_id)
+                            return
 
-            if not awaiting:
-                claimed = await SocialImportJobStore.claim_next_queued_photo(
-                    self.db,
-                    job_id=job_id,
-                    user_id=self.user_id,
-                )
-                if claimed:
-                    await self._process_single_photo(job_id, claimed)
-                    continue
+                        await self._sync_job_counters(job_id)
+                        return
 
-            if awaiting and not buffered:
-                # We can process one photo in background while user reviews current one.
-                claimed = await SocialImportJobStore.claim_next_queued_photo(
-                    self.db,
-                    job_id=job_id,
-                    user_id=self.user_id,
-                )
-                if claimed:
-                    await self._process_single_photo(job_id, claimed)
-                    continue
+                    photo = claimed.pop(0)
+                    outcome = await self._process_claimed_photo(job_id, photo, awaiting)
 
-            done = await self._is_job_complete(job_id)
-            if done:
-                await self._complete_job(job_id)
-                return
+                since_checkpoint += 1
+                if outcome == SocialImportPhotoStatus.AWAITING_REVIEW.value:
+                    awaiting = {**photo, "status": outcome}
+                elif outcome == SocialImportPhotoStatus.BUFFERED_READY.value:
+                    buffered = {**photo, "status": outcome}
+                elif outcome == SocialImportPhotoStatus.FAILED.value:
+                    claim_batch = self.QUEUE_CLAIM_BATCH_SIZE
+                else:
+                    # Put back in the queue (rate-limit pause) or unknown:
+                    # re-read the job and slots before going on.
+                    checkpoint_due = True
+        finally:
+            if claimed:
+                # Claimed but never started (queue filled up, pause, error):
+                # hand them back so the next run and the counters see them
+                # as queued rather than stuck in processing.
+                try:
+                    await SocialImportJobStore.release_claimed_photos(
+                        self.db,
+                        job_id=job_id,
+                        user_id=self.user_id,
+                        photo_ids=[p["id"] for p in claimed],
+                    )
+                    claimed.clear()
+                except Exception as release_err:
+                    logger.warning(
+                        "Failed to release claimed social import photos",
+                        job_id=job_id,
+                        count=len(claimed),
+                        error=str(release_err),
+                    )
+            if self._counters_dirty:
+                try:
+                    await self._sync_job_counters(job_id)
+                except Exception as sync_err:
+                    logger.warning(
+                        "Failed to flush social import counters",
+                        job_id=job_id,
+                        error=str(sync_err),
+                    )
 
-            await self._sync_job_counters(job_id)
-            return
+    async def _process_claimed_photo(
+        self, job_id: str, photo: Dict[str, Any], awaiting: Optional[Dict[str, Any]]
+    ) -> Optional[str]:
+        """``_process_single_photo`` with its counter syncs coalesced."""
+        self._defer_counter_sync = True
+        try:
+            return await self._process_single_photo(
+                job_id, photo, review_slot_taken=awaiting is not None
+            )
+        finally:
+            self._defer_counter_sync = False
 
     async def _check_rate_limit_with_pause(
         self, job_id: str, operation_type: str, count: int = 1
@@ -684,7 +815,18 @@ class SocialImportPipelineService:
             result["generation_error"] = generation_error
         return result
 
-    async def _process_single_photo(self, job_id: str, photo: Dict[str, Any]) -> None:
+    async def _process_single_photo(
+        self,
+        job_id: str,
+        photo: Dict[str, Any],
+        review_slot_taken: Optional[bool] = None,
+    ) -> str:
+        """Extract + generate one claimed photo; returns its resulting status.
+
+        ``review_slot_taken`` is the caller's knowledge of whether a photo is
+        already awaiting review (it decides awaiting vs buffered); ``None``
+        reads the slots from the DB.
+        """
         photo_id = photo["id"]
         # Set before the try so the except handler can safely test them: the
         # extraction reservation is only released when it was made but never
@@ -710,7 +852,7 @@ class SocialImportPipelineService:
                     photo_id=photo_id,
                     updates={"status": SocialImportPhotoStatus.QUEUED.value},
                 )
-                return
+                return SocialImportPhotoStatus.QUEUED.value
             # The reservation above is only consumed by an actual provider
             # call. If the pre-extraction fetch/setup fails, the outer handler
             # releases it again so the daily slot is not burned on a photo
@@ -751,7 +893,7 @@ class SocialImportPipelineService:
                     },
                 )
                 await self._sync_job_counters(job_id)
-                return
+                return SocialImportPhotoStatus.FAILED.value
 
             # Persist the source photo once and attach to every item extracted
             # from it, so the image generator can reproduce the exact garment.
@@ -797,7 +939,7 @@ class SocialImportPipelineService:
                     photo_id=photo_id,
                     updates={"status": SocialImportPhotoStatus.QUEUED.value},
                 )
-                return
+                return SocialImportPhotoStatus.QUEUED.value
 
             generation_agent = await get_image_generation_agent(
                 user_id=self.user_id, db=self.db
@@ -805,11 +947,16 @@ class SocialImportPipelineService:
             processed_items: List[Dict[str, Any]] = []
             generation_success_count = 0
 
-            # Cache the source-photo download by URL: every item on a photo
-            # shares the same source_image_url, so fetch it once instead of
-            # re-GETting the multi-MB JPEG per item. (Items carrying their own
-            # distinct URL are still fetched once each.)
-            source_photo_cache: Dict[str, Optional[str]] = {}
+            # Download each distinct source photo once, up front and
+            # concurrently (bounded by the scraper session): every item on a
+            # photo usually shares the same source_image_url, and items that
+            # carry their own URL no longer wait on each other's downloads.
+            # A failed optional reference download (blocked host, 4xx/5xx,
+            # timeout, network error) maps to None and degrades that item to
+            # text-only generation; it must not fail the whole photo.
+            source_photo_cache = await SocialScraperService.fetch_photos_as_base64(
+                [item["source_image_url"] for item in raw_items if item.get("source_image_url")]
+            )
             for item in raw_items:
                 temp_id = item.get("temp_id") or f"item-{uuid.uuid4().hex[:8]}"
                 item_description = (
@@ -823,14 +970,6 @@ class SocialImportPipelineService:
                 # then decides whether to use this full photo as-is, crop it to
                 # the item's bbox, or drop it entirely - see that function for why.
                 src_url = item.get("source_image_url")
-                if src_url and src_url not in source_photo_cache:
-                    try:
-                        source_photo_cache[src_url] = await SocialScraperService.fetch_photo_as_base64(src_url)
-                    except (SocialImportError, httpx.HTTPStatusError, httpx.RequestError):
-                        # A failed optional reference download (4xx/5xx,
-                        # timeout, network error) degrades to text-only
-                        # generation; it must not fail the whole photo.
-                        source_photo_cache[src_url] = None
                 reference_image_base64: Optional[str] = (
                     source_photo_cache.get(src_url) if src_url else None
                 )
@@ -869,12 +1008,12 @@ class SocialImportPipelineService:
                         reference_image=reference_image_base64,
                     )
 
-                    image_bytes = base64.b64decode(generated.image_base64)
                     uploaded = await StorageService.upload_temp_generated_image(
                         db=self.db,
                         user_id=self.user_id,
-                        file_data=image_bytes,
+                        file_data=generated.image.data,
                         source="social-import",
+                        storage_ready=generated.storage_ready,
                     )
                     generation_success_count += 1
                     processed_items.append(
@@ -928,12 +1067,14 @@ class SocialImportPipelineService:
                 items=processed_items,
             )
 
-            slots = await SocialImportJobStore.get_slots(
-                self.db, job_id=job_id, user_id=self.user_id
-            )
+            if review_slot_taken is None:
+                slots = await SocialImportJobStore.get_slots(
+                    self.db, job_id=job_id, user_id=self.user_id
+                )
+                review_slot_taken = bool(slots["awaiting"])
             target_status = (
                 SocialImportPhotoStatus.BUFFERED_READY
-                if slots["awaiting"]
+                if review_slot_taken
                 else SocialImportPhotoStatus.AWAITING_REVIEW
             )
 
@@ -966,6 +1107,7 @@ class SocialImportPipelineService:
                 {"job_id": job_id, "photo": updated_photo},
             )
             await self._sync_job_counters(job_id)
+            return target_status.value
 
         except Exception as e:
             error_kind = getattr(e, "error_kind", None)
@@ -1033,6 +1175,7 @@ class SocialImportPipelineService:
                 },
             )
             await self._sync_job_counters(job_id)
+            return SocialImportPhotoStatus.FAILED.value
 
     async def approve_photo(self, job_id: str, photo_id: str) -> Dict[str, Any]:
         lock = self._job_lock(job_id)
@@ -1463,16 +1606,36 @@ class SocialImportPipelineService:
         )
 
     async def _sync_job_counters(self, job_id: str) -> None:
+        """Recount the job's photos into its counters and publish them.
+
+        Each sync lists every photo of the job. While ``_run_queue`` is
+        processing a photo the calls are coalesced: at most one per
+        ``COUNTER_SYNC_INTERVAL_SECONDS``, the rest only mark the counters
+        dirty for the flush when the loop exits.
+        """
+        if self._defer_counter_sync:
+            self._counters_dirty = True
+            if time.monotonic() - self._counters_synced_at < self.COUNTER_SYNC_INTERVAL_SECONDS:
+                return
+        self._counters_dirty = False
+        self._counters_synced_at = time.monotonic()
         counts = await SocialImportJobStore.count_by_status(
             self.db, job_id=job_id, user_id=self.user_id
         )
+        # Batch claims flip photos to processing before they start; only the
+        # ones actually being worked on count as processed.
+        started = max(
+            0,
+            counts.get(SocialImportPhotoStatus.PROCESSING.value, 0)
+            - len(self._unstarted_claims),
+        )
         total_processed = (
             counts.get(SocialImportPhotoStatus.AWAITING_REVIEW.value, 0)
             + counts.get(SocialImportPhotoStatus.BUFFERED_READY.value, 0)
             + counts.get(SocialImportPhotoStatus.APPROVED.value, 0)
             + counts.get(SocialImportPhotoStatus.REJECTED.value, 0)
             + counts.get(SocialImportPhotoStatus.FAILED.value, 0)
-            + counts.get(SocialImportPhotoStatus.PROCESSING.value, 0)
+            + started
         )
 
         await SocialImportJobStore.update_job(
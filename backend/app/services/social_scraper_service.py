@@ -15,9 +15,12 @@ import logging
 import re
 import socket
 import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass
 from html import unescape
-from typing import Dict, List, Optional, Tuple
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 from urllib.parse import quote, urlencode, urljoin, urlparse
 
 import httpcore
@@ -26,6 +29,7 @@ import httpx
 from app.core.config import settings
 from app.core.exceptions import SocialImportError
 from app.models.social_import import DiscoverPhotosResult, ScrapedPhotoRef, SocialPlatform
+from app.utils.parallel import parallel_map_settled
 
 
 class _PinnedAddressNetworkBackend(httpcore.AsyncNetworkBackend):
@@ -94,6 +98,169 @@ class _PinnedAddressHTTPTransport(httpx.AsyncHTTPTransport):
         )
 
 
+class ScraperSession:
+    """HTTP state shared by every scraper call made for one import job.
+
+    Without a session each discovery page and each image hop opened its own
+    ``httpx.AsyncClient``, so a 2000-photo import paid a fresh TCP + TLS
+    handshake (and a DNS lookup) for nearly every request. A session keeps:
+
+    - one pooled client for profile pages and the Meta Graph API;
+    - one pooled client per validated ``(hostname, address)`` pair for image
+      downloads. The transport stays pinned to the address that passed the
+      SSRF check, so reusing it never connects anywhere unvalidated. Idle
+      clients beyond ``MAX_IMAGE_CLIENTS`` are closed least-recently-used
+      first; a client with a download in flight is never evicted;
+    - validated DNS resolutions for ``RESOLUTION_TTL_SECONDS``. Rebinding is
+      still harmless: the connection goes to the cached, already-validated
+      address, never to a fresh lookup;
+    - the profile HTML of the static scrape, which paginates by offset into
+      one document, so later pages reuse the first fetch instead of
+      downloading the same page again.
+
+    Bound to the running task by :func:`scraper_session`; scraper methods
+    pick it up from there, and without one they behave exactly as before.
+    """
+
+    MAX_IMAGE_CLIENTS = 16
+    MAX_CACHED_PAGES = 4
+    RESOLUTION_TTL_SECONDS = 60.0
+
+    def __init__(self, download_concurrency: Optional[int] = None) -> None:
+        if download_concurrency is None:
+            download_concurrency = settings.SOCIAL_IMPORT_DOWNLOAD_CONCURRENCY
+        self.download_concurrency = max(1, download_concurrency)
+        self.closed = False
+        self._web_client: Optional[httpx.AsyncClient] = None
+        self._image_clients: "OrderedDict[Tuple[str, str], httpx.AsyncClient]" = OrderedDict()
+        self._image_leases: Dict[Tuple[str, str], int] = {}
+        self._resolutions: Dict[Tuple[str, int], Tuple[float, str]] = {}
+        self._pages: "OrderedDict[Tuple[str, Optional[str]], Tuple[int, str]]" = OrderedDict()
+
+    def web_client(self) -> httpx.AsyncClient:
+        if self._web_client is None:
+            self._web_client = httpx.AsyncClient(timeout=20.0, follow_redirects=True)
+        return self._web_client
+
+    @asynccontextmanager
+    async def image_client(self, hostname: str, address: str) -> AsyncIterator[httpx.AsyncClient]:
+        key = (hostname, address)
+        client = self._image_clients.get(key)
+        if client is None:
+            client = _new_image_client(hostname, address)
+            self._image_clients[key] = client
+        self._image_clients.move_to_end(key)
+        self._image_leases[key] = self._image_leases.get(key, 0) + 1
+        try:
+            yield client
+        finally:
+            self._image_leases[key] -= 1
+            if not self._image_leases[key]:
+                del self._image_leases[key]
+            await self._evict_idle_image_clients()
+
+    async def _evict_idle_image_clients(self) -> None:
+        for key in list(self._image_clients):
+            if len(self._image_clients) <= self.MAX_IMAGE_CLIENTS:
+                return
+            if key not in self._image_leases:
+                client = self._image_clients.pop(key, None)
+                if client is not None:
+                    await client.aclose()
+
+    def cached_resolution(self, hostname: str, port: int) -> Optional[str]:
+        hit = self._resolutions.get((hostname, port))
+        if hit is None:
+            return None
+        expires_at, address = hit
+        if time.monotonic() >= expires_at:
+            del self._resolutions[(hostname, port)]
+            return None
+        return address
+
+    def remember_resolution(self, hostname: str, port: int, address: str) -> None:
+        self._resolutions[(hostname, port)] = (time.monotonic() + self.RESOLUTION_TTL_SECONDS, address)
+
+    def cached_page(self, url: str, cookie: Optional[str]) -> Optional[Tuple[int, str]]:
+        return self._pages.get((url, cookie))
+
+    def remember_page(self, url: str, cookie: Optional[str], status_code: int, html: str) -> None:
+        self._pages[(url, cookie)] = (status_code, html)
+        self._pages.move_to_end((url, cookie))
+        while len(self._pages) > self.MAX_CACHED_PAGES:
+            self._pages.popitem(last=False)
+
+    async def aclose(self) -> None:
+        self.closed = True
+        clients = list(self._image_clients.values())
+        if self._web_client is not None:
+            clients.append(self._web_client)
+        self._web_client = None
+        self._image_clients.clear()
+        self._image_leases.clear()
+        self._resolutions.clear()
+        self._pages.clear()
+        for client in clients:
+            await client.aclose()
+
+
+_current_session: ContextVar[Optional[ScraperSession]] = ContextVar(
+    "social_scraper_session", default=None
+)
+
+
+@asynccontextmanager
+async def scraper_session(download_concurrency: Optional[int] = None) -> AsyncIterator[ScraperSession]:
+    """Open a :class:`ScraperSession` and bind it to the current task.
+
+    Tasks created inside the block (prefetches, download workers) inherit it.
+    The session is closed on exit; a task that outlives the block sees a
+    closed session and falls back to one-shot clients.
+    """
+    session = ScraperSession(download_concurrency)
+    token = _current_session.set(session)
+    try:
+        yield session
+    finally:
+        _current_session.reset(token)
+        await session.aclose()
+
+
+def _active_session() -> Optional[ScraperSession]:
+    session = _current_session.get()
+    return None if session is None or session.closed else session
+
+
+def _new_image_client(hostname: str, address: str) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        timeout=30.0,
+        follow_redirects=False,
+        transport=_PinnedAddressHTTPTransport(hostname, address),
+    )
+
+
+@asynccontextmanager
+async def _web_client() -> AsyncIterator[httpx.AsyncClient]:
+    """The session's shared client, or a one-shot client closed on exit."""
+    session = _active_session()
+    if session is not None:
+        yield session.web_client()
+        return
+    async with httpx.AsyncClient(timeout=20.0, follow_redirects=True) as client:
+        yield client
+
+
+@asynccontextmanager
+async def _image_client(hostname: str, address: str) -> AsyncIterator[httpx.AsyncClient]:
+    session = _active_session()
+    if session is not None:
+        async with session.image_client(hostname, address) as client:
+            yield client
+        return
+    async with _new_image_client(hostname, address) as client:
+        yield client
+
+
 @dataclass
 class InstagramLoginResult:
     """Result of Instagram login attempt."""
@@ -147,6 +314,10 @@ class SocialScraperService:
         reserved, unspecified, documentation, and RFC 6598 shared-address
         space (``100.64.0.0/10``), which a denylist of individual flags
         misses.
+
+        Within a :class:`ScraperSession` a host that passed recently is
+        answered from the session's resolution cache; the URL itself is
+        still checked every time.
         """
         parsed = urlparse(image_url)
         if parsed.scheme not in {"http", "https"} or not parsed.hostname:
@@ -154,11 +325,18 @@ class SocialScraperService:
         if parsed.username or parsed.password:
             raise SocialImportError("Imported image URL cannot contain credentials")
 
+        port = parsed.port or (443 if parsed.scheme == "https" else 80)
+        session = _active_session()
+        if session is not None:
+            cached = session.cached_resolution(parsed.hostname, port)
+            if cached is not None:
+                return parsed.hostname, cached
+
         try:
             addresses = await asyncio.to_thread(
                 socket.getaddrinfo,
                 parsed.hostname,
-                parsed.port or (443 if parsed.scheme == "https" else 80),
+                port,
                 type=socket.SOCK_STREAM,
             )
         except (OSError, ValueError) as exc:
@@ -171,7 +349,10 @@ class SocialScraperService:
             ip = ipaddress.ip_address(address[4][0])
             if not ip.is_global:
                 raise SocialImportError("Imported image host is private or blocked")
-        return parsed.hostname, addresses[0][4][0]
+        address = addresses[0][4][0]
+        if session is not None:
+            session.remember_resolution(parsed.hostname, port, address)
+        return parsed.hostname, address
 
     @classmethod
     async def _instagram_login(
@@ -520,21 +701,18 @@ class SocialScraperService:
     ) -> Optional[str]:
         """Get Instagram user ID from profile page."""
         try:
-            async with httpx.AsyncClient(
-                timeout=20.0,
-                follow_redirects=True,
-                headers={
-                    "User-Agent": (
-                        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                        "AppleWebKit/537.36 (KHTML, like Gecko) "
-                        "Chrome/122.0.0.0 Safari/537.36"
-                    ),
-                    "Cookie": f"sessionid={sessionid}; csrftoken={csrftoken}",
-                    "X-CSRFToken": csrftoken,
-                    "X-IG-App-ID": cls._INSTAGRAM_APP_ID,
-                },
-            ) as client:
-                response = await client.get(f"{cls._INSTAGRAM_BASE}/{username}/")
+            headers = {
+                "User-Agent": (
+                    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+                    "AppleWebKit/537.36 (KHTML, like Gecko) "
+                    "Chrome/122.0.0.0 Safari/537.36"
+                ),
+                "Cookie": f"sessionid={sessionid}; csrftoken={csrftoken}",
+                "X-CSRFToken": csrftoken,
+                "X-IG-App-ID": cls._INSTAGRAM_APP_ID,
+            }
+            async with _web_client() as client:
+                response = await client.get(f"{cls._INSTAGRAM_BASE}/{username}/", headers=headers)
 
                 # Try to extract user ID from HTML
                 # Look for "profile_id" or user ID in embedded JSON
@@ -581,29 +759,26 @@ class SocialScraperService:
             if cursor:
                 params["max_id"] = cursor
 
-            async with httpx.AsyncClient(
-                timeout=20.0,
-                follow_redirects=True,
-                headers={
-                    "User-Agent": (
-                        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                        "AppleWebKit/537.36 (KHTML, like Gecko) "
-                        "Chrome/122.0.0.0 Safari/537.36"
-                    ),
-                    "Accept": "*/*",
-                    "Accept-Language": "en-US,en;q=0.9",
-                    "Cookie": f"sessionid={sessionid}; csrftoken={csrftoken}; ds_user_id={ds_user_id}",
-                    "X-CSRFToken": csrftoken,
-                    "X-IG-App-ID": cls._INSTAGRAM_APP_ID,
-                    "X-Requested-With": "XMLHttpRequest",
-                    "Referer": f"{cls._INSTAGRAM_BASE}/",
-                },
-            ) as client:
+            headers = {
+                "User-Agent": (
+                    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+                    "AppleWebKit/537.36 (KHTML, like Gecko) "
+                    "Chrome/122.0.0.0 Safari/537.36"
+                ),
+                "Accept": "*/*",
+                "Accept-Language": "en-US,en;q=0.9",
+                "Cookie": f"sessionid={sessionid}; csrftoken={csrftoken}; ds_user_id={ds_user_id}",
+                "X-CSRFToken": csrftoken,
+                "X-IG-App-ID": cls._INSTAGRAM_APP_ID,
+                "X-Requested-With": "XMLHttpRequest",
+                "Referer": f"{cls._INSTAGRAM_BASE}/",
+            }
+            async with _web_client() as client:
                 url = f"{cls._INSTAGRAM_BASE}/api/v1/feed/user/{ds_user_id}/"
                 if params:  # pragma: no cover - params always contains "count", so never empty
                     url += "?" + urlencode(params)
 
-                response = await client.get(url)
+                response = await client.get(url, headers=headers)
 
                 if response.status_code == 401:
                     # Session expired or invalid
@@ -912,7 +1087,7 @@ class SocialScraperService:
             params["after"] = cursor
 
         try:
-            async with httpx.AsyncClient(timeout=20.0, follow_redirects=True) as client:
+            async with _web_client() as client:
                 response = await client.get(f"{cls._META_GRAPH_BASE}/{ig_user_id}/media", params=params)
         except httpx.HTTPStatusError as e:
             cls._logger.warning(
@@ -1032,7 +1207,7 @@ class SocialScraperService:
             params["after"] = cursor
 
         try:
-            async with httpx.AsyncClient(timeout=20.0, follow_redirects=True) as client:
+            async with _web_client() as client:
                 response = await client.get(f"{cls._META_GRAPH_BASE}/me/posts", params=params)
         except httpx.HTTPStatusError as e:
             cls._logger.warning(
@@ -1220,34 +1395,42 @@ class SocialScraperService:
 
         headers = cls._build_headers(auth_session)
 
-        try:
-            async with httpx.AsyncClient(timeout=20.0, follow_redirects=True) as client:
-                response = await client.get(normalized_url, headers=headers)
-                html = response.text or ""
-        except httpx.RequestError as e:
-            cls._logger.warning(
-                "Social profile discovery request failed",
-                extra={"error": str(e), "platform": platform.value},
-                exc_info=True,
-            )
-            return DiscoverPhotosResult(
-                requires_auth=False,
-                photos=[],
-                next_cursor=None,
-                exhausted=False,
-                metadata={"error_type": "fetch_failure", "message": str(e)},
-            )
+        # Every offset page slices the same profile document: within a
+        # ScraperSession, fetch it once per job instead of once per page.
+        session = _active_session()
+        page = session.cached_page(normalized_url, headers.get("Cookie")) if session else None
+        if page is None:
+            try:
+                async with _web_client() as client:
+                    response = await client.get(normalized_url, headers=headers)
+                    page = (response.status_code, response.text or "")
+            except httpx.RequestError as e:
+                cls._logger.warning(
+                    "Social profile discovery request failed",
+                    extra={"error": str(e), "platform": platform.value},
+                    exc_info=True,
+                )
+                return DiscoverPhotosResult(
+                    requires_auth=False,
+                    photos=[],
+                    next_cursor=None,
+                    exhausted=False,
+                    metadata={"error_type": "fetch_failure", "message": str(e)},
+                )
+            if session is not None and page[0] < 400:
+                session.remember_page(normalized_url, headers.get("Cookie"), *page)
+        status_code, html = page
 
-        if response.status_code in (401, 403):
+        if status_code in (401, 403):
             return DiscoverPhotosResult(
                 requires_auth=True,
                 photos=[],
                 next_cursor=None,
                 exhausted=True,
-                metadata={"http_status": response.status_code},
+                metadata={"http_status": status_code},
             )
 
-        if response.status_code >= 400:
+        if status_code >= 400:
             return DiscoverPhotosResult(
                 requires_auth=False,
                 photos=[],
@@ -1255,8 +1438,8 @@ class SocialScraperService:
                 exhausted=False,
                 metadata={
                     "error_type": "fetch_failure",
-                    "message": f"Social profile returned HTTP {response.status_code}",
-                    "http_status": response.status_code,
+                    "message": f"Social profile returned HTTP {status_code}",
+                    "http_status": status_code,
                 },
             )
 
@@ -1320,12 +1503,7 @@ class SocialScraperService:
             # and the connection cannot redirect the request to a private
             # host.
             hostname, address = await SocialScraperService._resolve_remote_image_endpoint(current_url)
-            transport = _PinnedAddressHTTPTransport(hostname, address)
-            async with httpx.AsyncClient(
-                timeout=30.0,
-                follow_redirects=False,
-                transport=transport,
-            ) as client:
+            async with _image_client(hostname, address) as client:
                 async with client.stream("GET", current_url) as response:
                     if response.status_code in {301, 302, 303, 307, 308}:
                         location = response.headers.get("location")
@@ -1353,3 +1531,34 @@ class SocialScraperService:
                     return base64.b64encode(bytes(content)).decode("utf-8")
 
         raise SocialImportError("Imported image redirect chain is invalid")
+
+    @classmethod
+    async def fetch_photos_as_base64(cls, photo_urls: List[str]) -> Dict[str, Optional[str]]:
+        """Download several images concurrently, keyed by URL.
+
+        Duplicates are fetched once. At most ``SOCIAL_IMPORT_DOWNLOAD_CONCURRENCY``
+        (or the active session's limit) are in flight. A URL that is blocked,
+        answers 4xx/5xx or fails in transport maps to ``None``; any other
+        error propagates.
+        """
+        unique_urls = list(dict.fromkeys(photo_urls))
+        session = _active_session()
+        concurrency = (
+            session.download_concurrency
+            if session is not None
+            else max(1, settings.SOCIAL_IMPORT_DOWNLOAD_CONCURRENCY)
+        )
+        results = await parallel_map_settled(
+            unique_urls,
+            lambda url: cls.fetch_photo_as_base64(url),
+            concurrency=concurrency,
+        )
+        downloaded: Dict[str, Optional[str]] = {}
+        for url, result in zip(unique_urls, results):
+            if result.success:
+                downloaded[url] = result.data
+            elif isinstance(result.error, (SocialImportError, httpx.HTTPStatusError, httpx.RequestError)):
+                downloaded[url] = None
+            else:
+                raise result.error
+        return downloaded
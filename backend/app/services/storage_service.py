@@ -37,9 +37,10 @@ from app.utils.image_processing import (
     downscale_image_bytes_to_webp,
     sniff_image_mime,
     sniff_image_mime_from_magic,
-    transcode_to_webp,
     validate_image_bytes,
 )
+from app.utils.image_hash import hash_to_hex
+from app.utils.image_pipeline import Renditions, build_renditions, hash_image_bytes
 from app.core.image_executor import run_image_op
 from app.core.storage_keys import USER_ID_SEGMENT_RE, normalize_preview_key
 from app.services.object_storage import (
@@ -121,13 +122,19 @@ THUMB_CONTENT_TYPE = "image/webp"
 # keys themselves must never re-derive.
 THUMB_CATEGORIES = frozenset({"items", "outfits", "avatars", "sources", "feedback"})
 
+# Avatars also get a prepared AI-reference sibling (``{stem}_ref_v{N}.jpg``,
+# written on first use by avatar_reference_service). Bump the version when
+# the derivative encoding changes so stale derivatives stop being read.
+AVATAR_REFERENCE_VERSION = 1
+
 
 def _with_thumb_siblings(storage_paths: Iterable[str]) -> List[str]:
     """Return ``storage_paths`` in order, each followed by its ``_thumb`` sibling.
 
     Every path that leaves this service for a delete or a cleanup sweep must carry
     its derived thumbnail, or the `_thumb` object orphans in the bucket (thumbs are
-    never DB-referenced, so nothing else will ever find it again). Shared by the
+    never DB-referenced, so nothing else will ever find it again). Avatars also
+    carry their prepared ``_ref_v`` reference. Shared by the
     batch-delete and account-deletion paths so the two cannot drift.
 
     Falsy paths are dropped and the result is deduped. Membership is tested against
@@ -145,10 +152,13 @@ def _with_thumb_siblings(storage_paths: Iterable[str]) -> List[str]:
         path = normalize_preview_key(path)
         seen.add(path)
         expanded.append(path)
-        thumb_key = StorageService.thumb_key_for(path)
-        if thumb_key and thumb_key not in seen:
-            seen.add(thumb_key)
-            expanded.append(thumb_key)
+        for derived in (
+            StorageService.thumb_key_for(path),
+            StorageService.avatar_reference_key_for(path),
+        ):
+            if derived and derived not in seen:
+                seen.add(derived)
+                expanded.append(derived)
     return expanded
 
 
@@ -205,11 +215,36 @@ class StorageService:
         parts[-1] = f"{stem}_thumb{THUMB_EXTENSION}"
         return "/".join(parts)
 
+    @staticmethod
+    def avatar_reference_key_for(storage_path: str) -> Optional[str]:
+        """Derive the prepared-reference object key for an avatar ``storage_path``.
+
+        The provider-ready avatar derivative (see avatar_reference_service)
+        lives next to the original as ``{stem}_ref_v{N}.jpg`` (e.g.
+        ``u/avatars/abc.webp`` -> ``u/avatars/abc_ref_v1.jpg``). Returns None
+        for anything that is not a canonical avatar key, including thumb and
+        reference keys themselves.
+        """
+        if not storage_path:
+            return None
+        parts = storage_path.split("/")
+        if len(parts) != 3 or parts[1] != "avatars":
+            return None
+        name = parts[-1]
+        if "_thumb" in name or "_ref_v" in name:
+            return None
+        stem, dot, _ext = name.rpartition(".")
+        if not dot or not stem:
+            return None
+        parts[-1] = f"{stem}_ref_v{AVATAR_REFERENCE_VERSION}.jpg"
+        return "/".join(parts)
+
     @staticmethod
     async def _upload_thumbnail(
         backend,
         storage_path: str,
         file_data: bytes,
+        thumbnail: Optional[bytes] = None,
     ) -> bool:
         """Create the ``_thumb`` sibling object for an uploaded image.
 
@@ -219,7 +254,9 @@ class StorageService:
         is canonical so that, once ops has flipped ``THUMBNAILS_BACKFILLED``,
         the read path can emit ``thumbnail_url`` without per-object existence
         checks. CPU-bound Pillow work runs on the bounded image executor.
-        Returns True when the thumb object was written.
+        Returns True when the thumb object was written. Upload paths pass the
+        ``thumbnail`` their single-pass ``_storage_renditions`` call already
+        produced, so ``file_data`` is only decoded again when none was given.
 
         Always WebP, always ``image/webp`` (see THUMB_EXTENSION): transparency
         survives, and the key/bytes/Content-Type cannot disagree.
@@ -244,9 +281,11 @@ class StorageService:
         if not thumb_key:
             return False
         try:
-            thumb = await run_image_op(
-                downscale_image_bytes_to_webp, file_data, THUMB_MAX_EDGE, THUMB_QUALITY
-            )
+            thumb = thumbnail
+            if thumb is None:
+                thumb = await run_image_op(
+                    downscale_image_bytes_to_webp, file_data, THUMB_MAX_EDGE, THUMB_QUALITY
+                )
             if thumb is None:
                 logger.warning(
                     "Could not encode thumbnail; serving full-size for this object",
@@ -335,56 +374,68 @@ class StorageService:
             ) from error
 
     @staticmethod
-    def _normalize_upload_bytes(file_data: bytes) -> bytes:
-        """Normalize accepted upload bytes to the storage compression profile.
+    def _storage_renditions(
+        file_data: bytes,
+        *,
+        thumbnail: bool = True,
+        matte: bool = False,
+    ) -> Renditions:
+        """Storage-profile main rendition (and ``_thumb`` bytes) from ONE decode.
 
         Runs after ``_validate_image`` and before ``_sniff_content_type``, so the
         sniff then resolves the (possibly new WebP) bytes to ``image/webp`` and
         the key/content-type are minted as ``.webp`` / ``image/webp``.
 
-        Two steps, every stored image goes through both:
-          1. HEIC/HEIF, BMP and TIFF are accepted at the boundary but browsers
-             cannot render them, so they are transcoded to browser-safe WebP.
-          2. Storage compression: downscale to ``STORAGE_MAX_EDGE`` (2048px)
-             and re-encode as WebP at ``STORAGE_QUALITY`` (82). Web-native
-             formats (JPEG/PNG/WebP/AVIF) are NOT passed through anymore — a
-             10MB phone photo is stored as a ~200-400KB WebP with no visible
-             loss at display sizes. Keep-smaller: when the WebP output is not
-             smaller than the input, the original bytes are kept (a small PNG
-             logo or an already-compressed WebP is not inflated). Animated
-             GIFs pass through untouched (Pillow would flatten them to a
-             single frame). Alpha survives (WebP), so background-removed
-             cutouts stay transparent.
+        The main rendition follows the storage compression profile:
+          - HEIC/HEIF, BMP and TIFF are accepted at the boundary but browsers
+            cannot render them, so they are always re-encoded to WebP.
+          - Everything else is downscaled to ``STORAGE_MAX_EDGE`` (2048px) and
+            re-encoded as WebP at ``STORAGE_QUALITY`` (82) — a 10MB phone photo
+            is stored as a ~200-400KB WebP with no visible loss at display
+            sizes. Keep-smaller: when the WebP output is not smaller than the
+            input, the original bytes are kept (a small PNG logo or an
+            already-compressed WebP is not inflated). Animated GIFs pass
+            through untouched (Pillow would flatten them to a single frame).
+            Alpha survives (WebP), so background-removed cutouts stay
+            transparent.
+
+        ``thumbnail=True`` also encodes the ``_thumb`` rendition from the same
+        in-memory image (``THUMB_MAX_EDGE`` / ``THUMB_QUALITY``), and
+        ``matte=True`` runs the white-backdrop matte first (generated product
+        shots; see ``background_removal.py``). See ``image_pipeline.py``.
 
         Sync by design; callers run it on the bounded image executor
-        (``run_image_op``) alongside ``_validate_image``. Best-effort: on any
-        failure the input is returned unchanged rather than dropping the
-        upload (the prior ``validate_image_bytes`` already ran
-        ``Image.verify()`` on these bytes, so a real photo that verifies also
-        re-encodes — failures need verify() to pass yet a full decode+reencode
-        to fail).
+        (``run_image_op``). Best-effort: on any failure the input bytes are
+        kept rather than dropping the upload.
         """
-        mime = sniff_image_mime_from_magic(file_data[:32])
-        if mime in _TRANSCODE_TO_WEBP_MIMES:
-            webp = transcode_to_webp(file_data)
-            if webp is not None:
-                file_data = webp
-            else:
+        renditions = build_renditions(
+            file_data,
+            max_edge=STORAGE_MAX_EDGE,
+            quality=STORAGE_QUALITY,
+            thumb_max_edge=THUMB_MAX_EDGE if thumbnail else None,
+            thumb_quality=THUMB_QUALITY,
+            matte=matte,
+            force_reencode_mimes=_TRANSCODE_TO_WEBP_MIMES,
+        )
+        if renditions.image_bytes is file_data:
+            mime = sniff_image_mime_from_magic(file_data[:32])
+            if mime in _TRANSCODE_TO_WEBP_MIMES:
                 logger.warning(
                     "Accepted non-web-native image failed to transcode to WebP; "
                     "storing original bytes (may not render in all browsers)",
                     mime=mime,
                 )
-                return file_data
-        if mime != "image/gif":
-            webp = downscale_image_bytes_to_webp(
-                file_data,
-                max_edge=STORAGE_MAX_EDGE,
-                quality=STORAGE_QUALITY,
-            )
-            if webp is not None and len(webp) < len(file_data):
-                file_data = webp
-        return file_data
+        return renditions
+
+    @staticmethod
+    def _normalize_upload_bytes(file_data: bytes) -> bytes:
+        """Normalize accepted upload bytes to the storage compression profile.
+
+        The main rendition of ``_storage_renditions`` without the thumbnail,
+        for uploads that store no ``_thumb`` sibling (temporary previews,
+        generated images). Sync; run it on the image executor.
+        """
+        return StorageService._storage_renditions(file_data, thumbnail=False).image_bytes
 
     @staticmethod
     def key_from_path(value: Optional[str]) -> Optional[str]:
@@ -481,7 +532,7 @@ class StorageService:
 
         Returns:
             Dict with image_url (presigned GET), thumbnail_url, storage_path,
-            and metadata
+            image_hash (perceptual hash hex, see image_hash.py) and metadata
 
         Raises:
             FileTooLargeError: If file exceeds size limit
@@ -494,10 +545,10 @@ class StorageService:
         await run_image_op(StorageService._validate_image, file_data, filename)
 
         # Normalize to the storage compression profile (WebP q82 @ 2048px,
-        # keep-smaller) before the storage key/content-type are minted.
-        file_data = await run_image_op(
-            StorageService._normalize_upload_bytes, file_data
-        )
+        # keep-smaller) before the storage key/content-type are minted. The
+        # thumbnail is encoded from the same decode (see image_pipeline.py).
+        renditions = await run_image_op(StorageService._storage_renditions, file_data)
+        file_data = renditions.image_bytes
 
         content_type = StorageService._sniff_content_type(file_data, filename)
         ext = EXTENSION_BY_MIME.get(content_type, os.path.splitext(filename)[1].lower() or ".jpg")
@@ -512,7 +563,9 @@ class StorageService:
                 cache_control=DEFAULT_CACHE_CONTROL,
             )
             # Thumbnail sibling (best-effort; never fails the upload).
-            await StorageService._upload_thumbnail(backend, storage_path, file_data)
+            await StorageService._upload_thumbnail(
+                backend, storage_path, file_data, thumbnail=renditions.thumbnail
+            )
             image_url = await StorageService.get_public_url(storage_path)
             thumbnail_url = image_url
 
@@ -530,7 +583,14 @@ class StorageService:
                 "storage_path": storage_path,
                 "is_primary": is_primary,
                 "width": None,  # Would be populated by image processing
-                "height": None
+                "height": None,
+                # Perceptual hash for the duplicate check's first tier
+                # (app/utils/image_hash.py); None when undecodable.
+                "image_hash": (
+                    hash_to_hex(renditions.image_hash)
+                    if renditions.image_hash is not None
+                    else None
+                ),
             }
 
         except Exception as e:
@@ -575,10 +635,10 @@ class StorageService:
         await run_image_op(StorageService._validate_image, file_data, filename)
 
         # Normalize to the storage compression profile (WebP q82 @ 2048px,
-        # keep-smaller) before the storage key/content-type are minted.
-        file_data = await run_image_op(
-            StorageService._normalize_upload_bytes, file_data
-        )
+        # keep-smaller) before the storage key/content-type are minted. The
+        # thumbnail is encoded from the same decode (see image_pipeline.py).
+        renditions = await run_image_op(StorageService._storage_renditions, file_data)
+        file_data = renditions.image_bytes
 
         content_type = StorageService._sniff_content_type(file_data, filename)
         ext = EXTENSION_BY_MIME.get(content_type, os.path.splitext(filename)[1].lower() or ".jpg")
@@ -593,7 +653,9 @@ class StorageService:
                 cache_control=DEFAULT_CACHE_CONTROL,
             )
             # Thumbnail sibling (best-effort; never fails the upload).
-            await StorageService._upload_thumbnail(backend, storage_path, file_data)
+            await StorageService._upload_thumbnail(
+                backend, storage_path, file_data, thumbnail=renditions.thumbnail
+            )
             image_url = await StorageService.get_public_url(storage_path)
 
             logger.info(
@@ -657,10 +719,10 @@ class StorageService:
         await run_image_op(StorageService._validate_image, file_data, filename)
 
         # Normalize to the storage compression profile (WebP q82 @ 2048px,
-        # keep-smaller) before the storage key/content-type are minted.
-        file_data = await run_image_op(
-            StorageService._normalize_upload_bytes, file_data
-        )
+        # keep-smaller) before the storage key/content-type are minted. The
+        # thumbnail is encoded from the same decode (see image_pipeline.py).
+        renditions = await run_image_op(StorageService._storage_renditions, file_data)
+        file_data = renditions.image_bytes
 
         content_type = StorageService._sniff_content_type(file_data, filename)
         ext = EXTENSION_BY_MIME.get(content_type, os.path.splitext(filename)[1].lower() or ".jpg")
@@ -675,7 +737,9 @@ class StorageService:
                 cache_control=DEFAULT_CACHE_CONTROL,
             )
             # Thumbnail sibling (best-effort; never fails the upload).
-            await StorageService._upload_thumbnail(backend, storage_path, file_data)
+            await StorageService._upload_thumbnail(
+                backend, storage_path, file_data, thumbnail=renditions.thumbnail
+            )
 
             logger.info(
                 "Uploaded avatar",
@@ -736,6 +800,18 @@ class StorageService:
                         thumb_key=thumb_key,
                         error=str(e),
                     )
+            # Avatars also carry a prepared AI-reference sibling (best-effort,
+            # like the thumb).
+            ref_key = StorageService.avatar_reference_key_for(storage_path)
+            if ref_key:
+                try:
+                    await backend.delete(ref_key)
+                except Exception as e:
+                    logger.warning(
+                        "Failed to delete avatar reference",
+                        ref_key=ref_key,
+                        error=str(e),
+                    )
             logger.info(
                 "Deleted image",
                 storage_path=storage_path,
@@ -1002,10 +1078,10 @@ class StorageService:
         await run_image_op(StorageService._validate_image, file_data, filename)
 
         # Normalize to the storage compression profile (WebP q82 @ 2048px,
-        # keep-smaller) before the storage key/content-type are minted.
-        file_data = await run_image_op(
-            StorageService._normalize_upload_bytes, file_data
-        )
+        # keep-smaller) before the storage key/content-type are minted. The
+        # thumbnail is encoded from the same decode (see image_pipeline.py).
+        renditions = await run_image_op(StorageService._storage_renditions, file_data)
+        file_data = renditions.image_bytes
 
         content_type = StorageService._sniff_content_type(file_data, filename)
         ext = EXTENSION_BY_MIME.get(content_type, os.path.splitext(filename)[1].lower() or ".jpg")
@@ -1020,7 +1096,9 @@ class StorageService:
                 cache_control=DEFAULT_CACHE_CONTROL,
             )
             # Thumbnail sibling (best-effort; never fails the upload).
-            await StorageService._upload_thumbnail(backend, storage_path, file_data)
+            await StorageService._upload_thumbnail(
+                backend, storage_path, file_data, thumbnail=renditions.thumbnail
+            )
             image_url = await StorageService.get_public_url(storage_path)
 
             logger.info(
@@ -1054,6 +1132,7 @@ class StorageService:
         bucket: Optional[str] = None,
         upsert: bool = True,
         cache_control: Optional[str] = None,
+        thumbnail: Optional[bytes] = None,
     ) -> dict:
         """Upload raw bytes to the S3 bucket with an explicit destination path.
 
@@ -1066,6 +1145,10 @@ class StorageService:
         idempotent — a retry after a committed-but-lost response overwrites the
         same path instead of erroring on a now-existing key).
 
+        ``thumbnail`` is an already-encoded ``_thumb`` rendition (from
+        ``_storage_renditions``); without it the thumb is encoded from
+        ``file_data``.
+
         Returns ``{"public_url": <presigned GET URL>, "storage_path": <key>,
         "bucket": <bucket>}``.
         """
@@ -1081,7 +1164,9 @@ class StorageService:
             # (items/outfits/avatars/sources/feedback). Skipped internally for
             # tmp/generated/export paths (thumb_key_for returns None) and
             # never fails the upload (best-effort by contract).
-            await StorageService._upload_thumbnail(backend, file_path, file_data)
+            await StorageService._upload_thumbnail(
+                backend, file_path, file_data, thumbnail=thumbnail
+            )
             public_url = await StorageService.get_public_url(file_path)
             return {
                 "public_url": public_url,
@@ -1104,6 +1189,7 @@ class StorageService:
         file_data: bytes,
         source: str = "social-import",
         extension: str = ".png",
+        storage_ready: bool = False,
     ) -> dict:
         """Upload temporary AI-generated image for review workflows.
 
@@ -1116,17 +1202,21 @@ class StorageService:
         generated images are no longer always PNG (matted product shots come
         back as WebP) and a mislabelled object is served with the wrong content
         type for as long as it lives.
+
+        ``storage_ready=True`` marks bytes our own pipeline already encoded to
+        the storage profile (a matted ``GeneratedImage``); they are stored as-is.
         """
         ext = extension if extension.startswith(".") else f".{extension}"
-        # Pillow decode is CPU-bound (up to ~7MB per image); never block the
-        # event loop during request handling. Runs on the bounded image
-        # executor (see app/core/image_executor.py).
-        await run_image_op(StorageService._validate_image, file_data, ext)
-        # Normalize to the storage compression profile (WebP q82 @ 2048px,
-        # keep-smaller) before the storage key/content-type are minted.
-        file_data = await run_image_op(
-            StorageService._normalize_upload_bytes, file_data
-        )
+        if not storage_ready:
+            # Pillow decode is CPU-bound (up to ~7MB per image); never block the
+            # event loop during request handling. Runs on the bounded image
+            # executor (see app/core/image_executor.py).
+            await run_image_op(StorageService._validate_image, file_data, ext)
+            # Normalize to the storage compression profile (WebP q82 @ 2048px,
+            # keep-smaller) before the storage key/content-type are minted.
+            file_data = await run_image_op(
+                StorageService._normalize_upload_bytes, file_data
+            )
         content_type = StorageService._sniff_content_type(file_data, ext)
         ext = EXTENSION_BY_MIME.get(content_type, ext)
         temp_name = f"tmp/{user_id}/{source}/{uuid.uuid4().hex}{ext}"
@@ -1164,10 +1254,10 @@ class StorageService:
         # executor (see app/core/image_executor.py).
         await run_image_op(StorageService._validate_image, file_data, ext)
         # Normalize to the storage compression profile (WebP q82 @ 2048px,
-        # keep-smaller) before the storage key/content-type are minted.
-        file_data = await run_image_op(
-            StorageService._normalize_upload_bytes, file_data
-        )
+        # keep-smaller) before the storage key/content-type are minted; the
+        # thumbnail comes from the same decode.
+        renditions = await run_image_op(StorageService._storage_renditions, file_data)
+        file_data = renditions.image_bytes
         # Sniffed from the bytes, with the caller's extension only as a fallback.
         content_type = StorageService._sniff_content_type(file_data, ext)
         ext = EXTENSION_BY_MIME.get(content_type, ext)
@@ -1177,6 +1267,7 @@ class StorageService:
             file_data=file_data,
             file_path=path,
             content_type=content_type,
+            thumbnail=renditions.thumbnail,
         )
         return {
             "image_url": upload["public_url"],
@@ -1246,6 +1337,20 @@ class StorageService:
             quality,
         )
 
+    @staticmethod
+    async def hash_stored_image(storage_path: str) -> Optional[int]:
+        """Perceptual hash (``dhash``) of a stored image, for the duplicate check.
+
+        Same bucket-key-only download as ``download_to_base64``; the decode
+        runs on the bounded image executor. None on any failure.
+        """
+        content = await StorageService._download_bytes(
+            storage_path, purpose="image for duplicate check"
+        )
+        if content is None:
+            return None
+        return await run_image_op(hash_image_bytes, content)
+
     @staticmethod
     async def download_to_base64(url: str, timeout: float = 10.0) -> Optional[str]:
         """Download a stored image back to base64 for image-gen reference.
@@ -4,12 +4,14 @@ Handles item embeddings and similarity search.
 """
 
 import asyncio
-from typing import Optional, List, Dict, Any, Tuple
+from typing import TYPE_CHECKING, Optional, List, Dict, Any, Tuple
 
-from pinecone import Pinecone, ServerlessSpec
 from app.core.config import settings
 from app.core.logging_config import get_context_logger
 
+if TYPE_CHECKING:  # pragma: no cover - annotations only
+    from pinecone import Pinecone
+
 logger = get_context_logger(__name__)
 
 
@@ -22,9 +24,13 @@ class VectorService:
         self._index = None
 
     @property
-    def pc(self) -> Pinecone:
+    def pc(self) -> "Pinecone":
         """Get or create Pinecone client."""
         if self._pc is None:
+            # SDK imported on first use so deployments without PINECONE_API_KEY
+            # never load it (this module is imported by several routers).
+            from pinecone import Pinecone
+
             self._pc = Pinecone(api_key=settings.PINECONE_API_KEY)
         return self._pc
 
@@ -365,6 +371,8 @@ class VectorService:
             True if index exists or was created
         """
         try:
+            from pinecone import ServerlessSpec
+
             existing_indexes = [idx.name for idx in self.pc.list_indexes()]
 
             if settings.PINECONE_INDEX_NAME in existing_indexes:
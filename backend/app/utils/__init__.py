@@ -3,12 +3,13 @@ Utility modules for async operations.
 """
 
 from .retry import with_retry
-from .parallel import parallel_with_retry, ParallelResult
+from .parallel import parallel_with_retry, ParallelAbortedError, ParallelResult
 from .db import maybe_single_data
 
 __all__ = [
     "with_retry",
     "parallel_with_retry",
     "ParallelResult",
+    "ParallelAbortedError",
     "maybe_single_data",
 ]
@@ -282,6 +282,45 @@ def _existing_alpha_fraction(img: Image.Image) -> float:
 # =============================================================================
 
 
+def matte_rgb(
+    rgb: Image.Image,
+) -> tuple[str, float, float, Optional[Image.Image]]:
+    """Matte an already-decoded, already-oriented RGB image.
+
+    Returns ``(status, transparent_fraction, center_opacity, matted)`` where
+    ``matted`` is an RGBA image (fit to MATTE_MAX_EDGE) on ``matted`` status
+    and None when a guard rejected the cut. Nothing is encoded here - that is
+    the point: `remove_white_background` encodes the result on its own, and
+    the single-pass generated-image pipeline (`app/utils/image_pipeline.py`)
+    reuses the same in-memory image for every rendition. Already-transparent
+    input must be filtered by the caller (it sees the source mode; this
+    function only sees RGB). ``rgb`` is consumed - it is resized in place and
+    becomes the RGBA result - so pass an image you own. May raise; both
+    callers catch.
+    """
+    if max(rgb.size) > MATTE_MAX_EDGE:
+        rgb.thumbnail((MATTE_MAX_EDGE, MATTE_MAX_EDGE))
+
+    candidate, min_ch = _near_white_candidate(rgb)
+    background = ImageChops.multiply(candidate, _border_connected(candidate))
+
+    transparent_fraction = _mask_fraction(background)
+    center_opacity = _center_opacity(background)
+
+    # G1 - nothing white and border-connected to remove.
+    if transparent_fraction < MIN_TRANSPARENT_FRACTION:
+        return STATUS_SKIPPED_NO_BACKGROUND, transparent_fraction, center_opacity, None
+    # G2 - the matte ate the subject.
+    if transparent_fraction > MAX_TRANSPARENT_FRACTION:
+        return STATUS_REJECTED_ATE_SUBJECT, transparent_fraction, center_opacity, None
+    # G3 - the flood walked through the garment.
+    if center_opacity < MIN_CENTER_OPACITY:
+        return STATUS_REJECTED_CENTER_TRANSPARENT, transparent_fraction, center_opacity, None
+
+    rgb.putalpha(_build_alpha(background, min_ch))
+    return STATUS_MATTED, transparent_fraction, center_opacity, rgb
+
+
 def remove_white_background(
     image_bytes: bytes, filename: Optional[str] = None
 ) -> MatteResult:
@@ -320,9 +359,6 @@ def remove_white_background(
             oriented = ImageOps.exif_transpose(opened)
             rgb = oriented.convert("RGB")
             original_size = rgb.size
-            if max(rgb.size) > MATTE_MAX_EDGE:
-                rgb.thumbnail((MATTE_MAX_EDGE, MATTE_MAX_EDGE))
-            processing_size = rgb.size
 
             if already_transparent >= MIN_TRANSPARENT_FRACTION:
                 return _unchanged(
@@ -331,40 +367,14 @@ def remove_white_background(
                     size=original_size,
                 )
 
-            candidate, min_ch = _near_white_candidate(rgb)
-            background = ImageChops.multiply(candidate, _border_connected(candidate))
-
-            transparent_fraction = _mask_fraction(background)
-            center_opacity = _center_opacity(background)
-
-            # G1 - nothing white and border-connected to remove.
-            if transparent_fraction < MIN_TRANSPARENT_FRACTION:
-                return _unchanged(
-                    STATUS_SKIPPED_NO_BACKGROUND,
-                    transparent_fraction,
-                    center_opacity,
-                    original_size,
-                )
-            # G2 - the matte ate the subject.
-            if transparent_fraction > MAX_TRANSPARENT_FRACTION:
-                return _unchanged(
-                    STATUS_REJECTED_ATE_SUBJECT,
-                    transparent_fraction,
-                    center_opacity,
-                    original_size,
-                )
-            # G3 - the flood walked through the garment.
-            if center_opacity < MIN_CENTER_OPACITY:
+            status, transparent_fraction, center_opacity, matted = matte_rgb(rgb)
+            if matted is None:
                 return _unchanged(
-                    STATUS_REJECTED_CENTER_TRANSPARENT,
-                    transparent_fraction,
-                    center_opacity,
-                    original_size,
+                    status, transparent_fraction, center_opacity, original_size
                 )
 
-            rgb.putalpha(_build_alpha(background, min_ch))
             buffer = io.BytesIO()
-            rgb.save(
+            matted.save(
                 buffer,
                 format=MATTE_FORMAT.upper(),
                 quality=MATTE_WEBP_QUALITY,
@@ -376,8 +386,8 @@ def remove_white_background(
                 status=STATUS_MATTED,
                 transparent_fraction=transparent_fraction,
                 center_opacity=center_opacity,
-                width=processing_size[0],
-                height=processing_size[1],
+                width=matted.size[0],
+                height=matted.size[1],
             )
     except Exception:
         # Best-effort: the caller keeps the image it already had.
@@ -544,6 +544,37 @@ def missing_referral_rpcs(db) -> list:
                 missing.append(name)
     return missing
 
+
+# ============================================================================
+# Boot-time social-import RPC presence probe (non-mutating)
+#
+# Every social import run claims its queued photos through
+# claim_social_import_photos (migration 043); without it each import fails
+# with PGRST202 at request time. The probe claims for the nil job/user UUIDs,
+# which match no photo row, so nothing is updated. Same policy as the probes
+# above: only PGRST202 means the function is missing.
+# ============================================================================
+
+SOCIAL_IMPORT_RPC_PROBES = {
+    "claim_social_import_photos": {
+        "p_job_id": _NIL_USER_UUID,
+        "p_user_id": _NIL_USER_UUID,
+        "p_limit": 1,
+    },
+}
+
+
+def missing_social_import_rpcs(db) -> list:
+    """Return the social-import RPC names absent from the hosted schema."""
+    missing = []
+    for name, args in SOCIAL_IMPORT_RPC_PROBES.items():
+        try:
+            db.rpc(name, args).execute()
+        except Exception as error:
+            if is_pgrst202_missing_rpc(error):
+                missing.append(name)
+    return missing
+
 # ============================================================================
 # Boot-time valid_batch_size bound probe (non-mutating)
 #
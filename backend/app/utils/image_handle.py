@@ -0,0 +1,96 @@
+"""Binary image handle for the in-process generation pipeline.
+
+Provider responses arrive as base64 (JSON wire format), and the generation
+agent used to keep them that way: every stage (matte, storage normalize,
+temp upload) decoded the string, worked on bytes, and re-encoded for the
+next stage. Base64 is 4/3 the size of the bytes, and a generation held the
+provider string, the decoded bytes and a re-encoded string alive at once.
+
+``ImageHandle`` holds the decoded bytes ONCE. Everything else is derived:
+
+- ``mime`` / ``dimensions`` are computed on first access from the header
+  (no full decode) and cached - they are tiny;
+- ``base64`` / ``data_url`` are encoded on EVERY access and never cached, so
+  a handle never carries a second, larger copy of the image. Only a wire
+  boundary (an API response body, a provider request, an SSE payload)
+  should ask for them.
+"""
+
+import base64
+import binascii
+import io
+from typing import Optional, Tuple
+
+from PIL import Image
+
+from app.utils.image_processing import FALLBACK_MIME, sniff_image_mime
+
+_UNSET = object()
+
+
+class ImageHandle:
+    """Raw image bytes plus lazily derived mime, dimensions and base64 views."""
+
+    __slots__ = ("data", "_mime", "_dimensions")
+
+    def __init__(self, data: bytes, mime: Optional[str] = None):
+        self.data = data
+        self._mime = mime
+        self._dimensions: object = _UNSET
+
+    @classmethod
+    def from_base64(cls, value: str) -> "ImageHandle":
+        """Decode a bare base64 string or a ``data:`` URL.
+
+        A data URL's declared mime is kept unless it is the generic fallback;
+        otherwise the mime is sniffed from the bytes on first use. Raises
+        ``ValueError`` on malformed base64, and on an http(s) URL: providers
+        can return a hosted image instead of inline data, and those bytes
+        must be downloaded (``remote_image_fetcher``), not base64-decoded.
+        """
+        if value.startswith(("http://", "https://")):
+            raise ValueError("Image is a URL, not base64; fetch it instead")
+        mime = None
+        if value.startswith("data:"):
+            header, _, value = value.partition(",")
+            declared = header[5:].split(";")[0]
+            if declared and declared != FALLBACK_MIME:
+                mime = declared
+        try:
+            data = base64.b64decode(value.strip(), validate=True)
+        except (binascii.Error, ValueError) as e:
+            raise ValueError(f"Invalid base64 image: {e}") from e
+        return cls(data, mime)
+
+    @property
+    def mime(self) -> str:
+        if self._mime is None:
+            self._mime = sniff_image_mime(self.data)
+        return self._mime
+
+    @property
+    def dimensions(self) -> Optional[Tuple[int, int]]:
+        """(width, height) read from the image header, or None if unreadable."""
+        if self._dimensions is _UNSET:
+            try:
+                with Image.open(io.BytesIO(self.data)) as img:
+                    self._dimensions = img.size
+            except Exception:
+                self._dimensions = None
+        return self._dimensions  # type: ignore[return-value]
+
+    @property
+    def base64(self) -> str:
+        """Bare base64 of the bytes. Encoded per access; not cached."""
+        return base64.b64encode(self.data).decode("utf-8")
+
+    @property
+    def data_url(self) -> str:
+        """``data:{mime};base64,...`` of the bytes. Encoded per access; not cached."""
+        return f"data:{self.mime};base64,{self.base64}"
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __repr__(self) -> str:
+        return f"ImageHandle(mime={self.mime!r}, bytes={len(self.data)})"
@@ -0,0 +1,114 @@
+"""Perceptual image hashes for near-duplicate photo detection.
+
+``/items/check-duplicates`` used to answer every check with an embedding
+(paid quota) plus a vector query, even when the new item's photo was a
+re-upload of one already in the wardrobe. Those near-identical photos are
+found far more cheaply by comparing 64-bit perceptual hashes:
+
+- ``dhash``: difference hash. The image is reduced to 9x8 grayscale and each
+  bit records whether a pixel is brighter than its right-hand neighbour.
+  Robust to re-encoding, resizing and mild colour/brightness changes; not
+  to crops or rotations (those fall through to the embedding path).
+- ``HashBKTree``: a BK-tree over Hamming distance, so "every stored hash
+  within N bits" visits a small part of a wardrobe's hashes instead of all
+  of them.
+
+Hashes are stored as 16-char lowercase hex (``item_images.image_hash``):
+a signed bigint would need sign juggling in both SQL and JSON.
+
+Transparent pixels are flattened onto white before hashing, so a
+background-removed cutout hashes like the product shot it came from.
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image
+
+HASH_BITS = 64
+IMAGE_HASH_PATTERN = r"^[0-9a-f]{16}$"
+_IMAGE_HASH_RE = re.compile(IMAGE_HASH_PATTERN)
+
+
+def dhash(img: Image.Image) -> int:
+    """64-bit difference hash of an already-decoded image."""
+    if img.mode not in ("RGB", "RGBA", "L", "LA"):
+        img = img.convert("RGBA")
+    # Resize first: converting a full-size image would cost more than the hash.
+    small = img.resize((9, 8), Image.Resampling.BOX).convert("RGBA")
+    backdrop = Image.new("RGBA", small.size, (255, 255, 255, 255))
+    gray = Image.alpha_composite(backdrop, small).convert("L")
+    pixels = gray.tobytes()
+    value = 0
+    for row in range(8):
+        offset = row * 9
+        for col in range(8):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+
+def hash_to_hex(value: int) -> str:
+    return f"{value:016x}"
+
+
+def hex_to_hash(value: Optional[str]) -> Optional[int]:
+    """Parse a stored/request hash; None for missing or malformed values."""
+    if not value or not _IMAGE_HASH_RE.match(value):
+        return None
+    return int(value, 16)
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+class HashBKTree:
+    """BK-tree of 64-bit hashes, each carrying the ids that share it.
+
+    Nodes are ``[hash, ids, children]`` where ``children`` maps an edge
+    distance to the child subtree. By the triangle inequality a query for
+    distance <= r only descends edges in ``[d - r, d + r]``.
+    """
+
+    def __init__(self) -> None:
+        self._root: Optional[list] = None
+        self._size = 0
+
+    def add(self, value: int, item_id: str) -> None:
+        self._size += 1
+        if self._root is None:
+            self._root = [value, [item_id], {}]
+            return
+        node = self._root
+        while True:
+            distance = hamming(value, node[0])
+            if distance == 0:
+                node[1].append(item_id)
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [value, [item_id], {}]
+                return
+            node = child
+
+    def search(self, value: int, max_distance: int) -> List[Tuple[str, int]]:
+        """``(item_id, distance)`` for every id within ``max_distance`` bits.
+
+        An id with several stored hashes is reported once, at its closest
+        distance; results are ordered nearest first.
+        """
+        best: Dict[str, int] = {}
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node = stack.pop()
+            distance = hamming(value, node[0])
+            if distance <= max_distance:
+                for item_id in node[1]:
+                    if distance < best.get(item_id, HASH_BITS + 1):
+                        best[item_id] = distance
+            low, high = distance - max_distance, distance + max_distance
+            stack.extend(child for edge, child in node[2].items() if low <= edge <= high)
+        return sorted(best.items(), key=lambda pair: pair[1])
+
+    def __len__(self) -> int:
+        return self._size
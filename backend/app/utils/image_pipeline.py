@@ -0,0 +1,190 @@
+"""Single-pass post-processing for images headed to storage.
+
+A generated image used to be decoded once per stage: the matte
+(`remove_white_background`) decoded and re-encoded it, `_validate_image`
+decoded it to verify, `_normalize_upload_bytes` decoded it again (twice for
+HEIC/TIFF: transcode, then downscale) and `_upload_thumbnail` decoded the
+stored bytes once more for the `_thumb` sibling. On the bounded image pool
+that is 3-4x the CPU and 3-4 full-size pixel buffers per image.
+
+`build_renditions` decodes ONCE and derives everything from that in-memory
+image: optional matte, the storage-profile main rendition and the thumbnail.
+The output contract is the one the separate steps had, so stored bytes,
+keys and content types do not change:
+
+- main: WebP at the storage profile, keep-smaller against the input;
+  within-bounds WebP and animated-GIF inputs are kept byte-identical;
+  ``force_reencode_mimes`` (formats browsers cannot render) are always
+  re-encoded; a matted image is the matte's own WebP encode;
+- thumbnail: WebP from the same image, or the main bytes themselves when
+  the main is a WebP already within the thumbnail bound;
+- the perceptual hash used by the duplicate check (``image_hash.py``);
+  ``hash_image_bytes`` takes the same hash of a photo that is not being
+  stored.
+
+Display direction, like `background_removal.py`: alpha is preserved, nothing
+here prepares an AI reference.
+"""
+
+import io
+from typing import NamedTuple, Optional
+
+from PIL import Image
+
+from app.utils.background_removal import (
+    MATTE_FORMAT,
+    MATTE_WEBP_QUALITY,
+    MIN_TRANSPARENT_FRACTION,
+    STATUS_ERROR,
+    STATUS_SKIPPED_NO_BACKGROUND,
+    _existing_alpha_fraction,
+    matte_rgb,
+)
+from app.utils.image_hash import dhash
+from app.utils.image_processing import (
+    _decode_and_fit,
+    sniff_image_mime,
+    sniff_image_mime_from_magic,
+)
+
+
+class Renditions(NamedTuple):
+    """Outputs of one `build_renditions` pass.
+
+    ``decoded`` is False when the input could not be decoded at all; then
+    ``image_bytes`` is the unmodified input and ``thumbnail`` is None.
+    ``matte_status`` is None when no matte was requested. ``image_hash`` is
+    the ``dhash`` of the decoded (pre-matte) pixels, for duplicate detection.
+    """
+
+    image_bytes: bytes
+    content_type: str
+    thumbnail: Optional[bytes]
+    decoded: bool
+    matte_status: Optional[str] = None
+    transparent_fraction: float = 0.0
+    center_opacity: float = 1.0
+    image_hash: Optional[int] = None
+
+
+def _encode_webp(img: Image.Image, quality: int) -> bytes:
+    buffer = io.BytesIO()
+    img.save(buffer, format="WEBP", quality=quality, method=4)
+    return buffer.getvalue()
+
+
+def build_renditions(
+    raw: bytes,
+    *,
+    max_edge: int,
+    quality: int,
+    thumb_max_edge: Optional[int] = None,
+    thumb_quality: int = 75,
+    matte: bool = False,
+    force_reencode_mimes: frozenset = frozenset(),
+) -> Renditions:
+    """Decode ``raw`` once and produce the main (and optional thumbnail) rendition.
+
+    Never raises. ``thumb_max_edge=None`` skips the thumbnail. ``matte=True``
+    runs the white-backdrop matte first (product / flat-lay shots only - see
+    `background_removal.py`); any guard rejection falls through to the plain
+    main rendition of the original pixels.
+    """
+    src_mime = sniff_image_mime_from_magic(raw[:32])
+    try:
+        img, src_format, src_size, had_alpha = _decode_and_fit(
+            raw, max_edge, flatten_alpha=False
+        )
+    except Exception:
+        return Renditions(
+            image_bytes=raw,
+            content_type=sniff_image_mime(raw),
+            thumbnail=None,
+            decoded=False,
+            matte_status=STATUS_ERROR if matte else None,
+        )
+
+    try:
+        image_hash: Optional[int] = dhash(img)
+    except Exception:
+        image_hash = None
+
+    main: Optional[bytes] = None
+    content_type = src_mime
+    matte_status = None
+    transparent_fraction = 0.0
+    center_opacity = 1.0
+
+    if matte:
+        try:
+            already = _existing_alpha_fraction(img) if had_alpha else 0.0
+            if already >= MIN_TRANSPARENT_FRACTION:
+                matte_status, transparent_fraction = STATUS_SKIPPED_NO_BACKGROUND, already
+            else:
+                matte_status, transparent_fraction, center_opacity, matted = matte_rgb(
+                    img.convert("RGB")
+                )
+                if matted is not None:
+                    img = matted
+                    main = _encode_webp(img, MATTE_WEBP_QUALITY)
+                    content_type = f"image/{MATTE_FORMAT}"
+        except Exception:
+            matte_status = STATUS_ERROR
+
+    if main is None:
+        if src_mime == "image/gif" or (src_format == "WEBP" and img.size == src_size):
+            # Animated GIFs would be flattened to one frame; a within-bounds
+            # WebP is already the storage profile.
+            main = raw
+        else:
+            try:
+                webp = _encode_webp(img, quality)
+            except Exception:
+                webp = None
+            if webp is not None and (src_mime in force_reencode_mimes or len(webp) < len(raw)):
+                main, content_type = webp, "image/webp"
+            else:
+                main = raw
+    if main is raw or content_type is None:
+        content_type = src_mime or sniff_image_mime(raw)
+
+    thumbnail: Optional[bytes] = None
+    if thumb_max_edge:
+        try:
+            if content_type == "image/webp" and max(img.size) <= thumb_max_edge:
+                thumbnail = main
+            else:
+                thumb = img.copy()
+                thumb.thumbnail((thumb_max_edge, thumb_max_edge))
+                thumbnail = _encode_webp(thumb, thumb_quality)
+        except Exception:
+            thumbnail = None
+
+    return Renditions(
+        image_bytes=main,
+        content_type=content_type,
+        thumbnail=thumbnail,
+        decoded=True,
+        matte_status=matte_status,
+        transparent_fraction=transparent_fraction,
+        center_opacity=center_opacity,
+        image_hash=image_hash,
+    )
+
+
+# Draft-decode bound for hashing alone: far below the storage profile, still
+# well above the 9x8 the hash reduces to.
+_HASH_DECODE_EDGE = 1024
+
+
+def hash_image_bytes(raw: bytes) -> Optional[int]:
+    """``dhash`` of ``raw`` through the same decode as `build_renditions`.
+
+    For photos that are checked before they are stored (the duplicate check).
+    Never raises: None for undecodable input.
+    """
+    try:
+        img, _, _, _ = _decode_and_fit(raw, _HASH_DECODE_EDGE, flatten_alpha=False)
+        return dhash(img)
+    except Exception:
+        return None
@@ -402,6 +402,32 @@ def _downscale_bytes(
 _PROVIDER_REJECTED_MIME_TYPES = frozenset({"image/avif", "image/heif", "image/heic"})
 
 
+def ensure_provider_safe_bytes(
+    raw: bytes,
+    mime: Optional[str] = None,
+    *,
+    max_edge: int = DEFAULT_MAX_EDGE,
+    quality: int = DEFAULT_QUALITY,
+) -> Tuple[bytes, str]:
+    """Bytes-level ``ensure_provider_safe_base64``: ``(bytes, mime)`` to send.
+
+    ``mime`` is the caller's declared type (a data-URL header, an HTTP
+    content type); when absent it is sniffed from the magic bytes, falling
+    back to ``image/jpeg``. AVIF/HEIF is re-encoded to JPEG; anything else -
+    and a rejected format that fails to decode - is returned as the SAME
+    bytes object with its mime, so callers that already hold raw bytes (the
+    Gemini part builder, ``ImageHandle``) never round-trip through base64.
+    """
+    if mime is None:
+        mime = sniff_image_mime_from_magic(raw[:32]) or "image/jpeg"
+    if mime not in _PROVIDER_REJECTED_MIME_TYPES:
+        return raw, mime
+    jpeg, _had_alpha = _downscale_bytes(raw, max_edge, quality)
+    if jpeg is None:
+        return raw, mime
+    return jpeg, "image/jpeg"
+
+
 def ensure_provider_safe_base64(
     image_base64: str,
     *,
@@ -430,10 +456,12 @@ def ensure_provider_safe_base64(
         if mime not in _PROVIDER_REJECTED_MIME_TYPES:
             return image_base64
         raw = base64.b64decode(b64_data, validate=True)
-        jpeg, _had_alpha = _downscale_bytes(raw, max_edge, quality)
-        if jpeg is None:
+        safe, safe_mime = ensure_provider_safe_bytes(
+            raw, mime, max_edge=max_edge, quality=quality
+        )
+        if safe is raw:
             return image_base64
-        return f"data:image/jpeg;base64,{base64.b64encode(jpeg).decode('utf-8')}"
+        return f"data:{safe_mime};base64,{base64.b64encode(safe).decode('utf-8')}"
 
     try:
         head = base64.b64decode(image_base64[:96], validate=False)
@@ -6,11 +6,27 @@ These helpers strip the fences and locate the first top-level JSON value
 than a greedy regex scan, which over-captures trailing prose that happens
 to contain a closing brace or bracket, and immune to delimiters that appear
 inside JSON string values (e.g. a garment description containing "{}").
+
+The scan is a single linear pass over the response (see `_balanced_blocks`):
+the previous implementation re-scanned the tail of the text from every
+'{' / '[' and was quadratic on long malformed output — a truncated
+multi-kilobyte array cost hundreds of milliseconds of event-loop time.
 """
 
 import json
 import re
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+# Only these characters can change the scanner's state; everything else is
+# skipped by the regex engine instead of being walked in Python.
+_SIGNIFICANT_CHARS = re.compile(r'[{}\[\]"\\]')
+_CLOSE_TO_OPEN = {"}": "{", "]": "["}
+
+# String-state automaton: outside a string, inside one, or just after a
+# backslash inside one.
+_OUT, _IN, _ESC = 0, 1, 2
+
+_DECODER = json.JSONDecoder()
 
 
 def extract_json_block(text: str) -> str:
@@ -27,6 +43,11 @@ def extract_json_block(text: str) -> str:
     Raises ValueError when no JSON is found or every candidate is
     unterminated/malformed.
     """
+    return _locate_json(text)[0]
+
+
+def _locate_json(text: str) -> Tuple[str, Any]:
+    """Return the first parseable balanced block and its parsed value."""
     if not text:
         raise ValueError("Empty model response")
 
@@ -35,58 +56,121 @@ def extract_json_block(text: str) -> str:
     if fenced:
         text = fenced.group(1)
 
-    # Walk every '{' or '[' in order, scanning a quote-aware balanced block
-    # from it and keeping the first one that actually parses as JSON.
-    for start, ch in enumerate(text):
-        if ch not in "{[":
-            continue
-        block = _scan_balanced_block(text, start, ch, "}" if ch == "{" else "]")
-        if block is None:
-            continue
+    # Only starts with a balanced close are worth parsing; try them in text
+    # order and keep the first one that actually parses as JSON. Nesting past
+    # the interpreter's recursion limit is never a real model response, and
+    # every nested candidate would recurse just as deep, so stop there.
+    blocks = _balanced_blocks(text)
+    for start in sorted(blocks):
         try:
-            json.loads(block)
+            value, end = _DECODER.raw_decode(text, start)
         except json.JSONDecodeError:
             continue
-        return block
+        except RecursionError:
+            raise ValueError("Model response JSON is nested too deeply") from None
+        # A value that parses from `start` ends exactly at the balancing
+        # close the scan found, so this is the same block json.loads saw.
+        return text[start:end], value
 
     raise ValueError("Model response did not contain JSON")
 
 
-def _scan_balanced_block(
-    text: str,
-    start: int,
-    open_char: str,
-    close_char: str,
-) -> Optional[str]:
-    """Scan a quote- and escape-aware balanced block beginning at `start`.
+class _Lane:
+    """Scanner state shared by every start position in the same string state.
+
+    Each '{' / '[' is scanned as if from a fresh, outside-a-string state, so
+    an opener that sits inside a string (relative to an earlier opener) is
+    still a candidate of its own. Starts whose string state coincides share
+    one lane; per bracket type, ``stacks`` holds groups of pending starts by
+    remaining depth (top of stack = one close away from balancing).
+    """
 
-    Returns the matched block text, or None when no balanced close exists.
-    Delimiters inside JSON strings (including escaped quotes) are ignored,
-    so a `}` or `]` inside a string value cannot close the block early and
-    a `{`/`[` inside a string cannot re-open it.
+    __slots__ = ("state", "escape_at", "stacks")
+
+    def __init__(self) -> None:
+        self.state = _OUT
+        self.escape_at = -1
+        self.stacks: Dict[str, List[List[int]]] = {"{": [], "[": []}
+
+    def is_idle(self) -> bool:
+        return not self.stacks["{"] and not self.stacks["["]
+
+    def absorb(self, other: "_Lane") -> None:
+        """Merge another lane in the same string state into this one."""
+        for kind, theirs in other.stacks.items():
+            ours = self.stacks[kind]
+            if len(ours) < len(theirs):
+                ours, theirs = theirs, ours
+            for depth in range(1, len(theirs) + 1):
+                mine, extra = ours[-depth], theirs[-depth]
+                if len(mine) < len(extra):
+                    mine, extra = extra, mine
+                mine.extend(extra)
+                ours[-depth] = mine
+            self.stacks[kind] = ours
+
+
+def _balanced_blocks(text: str) -> Dict[int, int]:
+    """Map each '{' / '[' start to the index of its balancing close.
+
+    Equivalent to scanning a quote- and escape-aware balanced block from
+    every opener independently (only the opener's own bracket type counts
+    towards depth), but done in one pass: at most three lanes (one per
+    string state) are alive at any position, and starts without a balanced
+    close are simply absent from the result.
     """
-    depth = 0
-    in_string = False
-    escaped = False
-    for i in range(start, len(text)):
+    ends: Dict[int, int] = {}
+    lanes: List[_Lane] = []
+    for match in _SIGNIFICANT_CHARS.finditer(text):
+        i = match.start()
         ch = text[i]
-        if in_string:
-            if escaped:
-                escaped = False
-            elif ch == "\\":
-                escaped = True
-            elif ch == '"':
-                in_string = False
+        handled_opener = False
+        for lane in lanes:
+            if lane.state == _ESC:
+                lane.state = _IN
+                if i == lane.escape_at + 1:
+                    continue  # this character is the escaped one
+            if lane.state == _IN:
+                if ch == "\\":
+                    lane.state = _ESC
+                    lane.escape_at = i
+                elif ch == '"':
+                    lane.state = _OUT
+                continue
+            if ch == '"':
+                lane.state = _IN
+            elif ch in _CLOSE_TO_OPEN:
+                stack = lane.stacks[_CLOSE_TO_OPEN[ch]]
+                if stack:
+                    for start in stack.pop():
+                        ends[start] = i
+            elif ch != "\\":
+                lane.stacks[ch].append([i])
+                handled_opener = True
+
+        if ch in "{[" and not handled_opener:
+            lane = _Lane()
+            lane.stacks[ch].append([i])
+            lanes.append(lane)
+
+        if len(lanes) > 1 or (lanes and lanes[0].is_idle()):
+            lanes = _merge_lanes(lanes)
+    return ends
+
+
+def _merge_lanes(lanes: List[_Lane]) -> List[_Lane]:
+    """Drop lanes with no pending starts and merge lanes in the same state."""
+    by_state: Dict[Tuple[int, int], _Lane] = {}
+    for lane in lanes:
+        if lane.is_idle():
             continue
-        if ch == '"':
-            in_string = True
-        elif ch == open_char:
-            depth += 1
-        elif ch == close_char:
-            depth -= 1
-            if depth == 0:
-                return text[start : i + 1]
-    return None
+        key = (lane.state, lane.escape_at if lane.state == _ESC else -1)
+        survivor = by_state.get(key)
+        if survivor is None:
+            by_state[key] = lane
+        else:
+            survivor.absorb(lane)
+    return list(by_state.values())
 
 
 def safe_extract_json_object(text: str) -> Optional[Dict[str, Any]]:
@@ -96,16 +180,16 @@ def safe_extract_json_object(text: str) -> Optional[Dict[str, Any]]:
     returned an array) so callers can fall back to their array path.
     """
     try:
-        parsed = json.loads(extract_json_block(text))
+        parsed = _locate_json(text)[1]
         return parsed if isinstance(parsed, dict) else None
-    except (ValueError, json.JSONDecodeError):
+    except ValueError:
         return None
 
 
 def safe_extract_json_array(text: str) -> Optional[List[Any]]:
     """Extract and parse the first JSON array in a model response, or None."""
     try:
-        parsed = json.loads(extract_json_block(text))
+        parsed = _locate_json(text)[1]
         return parsed if isinstance(parsed, list) else None
-    except (ValueError, json.JSONDecodeError):
+    except ValueError:
         return None
@@ -0,0 +1,255 @@
+"""
+In-process metrics registry rendered in the Prometheus text format.
+
+Before this the only runtime telemetry was ``log_memory`` (one RSS line per
+120s), so a slow batch could not be attributed to provider latency, the image
+pool, SSE backlog or the database without guesswork. Instrumented modules
+declare their metrics at import; ``GET /metrics`` (app/api/v1/metrics.py)
+renders every registered metric with ``render_latest()``.
+
+Deliberately small instead of a prometheus_client dependency: one process,
+one worker, three metric types, labels passed as keyword arguments::
+
+    REQUESTS = Counter("fitcheck_things_total", "Things done.", ("kind",))
+    REQUESTS.inc(kind="upload")
+
+Updates take a lock: DB latency is observed from ``asyncio.to_thread`` workers
+and image-op timings from the image executor's threads.
+
+Callback metrics (``callback=``) are evaluated at render time and return
+either a number (unlabelled) or ``{label-values tuple: number}``; use them to
+expose state another module already tracks (queue sizes, cache stats) rather
+than mirroring it.
+"""
+
+import logging
+import math
+from abc import ABC, abstractmethod
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds. Spans sub-ms DB/cache hits through multi-minute generations.
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0,
+)
+
+LabelKey = Tuple[str, ...]
+# (name suffix, label values, extra (name, value) label pairs, value)
+Sample = Tuple[str, LabelKey, Tuple[Tuple[str, str], ...], float]
+CallbackResult = Union[float, int, Dict[LabelKey, Union[float, int]]]
+
+
+class _Metric(ABC):
+    type_name = ""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        callback: Optional[Callable[[], CallbackResult]] = None,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames: Tuple[str, ...] = tuple(labelnames)
+        self._callback = callback
+        self._lock = threading.Lock()
+        REGISTRY.register(self)
+
+    def _key(self, labels: Dict[str, str]) -> LabelKey:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {self.labelnames}, got {tuple(sorted(labels))}"
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _callback_samples(self) -> Iterable[Sample]:
+        value = self._callback()
+        if isinstance(value, dict):
+            for key, sample in value.items():
+                yield "", tuple(key), (), float(sample)
+        elif value is not None:
+            yield "", (), (), float(value)
+
+    def _value_samples(self) -> Iterable[Sample]:
+        if self._callback is not None:
+            yield from self._callback_samples()
+            return
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield "", key, (), value
+
+    @abstractmethod
+    def samples(self) -> Iterable[Sample]:
+        """Everything this metric renders, one sample per line."""
+
+    def _format_labels(self, key: LabelKey, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+        pairs = list(zip(self.labelnames, key)) + list(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class Counter(_Metric):
+    """Monotonically increasing total."""
+
+    type_name = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self):
+        return self._value_samples()
+
+
+class Gauge(_Metric):
+    """Value that goes up and down."""
+
+    type_name = "gauge"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelKey, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self):
+        return self._value_samples()
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket distribution (``_bucket`` / ``_sum`` / ``_count``)."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets: Tuple[float, ...] = tuple(sorted(buckets))
+        # Per label set: [per-bucket counts..., +Inf count], sum.
+        self._series: Dict[LabelKey, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = ([0] * (len(self.buckets) + 1), [0.0])
+                self._series[key] = series
+            counts, total = series
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            else:
+                counts[-1] += 1
+            total[0] += value
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(self._key(labels))
+        return sum(series[0]) if series else 0
+
+    def samples(self):
+        with self._lock:
+            snapshot = [(key, list(counts), total[0]) for key, (counts, total) in self._series.items()]
+        for key, counts, total in snapshot:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                yield "_bucket", key, (("le", _format_value(bound)),), cumulative
+            cumulative += counts[-1]
+            yield "_bucket", key, (("le", "+Inf"),), cumulative
+            yield "_sum", key, (), total
+            yield "_count", key, (), cumulative
+
+
+class _Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> None:
+        # Last registration wins: tests importlib.reload() instrumented
+        # modules, which re-declares their metrics under the same name.
+        with self._lock:
+            self._metrics[metric.name] = metric
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines: List[str] = []
+        for metric in metrics:
+            try:
+                samples = list(metric.samples())
+            except Exception as e:
+                # One broken callback must not take the whole scrape down.
+                logger.warning("Metric %s failed to render: %s", metric.name, e)
+                continue
+            lines.append(f"# HELP {metric.name} {_escape_help(metric.documentation)}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            for suffix, key, extra, value in samples:
+                labels = metric._format_labels(key, extra)
+                lines.append(f"{metric.name}{suffix}{labels} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _escape_help(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+REGISTRY = _Registry()
+
+
+def render_latest() -> str:
+    """Every registered metric in the Prometheus text exposition format."""
+    return REGISTRY.render()
@@ -3,11 +3,28 @@ Parallel execution utilities with retry support.
 
 Provides utilities for processing multiple items in parallel
 with individual retry logic for each item.
+
+Every helper runs on a bounded worker pool (``parallel_stream``): at most
+``concurrency`` items are in flight, and an item's coroutine is only created
+when a worker picks it up. One gather task per input used to mean a
+500-element list spawned 500 simultaneous coroutines — a memory spike and a
+burst against whatever downstream service ``fn`` calls.
 """
 
 import asyncio
 import logging
-from typing import TypeVar, List, Callable, Awaitable, Any, Optional, Tuple, Type
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
 from dataclasses import dataclass
 
 from .retry import with_retry
@@ -17,6 +34,19 @@ logger = logging.getLogger(__name__)
 T = TypeVar("T")
 ItemT = TypeVar("ItemT")
 
+# Default in-flight cap per call. Callers fronting a process-wide semaphore
+# (image_gen_slot, REFERENCE_DOWNLOAD_SEMAPHORE) still queue there; this only
+# bounds how many coroutines one call materializes. None = one worker per item.
+DEFAULT_CONCURRENCY = 16
+
+
+class ParallelAbortedError(Exception):
+    """Recorded for items skipped or cancelled after a fatal error elsewhere."""
+
+    def __init__(self, cause: Exception):
+        super().__init__(f"Aborted after a fatal error: {type(cause).__name__}: {cause}")
+        self.cause = cause
+
 
 @dataclass
 class ParallelResult:
@@ -46,6 +76,9 @@ async def parallel_with_retry(
     retryable_exceptions: Tuple[Type[Exception], ...] = (Exception,),
     on_item_complete: Optional[Callable[[int, "ParallelResult"], None]] = None,
     should_retry: Optional[Callable[[Exception], bool]] = None,
+    concurrency: Optional[int] = DEFAULT_CONCURRENCY,
+    ordered: bool = True,
+    is_fatal: Optional[Callable[[Exception], bool]] = None,
 ) -> List[ParallelResult]:
     """
     Process items in parallel with individual retry logic for each.
@@ -70,9 +103,15 @@ async def parallel_with_retry(
             2026-08-03: "Uploaded bytes are not a valid image" retried 3
             extra times per file ("All 4 attempts failed") even though the
             error could never clear.
+        concurrency: Max items in flight at once (None = no cap)
+        ordered: Return results in input order (default) or completion order
+        is_fatal: Optional predicate; when an item's final error satisfies it,
+            in-flight items are cancelled and the rest are never started.
+            Both are reported as failures carrying ParallelAbortedError.
 
     Returns:
-        List of ParallelResult objects in the same order as input items
+        List of ParallelResult objects (in input order unless ``ordered`` is
+        False; ``index`` always maps back to the input list)
     """
 
     async def process_item(item: ItemT, index: int) -> ParallelResult:
@@ -118,19 +157,15 @@ async def parallel_with_retry(
 
         return pr
 
-    # Create tasks for all items
-    tasks = [process_item(item, i) for i, item in enumerate(items)]
-
-    # Execute all tasks in parallel
-    results = await asyncio.gather(*tasks, return_exceptions=False)
-
-    return results
+    return await _collect_settled(items, process_item, concurrency, ordered, is_fatal)
 
 
 async def parallel_map(
     items: List[ItemT],
     fn: Callable[[ItemT], Awaitable[T]],
     on_item_complete: Optional[Callable[[int, T], None]] = None,
+    concurrency: Optional[int] = DEFAULT_CONCURRENCY,
+    ordered: bool = True,
 ) -> List[T]:
     """
     Simple parallel map without retry logic.
@@ -139,12 +174,15 @@ async def parallel_map(
         items: List of items to process
         fn: Async function to apply to each item
         on_item_complete: Optional callback when each item completes
+        concurrency: Max items in flight at once (None = no cap)
+        ordered: Return results in input order (default) or completion order
 
     Returns:
-        List of results in the same order as input items
+        List of results
 
     Raises:
-        Exception if any item fails
+        The first item failure. Items still in flight are cancelled and the
+        rest are never started (gather left them running in the background).
     """
 
     async def process_item(item: ItemT, index: int) -> T:
@@ -153,13 +191,20 @@ async def parallel_map(
             on_item_complete(index, result)
         return result
 
-    tasks = [process_item(item, i) for i, item in enumerate(items)]
-    return await asyncio.gather(*tasks)
+    return [
+        result
+        async for _, result in parallel_stream(
+            items, process_item, concurrency=concurrency, ordered=ordered
+        )
+    ]
 
 
 async def parallel_map_settled(
     items: List[ItemT],
     fn: Callable[[ItemT], Awaitable[T]],
+    concurrency: Optional[int] = DEFAULT_CONCURRENCY,
+    ordered: bool = True,
+    is_fatal: Optional[Callable[[Exception], bool]] = None,
 ) -> List[ParallelResult]:
     """
     Parallel map that doesn't raise on individual failures.
@@ -169,9 +214,14 @@ async def parallel_map_settled(
     Args:
         items: List of items to process
         fn: Async function to apply to each item
+        concurrency: Max items in flight at once (None = no cap)
+        ordered: Return results in input order (default) or completion order
+        is_fatal: Optional predicate; a matching failure cancels the rest
+            (reported as ParallelAbortedError), as in parallel_with_retry
 
     Returns:
-        List of ParallelResult objects in the same order as input items
+        List of ParallelResult objects (in input order unless ``ordered`` is
+        False; ``index`` always maps back to the input list)
     """
 
     async def process_item(item: ItemT, index: int) -> ParallelResult:
@@ -189,5 +239,99 @@ async def parallel_map_settled(
                 pass
             return ParallelResult(success=False, error=e, index=index)
 
-    tasks = [process_item(item, i) for i, item in enumerate(items)]
-    return await asyncio.gather(*tasks)
+    return await _collect_settled(items, process_item, concurrency, ordered, is_fatal)
+
+
+async def parallel_stream(
+    items: List[ItemT],
+    fn: Callable[[ItemT, int], Awaitable[T]],
+    concurrency: Optional[int] = DEFAULT_CONCURRENCY,
+    ordered: bool = False,
+) -> AsyncIterator[Tuple[int, T]]:
+    """
+    Run ``fn(item, index)`` on a bounded worker pool, yielding as items finish.
+
+    ``min(concurrency, len(items))`` workers pull the next item when they
+    free up, so at most that many coroutines exist at once. Results are
+    yielded as ``(index, result)`` in completion order, or in input order
+    when ``ordered`` is True (finished items wait for their predecessors).
+    The hand-off queue holds at most ``concurrency`` results, so a slow
+    consumer pauses the workers instead of buffering everything.
+
+    The first exception raised by ``fn`` cancels the in-flight items, stops
+    the pool and propagates. Closing the generator early (``break`` inside
+    ``contextlib.aclosing``) cancels the pool the same way.
+    """
+    total = len(items)
+    if total == 0:
+        return
+    workers_count = total if concurrency is None else max(1, min(concurrency, total))
+    pending = iter(enumerate(items))
+    finished: "asyncio.Queue[Tuple[int, Any, Optional[BaseException]]]" = asyncio.Queue(
+        maxsize=workers_count
+    )
+
+    async def worker() -> None:
+        for index, item in pending:
+            try:
+                result = await fn(item, index)
+            except Exception as e:
+                await finished.put((index, None, e))
+                return
+            await finished.put((index, result, None))
+
+    workers = [asyncio.create_task(worker()) for _ in range(workers_count)]
+    buffered: Dict[int, Any] = {}
+    next_index = 0
+    try:
+        for _ in range(total):
+            index, result, error = await finished.get()
+            if error is not None:
+                raise error
+            if not ordered:
+                yield index, result
+                continue
+            buffered[index] = result
+            while next_index in buffered:
+                yield next_index, buffered.pop(next_index)
+                next_index += 1
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+
+async def _collect_settled(
+    items: List[ItemT],
+    process_item: Callable[[ItemT, int], Awaitable[ParallelResult]],
+    concurrency: Optional[int],
+    ordered: bool,
+    is_fatal: Optional[Callable[[Exception], bool]],
+) -> List[ParallelResult]:
+    """Drain ``parallel_stream`` for helpers whose items never raise.
+
+    A failure matching ``is_fatal`` stops the pool; every item without a
+    result by then is reported as a ParallelAbortedError failure.
+    """
+    results: List[ParallelResult] = []
+    fatal: Optional[Exception] = None
+    stream = parallel_stream(items, process_item, concurrency=concurrency, ordered=ordered)
+    try:
+        async for _, pr in stream:
+            results.append(pr)
+            if not pr.success and is_fatal is not None and is_fatal(pr.error):
+                fatal = pr.error
+                break
+    finally:
+        await stream.aclose()
+
+    if fatal is not None:
+        reported = {pr.index for pr in results}
+        results.extend(
+            ParallelResult(success=False, error=ParallelAbortedError(fatal), index=i)
+            for i in range(len(items))
+            if i not in reported
+        )
+        if ordered:
+            results.sort(key=lambda pr: pr.index)
+    return results
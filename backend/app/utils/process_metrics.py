@@ -9,9 +9,13 @@ is unavailable (macOS local dev).
 from __future__ import annotations
 
 import logging
+import os
 import resource
 import time
-from typing import Any, Dict, Optional
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from app.utils.metrics import Gauge
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +23,12 @@ logger = logging.getLogger(__name__)
 _MIN_LOG_INTERVAL_S = 120.0
 _last_log_at: float = 0.0
 
+# Per-phase startup durations in seconds, in the order they were recorded.
+# Filled by app/main.py (lifespan + background startup) and logged once when
+# background startup finishes, so a slow Railway deploy shows WHICH phase
+# (imports, schema probe, Pinecone, ...) ate the time.
+_startup_timings: Dict[str, float] = {}
+
 
 def get_rss_mb() -> Optional[float]:
     """Return CURRENT resident set size in megabytes, or None if unavailable.
@@ -48,6 +58,18 @@ def get_rss_mb() -> Optional[float]:
         return None
 
 
+def _rss_bytes() -> Optional[float]:
+    rss_mb = get_rss_mb()
+    return rss_mb * 1024 * 1024 if rss_mb is not None else None
+
+
+Gauge(
+    "fitcheck_process_resident_memory_bytes",
+    "Current process RSS (same source as /health rss_mb).",
+    callback=_rss_bytes,
+)
+
+
 def estimate_base64_mb(payloads: list[str]) -> float:
     """Rough decoded size estimate for base64 strings (MB)."""
     total = sum(len(p) for p in payloads if p)
@@ -75,3 +97,43 @@ def log_memory(
     if extra:
         payload.update(extra)
     logger.info("process_memory %s", payload)
+
+
+def process_uptime_seconds() -> Optional[float]:
+    """Seconds since this process was exec'd, or None where /proc is absent.
+
+    Covers interpreter start + every module import up to the call, which no
+    in-process timer can see (the earliest one starts after its own imports).
+    """
+    try:
+        with open("/proc/self/stat", "r", encoding="utf-8") as stat_file:
+            stat = stat_file.read()
+        with open("/proc/uptime", "r", encoding="utf-8") as uptime_file:
+            system_uptime = float(uptime_file.read().split()[0])
+        # Field 22 (starttime, clock ticks after boot); split after the
+        # parenthesised comm field, which may itself contain spaces.
+        start_ticks = int(stat.rsplit(")", 1)[1].split()[19])
+        return round(max(0.0, system_uptime - start_ticks / os.sysconf("SC_CLK_TCK")), 3)
+    except (FileNotFoundError, OSError, ValueError, IndexError):
+        return None
+
+
+def record_startup_phase(name: str, seconds: Optional[float]) -> None:
+    """Store one startup phase duration (None = unmeasurable, skipped)."""
+    if seconds is not None:
+        _startup_timings[name] = round(seconds, 3)
+
+
+@contextmanager
+def startup_phase(name: str) -> Iterator[None]:
+    """Time the enclosed block as startup phase ``name`` (recorded on error too)."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_startup_phase(name, time.perf_counter() - started)
+
+
+def get_startup_timings() -> Dict[str, float]:
+    """Snapshot of the startup phases recorded so far."""
+    return dict(_startup_timings)
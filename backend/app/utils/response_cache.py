@@ -0,0 +1,103 @@
+"""
+In-process cache for public, user-independent JSON responses.
+
+Built for the blog read path (app/api/v1/blog.py): anonymous crawler traffic
+asks for the same handful of lists and posts over and over, and each request
+used to be a Supabase round trip. Entries hold the response payload plus a
+strong ETag computed once at fill time, so a revalidating client
+(``If-None-Match``) gets a 304 without the payload being re-serialized.
+
+Bounded by a TTL and an LRU entry cap (search terms make the key space
+open-ended). ``clear()`` is the write-side invalidation; it bumps a
+generation counter so a fill that started before the clear — a request that
+read the old rows from the DB while an admin published — is discarded
+instead of re-caching stale data for a whole TTL::
+
+    generation = cache.generation
+    payload = await load_from_db()
+    entry = cache.put(key, payload, generation=generation)
+
+Single event loop, no awaits inside the methods: no lock needed.
+"""
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    payload: Dict[str, Any]
+    etag: str
+
+
+def compute_etag(payload: Any) -> str:
+    """Strong ETag over the canonical JSON encoding of ``payload``."""
+    body = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return '"' + hashlib.sha256(body.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """RFC 9110 weak comparison of an ``If-None-Match`` header against ``etag``."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    bare = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == bare
+        for candidate in if_none_match.split(",")
+    )
+
+
+class ResponseCache:
+    """TTL + LRU map of key -> :class:`CachedResponse`."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self.generation = 0
+        self._entries: "OrderedDict[Hashable, Tuple[float, CachedResponse]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        if self.ttl_seconds <= 0:
+            return None
+        hit = self._entries.get(key)
+        if hit is None:
+            return None
+        expires_at, entry = hit
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(
+        self,
+        key: Hashable,
+        payload: Dict[str, Any],
+        generation: Optional[int] = None,
+    ) -> CachedResponse:
+        """Cache ``payload`` under ``key`` and return its entry.
+
+        With ``generation`` (read before loading the payload), a payload
+        loaded across a ``clear()`` is returned to its caller but not stored.
+        """
+        entry = CachedResponse(payload=payload, etag=compute_etag(payload))
+        if self.ttl_seconds <= 0 or (generation is not None and generation != self.generation):
+            return entry
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, entry)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -36,6 +36,7 @@ import asyncio
 from typing import Any, Dict, List, Optional
 
 from app.core.config import settings
+from app.utils.metrics import Counter, Gauge
 
 # Deep enough to absorb a normal burst (one batch of generations), shallow
 # enough that 100 buffered base64 events per stalled client is survivable.
@@ -147,6 +148,30 @@ def event_size_bytes(event: Dict[str, Any]) -> int:
 _buffered_bytes: "Dict[asyncio.Queue, int]" = {}
 
 
+# Backlog telemetry (GET /metrics). Only queues holding events appear in the
+# ledger, so these read it directly instead of tracking subscribers twice.
+Gauge(
+    "fitcheck_sse_buffered_events",
+    "Events buffered across SSE subscriber queues.",
+    callback=lambda: sum(queue.qsize() for queue in list(_buffered_bytes)),
+)
+Gauge(
+    "fitcheck_sse_buffered_bytes",
+    "Estimated bytes buffered across SSE subscriber queues.",
+    callback=lambda: sum(_buffered_bytes.values()),
+)
+Gauge(
+    "fitcheck_sse_max_queue_depth",
+    "Deepest single SSE subscriber backlog, in events.",
+    callback=lambda: max((queue.qsize() for queue in list(_buffered_bytes)), default=0),
+)
+SSE_SUBSCRIBERS_DROPPED = Counter(
+    "fitcheck_sse_subscribers_dropped_total",
+    "SSE subscribers dropped for falling behind.",
+    ("reason",),
+)
+
+
 def note_put(queue: asyncio.Queue, size: int) -> None:
     _buffered_bytes[queue] = _buffered_bytes.get(queue, 0) + size
 
@@ -228,6 +253,7 @@ def fanout(event: Dict[str, Any], subscribers: List[asyncio.Queue]) -> List[asyn
             except Exception:  # pragma: no cover - defensive, matches prior behaviour
                 pass
             dropped.append(queue)
+            SSE_SUBSCRIBERS_DROPPED.inc(reason="bytes")
             continue
         try:
             queue.put_nowait((event, size))
@@ -239,6 +265,7 @@ def fanout(event: Dict[str, Any], subscribers: List[asyncio.Queue]) -> List[asyn
             _drain_and_drop(queue)
             queue.put_nowait((overflow_event(), 0))
             dropped.append(queue)
+            SSE_SUBSCRIBERS_DROPPED.inc(reason="events")
         except Exception:  # pragma: no cover - defensive, matches prior behaviour
             dropped.append(queue)
     return dropped
@@ -0,0 +1,58 @@
+-- FitCheck AI - Batch claim for the social import queue
+--
+-- SocialImportPipelineService._run_queue claimed one photo per loop iteration
+-- with a list + compare-and-set UPDATE (two round trips per photo, on top of
+-- the job/slot re-reads). `claim_social_import_photos` claims up to `p_limit`
+-- queued photos of a job, lowest ordinal first, in one statement:
+--
+-- * FOR UPDATE SKIP LOCKED keeps two runners (e.g. a capacity retry racing a
+--   resume on another worker) from claiming the same photo;
+-- * the outer `status = 'queued'` filter keeps the old compare-and-set
+--   semantics - a row that changed status since the inner select is skipped.
+--
+-- Photos a run claims but does not get to are handed back by the backend
+-- (a plain UPDATE to 'queued'); no RPC needed for that direction.
+--
+-- Idempotent (CREATE OR REPLACE): safe to re-run in the SQL editor.
+--
+-- Target: Supabase Postgres
+
+BEGIN;
+
+CREATE OR REPLACE FUNCTION public.claim_social_import_photos(
+    p_job_id UUID,
+    p_user_id UUID,
+    p_limit INTEGER DEFAULT 1
+)
+RETURNS SETOF public.social_import_photos AS $$
+BEGIN
+    IF p_limit <= 0 THEN
+        RAISE EXCEPTION 'Invalid social import claim limit';
+    END IF;
+
+    RETURN QUERY
+    UPDATE public.social_import_photos AS p
+    SET status = 'processing',
+        processing_started_at = NOW(),
+        updated_at = NOW()
+    WHERE p.id IN (
+        SELECT q.id
+        FROM public.social_import_photos AS q
+        WHERE q.job_id = p_job_id
+          AND q.user_id = p_user_id
+          AND q.status = 'queued'
+        ORDER BY q.ordinal ASC
+        LIMIT p_limit
+        FOR UPDATE SKIP LOCKED
+    )
+      AND p.status = 'queued'
+    RETURNING p.*;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+REVOKE EXECUTE ON FUNCTION public.claim_social_import_photos(UUID, UUID, INTEGER)
+    FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.claim_social_import_photos(UUID, UUID, INTEGER)
+    TO service_role;
+
+COMMIT;
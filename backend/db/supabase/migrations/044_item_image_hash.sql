@@ -0,0 +1,34 @@
+-- FitCheck AI - Perceptual hash per item image
+--
+-- ``POST /items/check-duplicates`` now consults a local perceptual-hash tier
+-- before spending embedding quota and a vector query: most duplicate uploads
+-- are near-identical photos of an item already in the wardrobe. The hash is
+-- computed at upload time in the same decode as the storage rendition
+-- (``backend/app/utils/image_pipeline.py``), returned by ``POST /items/upload``
+-- and stored here by ``POST /items`` / ``POST /items/{id}/images``.
+--
+-- 64-bit dHash as 16 lowercase hex chars (``backend/app/utils/image_hash.py``);
+-- text rather than BIGINT so neither SQL nor JSON has to handle the sign bit.
+-- Nullable: rows written before this migration simply never match the hash
+-- tier and fall through to the embedding path.
+--
+-- No index: the backend loads a user's hashes once and queries them from an
+-- in-process BK-tree (``backend/app/services/image_hash_index.py``).
+--
+-- Idempotent (ADD COLUMN IF NOT EXISTS / DROP CONSTRAINT IF EXISTS): safe to
+-- re-run in the SQL editor.
+--
+-- Target: Supabase Postgres
+
+BEGIN;
+
+ALTER TABLE public.item_images
+    ADD COLUMN IF NOT EXISTS image_hash TEXT;
+
+ALTER TABLE public.item_images
+    DROP CONSTRAINT IF EXISTS item_images_image_hash_format;
+ALTER TABLE public.item_images
+    ADD CONSTRAINT item_images_image_hash_format
+    CHECK (image_hash IS NULL OR image_hash ~ '^[0-9a-f]{16}$');
+
+COMMIT;
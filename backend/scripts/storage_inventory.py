@@ -271,6 +271,26 @@ def parent_stem_of_thumb(key: str) -> Optional[str]:
     return f"{head}/{stem}"
 
 
+def parent_stem_of_derived(key: str) -> Optional[str]:
+    """The extension-less parent key of any derived sibling, or None.
+
+    Covers ``_thumb`` siblings (``parent_stem_of_thumb``) and the prepared
+    avatar references written next to avatars as ``{stem}_ref_v{N}.jpg``
+    (``StorageService.avatar_reference_key_for``). Like thumbs, the reference
+    is always JPEG, so the parent is matched on its stem.
+    """
+    parent = parent_stem_of_thumb(key)
+    if parent is not None:
+        return parent
+    head, sep, name = key.rpartition("/")
+    if not sep or head.rpartition("/")[2] != "avatars" or "_ref_v" not in name:
+        return None
+    stem = name.rsplit("_ref_v", 1)[0]
+    if not stem:
+        return None
+    return f"{head}/{stem}"
+
+
 def key_stem(key: str) -> str:
     """A key with its extension removed (``u/items/abc.jpg`` -> ``u/items/abc``).
 
@@ -539,17 +559,18 @@ async def _run(
         print(f"  {len(db_keys)} distinct DB storage_path key(s)")
 
         orphans = sorted(bucket_set - set(db_keys))
-        # A `_thumb` sibling is DERIVED from a DB-referenced key (read paths
-        # materialize its URL from the parent's storage_path); it is never an
-        # orphan and must never be deleted as one. Matched on the extension-less
+        # A `_thumb` sibling (or an avatar's `_ref_v` reference) is DERIVED
+        # from a DB-referenced key (read paths materialize its URL from the
+        # parent's storage_path); it is never an orphan and must never be
+        # deleted as one. Matched on the extension-less
         # stem because thumbs are always .webp while the parent may be any format
-        # (see parent_stem_of_thumb). A set, not the db_keys list: this runs once
+        # (see parent_stem_of_derived). A set, not the db_keys list: this runs once
         # per bucket object.
         db_stems = {key_stem(key) for key in db_keys}
         orphans = [
             key
             for key in orphans
-            if (parent := parent_stem_of_thumb(key)) is None or parent not in db_stems
+            if (parent := parent_stem_of_derived(key)) is None or parent not in db_stems
         ]
         missing = sorted(set(db_keys) - bucket_set)
 
@@ -0,0 +1,49 @@
+"""Conditional GETs for the public blog through the real app: the ETag the
+cache computes round-trips as If-None-Match into a bodyless 304."""
+
+from tests.utils.fake_db import FakeDB
+
+
+def _seed(db: FakeDB) -> None:
+    db.rows["blog_posts"] = [
+        {
+            "id": "11111111-1111-1111-1111-111111111111",
+            "slug": "first-post",
+            "title": "First",
+            "excerpt": "Excerpt",
+            "content": "Full markdown content",
+            "category": "Trends",
+            "date": "2026-08-01",
+            "read_time": "5 min read",
+            "emoji": "x",
+            "keywords": [],
+            "author": "FitCheck AI",
+            "author_title": None,
+            "featured_image_url": None,
+            "is_published": True,
+            "created_at": "2026-08-01T00:00:00Z",
+            "updated_at": "2026-08-01T00:00:00Z",
+        }
+    ]
+
+
+def test_blog_endpoints_answer_if_none_match_with_304(client, db):
+    _seed(db)
+    for path in ("/api/v1/blog/posts", "/api/v1/blog/categories", "/api/v1/blog/posts/first-post"):
+        first = client.get(path)
+        assert first.status_code == 200, path
+        etag = first.headers["etag"]
+
+        revalidated = client.get(path, headers={"If-None-Match": etag})
+
+        assert revalidated.status_code == 304, path
+        assert revalidated.content == b""
+        assert revalidated.headers["etag"] == etag
+        assert revalidated.headers["cache-control"].startswith("public")
+
+
+def test_list_payload_omits_article_content(client, db):
+    _seed(db)
+    post = client.get("/api/v1/blog/posts").json()["data"]["posts"][0]
+    assert post["slug"] == "first-post"
+    assert "content" not in post
@@ -106,6 +106,30 @@ def test_schema_missing_accepts_alternative_column():
     assert "users.birth_date" not in missing
 
 
+def test_schema_missing_probes_concurrently(monkeypatch):
+    """The ~40 probes overlap instead of paying one round trip each in turn."""
+    import threading
+    import time
+
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0}
+
+    def _execute():
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time.sleep(0.01)
+        with lock:
+            state["active"] -= 1
+        return object()
+
+    db = Mock()
+    db.table.return_value.select.return_value.limit.return_value.execute.side_effect = _execute
+
+    assert main_module._schema_missing(db) == []
+    assert 1 < state["peak"] <= main_module._SCHEMA_PROBE_WORKERS
+
+
 # ---------------------------------------------------------------------------
 # _seed_schema_status_in_thread / _init_pinecone_in_thread
 # ---------------------------------------------------------------------------
@@ -117,6 +141,7 @@ async def test_seed_schema_status_logs_rpc_gaps_and_critical_bound(monkeypatch):
     monkeypatch.setattr(main_module, "_schema_missing", lambda db: ["users"])
     monkeypatch.setattr(main_module, "missing_quota_rpcs", lambda db: ["reserve_ai_usage"])
     monkeypatch.setattr(main_module, "missing_referral_rpcs", lambda db: ["redeem_referral_atomic"])
+    monkeypatch.setattr(main_module, "missing_social_import_rpcs", lambda db: ["claim_social_import_photos"])
     monkeypatch.setattr(main_module, "probe_valid_batch_size_bound", lambda db: ("critical", "bound <= 10"))
 
     await main_module._seed_schema_status_in_thread()
@@ -132,6 +157,7 @@ async def test_seed_schema_status_bound_levels(monkeypatch, level):
     monkeypatch.setattr(main_module, "_schema_missing", lambda db: [])
     monkeypatch.setattr(main_module, "missing_quota_rpcs", lambda db: [])
     monkeypatch.setattr(main_module, "missing_referral_rpcs", lambda db: [])
+    monkeypatch.setattr(main_module, "missing_social_import_rpcs", lambda db: [])
     monkeypatch.setattr(main_module, "probe_valid_batch_size_bound", lambda db: (level, f"message {level}"))
 
     await main_module._seed_schema_status_in_thread()
@@ -200,6 +226,22 @@ async def test_background_startup_logs_crash_when_logging_itself_fails(monkeypat
     logger.exception.assert_called_once()
 
 
+@pytest.mark.asyncio
+async def test_background_startup_logs_phase_timings(monkeypatch):
+    monkeypatch.setattr("app.utils.process_metrics._startup_timings", {"boot_to_lifespan": 1.5})
+    monkeypatch.setattr(main_module, "_seed_schema_status_in_thread", AsyncMock())
+    monkeypatch.setattr(main_module, "_init_pinecone_in_thread", AsyncMock())
+    monkeypatch.setattr("app.utils.process_metrics.log_memory", Mock())
+    logger = Mock()
+
+    await main_module._background_startup(logger)
+
+    timing_calls = [c for c in logger.info.call_args_list if c.args[0].startswith("Startup timings")]
+    assert len(timing_calls) == 1
+    assert "boot_to_lifespan=1.50s" in timing_calls[0].args[0]
+    assert set(timing_calls[0].kwargs["extra"]["startup_timings"]) == {"boot_to_lifespan", "background_startup"}
+
+
 # ---------------------------------------------------------------------------
 # Lifespan via context-managed TestClient
 # ---------------------------------------------------------------------------
@@ -291,3 +333,21 @@ def test_ready_endpoint_falls_back_when_check_raises(_lifespan_mocks, monkeypatc
     body = resp.json()
     assert body["status"] == "not_ready"
     assert body["schema_ready"] is False
+
+
+def test_importing_the_app_does_not_load_heavy_sdks():
+    """google.genai (~1.1s, ~35MB) and pinecone load on first use, not at boot.
+
+    Runs in a fresh interpreter: this suite's own imports already pulled both in.
+    """
+    import subprocess
+    import sys
+
+    probe = (
+        "import sys, app.main; "
+        "print(sorted(m for m in ('google.genai', 'pinecone', 'swisseph') if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", probe], capture_output=True, text=True, timeout=120, check=True
+    )
+    assert result.stdout.strip() == "[]"
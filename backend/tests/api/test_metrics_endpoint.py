@@ -0,0 +1,56 @@
+"""Contract tests for GET /metrics through the real app: disabled without
+METRICS_TOKEN, bearer-gated with it, and per-route latency labelled by route
+template rather than raw path."""
+
+from __future__ import annotations
+
+import pytest
+
+from app.core.config import settings
+
+
+@pytest.fixture
+def metrics_token(monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-secret")
+    return "scrape-secret"
+
+
+def test_metrics_is_hidden_without_a_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "")
+
+    assert client.get("/metrics").status_code == 404
+
+
+def test_metrics_rejects_a_wrong_token(client, metrics_token):
+    response = client.get("/metrics", headers={"Authorization": "Bearer nope"})
+
+    assert response.status_code == 401
+
+
+def test_metrics_serves_prometheus_text(client, metrics_token):
+    client.get("/robots.txt")
+    client.get("/api/v1/images/some-id-that-is-not-a-route/extra/segments")
+
+    response = client.get("/metrics", headers={"Authorization": f"Bearer {metrics_token}"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert 'fitcheck_http_request_duration_seconds_count{method="GET",route="/robots.txt",status="200"}' in body
+    assert 'route="unmatched",status="404"' in body
+    # The scrape itself is not recorded, and raw paths never become labels.
+    assert 'route="/metrics"' not in body
+    assert "some-id-that-is-not-a-route" not in body
+    for family in (
+        "fitcheck_semaphore_waiting",
+        "fitcheck_image_op_queue_depth",
+        "fitcheck_sse_buffered_events",
+        "fitcheck_extraction_cache_hits_total",
+        "fitcheck_db_request_duration_seconds",
+        "fitcheck_process_resident_memory_bytes",
+    ):
+        assert f"# TYPE {family} " in body
+
+
+def test_metrics_is_not_in_openapi(client):
+    assert "/metrics" not in client.get("/api/v1/openapi.json").json()["paths"]
@@ -4,10 +4,14 @@ logging, and CORS — the app-level behavior that direct-call tests bypass."""
 from __future__ import annotations
 
 import logging
+from unittest.mock import patch
 
 import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
 
-from tests.utils.auth_helpers import make_hs256_token
+from tests.utils.auth_helpers import auth_header, make_hs256_token
 
 
 # ---------------------------------------------------------------------------
@@ -80,6 +84,19 @@ def test_bearer_token_without_sub_is_ignored(client, caplog):
     assert not records_with_user, "no log record may carry a user_id without a token sub"
 
 
+def test_bearer_token_is_parsed_once_per_request(client, db):
+    """verify_token reuses the middleware's parse instead of re-reading the
+    header; the token still verifies (the profile lookup is what fails)."""
+    from app.core import security
+
+    token = make_hs256_token(sub="no-such-user")
+    with patch.object(security.jwt, "get_unverified_header", side_effect=AssertionError("re-parsed")):
+        response = client.get("/api/v1/users/me", headers=auth_header(token))
+
+    assert response.status_code == 401
+    assert response.json()["code"] == "AUTH_PROFILE_NOT_FOUND"
+
+
 # ---------------------------------------------------------------------------
 # Request logging
 # ---------------------------------------------------------------------------
@@ -124,6 +141,90 @@ def test_request_logging_skips_cors_preflights(client, caplog):
     )
 
 
+def _streaming_app(events):
+    from app.core.middleware import CorrelationIdMiddleware, RequestLoggingMiddleware
+
+    mini = FastAPI()
+
+    @mini.get("/stream")
+    async def stream():
+        async def body():
+            yield b"data: one\n\n"
+            events.append("second chunk")
+            yield b"data: two\n\n"
+
+        return StreamingResponse(body(), media_type="text/event-stream")
+
+    @mini.get("/boom")
+    async def boom():
+        raise RuntimeError("kaboom")
+
+    @mini.get("/broken-stream")
+    async def broken_stream():
+        async def body():
+            yield b"data: one\n\n"
+            raise RuntimeError("mid-stream")
+
+        return StreamingResponse(body(), media_type="text/event-stream")
+
+    mini.add_middleware(RequestLoggingMiddleware)
+    mini.add_middleware(CorrelationIdMiddleware)
+    return mini
+
+
+def test_streaming_response_passes_through_and_logs_at_response_start(caplog):
+    events = []
+    client = TestClient(_streaming_app(events))
+
+    class _Order(logging.Handler):
+        def emit(self, record):
+            if "<--" in record.getMessage():
+                events.append("response logged")
+
+    handler = _Order()
+    logging.getLogger("app.core.middleware").addHandler(handler)
+    try:
+        with caplog.at_level(logging.INFO, logger="app.core.middleware"):
+            response = client.get("/stream", headers={"X-Correlation-ID": "sse-1"})
+    finally:
+        logging.getLogger("app.core.middleware").removeHandler(handler)
+
+    assert response.status_code == 200
+    assert response.text == "data: one\n\ndata: two\n\n"
+    assert response.headers["X-Correlation-ID"] == "sse-1"
+    assert response.headers["content-type"].startswith("text/event-stream")
+    # Logged when the stream opened, not after it finished.
+    assert events == ["response logged", "second chunk"]
+
+
+def test_unhandled_exception_is_logged_and_observed(caplog):
+    from app.utils.metrics import REGISTRY
+
+    histogram = REGISTRY.get("fitcheck_http_request_duration_seconds")
+    before = histogram.count(method="GET", route="/boom", status="exception")
+    client = TestClient(_streaming_app([]), raise_server_exceptions=False)
+
+    with caplog.at_level(logging.INFO, logger="app.core.middleware"):
+        response = client.get("/boom")
+
+    assert response.status_code == 500
+    assert any(
+        "EXCEPTION" in r.getMessage() and "RuntimeError: kaboom" in r.getMessage() for r in caplog.records
+    )
+    assert histogram.count(method="GET", route="/boom", status="exception") == before + 1
+
+
+def test_failure_mid_stream_keeps_the_logged_status(caplog):
+    client = TestClient(_streaming_app([]), raise_server_exceptions=False)
+
+    with caplog.at_level(logging.INFO, logger="app.core.middleware"):
+        client.get("/broken-stream")
+
+    messages = [r.getMessage() for r in caplog.records]
+    assert any("/broken-stream | 200" in m for m in messages)
+    assert not any("EXCEPTION" in m for m in messages)
+
+
 # ---------------------------------------------------------------------------
 # CORS
 # ---------------------------------------------------------------------------
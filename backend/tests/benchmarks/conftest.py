@@ -0,0 +1,130 @@
+"""Fixtures and session plumbing for the hot-path benchmarks.
+
+The suite is opt-in — every test here is skipped unless ``--benchmark`` is
+passed — so the default ``pytest`` gate stays fast and timing-independent.
+Run it without coverage (a tracer slows CPU-bound code several-fold)::
+
+    pytest tests/benchmarks --benchmark --no-cov
+    pytest tests/benchmarks --benchmark --no-cov --benchmark-save   # refresh baselines
+
+Under an active tracer results are reported but never enforced or saved.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, List
+
+import pytest
+
+from tests.benchmarks.harness import (
+    DEFAULT_TOLERANCE,
+    BaselineStore,
+    Benchmark,
+    BenchmarkResult,
+    measure_calibration,
+    tracer_active,
+)
+from tests.utils.fake_db import FakeBuilder, FakeDB
+
+_results: List[BenchmarkResult] = []
+# Captured when the first benchmark starts: coverage has already stopped
+# tracing by the time sessionfinish / terminal_summary run.
+_run: Dict[str, Any] = {}
+
+
+@pytest.fixture(scope="session")
+def _benchmark_session(request):
+    if not request.config.getoption("--benchmark"):
+        pytest.skip("benchmarks are opt-in: pass --benchmark")
+    _run.update(traced=tracer_active(), calibration=measure_calibration())
+    return {
+        "store": BaselineStore(),
+        "calibration": _run["calibration"],
+        "tolerance": request.config.getoption("--benchmark-tolerance") or DEFAULT_TOLERANCE,
+        "enforce": not request.config.getoption("--benchmark-save") and not _run["traced"],
+    }
+
+
+@pytest.fixture
+def benchmark(request, _benchmark_session) -> Benchmark:
+    """Times the code under test; the test's function name is its baseline key."""
+    return Benchmark(
+        request.node.name,
+        _benchmark_session["store"],
+        _benchmark_session["calibration"],
+        _benchmark_session["tolerance"],
+        _results,
+        enforce=_benchmark_session["enforce"],
+    )
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if _results and session.config.getoption("--benchmark-save") and not _run["traced"]:
+        BaselineStore().save(_results, _run["calibration"])
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    if not _results:
+        return
+    terminalreporter.section("benchmarks")
+    if _run["traced"]:
+        terminalreporter.write_line(
+            "coverage/tracer active: timings reported only (re-run with --no-cov to compare or save)"
+        )
+    for result in _results:
+        baseline = "no baseline" if result.baseline is None else f"baseline {result.baseline * 1000:9.2f}ms"
+        flag = "  REGRESSED" if result.regressed and not _run["traced"] else ""
+        terminalreporter.write_line(
+            f"{result.name:<55} {result.median * 1000:9.2f}ms  {baseline}{flag}"
+        )
+    if config.getoption("--benchmark-save") and not _run["traced"]:
+        terminalreporter.write_line(f"baselines written to {BaselineStore().path}")
+
+
+# ---------------------------------------------------------------------------
+# Fakes with simulated latency
+# ---------------------------------------------------------------------------
+
+# Round-trip latencies injected into the fakes. Real values vary; what the
+# latency-bound benchmarks pin is how many of these the code pays serially.
+DB_LATENCY_SECONDS = 0.02
+STORAGE_LATENCY_SECONDS = 0.01
+AI_LATENCY_SECONDS = 0.05
+
+
+class _SlowBuilder(FakeBuilder):
+    """FakeBuilder whose ``execute`` pays a PostgREST round trip (in the
+    worker thread, as the real sync client does) and whose ``not_`` is a
+    property like postgrest-py's."""
+
+    @property
+    def not_(self):  # noqa: A003 - mirrors the real client attribute name
+        return self._not
+
+    def execute(self):
+        time.sleep(DB_LATENCY_SECONDS)
+        return super().execute()
+
+
+class SlowFakeDB(FakeDB):
+    def table(self, name: str) -> _SlowBuilder:
+        return _SlowBuilder(self, name)
+
+
+@pytest.fixture
+def slow_storage(monkeypatch):
+    """Presigned-URL minting with a network round trip per key."""
+    import asyncio
+
+    from app.core.config import settings
+    from app.services.storage_service import StorageService
+
+    async def _get_public_url(key: str) -> str:
+        await asyncio.sleep(STORAGE_LATENCY_SECONDS)
+        return f"https://bucket.example.com/{key}?sig=x"
+
+    monkeypatch.setattr(settings, "IMAGE_SERVING_MODE", "presigned")
+    monkeypatch.setattr(settings, "THUMBNAIL_SERVING", True)
+    monkeypatch.setattr(settings, "THUMBNAILS_BACKFILLED", True)
+    monkeypatch.setattr(StorageService, "get_public_url", staticmethod(_get_public_url))
@@ -0,0 +1,192 @@
+"""Timing harness for the hot-path benchmarks (pytest-benchmark style).
+
+A benchmark calls the ``benchmark`` fixture with the code under test; the
+harness runs it for warm-up + measured rounds, keeps the median, and compares
+it against the stored baseline in ``baselines.json``::
+
+    def test_fanout(benchmark):
+        benchmark(fanout, event, subscribers)
+
+    def test_pipeline(benchmark):
+        benchmark.run_async(lambda: service.run_pipeline(make_job()), cpu_bound=False)
+
+Baselines are machine-dependent, so each saved file also records a
+calibration time (a fixed pure-Python workload). CPU-bound benchmarks are
+compared after scaling by ``current calibration / saved calibration``;
+latency-bound ones (fakes with simulated network delay, where the number
+measures how much of that delay is overlapped) are compared as-is.
+
+Deliberately in-house rather than a pytest-benchmark dependency: a median, a
+baseline file and a tolerance are all the suite needs.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import pytest
+
+BASELINES_PATH = Path(__file__).with_name("baselines.json")
+
+# A median slower than baseline x this fails the benchmark. Generous on
+# purpose: the point is catching a lost gather or an accidental quadratic
+# (3x-40x), not scheduler noise between runs.
+DEFAULT_TOLERANCE = 2.0
+
+
+def _calibration_workload() -> int:
+    total = 0
+    table: Dict[str, int] = {}
+    for i in range(60_000):
+        key = f"k{i % 512}"
+        table[key] = table.get(key, 0) + i
+        total += len(key)
+    return total
+
+
+def measure_calibration(rounds: int = 5) -> float:
+    """Median seconds for a fixed workload: this machine's speed right now."""
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        _calibration_workload()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def tracer_active() -> bool:
+    """True under coverage/debuggers, which slow CPU-bound code several-fold."""
+    if sys.gettrace() is not None:
+        return True
+    monitoring = getattr(sys, "monitoring", None)
+    return monitoring is not None and monitoring.get_tool(monitoring.COVERAGE_ID) is not None
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    median: float
+    rounds: int
+    cpu_bound: bool
+    baseline: Optional[float] = None
+    limit: Optional[float] = None
+
+    @property
+    def regressed(self) -> bool:
+        return self.limit is not None and self.median > self.limit
+
+
+class BaselineStore:
+    """``baselines.json``: ``{"calibration_seconds": s, "benchmarks": {name: {...}}}``."""
+
+    def __init__(self, path: Path = BASELINES_PATH):
+        self.path = path
+        try:
+            data = json.loads(path.read_text())
+        except FileNotFoundError:
+            data = {}
+        self.calibration: Optional[float] = data.get("calibration_seconds")
+        self.benchmarks: Dict[str, Dict[str, Any]] = data.get("benchmarks", {})
+
+    def save(self, results: List[BenchmarkResult], calibration: float) -> None:
+        benchmarks = dict(self.benchmarks)
+        for result in results:
+            benchmarks[result.name] = {
+                "median_seconds": round(result.median, 6),
+                "cpu_bound": result.cpu_bound,
+            }
+        payload = {
+            "calibration_seconds": round(calibration, 6),
+            "benchmarks": dict(sorted(benchmarks.items())),
+        }
+        self.path.write_text(json.dumps(payload, indent=2) + "\n")
+
+
+class Benchmark:
+    """The ``benchmark`` fixture: times one callable per test."""
+
+    def __init__(
+        self,
+        name: str,
+        store: BaselineStore,
+        calibration: float,
+        tolerance: float,
+        results: List[BenchmarkResult],
+        enforce: bool = True,
+    ):
+        self.name = name
+        self._store = store
+        self._calibration = calibration
+        self._tolerance = tolerance
+        self._results = results
+        self._enforce = enforce
+
+    def __call__(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        rounds: int = 20,
+        warmup: int = 2,
+        cpu_bound: bool = True,
+        **kwargs: Any,
+    ) -> Any:
+        """Time ``fn(*args, **kwargs)``; returns the last call's result."""
+        result = None
+        samples = []
+        for index in range(warmup + rounds):
+            started = time.perf_counter()
+            result = fn(*args, **kwargs)
+            if index >= warmup:
+                samples.append(time.perf_counter() - started)
+        self._record(samples, cpu_bound)
+        return result
+
+    def run_async(
+        self,
+        make_coro: Callable[[], Awaitable[Any]],
+        *,
+        rounds: int = 5,
+        warmup: int = 1,
+        cpu_bound: bool = False,
+    ) -> Any:
+        """Time ``await make_coro()`` on one event loop (a fresh coroutine per round)."""
+
+        async def _rounds():
+            result = None
+            samples = []
+            for index in range(warmup + rounds):
+                started = time.perf_counter()
+                result = await make_coro()
+                if index >= warmup:
+                    samples.append(time.perf_counter() - started)
+            return result, samples
+
+        result, samples = asyncio.run(_rounds())
+        self._record(samples, cpu_bound)
+        return result
+
+    def _record(self, samples: List[float], cpu_bound: bool) -> None:
+        median = statistics.median(samples)
+        outcome = BenchmarkResult(self.name, median, len(samples), cpu_bound)
+        saved = self._store.benchmarks.get(self.name)
+        if saved is not None:
+            baseline = saved["median_seconds"]
+            if cpu_bound and self._store.calibration:
+                baseline *= self._calibration / self._store.calibration
+            outcome.baseline = baseline
+            outcome.limit = baseline * self._tolerance
+        self._results.append(outcome)
+        if self._enforce and outcome.regressed:
+            pytest.fail(
+                f"{self.name} regressed: median {median * 1000:.2f}ms > "
+                f"{outcome.limit * 1000:.2f}ms (baseline {outcome.baseline * 1000:.2f}ms "
+                f"x {self._tolerance})",
+                pytrace=False,
+            )
@@ -0,0 +1,222 @@
+"""Hot-path benchmarks against the test fakes (opt-in: ``--benchmark``).
+
+CPU-bound paths (JSON scanning, SSE fan-out, matting) are timed directly.
+I/O-bound paths (match, URL materialization, the batch pipeline) run against
+fakes with simulated round-trip latency (see ``conftest.py``), so what they
+pin is concurrency structure: a lost ``gather`` turns one round trip into
+forty, which no unit test asserts on.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+from PIL import Image, ImageDraw
+
+from tests.benchmarks.conftest import AI_LATENCY_SECONDS, SlowFakeDB
+
+USER_ID = "11111111-1111-1111-1111-111111111111"
+
+
+# ---------------------------------------------------------------------------
+# CPU-bound
+# ---------------------------------------------------------------------------
+
+
+def _extraction_response(items: int) -> str:
+    payload = {
+        "items": [
+            {
+                "name": f"Garment {i}",
+                "category": "tops",
+                "colors": ["navy", "white"],
+                "description": 'Cotton shirt, 5\'10" model, logo reads "{FC}"',
+                "bbox": [0.1, 0.2, 0.5, 0.9],
+            }
+            for i in range(items)
+        ]
+    }
+    return "Here is what I found:\n```json\n" + json.dumps(payload) + "\n```\nLet me know {more}."
+
+
+def test_extract_json_block_large_response(benchmark):
+    from app.utils.json_utils import extract_json_block
+
+    text = _extraction_response(200)
+    block = benchmark(extract_json_block, text, rounds=50)
+    assert len(json.loads(block)["items"]) == 200
+
+
+def test_extract_json_block_malformed_prose(benchmark):
+    from app.utils.json_utils import extract_json_block
+
+    # Truncated output with many openers: the shape that used to go quadratic.
+    text = 'prose "' + '{"a": [1, {"b": "c' * 2_000
+
+    def scan():
+        try:
+            return extract_json_block(text)
+        except ValueError:
+            return None
+
+    benchmark(scan, rounds=20)
+
+
+def test_sse_fanout_to_many_subscribers(benchmark):
+    from app.utils.sse_queue import discard_subscriber, fanout
+
+    subscribers = [asyncio.Queue(maxsize=100) for _ in range(50)]
+    events = [
+        {"type": "item_generation_complete", "data": {"temp_id": f"t{i}", "image_base64": "A" * 64_000}}
+        for i in range(20)
+    ]
+
+    def fan_out_and_drain():
+        dropped = 0
+        for event in events:
+            dropped += len(fanout(event, subscribers))
+        for queue in subscribers:
+            discard_subscriber(queue)
+        return dropped
+
+    assert benchmark(fan_out_and_drain, rounds=20) == 0
+
+
+def test_remove_white_background_product_shot(benchmark):
+    from app.utils.background_removal import remove_white_background
+
+    img = Image.new("RGB", (1024, 1024), (255, 255, 255))
+    ImageDraw.Draw(img).rounded_rectangle((260, 160, 780, 900), radius=60, fill=(38, 44, 61))
+    buf = io.BytesIO()
+    img.save(buf, format="JPEG", quality=92)
+    source = buf.getvalue()
+
+    result = benchmark(remove_white_background, source, rounds=5, warmup=1)
+    assert result.status == "matted"
+
+
+# ---------------------------------------------------------------------------
+# Latency-bound (fakes with simulated round trips)
+# ---------------------------------------------------------------------------
+
+
+def _item_row(index: int, category: str) -> Dict[str, Any]:
+    return {
+        "id": f"item-{index}",
+        "user_id": USER_ID,
+        "name": f"Item {index}",
+        "category": category,
+        "colors": ["black"] if index % 2 else ["white"],
+        "condition": "clean",
+        "is_deleted": False,
+        "item_images": [
+            {"id": f"img-{index}", "storage_path": f"{USER_ID}/items/{index}.webp", "is_primary": True}
+        ],
+    }
+
+
+def test_match_items_against_a_full_wardrobe(benchmark, slow_storage):
+    from app.api.v1 import recommendations
+    from app.api.v1.recommendations import MatchRequest
+
+    categories = ("tops", "bottoms", "shoes", "outerwear", "accessories")
+    db = SlowFakeDB(rows={"items": [_item_row(i, categories[i % 5]) for i in range(300)]})
+
+    async def match():
+        return await recommendations.match_items(
+            MatchRequest(item_ids=["item-0"]), category=None, limit=20, min_score=0, user_id=USER_ID, db=db
+        )
+
+    result = benchmark.run_async(match)
+    assert len(result["data"]["matches"]) == 20
+
+
+def test_materialize_image_urls_for_a_page(benchmark, slow_storage):
+    from app.api.v1.images import materialize_image_urls
+
+    def page() -> List[Dict[str, Any]]:
+        return [{"storage_path": f"{USER_ID}/items/{i}.webp"} for i in range(40)]
+
+    result = benchmark.run_async(lambda: materialize_image_urls(page()), rounds=10)
+    assert all(img["thumbnail_url"].endswith("_thumb.webp?sig=x") for img in result)
+
+
+def test_batch_pipeline_overlapped_extract_and_generate(benchmark):
+    from app.core.concurrency import EXTRACTION_SEMAPHORE, image_gen_slot, timed_acquire
+    from app.services.batch_extraction_service import BatchExtractionService
+    from app.services.batch_job_service import (
+        BatchImageData,
+        BatchJob,
+        BatchJobService,
+        BatchJobStatus,
+    )
+
+    async def fake_extract(self, job, image_id, image_base64, agent, **kwargs):
+        async with timed_acquire(EXTRACTION_SEMAPHORE, "extraction"):
+            await asyncio.sleep(AI_LATENCY_SECONDS)
+        items = [
+            {"temp_id": f"{image_id}-{n}", "category": "tops", "colors": ["black"], "confidence": 0.9}
+            for n in range(3)
+        ]
+        added = await BatchJobService.add_detected_items(job.job_id, image_id, items)
+        await BatchJobService.broadcast_event(
+            job.job_id, "image_extraction_complete", {"image_id": image_id, "items": items}
+        )
+        await kwargs["on_items_ready"](added)
+        return items
+
+    async def fake_generate(self, job, item, agent, reference_image_base64):
+        async with image_gen_slot():
+            await asyncio.sleep(AI_LATENCY_SECONDS)
+        await BatchJobService.update_item_generation(job.job_id, item.temp_id, generated_image_base64="ZmFrZQ==")
+        return "ZmFrZQ=="
+
+    async def run_job():
+        images = {
+            f"img-{i}": BatchImageData(image_id=f"img-{i}", image_base64="dGVzdA==", filename=f"{i}.jpg")
+            for i in range(6)
+        }
+        job = BatchJob(
+            job_id=str(uuid4()),
+            user_id=USER_ID,
+            status=BatchJobStatus.PENDING,
+            created_at=datetime.now(timezone.utc),
+            auto_generate=True,
+            generation_batch_size=5,
+            images=images,
+        )
+        async with BatchJobService._lock:
+            BatchJobService._jobs[job.job_id] = job
+        try:
+            await BatchExtractionService(user_id=USER_ID, db=MagicMock()).run_pipeline(job)
+        finally:
+            async with BatchJobService._lock:
+                BatchJobService._jobs.pop(job.job_id, None)
+        return job
+
+    with (
+        patch.object(BatchExtractionService, "_extract_single_image", fake_extract),
+        patch.object(BatchExtractionService, "_generate_single_item", fake_generate),
+        patch.object(BatchExtractionService, "_fetch_user_avatar_base64", AsyncMock(return_value=None)),
+        patch.object(BatchExtractionService, "_cache_extraction_results", AsyncMock()),
+        patch(
+            "app.services.batch_extraction_service.get_item_extraction_agent",
+            AsyncMock(return_value=MagicMock()),
+        ),
+        patch(
+            "app.services.batch_extraction_service.get_image_generation_agent",
+            AsyncMock(return_value=MagicMock()),
+        ),
+        patch.object(BatchJobService, "release_image_payloads", AsyncMock()),
+        patch.object(BatchJobService, "clear_event_history", AsyncMock()),
+    ):
+        job = benchmark.run_async(run_job, rounds=3)
+
+    assert job.status == BatchJobStatus.COMPLETED
+    assert len(job.generation_completed) == 18
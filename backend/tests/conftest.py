@@ -95,6 +95,59 @@ def _block_network(monkeypatch, request):
     yield
 
 
+@pytest.fixture(autouse=True)
+def _reset_response_caches():
+    """Start every test with empty in-process response caches.
+
+    The public blog routes, the photoshoot scene-plan cache, the AI settings
+    snapshots and resolved credentials, the prepared avatar references and
+    the provider circuit-breaker state, the Gemini pacers, the remote image
+    fetcher, the duplicate-check hash index and the adaptive concurrency limits keep their state at module level; without a reset, one test's rows would be
+    served to the next test asking for the same key. Only clears modules that
+    are already imported.
+    """
+    blog = sys.modules.get("app.api.v1.blog")
+    if blog is not None:
+        blog.invalidate_blog_cache()
+    photoshoot = sys.modules.get("app.services.photoshoot_service")
+    if photoshoot is not None:
+        photoshoot._prompt_plan_cache.clear()
+    ai_settings = sys.modules.get("app.services.ai_settings_service")
+    if ai_settings is not None:
+        ai_settings._credential_cache.clear()
+        ai_settings._settings_snapshots.clear()
+        ai_settings._provisioned_rows.clear()
+        ai_settings._fernets = None
+    avatar = sys.modules.get("app.services.avatar_reference_service")
+    if avatar is not None:
+        avatar.AvatarReferenceService._cache.clear()
+        avatar.AvatarReferenceService._inflight.clear()
+    health = sys.modules.get("app.services.ai_provider_health_service")
+    if health is not None:
+        health.get_health_service().clear_cache()
+    gemini = sys.modules.get("app.services.gemini_provider")
+    if gemini is not None:
+        gemini.clear_rate_pacers()
+    fetcher_module = sys.modules.get("app.services.remote_image_fetcher")
+    if fetcher_module is not None:
+        # Client and semaphore bind to the test's event loop: rebuild lazily.
+        fetcher = fetcher_module.get_remote_image_fetcher()
+        fetcher.clear_cache()
+        fetcher._inflight.clear()
+        fetcher._client = fetcher._semaphore = None
+    hash_index = sys.modules.get("app.services.image_hash_index")
+    if hash_index is not None:
+        hash_index.get_image_hash_index().clear()
+    concurrency = sys.modules.get("app.core.concurrency")
+    if concurrency is not None:
+        for limiter in (concurrency.EXTRACTION_SEMAPHORE, concurrency.GENERATION_SEMAPHORE):
+            if isinstance(limiter, concurrency.AdaptiveLimiter):
+                limiter.limit = float(limiter.max_limit)
+                limiter._last_decrease = float("-inf")
+                limiter._latency_ewma = limiter._latency_baseline = None
+    yield
+
+
 # ---------------------------------------------------------------------------
 # Database doubles — the suite's "fresh database"
 # ---------------------------------------------------------------------------
@@ -133,3 +186,33 @@ def anon_db() -> Mock:
 def service_db() -> Mock:
     """Fresh mock of the service-role Supabase client (admin auth lookups)."""
     return Mock()
+
+
+# ---------------------------------------------------------------------------
+# Benchmark suite switches (tests/benchmarks/, opt-in)
+# ---------------------------------------------------------------------------
+
+
+def pytest_addoption(parser):
+    # Registered here, not in tests/benchmarks/conftest.py: pytest only reads
+    # options from conftests it loads at startup, and a bare `pytest` does
+    # not load subdirectory conftests until collection.
+    group = parser.getgroup("benchmark", "hot-path benchmarks (tests/benchmarks/)")
+    group.addoption(
+        "--benchmark",
+        action="store_true",
+        default=False,
+        help="Run tests/benchmarks/ (skipped otherwise) and compare against baselines.json.",
+    )
+    group.addoption(
+        "--benchmark-save",
+        action="store_true",
+        default=False,
+        help="With --benchmark: write this run's medians to baselines.json instead of comparing.",
+    )
+    group.addoption(
+        "--benchmark-tolerance",
+        type=float,
+        default=None,
+        help="Fail when a median exceeds baseline x this factor (default 2.0).",
+    )
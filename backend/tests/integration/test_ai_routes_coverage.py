@@ -175,7 +175,9 @@ async def test_provider_ready_avatar_url_rejects_non_https_external_url(monkeypa
 async def test_fetch_user_avatar_base64_downloads_stored_avatar(monkeypatch):
     db = FakeDB(rows={"users": [user_row(id=USER_ID, avatar_url=OWNED_AVATAR)]})
     monkeypatch.setattr(
-        StorageService, "download_to_base64", staticmethod(AsyncMock(return_value="b64-avatar"))
+        StorageService,
+        "download_and_downscale_to_base64",
+        staticmethod(AsyncMock(return_value="b64-avatar")),
     )
 
     avatar = await ai_module._fetch_user_avatar_base64(USER_ID, db)
@@ -202,7 +204,7 @@ async def test_fetch_user_avatar_base64_download_failure_returns_none(monkeypatc
     db = FakeDB(rows={"users": [user_row(id=USER_ID, avatar_url=OWNED_AVATAR)]})
     monkeypatch.setattr(
         StorageService,
-        "download_to_base64",
+        "download_and_downscale_to_base64",
         staticmethod(AsyncMock(side_effect=RuntimeError("storage down"))),
     )
 
@@ -413,9 +415,10 @@ async def test_generate_outfit_with_avatar_and_body_profile(monkeypatch):
     )
     _fake_agent(monkeypatch, "generate_outfit", result=_outfit_result())
     monkeypatch.setattr(
-        StorageService, "download_to_base64", staticmethod(AsyncMock(return_value="raw-avatar"))
+        StorageService,
+        "download_and_downscale_to_base64",
+        staticmethod(AsyncMock(return_value="raw-avatar-downscaled")),
     )
-    monkeypatch.setattr(ai_module, "downscale_base64_image", lambda b64: f"{b64}-downscaled")
     monkeypatch.setattr(
         ai_module,
         "resolve_outfit_item_references",
@@ -460,7 +463,7 @@ async def test_generate_outfit_avatar_download_returns_none(monkeypatch):
     db = FakeDB(rows={"users": [user_row(id=USER_ID, avatar_url=OWNED_AVATAR)]})
     _fake_agent(monkeypatch, "generate_outfit", result=_outfit_result())
     monkeypatch.setattr(
-        StorageService, "download_to_base64", staticmethod(AsyncMock(return_value=None))
+        StorageService, "download_and_downscale_to_base64", staticmethod(AsyncMock(return_value=None))
     )
     monkeypatch.setattr(
         ai_module,
@@ -487,9 +490,10 @@ async def test_generate_outfit_body_profile_disabled(monkeypatch):
     )
     _fake_agent(monkeypatch, "generate_outfit", result=_outfit_result())
     monkeypatch.setattr(
-        StorageService, "download_to_base64", staticmethod(AsyncMock(return_value="raw-avatar"))
+        StorageService,
+        "download_and_downscale_to_base64",
+        staticmethod(AsyncMock(return_value="raw-avatar-downscaled")),
     )
-    monkeypatch.setattr(ai_module, "downscale_base64_image", lambda b64: f"{b64}-downscaled")
     monkeypatch.setattr(
         ai_module,
         "resolve_outfit_item_references",
@@ -516,9 +520,10 @@ async def test_generate_outfit_body_profile_row_missing(monkeypatch):
     )
     _fake_agent(monkeypatch, "generate_outfit", result=_outfit_result())
     monkeypatch.setattr(
-        StorageService, "download_to_base64", staticmethod(AsyncMock(return_value="raw-avatar"))
+        StorageService,
+        "download_and_downscale_to_base64",
+        staticmethod(AsyncMock(return_value="raw-avatar-downscaled")),
     )
-    monkeypatch.setattr(ai_module, "downscale_base64_image", lambda b64: f"{b64}-downscaled")
     monkeypatch.setattr(
         ai_module,
         "resolve_outfit_item_references",
@@ -540,7 +545,7 @@ async def test_generate_outfit_avatar_download_failure_falls_back_to_generic_mod
     _fake_agent(monkeypatch, "generate_outfit", result=_outfit_result())
     monkeypatch.setattr(
         StorageService,
-        "download_to_base64",
+        "download_and_downscale_to_base64",
         staticmethod(AsyncMock(side_effect=RuntimeError("storage down"))),
     )
     monkeypatch.setattr(
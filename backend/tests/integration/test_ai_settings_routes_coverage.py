@@ -10,7 +10,7 @@ Follows the house convention of calling route functions directly with
 tests.utils.fake_db.FakeDB and patching AISettingsService staticmethods.
 """
 from types import SimpleNamespace
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, Mock
 
 import pytest
 
@@ -393,12 +393,14 @@ async def test_reset_provider_config_removes_stored_config(monkeypatch):
             return_value={"provider_configs": {"custom": {"api_key_encrypted": "enc"}, "gemini": {}}}
         ),
     )
+    monkeypatch.setattr(AISettingsService, "invalidate_settings", Mock())
     db = FakeDB()
 
     result = await ai_settings_module.reset_provider_config("custom", user_id=USER_ID, db=db)
 
     assert result["data"] == {"provider": "custom", "reset": True}
     assert db.updates == [("user_ai_settings", {"provider_configs": {"gemini": {}}})]
+    AISettingsService.invalidate_settings.assert_called_once_with(USER_ID)
 
 
 @pytest.mark.asyncio
@@ -163,3 +163,112 @@ async def test_get_post_missing_is_not_cacheable():
         await blog_module.get_post(slug="missing-post", db=db, response=response)
 
     assert "Cache-Control" not in response.headers
+
+
+# ---------------------------------------------------------------------------
+# Summary projection + server-side response cache (2026-10-19)
+# ---------------------------------------------------------------------------
+
+
+def _request(if_none_match=None) -> Mock:
+    request = Mock()
+    request.headers = {"if-none-match": if_none_match} if if_none_match else {}
+    return request
+
+
+@pytest.mark.asyncio
+async def test_list_posts_projects_summary_columns_only():
+    db, query = _chain_db([_post_row("first-post")], count=1)
+
+    await blog_module.list_posts(
+        params=BlogPostListParams(page=1, page_size=12), db=db, response=Response()
+    )
+
+    columns = query.select.call_args.args[0].split(",")
+    assert "content" not in columns
+    assert {"slug", "title", "excerpt", "featured_image_url"} <= set(columns)
+    assert query.select.call_args.kwargs == {"count": "exact"}
+
+
+@pytest.mark.asyncio
+async def test_repeat_list_is_served_from_cache_with_stable_etag():
+    db, query = _chain_db([_post_row("first-post")], count=1)
+    params = BlogPostListParams(page=1, page_size=12)
+    first, second = Response(), Response()
+
+    await blog_module.list_posts(params=params, db=db, response=first)
+    result = await blog_module.list_posts(params=params, db=db, response=second)
+
+    assert query.execute.call_count == 1
+    assert result["data"]["posts"][0]["slug"] == "first-post"
+    assert first.headers["ETag"] == second.headers["ETag"]
+    assert second.headers["Cache-Control"] == CACHE_CONTROL
+
+
+@pytest.mark.asyncio
+async def test_matching_if_none_match_returns_304_without_body():
+    db, query = _chain_db([{"category": "Trends"}])
+    first = Response()
+    await blog_module.get_categories(db=db, response=first)
+
+    result = await blog_module.get_categories(
+        db=db, response=Response(), request=_request(first.headers["ETag"])
+    )
+
+    assert result.status_code == 304
+    assert result.body == b""
+    assert result.headers["ETag"] == first.headers["ETag"]
+    assert result.headers["Cache-Control"] == CACHE_CONTROL
+    assert query.execute.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_if_none_match_gets_the_full_payload():
+    db, _query = _chain_db([{"category": "Trends"}])
+
+    result = await blog_module.get_categories(
+        db=db, response=Response(), request=_request('"not-the-current-etag"')
+    )
+
+    assert result["data"]["categories"] == ["Trends"]
+
+
+@pytest.mark.asyncio
+async def test_missing_post_is_not_cached():
+    single_result = Mock()
+    single_result.data = None
+    query = Mock()
+    query.select.return_value = query
+    query.eq.return_value = query
+    query.single.return_value = query
+    query.execute.return_value = single_result
+    db = Mock()
+    db.table.return_value = query
+
+    for _ in range(2):
+        with pytest.raises(NotFoundError):
+            await blog_module.get_post(slug="missing-post", db=db, response=Response())
+
+    assert query.execute.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_fill_that_races_an_invalidation_is_not_cached():
+    """A list read from the DB before an admin write lands must not be cached
+    after the write's invalidation, or the old list would be served for a
+    whole TTL."""
+    db, query = _chain_db([_post_row("old-post")], count=1)
+    real_execute = query.execute.side_effect
+
+    def execute_then_publish():
+        blog_module.invalidate_blog_cache()  # admin write lands mid-request
+        return query
+
+    query.execute.side_effect = execute_then_publish
+    params = BlogPostListParams(page=1, page_size=12)
+    result = await blog_module.list_posts(params=params, db=db, response=Response())
+    assert result["data"]["posts"][0]["slug"] == "old-post"
+
+    query.execute.side_effect = real_execute
+    await blog_module.list_posts(params=params, db=db, response=Response())
+    assert query.execute.call_count == 2
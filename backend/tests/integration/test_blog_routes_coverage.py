@@ -532,3 +532,29 @@ async def test_list_all_posts_denied_for_non_admin():
             user={"id": "u1", "role": "user"},
             db=db,
         )
+
+
+# =============================================================================
+# Response-cache invalidation on admin writes
+# =============================================================================
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("write", ["create", "update", "delete"])
+async def test_admin_writes_invalidate_public_cache(write):
+    db = FakeDB(rows={"blog_posts": [_post_row("first-post")]}, insert_defaults=_write_defaults())
+    params = BlogPostListParams(page=1, page_size=10)
+    await blog_module.list_posts(params=params, db=db, response=Response())
+    await blog_module.get_post(slug="first-post", db=db, response=Response())
+    assert len(blog_module._blog_cache) == 2
+
+    if write == "create":
+        await blog_module.create_post(post_data=_create_data(), user=ADMIN, db=db)
+    elif write == "update":
+        await blog_module.update_post(
+            slug="first-post", post_data=BlogPostUpdate(title="Retitled"), user=ADMIN, db=db
+        )
+    else:
+        await blog_module.delete_post(slug="first-post", user=ADMIN, db=db)
+
+    assert len(blog_module._blog_cache) == 0
@@ -20,13 +20,16 @@ from typing import Any, Dict, List, Optional
 from unittest.mock import AsyncMock, Mock
 
 import pytest
+from pydantic import ValidationError as PydanticValidationError
 
 from app.api.v1 import items as items_module
 from app.core.exceptions import (
     AIServiceError,
     DatabaseError,
     ImageNotFoundError,
+    InvalidInputError,
     ItemNotFoundError,
+    PermissionDeniedError,
     RateLimitError,
     StorageServiceError,
     UnsupportedMediaTypeError,
@@ -227,6 +230,7 @@ async def test_upload_item_images_uploads_all_files_in_parallel(monkeypatch):
             "image_url": f"https://cdn/{kwargs['filename']}",
             "thumbnail_url": f"https://cdn/{kwargs['filename']}-t.jpg",
             "storage_path": f"u/items/{kwargs['filename']}",
+            "image_hash": "00000000000000ff",
         }
 
     monkeypatch.setattr(StorageService, "upload_item_image", fake_upload)
@@ -245,6 +249,8 @@ async def test_upload_item_images_uploads_all_files_in_parallel(monkeypatch):
     assert len(data["images"]) == 2
     assert [s["is_primary"] for s in seen] == [True, False]
     assert [s["filename"] for s in seen] == ["a.png", "b.png"]
+    # The hash goes back to the client, which passes it to create/check-duplicates.
+    assert [i["image_hash"] for i in data["images"]] == ["00000000000000ff"] * 2
 
 
 @pytest.mark.asyncio
@@ -312,12 +318,17 @@ async def test_create_item_inserts_with_images_and_stores_embedding(monkeypatch)
         category="tops",
         colors=["white"],
         brand="Uniqlo",
-        images=[ItemImageBase(image_url="https://cdn/1.jpg", is_primary=True)],
+        images=[
+            ItemImageBase(
+                image_url="https://cdn/1.jpg", is_primary=True, image_hash="0123456789abcdef"
+            )
+        ],
     )
     result = await items_module.create_item(item=item, user_id=USER_ID, db=db)
 
     assert result["message"] == "Created"
     data = result["data"]
+    assert data["images"][0]["image_hash"] == "0123456789abcdef"
     assert data["name"] == "Linen shirt"
     assert data["user_id"] == USER_ID
     assert data["usage_times_worn"] == 0
@@ -1779,6 +1790,187 @@ async def test_check_duplicates_falls_back_when_embedding_generation_fails(monke
     release.assert_awaited_once()
 
 
+@pytest.mark.asyncio
+async def test_check_duplicates_hash_tier_answers_without_spending_quota(monkeypatch):
+    stored = "f0e1d2c3b4a59687"
+    near = "f0e1d2c3b4a59686"  # one bit away
+    db = FakeDB(
+        rows={
+            "items": [
+                _item_row(
+                    name="Navy jacket",
+                    item_images=[_image_row(image_hash=stored)],
+                ),
+                _item_row(id=OTHER_ITEM_ID, item_images=[_image_row(image_hash="0" * 16)]),
+            ]
+        }
+    )
+    reserve, generate, _ = _patch_embedding(monkeypatch)
+    vector = _patch_vector_service(monkeypatch)
+
+    result = await items_module.check_duplicates(
+        request=_duplicate_request(image_hash=near), threshold=0.75, limit=5, user_id=USER_ID, db=db
+    )
+
+    assert result["message"] == "Found 1 potential duplicate(s)"
+    (dup,) = result["data"]["duplicates"]
+    assert dup["id"] == ITEM_ID
+    assert dup["similarity_score"] == round(1 - 1 / 64, 3)
+    assert dup["reasons"][0] == "Near-identical photo"
+    reserve.assert_not_awaited()
+    generate.assert_not_awaited()
+    vector.find_similar.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_check_duplicates_hash_miss_falls_through_to_embeddings(monkeypatch):
+    db = FakeDB(
+        rows={
+            "items": [
+                _item_row(item_images=[_image_row(image_hash="ffffffffffffffff")]),
+                # Same photo, but deleted: never reported.
+                _item_row(
+                    id=OTHER_ITEM_ID,
+                    is_deleted=True,
+                    item_images=[_image_row(image_hash="0000000000000000")],
+                ),
+            ]
+        }
+    )
+    reserve, _, _ = _patch_embedding(monkeypatch)
+    vector = _patch_vector_service(monkeypatch)
+
+    result = await items_module.check_duplicates(
+        request=_duplicate_request(image_hash="0000000000000000"),
+        threshold=0.75,
+        limit=5,
+        user_id=USER_ID,
+        db=db,
+    )
+
+    assert result["data"]["has_duplicates"] is False
+    reserve.assert_awaited_once()
+    vector.find_similar.assert_awaited_once()
+
+
+def _studio_photo_png() -> bytes:
+    import io
+
+    from PIL import Image, ImageDraw
+
+    img = Image.new("RGB", (1024, 1024), (255, 255, 255))
+    ImageDraw.Draw(img).rectangle((260, 140, 760, 900), fill=(30, 40, 90))
+    ImageDraw.Draw(img).ellipse((420, 300, 600, 480), fill=(200, 180, 40))
+    buffer = io.BytesIO()
+    img.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _db_with_stored_photo(raw: bytes) -> FakeDB:
+    """A wardrobe holding ``raw`` as stored by POST /items/upload."""
+    from app.utils.image_hash import hash_to_hex
+    from app.utils.image_pipeline import build_renditions
+
+    stored = build_renditions(raw, max_edge=2048, quality=82).image_hash
+    return FakeDB(
+        rows={
+            "items": [
+                _item_row(item_images=[_image_row(image_hash=hash_to_hex(stored))]),
+                _item_row(id=OTHER_ITEM_ID, item_images=[_image_row(image_hash="0" * 16)]),
+            ]
+        }
+    )
+
+
+@pytest.mark.asyncio
+async def test_check_duplicates_hashes_an_inline_photo_before_upload(monkeypatch):
+    """The web review flow checks before uploading: the studio image goes
+    inline (data URL) and is hashed server-side against stored hashes."""
+    import base64
+
+    raw = _studio_photo_png()
+    db = _db_with_stored_photo(raw)
+    reserve, _, _ = _patch_embedding(monkeypatch)
+    vector = _patch_vector_service(monkeypatch)
+    data_url = "data:image/png;base64," + base64.b64encode(raw).decode()
+
+    result = await items_module.check_duplicates(
+        request=_duplicate_request(image_base64=data_url),
+        threshold=0.7,
+        limit=3,
+        user_id=USER_ID,
+        db=db,
+    )
+
+    (dup,) = result["data"]["duplicates"]
+    assert dup["id"] == ITEM_ID
+    assert dup["reasons"][0] == "Near-identical photo"
+    reserve.assert_not_awaited()
+    vector.find_similar.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_check_duplicates_hashes_an_owned_storage_object(monkeypatch):
+    raw = _studio_photo_png()
+    db = _db_with_stored_photo(raw)
+    reserve, _, _ = _patch_embedding(monkeypatch)
+    _patch_vector_service(monkeypatch)
+    downloaded = []
+
+    async def fake_download(url, timeout=10.0, purpose="storage image"):
+        downloaded.append(url)
+        return raw
+
+    monkeypatch.setattr(StorageService, "_download_bytes", staticmethod(fake_download))
+    key = f"tmp/{USER_ID}/generated/{'a' * 32}.png"
+
+    result = await items_module.check_duplicates(
+        request=_duplicate_request(image_storage_path=key),
+        threshold=0.7,
+        limit=3,
+        user_id=USER_ID,
+        db=db,
+    )
+
+    assert downloaded == [key]
+    assert result["data"]["duplicates"][0]["id"] == ITEM_ID
+    reserve.assert_not_awaited()
+
+    # Someone else's object is refused, never downloaded.
+    with pytest.raises(PermissionDeniedError):
+        await items_module.check_duplicates(
+            request=_duplicate_request(
+                image_storage_path=f"22222222-2222-2222-2222-222222222222/items/{'b' * 32}.webp"
+            ),
+            threshold=0.7,
+            limit=3,
+            user_id=USER_ID,
+            db=db,
+        )
+    assert downloaded == [key]
+
+
+@pytest.mark.asyncio
+async def test_check_duplicates_rejects_an_invalid_inline_photo(monkeypatch):
+    db = FakeDB(rows={"items": [_item_row()]})
+    reserve, _, _ = _patch_embedding(monkeypatch)
+
+    with pytest.raises(InvalidInputError):
+        await items_module.check_duplicates(
+            request=_duplicate_request(image_base64="https://x.com/y.png"),
+            threshold=0.75,
+            limit=5,
+            user_id=USER_ID,
+            db=db,
+        )
+    reserve.assert_not_awaited()
+
+
+def test_duplicate_request_rejects_malformed_image_hash():
+    with pytest.raises(PydanticValidationError):
+        _duplicate_request(image_hash="not-a-hash")
+
+
 @pytest.mark.asyncio
 async def test_check_duplicates_reports_no_matches_when_vector_search_is_empty(monkeypatch):
     db = FakeDB(rows={"items": [_item_row()]})
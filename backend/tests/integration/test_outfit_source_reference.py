@@ -492,7 +492,7 @@ def _patch_route_deps(monkeypatch, *, source_result):
     fake_agent = AsyncMock()
     fake_agent.generate_outfit = AsyncMock(
         return_value=GeneratedImage(
-            image_base64="ZmFrZQ==", prompt="p", model="m", provider="fake"
+            image="ZmFrZQ==", prompt="p", model="m", provider="fake"
         )
     )
 
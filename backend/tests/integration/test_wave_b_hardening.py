@@ -808,3 +808,24 @@ async def test_referral_rpc_probes_are_non_mutating():
     apply_args = REFERRAL_RPC_PROBES["apply_referral_credit_atomic"]
     assert apply_args["p_user_id"] == _NIL_USER_UUID
     assert apply_args["p_months"] == 1
+
+
+@pytest.mark.asyncio
+async def test_missing_social_import_rpcs_probes_claim_without_mutating():
+    """The claim probe targets the nil job/user (no photo row matches) and
+    reports the function only when PostgREST answers PGRST202."""
+    from app.utils.db import (
+        SOCIAL_IMPORT_RPC_PROBES,
+        _NIL_USER_UUID,
+        missing_social_import_rpcs,
+    )
+
+    args = SOCIAL_IMPORT_RPC_PROBES["claim_social_import_photos"]
+    assert args["p_job_id"] == args["p_user_id"] == _NIL_USER_UUID
+
+    db = Mock()
+    db.rpc.side_effect = _PGRST202("claim_social_import_photos")
+    assert missing_social_import_rpcs(db) == ["claim_social_import_photos"]
+
+    db.rpc.side_effect = RuntimeError("connection refused")  # not PGRST202
+    assert missing_social_import_rpcs(db) == []
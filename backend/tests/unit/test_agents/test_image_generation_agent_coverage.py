@@ -25,7 +25,8 @@ from app.agents.image_generation_agent import (
 )
 from app.core.exceptions import AIServiceError
 from app.services.ai_settings_service import AISettingsService
-from app.utils.background_removal import STATUS_MATTED, MatteResult
+from app.utils.background_removal import STATUS_MATTED
+from app.utils.image_pipeline import Renditions
 from app.utils.parallel import ParallelResult
 
 
@@ -51,22 +52,20 @@ def _item(name, category="tops", reference=None):
     return item
 
 
-def _matted_result() -> MatteResult:
+def _matted_result() -> Renditions:
     """A successful matte outcome for the run_image_op stub.
 
-    _matte reads result.status/transparent_fraction/center_opacity/
-    content_type after run_image_op returns, so the stub must hand back a
-    real MatteResult (status=STATUS_MATTED keeps the flat-lay/variations
+    _matte reads result.matte_status/transparent_fraction/center_opacity/
+    content_type after run_image_op returns, so the stub must hand back real
+    Renditions (matte_status=STATUS_MATTED keeps the flat-lay/variations
     branch on the "cutout applied" path).
     """
-    return MatteResult(
-        image_bytes=b"ZmFrZQ==",
+    return Renditions(
+        image_bytes=b"fake",
         content_type="image/png",
-        status=STATUS_MATTED,
-        transparent_fraction=0.0,
-        center_opacity=1.0,
-        width=4,
-        height=4,
+        thumbnail=None,
+        decoded=True,
+        matte_status=STATUS_MATTED,
     )
 
 
@@ -92,16 +91,16 @@ def test_resolve_background_custom_passthrough_and_none():
 
 
 def test_generated_image_to_dict():
-    image = GeneratedImage("b64", "prompt", "model", "provider", "url", "path")
+    image = GeneratedImage("ZmFrZQ==", "prompt", "model", "provider", "url", "path")
     assert image.to_dict() == {
-        "image_base64": "b64",
+        "image_base64": "ZmFrZQ==",
         "image_url": "url",
         "storage_path": "path",
         "prompt": "prompt",
         "model": "model",
         "provider": "provider",
     }
-    bare = GeneratedImage("b64", "p", "m", "prov")
+    bare = GeneratedImage("ZmFrZQ==", "p", "m", "prov")
     assert bare.to_dict()["image_url"] is None
     assert bare.to_dict()["storage_path"] is None
 
@@ -125,20 +124,23 @@ async def test_matte_executor_failure_returns_original():
 @pytest.mark.asyncio
 async def test_matte_success_returns_new_image():
     generated = GeneratedImage("ZmFrZQ==", "p", "m", "prov")
-    matte_result = MatteResult(
+    matte_result = Renditions(
         image_bytes=b"new-bytes",
         content_type="image/webp",
-        status=STATUS_MATTED,
+        thumbnail=None,
+        decoded=True,
+        matte_status=STATUS_MATTED,
         transparent_fraction=0.95,
-        center_opacity=1.0,
-        width=10,
-        height=10,
     )
-    with patch(
-        "app.agents.image_generation_agent.run_image_op",
-        new=AsyncMock(return_value=("bmV3LWJ5dGVz", matte_result)),
-    ):
+    run = AsyncMock(return_value=matte_result)
+    with patch("app.agents.image_generation_agent.run_image_op", new=run):
         result = await ImageGenerationAgent._matte(generated, context="product image")
+    # One pass: matte and storage encode together, no thumbnail.
+    assert run.await_args.kwargs == {"thumbnail": False, "matte": True}
+    assert result.storage_ready is True
+    assert generated.storage_ready is False
+    assert result.image.data == b"new-bytes"
+    assert result.image.mime == "image/webp"
     assert result.image_base64 == "bmV3LWJ5dGVz"
     assert result.prompt == "p"
     assert result.model == "m"
@@ -148,18 +150,18 @@ async def test_matte_success_returns_new_image():
 @pytest.mark.asyncio
 async def test_matte_non_matted_status_returns_original():
     generated = GeneratedImage("ZmFrZQ==", "p", "m", "prov")
-    matte_result = MatteResult(
+    matte_result = Renditions(
         image_bytes=b"same",
         content_type="image/jpeg",
-        status="skipped_no_background",
+        thumbnail=None,
+        decoded=True,
+        matte_status="skipped_no_background",
         transparent_fraction=0.1,
         center_opacity=0.9,
-        width=1,
-        height=1,
     )
     with patch(
         "app.agents.image_generation_agent.run_image_op",
-        new=AsyncMock(return_value=("ZmFrZQ==", matte_result)),
+        new=AsyncMock(return_value=matte_result),
     ):
         result = await ImageGenerationAgent._matte(generated, context="product image")
     assert result is generated
@@ -381,7 +383,7 @@ async def test_generate_flat_lay_delegates_to_outfit():
     # stub it so this stays a pure unit test.
     with patch(
         "app.agents.image_generation_agent.run_image_op",
-        new=AsyncMock(return_value=("ZmFrZQ==", _matted_result())),
+        new=AsyncMock(return_value=_matted_result()),
     ):
         result = await agent.generate_flat_lay(
             items=[_item("tee", "tops")], style="boho", background="white", lighting="warm"
@@ -411,7 +413,7 @@ async def test_generate_variations_default_styles_runs_all():
         # generate_outfit, which can reach _matte -> run_image_op.
         with patch(
             "app.agents.image_generation_agent.run_image_op",
-            new=AsyncMock(return_value=("ZmFrZQ==", _matted_result())),
+            new=AsyncMock(return_value=_matted_result()),
         ):
             results = await agent.generate_variations(items=[_item("tee", "tops")])
 
@@ -461,6 +463,20 @@ async def test_generate_image_no_images_is_retryable():
     assert excinfo.value.retryable is True
 
 
+@pytest.mark.asyncio
+async def test_generate_image_downloads_a_hosted_result():
+    agent = _make_agent("https://cdn.example.com/out.png")
+    fetcher = AsyncMock()
+    fetcher.fetch = AsyncMock(return_value=(b"fake", "image/png"))
+    with patch(
+        "app.agents.image_generation_agent.get_remote_image_fetcher", return_value=fetcher
+    ):
+        result = await agent._generate_image("prompt")
+    fetcher.fetch.assert_awaited_once_with("https://cdn.example.com/out.png")
+    assert result.image.data == b"fake"
+    assert result.image.mime == "image/png"
+
+
 @pytest.mark.asyncio
 async def test_generate_image_wraps_generic_error():
     agent = _make_agent()
@@ -550,6 +566,21 @@ async def test_save_generated_image_success(fake_db):
     assert call_kwargs["db"] is fake_db
 
 
+@pytest.mark.asyncio
+async def test_save_generated_image_stores_storage_ready_bytes_as_is(fake_db):
+    generated = GeneratedImage("ZmFrZQ==", "p", "m", "prov", storage_ready=True)
+    run = AsyncMock()
+    upload = AsyncMock(return_value={"public_url": "https://cdn.example/x.webp"})
+    with (
+        patch("app.agents.image_generation_agent.run_image_op", new=run),
+        patch("app.services.storage_service.StorageService.upload_file", new=upload),
+    ):
+        await save_generated_image(generated, user_id="u1", image_type="product", db=fake_db)
+
+    run.assert_not_awaited()
+    assert upload.await_args.kwargs["file_data"] == b"fake"
+
+
 @pytest.mark.asyncio
 async def test_save_generated_image_error_returns_empty(fake_db):
     generated = GeneratedImage("ZmFrZQ==", "p", "m", "prov")
@@ -0,0 +1,201 @@
+"""
+Tests for the adaptive (AIMD) AI concurrency limiter.
+
+EXTRACTION_SEMAPHORE / GENERATION_SEMAPHORE used to be fixed 30-permit
+semaphores: too many when the provider throttles (retry storms), too few
+when it is healthy. They are now AdaptiveLimiters fed by the provider layer
+through record_provider_call. Covers the semaphore contract, the AIMD
+adjustments, routing of reports to held limiters (system-key calls only),
+and the limit gauge.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.core import concurrency
+from app.core.concurrency import AdaptiveLimiter, record_provider_call, timed_acquire
+from app.core.config import settings
+from app.utils.metrics import render_latest
+
+
+SYSTEM_KEY = "sk-system"
+
+
+@pytest.fixture(autouse=True)
+def _aimd_settings(monkeypatch):
+    monkeypatch.setattr(settings, "AI_ADAPTIVE_CONCURRENCY_ENABLED", True)
+    monkeypatch.setattr(settings, "AI_ADAPTIVE_CONCURRENCY_MIN", 2)
+    monkeypatch.setattr(settings, "AI_ADAPTIVE_CONCURRENCY_BACKOFF", 0.5)
+    monkeypatch.setattr(settings, "AI_ADAPTIVE_CONCURRENCY_LATENCY_TOLERANCE", 2.0)
+    monkeypatch.setattr(settings, "AI_CHAT_API_KEY", SYSTEM_KEY)
+
+
+# --------------------------------------------------------------------------- #
+# Semaphore contract
+# --------------------------------------------------------------------------- #
+@pytest.mark.asyncio
+async def test_permits_are_bounded_and_handed_over_fifo():
+    limiter = AdaptiveLimiter(2, "test")
+    await limiter.acquire()
+    await limiter.acquire()
+    assert limiter.locked() and limiter._value == 0
+
+    order = []
+
+    async def waiter(name):
+        await limiter.acquire()
+        order.append(name)
+
+    tasks = [asyncio.create_task(waiter(n)) for n in ("a", "b")]
+    await asyncio.sleep(0)
+    assert limiter.waiting == 2
+
+    limiter.release()
+    await asyncio.sleep(0)
+    assert order == ["a"]
+    limiter.release()
+    await asyncio.gather(*tasks)
+    assert order == ["a", "b"]
+    assert limiter.in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_leak_a_permit():
+    limiter = AdaptiveLimiter(1, "test")
+    await limiter.acquire()
+    task = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert limiter.waiting == 0
+
+    limiter.release()
+    assert limiter.in_flight == 0
+    assert limiter._value == 1
+
+
+@pytest.mark.asyncio
+async def test_cancellation_after_handoff_passes_the_permit_on():
+    limiter = AdaptiveLimiter(1, "test")
+    await limiter.acquire()
+    first = asyncio.create_task(limiter.acquire())
+    second = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+
+    limiter.release()  # hands the permit to `first`...
+    first.cancel()  # ...which is cancelled before it runs
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    assert await second is True
+    assert limiter.in_flight == 1
+
+
+# --------------------------------------------------------------------------- #
+# AIMD
+# --------------------------------------------------------------------------- #
+def test_overload_cuts_limit_once_per_congestion_window():
+    limiter = AdaptiveLimiter(30, "test")
+
+    limiter.record(1.0, overloaded=True)
+    assert limiter.limit == 15
+    # Started before the cut: admitted under the old limit, ignored.
+    limiter.record(5.0, overloaded=True)
+    assert limiter.limit == 15
+
+    limiter._last_decrease = time.monotonic() - 10
+    limiter.record(1.0, overloaded=True)
+    assert limiter.limit == 7.5
+    for _ in range(5):
+        limiter._last_decrease = float("-inf")
+        limiter.record(1.0, overloaded=True)
+    assert limiter.limit == 2  # AI_ADAPTIVE_CONCURRENCY_MIN floor
+
+
+@pytest.mark.asyncio
+async def test_healthy_saturated_calls_grow_limit_up_to_the_cap():
+    limiter = AdaptiveLimiter(4, "test")
+    limiter.limit = 2.0
+    await limiter.acquire()
+    await limiter.acquire()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+
+    for _ in range(3):
+        limiter.record(1.0)
+    # +1/limit per success: about one permit per limit's worth of successes,
+    # handed straight to the queued waiter.
+    assert 3 <= limiter.limit < 4
+    await asyncio.wait_for(waiter, timeout=1.0)
+    assert limiter.in_flight == 3
+
+    for _ in range(50):
+        limiter.record(1.0)
+    assert limiter.limit == 4
+
+
+def test_unsaturated_or_slow_calls_hold_the_limit():
+    limiter = AdaptiveLimiter(10, "test")
+    limiter.limit = 5.0
+    limiter.record(1.0)  # nothing in flight: no evidence more permits help
+    assert limiter.limit == 5.0
+
+    limiter.in_flight = 5
+    for _ in range(10):
+        limiter.record(10.0)  # latency far above the 1s baseline
+    assert limiter.limit == 5.0
+
+
+def test_disabled_limiter_keeps_the_configured_cap(monkeypatch):
+    monkeypatch.setattr(settings, "AI_ADAPTIVE_CONCURRENCY_ENABLED", False)
+    limiter = AdaptiveLimiter(30, "test")
+    limiter.record(1.0, overloaded=True)
+    assert limiter.limit == 30
+
+
+# --------------------------------------------------------------------------- #
+# Routing and telemetry
+# --------------------------------------------------------------------------- #
+@pytest.mark.asyncio
+async def test_reports_reach_only_the_limiters_the_task_holds(monkeypatch):
+    extraction = AdaptiveLimiter(10, "extraction")
+    generation = AdaptiveLimiter(10, "generation")
+    monkeypatch.setattr(concurrency, "GENERATION_SEMAPHORE", generation)
+
+    record_provider_call(1.0, api_key=SYSTEM_KEY, overloaded=True)  # nothing held: no-op
+    assert extraction.limit == generation.limit == 10
+
+    async with timed_acquire(extraction, "extraction"):
+        record_provider_call(1.0, api_key=SYSTEM_KEY, overloaded=True)
+    assert extraction.limit == 5
+    assert generation.limit == 10
+
+    async with concurrency.image_gen_slot():
+        async with concurrency.image_gen_slot():  # reentrant: held once
+            record_provider_call(1.0, api_key=SYSTEM_KEY, overloaded=True)
+    assert generation.limit == 5
+    assert generation.in_flight == 0
+
+    record_provider_call(1.0, api_key=SYSTEM_KEY, overloaded=True)
+    assert concurrency._HELD_LIMITERS.get() == ()
+
+
+@pytest.mark.asyncio
+async def test_byok_calls_do_not_move_the_shared_limit():
+    limiter = AdaptiveLimiter(10, "extraction")
+    async with timed_acquire(limiter, "extraction"):
+        record_provider_call(1.0, api_key="sk-user-byok", overloaded=True)
+        record_provider_call(1.0, api_key=None, overloaded=True)
+    assert limiter.limit == 10
+
+
+def test_current_limit_is_exported():
+    concurrency.GENERATION_SEMAPHORE.limit = 12.5
+    try:
+        assert (
+            'fitcheck_concurrency_limit{semaphore="generation"} 12.5' in render_latest()
+        )
+    finally:
+        concurrency.GENERATION_SEMAPHORE.limit = float(concurrency.GENERATION_SEMAPHORE.max_limit)
@@ -72,3 +72,31 @@ async def test_image_gen_slot_releases_on_exception(monkeypatch):
             raise RuntimeError("boom")
 
     assert sem._value == 1
+
+
+@pytest.mark.asyncio
+async def test_semaphore_waits_are_measured(monkeypatch):
+    """timed_acquire (and the generation slot) report queued tasks and the
+    time they spent waiting, so /metrics can tell capacity from latency."""
+    from app.core import concurrency
+
+    sem = asyncio.Semaphore(1)
+    waits_before = concurrency.SEMAPHORE_WAIT_SECONDS.count(semaphore="extraction")
+    release = asyncio.Event()
+
+    async def holder():
+        async with concurrency.timed_acquire(sem, "extraction"):
+            await release.wait()
+
+    first = asyncio.create_task(holder())
+    await asyncio.sleep(0)
+    second = asyncio.create_task(holder())
+    await asyncio.sleep(0.01)
+    assert concurrency._waiting["extraction"] == 1
+
+    release.set()
+    await asyncio.gather(first, second)
+
+    assert concurrency._waiting["extraction"] == 0
+    assert sem._value == 1
+    assert concurrency.SEMAPHORE_WAIT_SECONDS.count(semaphore="extraction") == waits_before + 2
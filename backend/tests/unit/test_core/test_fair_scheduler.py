@@ -0,0 +1,178 @@
+"""
+Tests for FairScheduler, the process-wide photoshoot generation budget.
+
+Several photoshoots running at once used to each bring their own per-job
+fan-out, multiplying in-flight generations (and their base64 buffers) until
+the container hit its memory limit. The scheduler caps the total and hands
+freed permits round-robin by user, then by job, instead of FIFO.
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.concurrency import FairScheduler
+
+
+async def _queue_waiters(scheduler, owners, order):
+    """Start one waiter per (user, job) owner, in order; each records its grant."""
+
+    async def waiter(label, user_id, job_id):
+        async with scheduler.slot(user_id, job_id):
+            order.append(label)
+
+    tasks = []
+    for label, user_id, job_id in owners:
+        tasks.append(asyncio.create_task(waiter(label, user_id, job_id)))
+        await asyncio.sleep(0)  # enqueue in a deterministic order
+    return tasks
+
+
+@pytest.mark.asyncio
+async def test_slot_acquires_and_releases():
+    scheduler = FairScheduler(2, "test")
+
+    async with scheduler.slot("u1", "j1"):
+        assert scheduler.available == 1
+    assert scheduler.available == 2
+    assert scheduler.active == 0
+
+
+@pytest.mark.asyncio
+async def test_capacity_floors_at_one():
+    assert FairScheduler(0, "test").capacity == 1
+
+
+@pytest.mark.asyncio
+async def test_freed_permits_rotate_across_users():
+    """A user who queued three generations first does not starve a second user."""
+    scheduler = FairScheduler(1, "test")
+    order = []
+    await scheduler.acquire("holder", "j0")
+    tasks = await _queue_waiters(
+        scheduler,
+        [("a1", "A", "ja"), ("a2", "A", "ja"), ("a3", "A", "ja"), ("b1", "B", "jb")],
+        order,
+    )
+    assert scheduler.waiting == 4
+
+    scheduler.release()
+    await asyncio.gather(*tasks)
+
+    assert order == ["a1", "b1", "a2", "a3"]
+    assert scheduler.active == 0
+    assert scheduler.waiting == 0
+
+
+@pytest.mark.asyncio
+async def test_freed_permits_rotate_across_jobs_of_one_user():
+    scheduler = FairScheduler(1, "test")
+    order = []
+    await scheduler.acquire("holder", "j0")
+    tasks = await _queue_waiters(
+        scheduler,
+        [("x1", "A", "jx"), ("x2", "A", "jx"), ("y1", "A", "jy"), ("y2", "A", "jy")],
+        order,
+    )
+
+    scheduler.release()
+    await asyncio.gather(*tasks)
+
+    assert order == ["x1", "y1", "x2", "y2"]
+
+
+@pytest.mark.asyncio
+async def test_new_arrival_does_not_barge_past_waiters():
+    scheduler = FairScheduler(1, "test")
+    await scheduler.acquire("A", "ja")
+    queued = asyncio.create_task(scheduler.acquire("B", "jb"))
+    await asyncio.sleep(0)
+
+    scheduler.release()  # handed straight to B
+    late = asyncio.create_task(scheduler.acquire("C", "jc"))
+    await asyncio.sleep(0)
+
+    assert queued.done()
+    assert not late.done()
+    scheduler.release()
+    await late
+    scheduler.release()
+    assert scheduler.active == 0
+
+
+@pytest.mark.asyncio
+async def test_last_cancelled_waiter_clears_its_owner():
+    scheduler = FairScheduler(1, "test")
+    await scheduler.acquire("A", "ja")
+    waiter = asyncio.create_task(scheduler.acquire("B", "jb"))
+    await asyncio.sleep(0)
+
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    assert scheduler.waiting == 0
+    scheduler.release()
+    assert scheduler.active == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_the_queue():
+    scheduler = FairScheduler(1, "test")
+    await scheduler.acquire("A", "ja")
+    waiter = asyncio.create_task(scheduler.acquire("B", "jb"))
+    same_job = asyncio.create_task(scheduler.acquire("B", "jb"))
+    other_job = asyncio.create_task(scheduler.acquire("B", "jc"))
+    await asyncio.sleep(0)
+
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    assert scheduler.waiting == 2
+    scheduler.release()
+    await same_job
+    scheduler.release()
+    await other_job
+    scheduler.release()
+    assert scheduler.active == 0
+
+
+@pytest.mark.asyncio
+async def test_permit_granted_to_a_cancelled_waiter_is_passed_on():
+    scheduler = FairScheduler(1, "test")
+    await scheduler.acquire("A", "ja")
+    granted_then_cancelled = asyncio.create_task(scheduler.acquire("B", "jb"))
+    next_waiter = asyncio.create_task(scheduler.acquire("C", "jc"))
+    await asyncio.sleep(0)
+
+    scheduler.release()  # resolves B's future...
+    granted_then_cancelled.cancel()  # ...but B is cancelled before it runs
+    with pytest.raises(asyncio.CancelledError):
+        await granted_then_cancelled
+
+    await next_waiter
+    assert scheduler.active == 1
+    scheduler.release()
+    assert scheduler.active == 0
+
+
+@pytest.mark.asyncio
+async def test_release_skips_waiter_cancelled_in_the_same_tick():
+    """A waiter whose cancellation has not run yet is skipped, not granted."""
+    scheduler = FairScheduler(1, "test")
+    await scheduler.acquire("A", "ja")
+    cancelled = asyncio.create_task(scheduler.acquire("B", "jb"))
+    next_waiter = asyncio.create_task(scheduler.acquire("C", "jc"))
+    await asyncio.sleep(0)
+
+    cancelled.cancel()  # cancels B's future now; B's handler runs later
+    scheduler.release()
+
+    await next_waiter
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+    assert scheduler.active == 1
+    assert scheduler.waiting == 0
+    scheduler.release()
+    assert scheduler.active == 0
@@ -8,6 +8,7 @@ op runs on.
 """
 
 import asyncio
+import threading
 import time
 
 import pytest
@@ -59,3 +60,27 @@ def test_shutdown_is_recoverable():
     image_executor.shutdown()
     assert asyncio.run(main()) == "alive"
     image_executor.shutdown()
+
+
+def test_queue_depth_and_wait_are_recorded(monkeypatch):
+    """With one worker, the second op queues behind the first: the depth
+    gauge sees it while it waits, and the wait histogram records it."""
+    monkeypatch.setattr(settings, "IMAGE_PROCESS_WORKERS", 1)
+    image_executor.shutdown()
+    waits_before = image_executor.IMAGE_OP_WAIT_SECONDS.count()
+    gate = threading.Event()
+    seen = {}
+
+    async def main():
+        first = image_executor.run_image_op(gate.wait, 5)
+        second = image_executor.run_image_op(lambda: "done")
+        await asyncio.sleep(0.05)
+        seen["queued"], seen["running"] = image_executor._queued, image_executor._running
+        gate.set()
+        return await asyncio.gather(first, second)
+
+    assert asyncio.run(main())[1] == "done"
+    assert seen == {"queued": 1, "running": 1}
+    assert (image_executor._queued, image_executor._running) == (0, 0)
+    assert image_executor.IMAGE_OP_WAIT_SECONDS.count() == waits_before + 2
+    image_executor.shutdown()
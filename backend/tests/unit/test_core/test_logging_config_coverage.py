@@ -3,24 +3,31 @@
 The ContextLogger wrapper is used app-wide via get_context_logger, but the
 formatter internals, session logging setup, and sanitizer are rarely
 exercised directly. This file covers them, restoring the root logger's
-handlers after each setup_session_logging call.
+handlers (and stopping the writer thread) after each setup_session_logging
+call.
 """
 
 import logging
+import queue
 import sys
+import threading
 
 import pytest
 
 from app.core import logging_config
 from app.core.logging_config import (
     ContextLogger,
+    DebugSampler,
+    DroppingQueueHandler,
     JsonFormatter,
     PrettyFormatter,
     get_logger,
     sanitize_for_logging,
     setup_session_logging,
+    shutdown_logging,
 )
-from app.core.middleware import CorrelationIdLogFilter
+from app.core.middleware import CorrelationIdLogFilter, _correlation_id
+from app.utils.metrics import REGISTRY
 
 
 @pytest.fixture(autouse=True)
@@ -29,6 +36,7 @@ def _restore_root_logger():
     saved_handlers = list(root.handlers)
     saved_level = root.level
     yield
+    shutdown_logging()
     root.handlers[:] = saved_handlers
     root.setLevel(saved_level)
 
@@ -168,9 +176,12 @@ def test_setup_session_logging_dev_branch_creates_session_file(monkeypatch, tmp_
 
     assert log_path.startswith(str(tmp_path))
     assert log_path.endswith(".log")
-    assert any(isinstance(h, logging.FileHandler) for h in root.handlers)
-    assert any(isinstance(h, logging.StreamHandler) for h in root.handlers)
-    assert any(hasattr(h, "filters") and any(isinstance(f, CorrelationIdLogFilter) for f in h.filters) for h in root.handlers)
+    # The root logger only enqueues; the sinks live on the listener thread.
+    assert [type(h) for h in root.handlers] == [DroppingQueueHandler]
+    sinks = logging_config._listener.handlers
+    assert any(isinstance(h, logging.FileHandler) for h in sinks)
+    assert any(type(h) is logging.StreamHandler for h in sinks)
+    assert any(isinstance(f, CorrelationIdLogFilter) for f in root.handlers[0].filters)
 
 
 def test_setup_session_logging_production_skips_file(monkeypatch, tmp_path):
@@ -186,10 +197,11 @@ def test_setup_session_logging_production_skips_file(monkeypatch, tmp_path):
     log_path = setup_session_logging()
 
     assert log_path == ""
-    assert not any(isinstance(h, logging.FileHandler) for h in root.handlers)
+    sinks = logging_config._listener.handlers
+    assert not any(isinstance(h, logging.FileHandler) for h in sinks)
     # Console handler uses the JSON formatter in production.
     json_handlers = [
-        h for h in root.handlers if isinstance(h, logging.StreamHandler)
+        h for h in sinks if isinstance(h, logging.StreamHandler)
     ]
     assert json_handlers
     assert isinstance(json_handlers[0].formatter, JsonFormatter)
@@ -211,6 +223,119 @@ def test_setup_session_logging_respects_invalid_log_level(monkeypatch, tmp_path)
     assert root.level == logging.INFO  # falls back to INFO
 
 
+# ---------------------------------------------------------------------------
+# Queue pipeline: enqueue on the caller, format + write on the listener
+# ---------------------------------------------------------------------------
+
+
+class _ThreadRecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+        self.threads = []
+
+    def emit(self, record):
+        self.lines.append(self.format(record))
+        self.threads.append(threading.current_thread())
+
+
+def _setup_with_sink(monkeypatch, tmp_path):
+    monkeypatch.setattr(logging_config.settings, "LOG_DIR", str(tmp_path))
+    monkeypatch.setattr(
+        logging_config.settings.__class__,
+        "is_production",
+        property(lambda self: True),
+    )
+    setup_session_logging()
+    sink = _ThreadRecordingHandler()
+    sink.setFormatter(JsonFormatter())
+    logging_config._listener.handlers = (sink,)
+    return sink
+
+
+def test_records_are_formatted_on_the_listener_thread_with_caller_context(monkeypatch, tmp_path):
+    sink = _setup_with_sink(monkeypatch, tmp_path)
+    token = _correlation_id.set("corr-queue")
+    payload = {"n": 1}
+    try:
+        logging.getLogger("queue.test").warning("value %s", payload)
+        payload["n"] = 2  # mutated after the call: the line must keep the old value
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logging.getLogger("queue.test").exception("failed")
+    finally:
+        _correlation_id.reset(token)
+    shutdown_logging()  # drains the queue
+
+    assert sink.threads and threading.main_thread() not in sink.threads
+    assert "value {'n': 1}" in sink.lines[0]
+    assert '"correlation_id": "corr-queue"' in sink.lines[0]
+    assert "ValueError: boom" in sink.lines[1]
+
+
+def test_queue_handler_drops_and_counts_when_full_then_reports():
+    dropped = REGISTRY.get("fitcheck_log_records_dropped_total")
+    before = dropped.value(reason="queue_full")
+    log_queue = queue.Queue(maxsize=1)
+    handler = DroppingQueueHandler(log_queue)
+    logger = logging.getLogger("queue.full.test")
+
+    def record(msg):
+        return logger.makeRecord(logger.name, logging.INFO, __file__, 1, msg, None, None)
+
+    handler.handle(record("kept"))
+    handler.handle(record("lost-1"))
+    handler.handle(record("lost-2"))
+    assert dropped.value(reason="queue_full") == before + 2
+    assert log_queue.get_nowait().getMessage() == "kept"
+
+    handler.handle(record("after"))
+    notice = log_queue.get_nowait()
+    assert notice.levelno == logging.WARNING
+    assert "dropped 2 record(s)" in notice.getMessage()
+    # The notice took the only slot; "after" is counted and re-reported next time.
+    assert log_queue.empty()
+    handler.handle(record("later"))
+    assert "dropped 1 record(s)" in log_queue.get_nowait().getMessage()
+
+
+def test_debug_sampler_keeps_burst_then_one_in_n_per_call_site(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(logging_config.time, "monotonic", lambda: clock[0])
+    sampler = DebugSampler(burst=3, every=5)
+    sampled = REGISTRY.get("fitcheck_log_records_dropped_total")
+    before = sampled.value(reason="sampled")
+
+    kept = sum(sampler.filter(_record("tick", logging.DEBUG)) for _ in range(23))
+    assert kept == 3 + 4  # burst, then counts 8, 13, 18, 23
+    assert sampled.value(reason="sampled") == before + 16
+    # Other call sites and INFO+ are unaffected.
+    other = _record("tick", logging.DEBUG)
+    other.lineno = 7
+    assert sampler.filter(other)
+    assert sampler.filter(_record("info"))
+    # A new window resets the burst.
+    clock[0] += 1.0
+    assert sampler.filter(_record("tick", logging.DEBUG))
+
+
+def test_debug_sampler_disabled_with_every_one():
+    sampler = DebugSampler(burst=0, every=1)
+    assert all(sampler.filter(_record("tick", logging.DEBUG)) for _ in range(50))
+
+
+def test_setup_session_logging_replaces_previous_listener(monkeypatch, tmp_path):
+    _setup_with_sink(monkeypatch, tmp_path)
+    first = logging_config._listener
+    setup_session_logging()
+    assert logging_config._listener is not first
+    assert first._thread is None  # stopped, not leaked
+    shutdown_logging()
+    shutdown_logging()  # idempotent
+    assert logging_config._listener is None
+
+
 # ---------------------------------------------------------------------------
 # get_logger / sanitize_for_logging
 # ---------------------------------------------------------------------------
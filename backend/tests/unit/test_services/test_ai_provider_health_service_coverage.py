@@ -4,9 +4,12 @@ Sibling to test_ai_provider_health_service.py: this file covers the cache /
 circuit-breaker state machine (TTL hit, open circuit, expired circuit), the
 non-OpenAI host branch that skips the Bearer header, the ConnectError /
 ConnectTimeout / generic-exception handlers (including consecutive-failure
-increments), and clear_cache.
+increments), clear_cache, the passive feed from real calls
+(record_success / record_failure / allow_request), the shared probe client
+and per-host single-flight probing.
 """
 
+import asyncio
 import time
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -113,7 +116,7 @@ async def test_non_openai_host_check_skips_auth_header():
     resp.status_code = 200
     resp.headers = {}
 
-    async def _get(url, headers=None):
+    async def _get(url, headers=None, timeout=None):
         captured["headers"] = headers
         return resp
 
@@ -202,3 +205,162 @@ def test_clear_cache_specific_and_all():
 
     svc.clear_cache()
     assert svc._health_cache == {}
+
+
+# =============================================================================
+# Passive feed from real calls
+# =============================================================================
+
+URL = "https://apihub.agnes-ai.com/v1"
+
+
+def test_record_failure_opens_circuit_at_threshold():
+    svc = AIProviderHealthService()
+    assert svc.allow_request(URL) is True
+
+    svc.record_failure(URL, "ReadTimeout")
+    svc.record_failure(URL, "Status 503")
+    # Below the threshold: still allowed, and the cached status is untouched.
+    assert svc.allow_request(URL) is True
+    assert URL not in svc._health_cache
+
+    svc.record_failure(URL, "Status 503")
+    assert svc.allow_request(URL) is False
+    assert svc._health_cache[URL].available is False
+    assert svc._health_cache[URL].error == "Status 503"
+
+
+@pytest.mark.asyncio
+async def test_passively_opened_circuit_fails_checks_fast_until_reset():
+    svc = AIProviderHealthService()
+    for _ in range(3):
+        svc.record_failure(URL, "ConnectError")
+
+    with patch("app.services.ai_provider_health_service.httpx.AsyncClient") as client_cls:
+        result = await svc.check_provider_health(URL, "k")
+    assert result.available is False
+    client_cls.assert_not_called()
+
+    # Past the reset timeout the next check is the half-open probe; a healthy
+    # answer closes the circuit for real traffic again.
+    svc._health_cache[URL].last_check = time.time() - 200
+    with _patch_client(status_code=200):
+        result = await svc.check_provider_health(URL, "k")
+    assert result.available is True
+    assert svc.allow_request(URL) is True
+
+
+@pytest.mark.asyncio
+async def test_separate_failing_calls_trip_even_when_models_answers():
+    """A host that 503s on chat but answers /models: each call's pre-flight
+    check and its failed POST must add up across calls."""
+    svc = AIProviderHealthService()
+    fake_client = _make_fake_client(status_code=200)
+    with patch(
+        "app.services.ai_provider_health_service.httpx.AsyncClient", return_value=fake_client
+    ):
+        for _ in range(2):  # two separate calls, each one failed POST
+            assert (await svc.check_provider_health(URL, "k")).available is True
+            assert svc.allow_request(URL) is True
+            svc.record_failure(URL, "Status 503")
+        # One probe only: a sub-threshold failure does not force a re-probe.
+        assert fake_client.get.await_count == 1
+
+        # Even a fresh probe in between does not reset the passive count.
+        svc._health_cache[URL].last_check = time.time() - 200
+        assert (await svc.check_provider_health(URL, "k")).available is True
+        svc.record_failure(URL, "Status 503")
+    assert svc.allow_request(URL) is False
+
+    svc.record_success(URL)
+    svc.record_failure(URL, "Status 503")
+    assert svc.allow_request(URL) is True
+
+
+def test_record_success_closes_circuit_and_keeps_latency():
+    svc = AIProviderHealthService()
+    for _ in range(3):
+        svc.record_failure(URL, "ConnectError")
+
+    svc.record_success(URL, latency_ms=812.5)
+
+    status = svc._health_cache[URL]
+    assert status.available is True
+    assert status.consecutive_failures == 0
+    assert status.latency_ms == 812.5
+    assert svc.allow_request(URL) is True
+
+
+# =============================================================================
+# Shared client / per-host probing
+# =============================================================================
+
+
+@pytest.mark.asyncio
+async def test_probes_reuse_one_client_and_close_releases_it():
+    svc = AIProviderHealthService()
+    fake_client = _make_fake_client(status_code=200)
+    with patch(
+        "app.services.ai_provider_health_service.httpx.AsyncClient", return_value=fake_client
+    ) as client_cls:
+        await svc.check_provider_health("https://a.example.com/v1", "k", timeout_seconds=3.0)
+        await svc.check_provider_health("https://b.example.com/v1", "k")
+
+    client_cls.assert_called_once()
+    assert fake_client.get.await_args_list[0].kwargs["timeout"] == 3.0
+
+    await svc.close()
+    fake_client.aclose.assert_awaited_once()
+    assert svc._client is None
+    await svc.close()  # idempotent
+
+
+@pytest.mark.asyncio
+async def test_concurrent_checks_of_one_host_share_a_probe():
+    svc = AIProviderHealthService()
+    release = asyncio.Event()
+    resp = MagicMock(spec=httpx.Response)
+    resp.status_code = 200
+    resp.headers = {}
+
+    async def _slow_get(url, headers=None, timeout=None):
+        await release.wait()
+        return resp
+
+    fake_client = _make_fake_client()
+    fake_client.get = AsyncMock(side_effect=_slow_get)
+    with patch("app.services.ai_provider_health_service.httpx.AsyncClient", return_value=fake_client):
+        checks = [asyncio.create_task(svc.check_provider_health(URL, "k")) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*checks)
+
+    assert all(r.available for r in results)
+    assert fake_client.get.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_slow_probe_does_not_block_other_hosts():
+    svc = AIProviderHealthService()
+    release = asyncio.Event()
+    resp = MagicMock(spec=httpx.Response)
+    resp.status_code = 200
+    resp.headers = {}
+
+    async def _get(url, headers=None, timeout=None):
+        if "slow" in url:
+            await release.wait()
+        return resp
+
+    fake_client = _make_fake_client()
+    fake_client.get = AsyncMock(side_effect=_get)
+    with patch("app.services.ai_provider_health_service.httpx.AsyncClient", return_value=fake_client):
+        slow = asyncio.create_task(svc.check_provider_health("https://slow.example.com/v1", "k"))
+        await asyncio.sleep(0)
+        fast = await asyncio.wait_for(
+            svc.check_provider_health("https://fast.example.com/v1", "k"), timeout=1.0
+        )
+        assert fast.available is True
+        assert not slow.done()
+        release.set()
+        assert (await slow).available is True
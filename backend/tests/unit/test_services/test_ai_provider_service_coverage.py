@@ -107,6 +107,9 @@ def _healthy_health_service():
     fake = SimpleNamespace(
         check_provider_health=AsyncMock(return_value=status),
         clear_cache=Mock(),
+        allow_request=Mock(return_value=True),
+        record_success=Mock(),
+        record_failure=Mock(),
     )
     with patch("app.services.ai_provider_health_service.get_health_service", return_value=fake):
         yield fake
@@ -283,12 +286,14 @@ def test_http_error_detail_falls_back_to_text_on_parse_failure():
 
 
 @pytest.mark.asyncio
-async def test_execute_chat_attempt_connect_error_clears_health_cache(_healthy_health_service):
+async def test_execute_chat_attempt_connect_error_feeds_circuit_breaker(_healthy_health_service):
     service = AIProviderService(_make_config())
     attempt = dict(_attempt_dict(), client=_RaisingClient(httpx.ConnectError("refused")))
     with pytest.raises(httpx.ConnectError):
         await service._execute_chat_attempt(attempt)
-    _healthy_health_service.clear_cache.assert_called_once_with("https://x.example.com/v1")
+    _healthy_health_service.record_failure.assert_called_once_with(
+        "https://x.example.com/v1", "ConnectError"
+    )
 
 
 @pytest.mark.asyncio
@@ -312,6 +317,146 @@ async def test_execute_chat_attempt_transient_error_reraises():
         await service._execute_chat_attempt(attempt)
 
 
+@pytest.mark.asyncio
+async def test_execute_chat_attempt_feeds_outcomes_to_circuit_breaker(_healthy_health_service):
+    class _SequenceClient:
+        def __init__(self, responses):
+            self._responses = list(responses)
+
+        async def post(self, url, json=None, headers=None):
+            return self._responses.pop(0)
+
+    service = AIProviderService(_make_config())
+    client = _SequenceClient([
+        _FakeResponse({}, status_code=503),
+        _FakeResponse({"error": "bad request"}, status_code=400),
+    ])
+    attempt = dict(_attempt_dict(), client=client)
+
+    with pytest.raises(service._TransientChatAPIOverload):
+        await service._execute_chat_attempt(attempt)
+    _healthy_health_service.record_failure.assert_called_once_with(
+        "https://x.example.com/v1", "Status 503"
+    )
+
+    # A permanent 4xx still proves the host answered.
+    with pytest.raises(httpx.HTTPStatusError):
+        await service._execute_chat_attempt(attempt)
+    _healthy_health_service.record_success.assert_called_once()
+    assert _healthy_health_service.record_success.call_args.args[0] == "https://x.example.com/v1"
+
+
+@pytest.mark.asyncio
+async def test_execute_chat_attempt_throttling_does_not_trip_the_breaker():
+    """429/408 mean the host is up but throttling: a burst of them must not
+    open the circuit (real breaker, not the mock)."""
+    from app.services.ai_provider_health_service import AIProviderHealthService
+
+    class _SequenceClient:
+        def __init__(self, responses):
+            self._responses = list(responses)
+
+        async def post(self, url, json=None, headers=None):
+            return self._responses.pop(0)
+
+    health = AIProviderHealthService()
+    service = AIProviderService(_make_config())
+    attempt = dict(_attempt_dict(), client=_SequenceClient(
+        [_FakeResponse({}, status_code=429)] * 4 + [_FakeResponse({}, status_code=408)]
+    ))
+    with patch(
+        "app.services.ai_provider_health_service.get_health_service", return_value=health
+    ), patch("app.services.ai_provider_service.record_provider_call"):
+        for _ in range(5):
+            with pytest.raises(service._TransientChatAPIOverload):
+                await service._execute_chat_attempt(attempt)
+
+    assert health.allow_request("https://x.example.com/v1")
+    assert "https://x.example.com/v1" not in health._health_cache
+
+
+@pytest.mark.asyncio
+async def test_execute_chat_attempt_reports_to_adaptive_limiter():
+    class _SequenceClient:
+        def __init__(self, outcomes):
+            self._outcomes = list(outcomes)
+
+        async def post(self, url, json=None, headers=None):
+            outcome = self._outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+    service = AIProviderService(_make_config())
+    attempt = dict(_attempt_dict(), client=_SequenceClient([
+        _FakeResponse({}, status_code=429),
+        httpx.ReadTimeout("slow"),
+        httpx.ConnectError("refused"),
+        _FakeResponse({"error": "bad"}, status_code=400),
+        _FakeResponse({"choices": []}),
+    ]))
+
+    with patch("app.services.ai_provider_service.record_provider_call") as record:
+        for _ in range(4):
+            with pytest.raises(Exception):
+                await service._execute_chat_attempt(attempt)
+        await service._execute_chat_attempt(attempt)
+
+    # 429 and the timeout are overload; a refused connection (breaker's job)
+    # and a permanent 4xx say nothing about load; the 200 is a latency sample.
+    overloaded = [c.kwargs.get("overloaded", False) for c in record.call_args_list]
+    assert overloaded == [True, True, False]
+
+
+@pytest.mark.asyncio
+async def test_execute_chat_attempt_pool_timeout_does_not_count_against_provider(
+    _healthy_health_service,
+):
+    service = AIProviderService(_make_config())
+    attempt = dict(_attempt_dict(), client=_RaisingClient(httpx.PoolTimeout("pool")))
+    with pytest.raises(httpx.PoolTimeout):
+        await service._execute_chat_attempt(attempt)
+    _healthy_health_service.record_failure.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_skips_post_and_falls_through_to_next_attempt(_healthy_health_service):
+    _healthy_health_service.allow_request.side_effect = (
+        lambda base_url: base_url != "https://x.example.com/v1"
+    )
+    fallback_client = Mock()
+    fallback_client.post = AsyncMock(return_value=_FakeResponse({"choices": []}))
+    primary = dict(_attempt_dict(), client=_RaisingClient(AssertionError("must not POST")))
+    fallback = dict(_attempt_dict(), client=fallback_client, base_url="https://y.example.com/v1")
+
+    service = AIProviderService(_make_config())
+    with patch("asyncio.sleep", AsyncMock()) as sleep:
+        data, status = await service._call_with_retry_and_fallback([primary, fallback])
+
+    assert (data, status) == ({"choices": []}, 200)
+    sleep.assert_not_awaited()  # no retry backoff spent on the open circuit
+
+    with pytest.raises(AIServiceError) as exc_info:
+        await service._call_with_retry_and_fallback([primary])
+    assert exc_info.value.retryable is True
+    assert "circuit open" in str(exc_info.value)
+
+
+@pytest.mark.asyncio
+async def test_circuit_tripping_mid_retry_stops_retrying(_healthy_health_service):
+    # The first failure trips the breaker (as the third consecutive failure
+    # would); the retry must not POST again.
+    _healthy_health_service.allow_request.side_effect = [True, False]
+    client = Mock()
+    client.post = AsyncMock(side_effect=httpx.ReadTimeout("slow"))
+    service = AIProviderService(_make_config())
+
+    with patch("asyncio.sleep", AsyncMock()):
+        with pytest.raises(AIServiceError, match="circuit open"):
+            await service._call_with_retry_and_fallback([dict(_attempt_dict(), client=client)])
+    assert client.post.await_count == 1
+
+
 # =============================================================================
 # _call_with_retry_and_fallback loop mechanics
 # =============================================================================
@@ -760,6 +905,33 @@ async def test_generate_image_via_images_api_fails_fast_when_unhealthy(_healthy_
     assert "unavailable" in str(exc_info.value)
 
 
+@pytest.mark.asyncio
+async def test_generate_image_via_images_api_open_circuit_raises_fallback_worthy(
+    _healthy_health_service,
+):
+    _healthy_health_service.allow_request.return_value = False
+    client = Mock()
+    client.post = AsyncMock()
+    service = AIProviderService(_make_config())
+    with patch.object(AIProviderService, "_get_client", AsyncMock(return_value=client)):
+        with pytest.raises(AIServiceError, match="circuit open") as exc_info:
+            await service._generate_image_via_images_api("a cat", model="image-model")
+    assert exc_info.value.retryable is True
+    client.post.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_generate_image_via_images_api_transport_error_feeds_breaker(_healthy_health_service):
+    client = Mock()
+    client.post = AsyncMock(side_effect=httpx.ConnectError("refused"))
+    service = AIProviderService(_make_config())
+    with patch.object(AIProviderService, "_get_client", AsyncMock(return_value=client)), \
+         patch("asyncio.sleep", AsyncMock()):
+        with pytest.raises(AIServiceError):
+            await service._generate_image_via_images_api("a cat", model="image-model")
+    assert _healthy_health_service.record_failure.call_count == 2
+
+
 @pytest.mark.asyncio
 async def test_generate_image_via_images_api_json_parse_failure_is_not_retryable():
     class _BadJsonClient:
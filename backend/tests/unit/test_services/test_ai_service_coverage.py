@@ -35,11 +35,23 @@ def test_create_genai_client_returns_none_without_key(monkeypatch):
 
 def test_create_genai_client_raises_on_client_failure(monkeypatch):
     monkeypatch.setattr(ai_module.settings, "AI_GEMINI_API_KEY", "k")
-    with patch.object(ai_module.genai, "Client", side_effect=RuntimeError("no client")):
+    with patch("google.genai.Client", side_effect=RuntimeError("no client")):
         with pytest.raises(AIServiceError, match="Failed to initialize AI client"):
             ai_module._create_genai_client()
 
 
+def test_get_client_builds_the_client_once_on_first_use(monkeypatch):
+    """The SDK client is built lazily (google.genai is a large import), then reused."""
+    sentinel = object()
+    factory = Mock(return_value=sentinel)
+    monkeypatch.setattr(ai_module, "_client", ai_module._UNSET)
+    monkeypatch.setattr(ai_module, "_create_genai_client", factory)
+
+    assert ai_module._get_client() is sentinel
+    assert ai_module._get_client() is sentinel
+    factory.assert_called_once_with()
+
+
 # =============================================================================
 # EmbeddingService.generate_embedding
 # =============================================================================
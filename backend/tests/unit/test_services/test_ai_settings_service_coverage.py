@@ -5,8 +5,9 @@ and quota machinery that file's provider-dispatch tests skip - encryption
 helpers (missing key / failure branches), the daily-reset path of
 get_user_settings, update_user_settings config merging, check_rate_limit,
 ensure_ai_settings_row (FK race / missing RPC handling), reserve_usage /
-release_usage success and failure branches, usage stats and the display
-config masking.
+release_usage success and failure branches, usage stats, the display
+config masking, the Fernet / resolved-credential caches and the settings
+snapshot with its write-through usage counters.
 
 DB access goes through the in-memory FakeDB (the suite's "fresh database")
 with the real execute_with_reconnect, except where an error injection point
@@ -22,9 +23,13 @@ import pytest
 from app.core.config import settings
 from app.core.exceptions import AIServiceError
 from app.services.ai_provider_service import AIProviderService
+from app.services import ai_settings_service
+from app.services.ai_provider_service import AIProvider
 from app.services.ai_settings_service import (
     AISettingsService,
+    _credential_cache,
     _get_encryption_key,
+    _settings_snapshots,
     _get_legacy_encryption_key,
     decrypt_api_key,
     encrypt_api_key,
@@ -329,6 +334,317 @@ async def test_update_user_settings_propagates_aiservice_error():
         )
 
 
+# =============================================================================
+# Fernet instances and the resolved-credential cache
+# =============================================================================
+
+
+def _byok_row(user_id="u1", api_key="user-key", model="byok-model"):
+    return {
+        "user_id": user_id,
+        "default_provider": "custom",
+        "provider_configs": {"custom": {
+            "api_key_encrypted": encrypt_api_key(api_key),
+            "api_url": "https://my-proxy.example.com/v1",
+            "model": model,
+        }},
+    }
+
+
+def test_fernet_instances_are_built_once_per_secret(monkeypatch):
+    from cryptography.fernet import Fernet
+
+    built = []
+
+    def counting_fernet(key):
+        built.append(key)
+        return Fernet(key)
+
+    with patch("app.services.ai_settings_service.Fernet", counting_fernet):
+        token = encrypt_api_key("secret")
+        assert decrypt_api_key(token) == "secret"
+        assert decrypt_api_key(token) == "secret"
+        assert len(built) == 2  # current + legacy, once
+
+        monkeypatch.setattr(settings, "AI_ENCRYPTION_KEY", "another-secret")
+        assert decrypt_api_key(token) is None  # rotated away
+        assert len(built) == 4
+
+
+def test_fernet_build_failure_counts_as_missing_key(monkeypatch):
+    def broken_fernet(key):
+        raise ValueError("bad key")
+
+    monkeypatch.setattr(settings, "DEBUG", True)
+    with patch("app.services.ai_settings_service.Fernet", broken_fernet):
+        assert encrypt_api_key("secret") == "__PLAINTEXT__secret"
+        assert decrypt_api_key("gAAAA-token") is None
+
+
+@pytest.mark.asyncio
+async def test_legacy_encrypted_key_decrypts_once_per_ttl(fake_db):
+    from cryptography.fernet import Fernet
+
+    legacy = Fernet(_get_legacy_encryption_key()).encrypt(b"legacy-key").decode()
+    row = _byok_row()
+    row["provider_configs"]["custom"]["api_key_encrypted"] = legacy
+    fake_db.rows["user_ai_settings"] = [row]
+
+    with patch(
+        "app.services.ai_settings_service.decrypt_api_key", wraps=decrypt_api_key
+    ) as decrypt:
+        for _ in range(3):
+            config = await AISettingsService.get_effective_provider_config(
+                "u1", AIProvider.CUSTOM, db=fake_db
+            )
+            assert config.api_key == "legacy-key"
+
+    assert decrypt.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_credentials_cached_across_calls_and_shared_with_service_lookup(fake_db):
+    fake_db.rows["user_ai_settings"] = [_byok_row()]
+    reads = AsyncMock(wraps=AISettingsService.get_user_settings)
+
+    with patch.object(AISettingsService, "get_user_settings", reads):
+        service = await AISettingsService.get_ai_service_for_user("u1", db=fake_db)
+        first = await AISettingsService.get_effective_provider_config(
+            "u1", AIProvider.CUSTOM, db=fake_db
+        )
+        second = await AISettingsService.get_effective_provider_config(
+            "u1", AIProvider.CUSTOM, db=fake_db
+        )
+    await service.close()
+
+    assert reads.await_count == 1
+    assert first.api_key == second.api_key == "user-key"
+    # Callers get their own config object.
+    assert first is not second
+
+
+@pytest.mark.asyncio
+async def test_settings_write_invalidates_cached_credentials(fake_db):
+    fake_db.rows["user_ai_settings"] = [_byok_row(model="old-model")]
+    config = await AISettingsService.get_effective_provider_config(
+        "u1", AIProvider.CUSTOM, db=fake_db
+    )
+    assert config.model == "old-model"
+
+    await AISettingsService.update_user_settings(
+        "u1", {"provider_configs": {"custom": {"model": "new-model"}}}, db=fake_db,
+    )
+
+    config = await AISettingsService.get_effective_provider_config(
+        "u1", AIProvider.CUSTOM, db=fake_db
+    )
+    assert config.model == "new-model"
+
+
+@pytest.mark.asyncio
+async def test_failed_settings_write_still_invalidates():
+    _credential_cache.put(
+        "u1", ai_settings_service._ResolvedCredentials(settings={}), _credential_cache.generation
+    )
+    with pytest.raises(AIServiceError):
+        await AISettingsService.update_user_settings(
+            "u1", {"x": 1}, db=_BoomTableDb(RuntimeError("db down")),
+            current_settings={"provider_configs": {}},
+        )
+    assert _credential_cache.get("u1") is None
+
+
+def test_credential_cache_drops_fill_from_before_invalidation():
+    generation = _credential_cache.generation
+    _credential_cache.invalidate("u1")
+    _credential_cache.put("u1", ai_settings_service._ResolvedCredentials(settings={}), generation)
+    assert _credential_cache.get("u1") is None
+
+
+def test_another_users_write_does_not_drop_a_fill():
+    generation = _settings_snapshots.generation
+    AISettingsService._apply_usage("u2", "generation", 1)
+    _credential_cache.invalidate("u2")
+    _settings_snapshots.put("u1", {"user_id": "u1"}, generation)
+    assert _settings_snapshots.get("u1") == {"user_id": "u1"}
+
+    generation = _settings_snapshots.generation
+    _settings_snapshots.bump("u1")
+    _settings_snapshots.put("u1", {"user_id": "u1", "stale": True}, generation)
+    assert "stale" not in _settings_snapshots.get("u1")
+
+
+def test_forgotten_write_stamp_still_drops_older_fills(monkeypatch):
+    monkeypatch.setattr(settings, "AI_CREDENTIAL_CACHE_MAX_ENTRIES", 2)
+    credentials = ai_settings_service._ResolvedCredentials(settings={})
+    generation = _credential_cache.generation
+    for user_id in ("u1", "u2", "u3"):
+        _credential_cache.invalidate(user_id)
+    # u1's stamp was evicted; its pre-write fill is dropped conservatively.
+    _credential_cache.put("u1", credentials, generation)
+    assert _credential_cache.get("u1") is None
+    _credential_cache.put("u1", credentials, _credential_cache.generation)
+    assert _credential_cache.get("u1") is credentials
+
+
+def test_credential_cache_ttl_and_entry_cap(monkeypatch):
+    credentials = ai_settings_service._ResolvedCredentials(settings={})
+
+    monkeypatch.setattr(settings, "AI_CREDENTIAL_CACHE_TTL_SECONDS", 0)
+    _credential_cache.put("u1", credentials, _credential_cache.generation)
+    assert len(_credential_cache) == 0
+
+    monkeypatch.setattr(settings, "AI_CREDENTIAL_CACHE_TTL_SECONDS", 60)
+    monkeypatch.setattr(settings, "AI_CREDENTIAL_CACHE_MAX_ENTRIES", 2)
+    for user_id in ("u1", "u2", "u3"):
+        _credential_cache.put(user_id, credentials, _credential_cache.generation)
+    assert _credential_cache.get("u1") is None
+    assert _credential_cache.get("u3") is credentials
+
+    now = ai_settings_service.time.monotonic()
+    with patch("app.services.ai_settings_service.time.monotonic", return_value=now + 61):
+        assert _credential_cache.get("u3") is None
+    assert len(_credential_cache) == 1
+
+
+# =============================================================================
+# Settings snapshot and write-through usage counters
+# =============================================================================
+
+
+def _settings_selects(db):
+    return [args for table, args in db.selects if table == "user_ai_settings"]
+
+
+def _usage_row(**overrides):
+    row = {
+        "user_id": "u1",
+        "provider_configs": {},
+        "default_provider": "custom",
+        "daily_extraction_count": 3,
+        "daily_generation_count": 1,
+        "daily_embedding_count": 0,
+        "last_reset_date": date.today().isoformat(),
+        "total_extractions": 10,
+        "total_generations": 4,
+        "total_embeddings": 0,
+    }
+    row.update(overrides)
+    return row
+
+
+@pytest.mark.asyncio
+async def test_get_user_settings_served_from_snapshot_as_a_copy(fake_db):
+    fake_db.rows["user_ai_settings"] = [_usage_row()]
+
+    first = await AISettingsService.get_user_settings("u1", db=fake_db)
+    first["provider_configs"]["custom"] = {"model": "mutated"}
+    stats = await AISettingsService.get_usage_stats("u1", db=fake_db)
+    limit = await AISettingsService.check_rate_limit("u1", "extraction", db=fake_db)
+    second = await AISettingsService.get_user_settings("u1", db=fake_db)
+
+    assert len(_settings_selects(fake_db)) == 1
+    assert second["provider_configs"] == {}
+    assert stats["daily"]["extractions"] == 3
+    assert limit["current_count"] == 3
+
+
+@pytest.mark.asyncio
+async def test_snapshot_from_an_earlier_day_reads_as_zero_usage(fake_db):
+    fake_db.rows["user_ai_settings"] = [_usage_row()]
+    await AISettingsService.get_user_settings("u1", db=fake_db)
+
+    yesterday = (date.today() - timedelta(days=1)).isoformat()
+    _settings_snapshots.get("u1")["last_reset_date"] = yesterday
+    result = await AISettingsService.get_user_settings("u1", db=fake_db)
+
+    assert result["daily_extraction_count"] == 0
+    assert result["total_extractions"] == 10
+    assert result["last_reset_date"] == date.today().isoformat()
+    # Date-keyed in memory: no reset write, no re-read.
+    assert fake_db.updates == []
+    assert len(_settings_selects(fake_db)) == 1
+
+
+@pytest.mark.asyncio
+async def test_reservations_write_through_and_skip_the_row_check(fake_db):
+    fake_db.rows["user_ai_settings"] = [_usage_row()]
+    fake_db.rpc_results["reserve_ai_usage"] = [{"reserve_ai_usage": True}]
+    await AISettingsService.get_user_settings("u1", db=fake_db)
+
+    for _ in range(3):
+        assert await AISettingsService.reserve_usage("u1", "extraction", db=fake_db, count=2)
+    await AISettingsService.release_usage("u1", "extraction", db=fake_db, count=1)
+    stats = await AISettingsService.get_usage_stats("u1", db=fake_db)
+
+    # One full-row read, no ensure_ai_settings_row selects.
+    assert len(_settings_selects(fake_db)) == 1
+    assert stats["daily"]["extractions"] == 3 + 6 - 1
+    assert stats["total"]["extractions"] == 10 + 6 - 1
+
+
+@pytest.mark.asyncio
+async def test_row_check_runs_once_per_ttl_without_snapshot(fake_db):
+    fake_db.rpc_results["reserve_ai_usage"] = [{"reserve_ai_usage": True}]
+
+    for _ in range(3):
+        await AISettingsService.reserve_usage("u1", "generation", db=fake_db)
+
+    assert _settings_selects(fake_db) == [("user_id",)]
+    assert len(fake_db.rpc_calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_release_rolls_a_stale_day_and_clamps_at_zero(fake_db):
+    yesterday = (date.today() - timedelta(days=1)).isoformat()
+    fake_db.rows["user_ai_settings"] = [_usage_row()]
+    await AISettingsService.get_user_settings("u1", db=fake_db)
+    _settings_snapshots.get("u1")["last_reset_date"] = yesterday
+
+    await AISettingsService.release_usage("u1", "generation", db=fake_db, count=5)
+    # Unknown operations are left to the RPC to reject.
+    AISettingsService._apply_usage("u1", "photoshoot", 1)
+    result = await AISettingsService.get_user_settings("u1", db=fake_db)
+
+    assert result["daily_generation_count"] == 0
+    assert result["total_generations"] == 0
+    assert result["daily_extraction_count"] == 0
+
+
+@pytest.mark.asyncio
+async def test_refused_or_failed_reservation_drops_the_snapshot(fake_db):
+    fake_db.rows["user_ai_settings"] = [_usage_row()]
+    fake_db.rpc_results["reserve_ai_usage"] = [{"reserve_ai_usage": False}]
+    await AISettingsService.get_user_settings("u1", db=fake_db)
+
+    assert await AISettingsService.reserve_usage("u1", "extraction", db=fake_db) is False
+    assert _settings_snapshots.get("u1") is None
+
+    await AISettingsService.get_user_settings("u1", db=fake_db)
+    with patch.object(AISettingsService, "ensure_ai_settings_row", AsyncMock()):
+        with pytest.raises(AIServiceError):
+            await AISettingsService.reserve_usage(
+                "u1", "extraction", db=_BoomRpcDb(RuntimeError("connection reset"))
+            )
+    assert _settings_snapshots.get("u1") is None
+
+
+@pytest.mark.asyncio
+async def test_fill_started_before_a_reservation_is_not_stored(fake_db):
+    fake_db.rows["user_ai_settings"] = [_usage_row()]
+    load = AISettingsService._load_user_settings
+
+    async def load_then_reserve(user_id, db):
+        row = await load(user_id, db)
+        AISettingsService._apply_usage(user_id, "extraction", 1)
+        return row
+
+    with patch.object(AISettingsService, "_load_user_settings", load_then_reserve):
+        await AISettingsService.get_user_settings("u1", db=fake_db)
+
+    assert _settings_snapshots.get("u1") is None
+
+
 # =============================================================================
 # get_ai_service_for_user - provider resolution edge cases
 # =============================================================================
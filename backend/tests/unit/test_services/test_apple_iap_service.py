@@ -1,5 +1,6 @@
 """Tests for the Apple App Store Server API service."""
 import base64
+import dataclasses
 import json
 from datetime import datetime, timedelta, timezone
 from unittest.mock import Mock, patch
@@ -9,6 +10,7 @@ import pytest
 from app.core.config import settings
 from app.core.exceptions import ValidationError
 from app.models.subscription import PlanType
+from app.services import apple_iap_service
 from app.services.apple_iap_service import (
     APPLE_PROD_API_URL,
     APPLE_SANDBOX_API_URL,
@@ -150,6 +152,81 @@ def test_verify_jws_rejects_malformed(jws_fixture):
 # ---------------------------------------------------------------------------
 
 
+# ---------------------------------------------------------------------------
+# Validated-chain cache
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture()
+def chain_cache():
+    apple_iap_service.reset_verified_chain_cache()
+    yield apple_iap_service._verified_chains
+    apple_iap_service.reset_verified_chain_cache()
+
+
+def test_verify_jws_walks_a_chain_once_then_only_checks_signatures(jws_fixture, chain_cache):
+    roots = (jws_fixture["root"],)
+    with patch.object(
+        AppleIAPService, "_verify_cert_chain", wraps=AppleIAPService._verify_cert_chain
+    ) as chain_walk:
+        for n in range(3):
+            payload = {"notificationType": "DID_RENEW", "notificationId": f"n{n}"}
+            jws = sign_jws(payload, jws_fixture["leaf_key"], jws_fixture["chain"])
+            assert AppleIAPService.verify_jws(jws, trust_roots=roots) == payload
+
+    assert chain_walk.call_count == 1
+    (entry,) = chain_cache.values()
+    assert entry.valid_until == jws_fixture["chain"][0].not_valid_after_utc.timestamp()
+
+
+def test_cached_chain_still_rejects_a_bad_signature(jws_fixture, chain_cache):
+    roots = (jws_fixture["root"],)
+    AppleIAPService.verify_jws(
+        sign_jws({"n": 1}, jws_fixture["leaf_key"], jws_fixture["chain"]), trust_roots=roots
+    )
+    # Same x5c chain, signed by a key that is not the leaf's.
+    forged = sign_jws({"n": 2}, make_ec_key(), jws_fixture["chain"])
+
+    with pytest.raises(AppleIAPSignatureError, match="signature verification failed"):
+        AppleIAPService.verify_jws(forged, trust_roots=roots)
+
+
+def test_cached_chain_is_not_reused_for_other_trust_roots(jws_fixture, chain_cache):
+    jws = sign_jws({"n": 1}, jws_fixture["leaf_key"], jws_fixture["chain"])
+    AppleIAPService.verify_jws(jws, trust_roots=(jws_fixture["root"],))
+
+    with pytest.raises(AppleIAPSignatureError, match="does not anchor to a trusted root"):
+        AppleIAPService.verify_jws(jws, trust_roots=(make_ca_cert(make_ec_key()),))
+
+
+def test_expired_cache_entry_revalidates_the_chain(jws_fixture, chain_cache):
+    roots = (jws_fixture["root"],)
+    jws = sign_jws({"n": 1}, jws_fixture["leaf_key"], jws_fixture["chain"])
+    AppleIAPService.verify_jws(jws, trust_roots=roots)
+    key, entry = next(iter(chain_cache.items()))
+    chain_cache[key] = dataclasses.replace(entry, valid_until=0.0)
+
+    with patch.object(
+        AppleIAPService, "_verify_cert_chain", wraps=AppleIAPService._verify_cert_chain
+    ) as chain_walk:
+        AppleIAPService.verify_jws(jws, trust_roots=roots)
+
+    assert chain_walk.call_count == 1
+    assert chain_cache[key].valid_until > 0.0
+
+
+def test_chain_cache_is_bounded(jws_fixture, chain_cache, monkeypatch):
+    monkeypatch.setattr(apple_iap_service, "_VERIFIED_CHAIN_CACHE_MAX", 2)
+    for _ in range(3):
+        root_key = make_ec_key()
+        root = make_ca_cert(root_key)
+        leaf_key = make_ec_key()
+        chain = [make_leaf_cert(leaf_key, root_key, root), root]
+        AppleIAPService.verify_jws(sign_jws({"n": 1}, leaf_key, chain), trust_roots=(root,))
+
+    assert len(chain_cache) == 2
+
+
 def test_generate_api_token_has_expected_shape():
     with patch.multiple(settings, **_apple_settings()):
         token = AppleIAPService.generate_api_token()
@@ -0,0 +1,274 @@
+"""Tests for the prepared avatar reference cache (AvatarReferenceService).
+
+Covers:
+- ``StorageService.avatar_reference_key_for`` derivation.
+- Memory hit, persisted ``_ref_v`` sibling hit and full miss (download +
+  downscale once, JPEG written back).
+- Non-owned / external avatar keys take the uncached path.
+- Concurrent misses share one preparation.
+- Entry and byte bounds of the in-process LRU.
+- ``delete_image`` and owned-path expansion carry the reference sibling.
+"""
+import asyncio
+import base64
+import io
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from PIL import Image
+
+from app.core.config import settings
+from app.services.avatar_reference_service import AvatarReferenceService
+from app.services.storage_service import StorageService, _with_thumb_siblings
+from tests.utils.fake_db import FakeDB
+from tests.utils.fake_storage import FakeS3Backend
+
+USER_ID = "user-1"
+AVATAR_KEY = f"{USER_ID}/avatars/0123456789abcdef0123456789abcdef.webp"
+REF_KEY = f"{USER_ID}/avatars/0123456789abcdef0123456789abcdef_ref_v1.jpg"
+
+
+def _jpeg_bytes() -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (4, 4), (200, 10, 10)).save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+class _KeyedBackend(FakeS3Backend):
+    """FakeS3Backend that serves objects per key instead of one blob."""
+
+    def __init__(self, objects_by_key=None):
+        super().__init__()
+        self.objects_by_key = dict(objects_by_key or {})
+
+    async def download(self, key: str) -> bytes:
+        self.download_keys.append(key)
+        if key not in self.objects_by_key:
+            raise Exception("NoSuchKey")
+        return self.objects_by_key[key]
+
+
+def _patch_backend(backend):
+    return patch("app.services.avatar_reference_service.get_storage_backend", return_value=backend)
+
+
+def _patch_prepare(**kwargs):
+    return patch.object(
+        StorageService,
+        "download_and_downscale_to_base64",
+        new=AsyncMock(**kwargs),
+    )
+
+
+# --------------------------------------------------------------------------- #
+# avatar_reference_key_for (pure)
+# --------------------------------------------------------------------------- #
+def test_avatar_reference_key_for_canonical_avatars_only():
+    assert StorageService.avatar_reference_key_for(AVATAR_KEY) == REF_KEY
+    assert (
+        StorageService.avatar_reference_key_for("u/avatars/abc.png")
+        == "u/avatars/abc_ref_v1.jpg"
+    )
+    assert StorageService.avatar_reference_key_for("u/items/abc.jpg") is None
+    assert StorageService.avatar_reference_key_for("u/avatars/abc_thumb.webp") is None
+    assert StorageService.avatar_reference_key_for("u/avatars/abc_ref_v1.jpg") is None
+    assert StorageService.avatar_reference_key_for("u/avatars/noext") is None
+    assert StorageService.avatar_reference_key_for("avatars/abc.jpg") is None
+    assert StorageService.avatar_reference_key_for("") is None
+
+
+# --------------------------------------------------------------------------- #
+# get_reference_base64
+# --------------------------------------------------------------------------- #
+@pytest.mark.asyncio
+async def test_full_miss_prepares_once_and_persists_jpeg_sibling():
+    jpeg = _jpeg_bytes()
+    prepared = base64.b64encode(jpeg).decode()
+    backend = _KeyedBackend()
+    db = FakeDB(rows={"users": [{"id": USER_ID, "avatar_url": AVATAR_KEY}]})
+
+    with _patch_backend(backend), _patch_prepare(return_value=prepared) as prepare:
+        first = await AvatarReferenceService.get_reference_base64(USER_ID, db)
+        second = await AvatarReferenceService.get_reference_base64(USER_ID, db)
+
+    assert first == second == prepared
+    prepare.assert_awaited_once_with(AVATAR_KEY)
+    assert backend.download_keys == [REF_KEY]
+    assert [call["key"] for call in backend.upload_calls] == [REF_KEY]
+    assert backend.upload_calls[0]["data"] == jpeg
+    assert backend.upload_calls[0]["content_type"] == "image/jpeg"
+
+
+@pytest.mark.asyncio
+async def test_persisted_sibling_skips_the_original_download():
+    jpeg = _jpeg_bytes()
+    backend = _KeyedBackend({REF_KEY: jpeg})
+
+    with _patch_backend(backend), _patch_prepare(return_value="unused") as prepare:
+        result = await AvatarReferenceService.get_reference_base64(
+            USER_ID, avatar_url=AVATAR_KEY
+        )
+
+    assert result == base64.b64encode(jpeg).decode()
+    prepare.assert_not_awaited()
+    assert backend.upload_calls == []
+
+
+@pytest.mark.asyncio
+async def test_non_jpeg_passthrough_is_served_but_not_persisted():
+    # The downscaler returns the original bytes when re-encoding would not
+    # shrink them; those must not be written under a .jpg key.
+    png = base64.b64encode(b"\x89PNG\r\n\x1a\n-small").decode()
+    backend = _KeyedBackend()
+
+    with _patch_backend(backend), _patch_prepare(return_value=png):
+        result = await AvatarReferenceService.get_reference_base64(
+            USER_ID, avatar_url=AVATAR_KEY
+        )
+
+    assert result == png
+    assert backend.upload_calls == []
+
+
+@pytest.mark.asyncio
+async def test_persist_failure_still_returns_prepared_avatar():
+    prepared = base64.b64encode(_jpeg_bytes()).decode()
+    backend = _KeyedBackend()
+    backend.upload = AsyncMock(side_effect=RuntimeError("s3 down"))
+
+    with _patch_backend(backend), _patch_prepare(return_value=prepared):
+        result = await AvatarReferenceService.get_reference_base64(
+            USER_ID, avatar_url=AVATAR_KEY
+        )
+
+    assert result == prepared
+
+
+@pytest.mark.asyncio
+async def test_non_owned_avatar_takes_uncached_path():
+    foreign = "user-2/avatars/0123456789abcdef0123456789abcdef.jpg"
+    backend = _KeyedBackend()
+
+    with _patch_backend(backend), _patch_prepare(return_value="b64") as prepare:
+        for _ in range(2):
+            assert (
+                await AvatarReferenceService.get_reference_base64(USER_ID, avatar_url=foreign)
+                == "b64"
+            )
+
+    assert prepare.await_count == 2
+    assert backend.download_keys == []
+    assert len(AvatarReferenceService._cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_missing_row_db_or_failure_returns_none():
+    assert await AvatarReferenceService.get_reference_base64(USER_ID) is None
+    assert await AvatarReferenceService.get_reference_base64(USER_ID, FakeDB()) is None
+
+    with _patch_backend(_KeyedBackend()), _patch_prepare(side_effect=RuntimeError("boom")):
+        assert (
+            await AvatarReferenceService.get_reference_base64(USER_ID, avatar_url=AVATAR_KEY)
+            is None
+        )
+    # A failed preparation is not cached.
+    assert len(AvatarReferenceService._cache) == 0
+    assert AvatarReferenceService._inflight == {}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_preparation():
+    prepared = base64.b64encode(_jpeg_bytes()).decode()
+    release = asyncio.Event()
+
+    async def slow_prepare(key):
+        await release.wait()
+        return prepared
+
+    backend = _KeyedBackend()
+    with _patch_backend(backend), patch.object(
+        StorageService, "download_and_downscale_to_base64", new=AsyncMock(side_effect=slow_prepare)
+    ) as prepare:
+        callers = [
+            asyncio.create_task(
+                AvatarReferenceService.get_reference_base64(USER_ID, avatar_url=AVATAR_KEY)
+            )
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        callers[0].cancel()
+        release.set()
+        results = await asyncio.gather(*callers, return_exceptions=True)
+
+    assert isinstance(results[0], asyncio.CancelledError)
+    assert results[1:] == [prepared, prepared]
+    prepare.assert_awaited_once()
+    assert AvatarReferenceService._inflight == {}
+
+
+# --------------------------------------------------------------------------- #
+# LRU bounds
+# --------------------------------------------------------------------------- #
+def test_cache_evicts_by_entries_and_bytes(monkeypatch):
+    cache = AvatarReferenceService._cache
+    monkeypatch.setattr(settings, "AVATAR_REFERENCE_CACHE_MAX_ENTRIES", 2)
+    monkeypatch.setattr(settings, "AVATAR_REFERENCE_CACHE_MAX_BYTES", 10)
+
+    cache.put("a", "1234")
+    cache.put("b", "1234")
+    assert cache.get("a") == "1234"  # a is now most recent
+    cache.put("c", "12")
+    assert cache.get("b") is None
+    assert len(cache) == 2
+
+    cache.put("d", "123456")  # 4 + 2 + 6 > 10: evict oldest until it fits
+    assert cache.get("a") is None
+    assert cache.total_bytes <= 10
+
+    cache.put("d", "1")  # replacing an entry re-accounts its bytes
+    assert cache.total_bytes == 3
+
+    cache.put("huge", "x" * 11)  # larger than the whole budget: never cached
+    assert cache.get("huge") is None
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.total_bytes == 0
+
+
+# --------------------------------------------------------------------------- #
+# delete_image
+# --------------------------------------------------------------------------- #
+@pytest.mark.asyncio
+async def test_delete_image_removes_reference_sibling():
+    backend = FakeS3Backend()
+    with patch("app.services.storage_service.get_storage_backend", return_value=backend):
+        assert await StorageService.delete_image(None, AVATAR_KEY) is True
+
+    assert REF_KEY in backend.delete_calls
+    assert backend.delete_calls[0] == AVATAR_KEY
+
+
+@pytest.mark.asyncio
+async def test_delete_image_reference_failure_is_best_effort():
+    backend = FakeS3Backend()
+    real_delete = backend.delete
+
+    async def delete(key):
+        if key == REF_KEY:
+            raise RuntimeError("s3 down")
+        await real_delete(key)
+
+    backend.delete = delete
+    with patch("app.services.storage_service.get_storage_backend", return_value=backend):
+        assert await StorageService.delete_image(None, AVATAR_KEY) is True
+
+
+def test_owned_path_expansion_includes_reference_sibling():
+    assert _with_thumb_siblings([AVATAR_KEY, "user-1/items/abc.jpg"]) == [
+        AVATAR_KEY,
+        f"{USER_ID}/avatars/0123456789abcdef0123456789abcdef_thumb.webp",
+        REF_KEY,
+        "user-1/items/abc.jpg",
+        "user-1/items/abc_thumb.webp",
+    ]
@@ -16,6 +16,7 @@ from PIL import Image
 
 from app.services.batch_extraction_service import BatchExtractionService
 from app.services.batch_job_service import BatchJob, BatchJobStatus, DetectedItemData
+from app.utils.image_handle import ImageHandle
 
 
 def _make_photo_b64(size=(1000, 1000)) -> str:
@@ -53,7 +54,9 @@ def _make_item(**overrides) -> DetectedItemData:
 
 class _FakeGeneratedImage:
     def __init__(self, image_base64: str = "Z2VuZXJhdGVk"):
-        self.image_base64 = image_base64
+        self.image = ImageHandle.from_base64(image_base64)
+        self.image_base64 = self.image.base64
+        self.storage_ready = False
 
 
 def _make_agent() -> AsyncMock:
@@ -13,7 +13,7 @@ import asyncio
 import base64
 import io
 from datetime import datetime, timezone
-from unittest.mock import AsyncMock, MagicMock, Mock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
 import pytest
@@ -29,6 +29,7 @@ from app.services.batch_job_service import (
     BatchJobStatus,
     DetectedItemData,
 )
+from app.utils.image_handle import ImageHandle
 from tests.utils.fake_db import FakeDB
 
 
@@ -69,7 +70,9 @@ def _clear_job_store():
 
 class _FakeGeneratedImage:
     def __init__(self, image_base64: str = "Z2VuZXJhdGVk"):
-        self.image_base64 = image_base64
+        self.image = ImageHandle.from_base64(image_base64)
+        self.image_base64 = self.image.base64
+        self.storage_ready = False
 
 
 async def _call_once(fn, **kwargs):
@@ -83,23 +86,6 @@ def _make_extraction_agent(items):
     return agent
 
 
-class _FakeAvatarClient:
-    def __init__(self, response=None, exc=None):
-        self.response = response
-        self.exc = exc
-
-    async def __aenter__(self):
-        return self
-
-    async def __aexit__(self, *args):
-        return False
-
-    async def get(self, url, **kwargs):
-        if self.exc is not None:
-            raise self.exc
-        return self.response
-
-
 # ---------------------------------------------------------------------------
 # _extract_single_image
 # ---------------------------------------------------------------------------
@@ -889,17 +875,20 @@ async def test_generate_single_item_persists_generated_image():
         return_value=_FakeGeneratedImage("data:image/webp;base64,ZmFrZQ==")
     )
     service = BatchExtractionService(user_id="u1", db=None)
+    upload = AsyncMock(return_value={"image_url": "https://cdn/gen.webp"})
     with (
         patch("app.services.batch_extraction_service.with_retry", new=_call_once),
         patch(
             "app.services.batch_extraction_service.StorageService.upload_temp_generated_image",
-            new=AsyncMock(return_value={"image_url": "https://cdn/gen.webp"}),
+            new=upload,
         ),
         patch.object(BatchJobService, "broadcast_event", AsyncMock()),
     ):
         result = await service._generate_single_item(job, item, agent, None)
 
-    assert result == "data:image/webp;base64,ZmFrZQ=="
+    # The data URL was decoded once into the handle; the upload gets its bytes.
+    assert result == "ZmFrZQ=="
+    assert upload.await_args.kwargs["file_data"] == b"fake"
     assert item.generated_image_url == "https://cdn/gen.webp"
     assert item.status == "generated"
 
@@ -993,17 +982,21 @@ async def test_cache_extraction_results_paths():
 
 @pytest.mark.asyncio
 async def test_fetch_user_avatar_base64_paths():
+    owned = "u1/avatars/0123456789abcdef0123456789abcdef.jpg"
     service = BatchExtractionService(
         user_id="u1",
-        db=FakeDB(rows={"users": [{"id": "u1", "avatar_url": "https://cdn.test/avatar.png"}]}),
+        db=FakeDB(rows={"users": [{"id": "u1", "avatar_url": owned}]}),
     )
-    response = Mock(content=b"raw-avatar", raise_for_status=Mock())
     with patch(
-        "app.services.batch_extraction_service.httpx.AsyncClient",
-        return_value=_FakeAvatarClient(response=response),
-    ):
+        "app.services.avatar_reference_service.StorageService.download_and_downscale_to_base64",
+        new=AsyncMock(return_value="prepared-avatar"),
+    ) as prepare, patch(
+        "app.services.avatar_reference_service.get_storage_backend"
+    ) as backend:
+        backend.return_value.download = AsyncMock(return_value=None)
         result = await service._fetch_user_avatar_base64()
-    assert result == base64.b64encode(b"raw-avatar").decode()
+    assert result == "prepared-avatar"
+    prepare.assert_awaited_once_with(owned)
 
     # No user row.
     no_user = BatchExtractionService(user_id="u1", db=FakeDB())
@@ -1016,15 +1009,11 @@ async def test_fetch_user_avatar_base64_paths():
     assert await no_url._fetch_user_avatar_base64() is None
 
     # Timeout is swallowed.
-    timed_out = BatchExtractionService(
-        user_id="u1",
-        db=FakeDB(rows={"users": [{"id": "u1", "avatar_url": "https://cdn.test/a.png"}]}),
-    )
     with patch(
-        "app.services.batch_extraction_service.httpx.AsyncClient",
-        return_value=_FakeAvatarClient(exc=asyncio.TimeoutError()),
+        "app.services.batch_extraction_service.AvatarReferenceService.get_reference_base64",
+        new=AsyncMock(side_effect=asyncio.TimeoutError()),
     ):
-        assert await timed_out._fetch_user_avatar_base64() is None
+        assert await service._fetch_user_avatar_base64() is None
 
     # Generic failures are swallowed too.
     class _BrokenDb:
@@ -342,7 +342,7 @@ async def test_generate_single_item_passes_reference_image_and_description():
     async def fake_generate_product_image(**kwargs):
         captured_kwargs.update(kwargs)
         return GeneratedImage(
-            image_base64="ZmFrZQ==", prompt="p", model="m", provider="p"
+            image="ZmFrZQ==", prompt="p", model="m", provider="p"
         )
 
     fake_agent = MagicMock()
@@ -398,7 +398,7 @@ async def test_generate_single_item_falls_back_when_source_unavailable():
     async def fake_generate_product_image(**kwargs):
         captured_kwargs.update(kwargs)
         return GeneratedImage(
-            image_base64="ZmFrZQ==", prompt="p", model="m", provider="p"
+            image="ZmFrZQ==", prompt="p", model="m", provider="p"
         )
 
     fake_agent = MagicMock()
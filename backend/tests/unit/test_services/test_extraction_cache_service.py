@@ -1,11 +1,13 @@
 """
-Tests for ExtractionCacheService (in-memory extraction-result cache).
+Tests for ExtractionCacheService and its storage backends.
 
-The process-local ``_cache`` dict is cleared per test. Time is frozen by
-monkeypatching the module-level ``utcnow``/``utcnow_iso`` imports so
-expiry/hit/miss behavior is deterministic.
+Each test installs a fresh ``MemoryCacheBackend`` as the process-wide
+backend. Time is frozen by monkeypatching the module-level ``utcnow``
+import so expiry/hit/miss behavior is deterministic. The SQLite tier runs
+against a real database file under ``tmp_path``.
 """
 
+import asyncio
 import hashlib
 from datetime import datetime, timedelta, timezone
 from unittest.mock import AsyncMock
@@ -13,17 +15,28 @@ from unittest.mock import AsyncMock
 import pytest
 
 from app.services import extraction_cache_service as svc
-from app.services.extraction_cache_service import ExtractionCacheService
+from app.services.extraction_cache_service import (
+    CacheEntry,
+    ExtractionCacheService,
+    MemoryCacheBackend,
+    SqliteCacheBackend,
+    TieredCacheBackend,
+)
 
 FROZEN_NOW = datetime(2026, 1, 15, 12, 0, 0, tzinfo=timezone.utc)
+NOW = FROZEN_NOW.timestamp()
 
 
 @pytest.fixture(autouse=True)
-def _reset_cache():
-    """Each test starts (and ends) with an empty process-local cache."""
-    svc._cache.clear()
-    yield
-    svc._cache.clear()
+def memory_backend(monkeypatch):
+    """Each test starts with an empty memory backend and zeroed counters."""
+    backend = MemoryCacheBackend(max_entries=200, max_bytes=1024 * 1024)
+    monkeypatch.setattr(svc, "_backend", backend)
+    monkeypatch.setattr(svc, "_sweeper_task", None)
+    monkeypatch.setattr(ExtractionCacheService, "hits", 0)
+    monkeypatch.setattr(ExtractionCacheService, "misses", 0)
+    monkeypatch.setattr(ExtractionCacheService, "_ensure_sweeper_task", classmethod(lambda cls: None))
+    return backend
 
 
 def _cache_key(user_id: str, image: str) -> str:
@@ -31,6 +44,10 @@ def _cache_key(user_id: str, image: str) -> str:
     return f"{user_id}:{digest}"
 
 
+def _entry(result=None, ttl_seconds=3600, size=10) -> CacheEntry:
+    return CacheEntry(result if result is not None else {}, NOW + ttl_seconds, size)
+
+
 # ---------------------------------------------------------------------------
 # Hashing
 # ---------------------------------------------------------------------------
@@ -71,32 +88,24 @@ async def test_get_cached_result_miss_returns_none(monkeypatch):
     monkeypatch.setattr(svc, "utcnow", lambda: FROZEN_NOW)
 
     assert await ExtractionCacheService.get_cached_result("img", "u1") is None
+    assert ExtractionCacheService.misses == 1
 
 
 @pytest.mark.asyncio
-async def test_get_cached_result_hit_returns_stored_result(monkeypatch):
+async def test_get_cached_result_hit_returns_stored_result(monkeypatch, memory_backend):
     monkeypatch.setattr(svc, "utcnow", lambda: FROZEN_NOW)
-    key = _cache_key("u1", "img")
-    svc._cache[key] = {
-        "result": {"items": [{"id": 1}]},
-        "expiry": (FROZEN_NOW + timedelta(hours=1)).isoformat(),
-        "cached_at": FROZEN_NOW.isoformat(),
-    }
+    await memory_backend.set(_cache_key("u1", "img"), _entry({"items": [{"id": 1}]}))
 
     result = await ExtractionCacheService.get_cached_result("img", "u1")
 
     assert result == {"items": [{"id": 1}]}
+    assert ExtractionCacheService.hits == 1
 
 
 @pytest.mark.asyncio
-async def test_get_cached_result_hit_without_items_field(monkeypatch):
+async def test_get_cached_result_hit_without_items_field(monkeypatch, memory_backend):
     monkeypatch.setattr(svc, "utcnow", lambda: FROZEN_NOW)
-    key = _cache_key("u1", "img")
-    svc._cache[key] = {
-        "result": {"note": "no items"},
-        "expiry": (FROZEN_NOW + timedelta(hours=1)).isoformat(),
-        "cached_at": FROZEN_NOW.isoformat(),
-    }
+    await memory_backend.set(_cache_key("u1", "img"), _entry({"note": "no items"}))
 
     assert await ExtractionCacheService.get_cached_result("img", "u1") == {
         "note": "no items"
@@ -104,47 +113,22 @@ async def test_get_cached_result_hit_without_items_field(monkeypatch):
 
 
 @pytest.mark.asyncio
-async def test_get_cached_result_coerces_naive_expiry(monkeypatch):
-    """Pre-UTC-migration entries store naive ISO expiry; they must be
-    coerced to aware so the expiry comparison does not raise."""
-    monkeypatch.setattr(svc, "utcnow", lambda: FROZEN_NOW)
-    key = _cache_key("u1", "img")
-    svc._cache[key] = {
-        "result": {"items": []},
-        "expiry": (FROZEN_NOW + timedelta(hours=2)).replace(tzinfo=None).isoformat(),
-        "cached_at": "2026-01-15T10:00:00",
-    }
-
-    assert await ExtractionCacheService.get_cached_result("img", "u1") == {"items": []}
-
-
-@pytest.mark.asyncio
-async def test_get_cached_result_expired_removes_entry(monkeypatch):
+async def test_get_cached_result_is_scoped_per_user(monkeypatch, memory_backend):
     monkeypatch.setattr(svc, "utcnow", lambda: FROZEN_NOW)
-    key = _cache_key("u1", "img")
-    svc._cache[key] = {
-        "result": {"items": []},
-        "expiry": (FROZEN_NOW - timedelta(seconds=1)).isoformat(),
-        "cached_at": "2026-01-14T00:00:00+00:00",
-    }
+    await memory_backend.set(_cache_key("u1", "img"), _entry({"items": []}))
 
-    assert await ExtractionCacheService.get_cached_result("img", "u1") is None
-    assert key not in svc._cache
+    assert await ExtractionCacheService.get_cached_result("img", "u2") is None
 
 
 @pytest.mark.asyncio
-async def test_get_cached_result_corrupt_expiry_returns_none(monkeypatch):
+async def test_get_cached_result_expired_removes_entry(monkeypatch, memory_backend):
     monkeypatch.setattr(svc, "utcnow", lambda: FROZEN_NOW)
     key = _cache_key("u1", "img")
-    svc._cache[key] = {
-        "result": {"items": []},
-        "expiry": "not-a-date",
-        "cached_at": "2026-01-14T00:00:00+00:00",
-    }
+    await memory_backend.set(key, _entry({"items": []}, ttl_seconds=-1))
 
     assert await ExtractionCacheService.get_cached_result("img", "u1") is None
-    # The corrupt entry is left in place: only real expiry evicts.
-    assert key in svc._cache
+    assert key not in memory_backend
+    assert memory_backend.total_bytes == 0
 
 
 @pytest.mark.asyncio
@@ -164,52 +148,32 @@ async def test_get_cached_result_hash_error_returns_none(monkeypatch):
 
 
 @pytest.mark.asyncio
-async def test_set_cached_result_stores_entry_with_ttl(monkeypatch):
+async def test_set_cached_result_stores_entry_with_ttl(monkeypatch, memory_backend):
     monkeypatch.setattr(svc, "utcnow", lambda: FROZEN_NOW)
-    monkeypatch.setattr(svc, "utcnow_iso", lambda: FROZEN_NOW.isoformat())
 
     await ExtractionCacheService.set_cached_result("img", "u1", {"items": [1, 2]})
 
-    entry = svc._cache[_cache_key("u1", "img")]
-    assert entry["result"] == {"items": [1, 2]}
-    assert entry["expiry"] == (FROZEN_NOW + timedelta(hours=24)).isoformat()
-    assert entry["cached_at"] == FROZEN_NOW.isoformat()
+    entry = await memory_backend.get(_cache_key("u1", "img"), NOW)
+    assert entry.result == {"items": [1, 2]}
+    assert entry.expires_at == (FROZEN_NOW + timedelta(hours=24)).timestamp()
+    assert entry.size_bytes == len(b'{"items": [1, 2]}')
+    assert memory_backend.total_bytes == entry.size_bytes
 
 
 @pytest.mark.asyncio
-async def test_set_cached_result_evicts_oldest_when_over_cap(monkeypatch):
-    monkeypatch.setattr(ExtractionCacheService, "MAX_ENTRIES", 3)
-    monkeypatch.setattr(svc, "utcnow", lambda: FROZEN_NOW)
-    monkeypatch.setattr(svc, "utcnow_iso", lambda: FROZEN_NOW.isoformat())
-    svc._cache.update(
-        {
-            "oldest": {
-                "result": {},
-                "expiry": "2026-01-15T13:00:00+00:00",
-                "cached_at": "2026-01-15T09:00:00+00:00",
-            },
-            "middle": {
-                "result": {},
-                "expiry": "2026-01-15T13:00:00+00:00",
-                "cached_at": "2026-01-15T10:00:00+00:00",
-            },
-            "newest": {
-                "result": {},
-                "expiry": "2026-01-15T13:00:00+00:00",
-                "cached_at": "2026-01-15T11:00:00+00:00",
-            },
-        }
+async def test_set_cached_result_starts_sweeper(monkeypatch):
+    started = []
+    monkeypatch.setattr(
+        ExtractionCacheService, "_ensure_sweeper_task", classmethod(lambda cls: started.append(True))
     )
 
     await ExtractionCacheService.set_cached_result("img", "u1", {"items": []})
 
-    assert len(svc._cache) == 3
-    assert "oldest" not in svc._cache  # LRU-by-age eviction dropped it
-    assert _cache_key("u1", "img") in svc._cache
+    assert started == [True]
 
 
 @pytest.mark.asyncio
-async def test_set_cached_result_error_is_swallowed(monkeypatch):
+async def test_set_cached_result_error_is_swallowed(monkeypatch, memory_backend):
     monkeypatch.setattr(
         ExtractionCacheService,
         "_hash_image",
@@ -218,4 +182,229 @@ async def test_set_cached_result_error_is_swallowed(monkeypatch):
 
     await ExtractionCacheService.set_cached_result("img", "u1", {"items": []})
 
-    assert svc._cache == {}
+    assert len(memory_backend) == 0
+
+
+def test_stats_reports_counters_and_memory_tier(monkeypatch, memory_backend):
+    monkeypatch.setattr(ExtractionCacheService, "hits", 3)
+    monkeypatch.setattr(ExtractionCacheService, "misses", 1)
+    memory_backend._entries["k"] = _entry(size=7)
+    memory_backend.total_bytes = 7
+
+    assert ExtractionCacheService.stats() == {"hits": 3, "misses": 1, "entries": 1, "bytes": 7}
+
+
+def test_stats_without_backend(monkeypatch):
+    monkeypatch.setattr(svc, "_backend", None)
+
+    assert ExtractionCacheService.stats()["entries"] == 0
+
+
+# ---------------------------------------------------------------------------
+# Memory backend (LRU)
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_evicts_least_recently_used_over_entry_cap():
+    backend = MemoryCacheBackend(max_entries=3, max_bytes=10_000)
+    for key in ("a", "b", "c"):
+        await backend.set(key, _entry())
+    await backend.get("a", NOW)  # "a" is now most recently used
+
+    await backend.set("d", _entry())
+
+    assert len(backend) == 3
+    assert "b" not in backend
+    assert "a" in backend and "d" in backend
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_evicts_over_byte_budget():
+    backend = MemoryCacheBackend(max_entries=100, max_bytes=25)
+    await backend.set("a", _entry(size=10))
+    await backend.set("b", _entry(size=10))
+
+    await backend.set("c", _entry(size=10))
+
+    assert "a" not in backend
+    assert backend.total_bytes == 20
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_keeps_single_oversized_entry():
+    backend = MemoryCacheBackend(max_entries=100, max_bytes=5)
+    await backend.set("a", _entry(size=3))
+
+    await backend.set("big", _entry(size=50))
+
+    assert len(backend) == 1 and "big" in backend
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_replacing_key_reaccounts_bytes():
+    backend = MemoryCacheBackend(max_entries=10, max_bytes=100)
+    await backend.set("a", _entry(size=30))
+
+    await backend.set("a", _entry(size=5))
+
+    assert backend.total_bytes == 5
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_sweep_drops_only_expired():
+    backend = MemoryCacheBackend(max_entries=10, max_bytes=100)
+    await backend.set("old", _entry(ttl_seconds=-5, size=4))
+    await backend.set("live", _entry(size=6))
+
+    assert await backend.sweep(NOW) == 1
+    assert "old" not in backend and "live" in backend
+    assert backend.total_bytes == 6
+
+    backend.clear()
+    assert len(backend) == 0 and backend.total_bytes == 0
+
+
+# ---------------------------------------------------------------------------
+# SQLite + tiered backends
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_sqlite_backend_round_trip_survives_reopen(tmp_path):
+    path = str(tmp_path / "nested" / "cache.sqlite3")
+    first = SqliteCacheBackend(path, max_bytes=10_000)
+    await first.set("k", _entry({"items": [{"name": "tee"}]}, size=20))
+    await first.close()
+
+    second = SqliteCacheBackend(path, max_bytes=10_000)
+    entry = await second.get("k", NOW)
+    await second.close()
+
+    assert entry.result == {"items": [{"name": "tee"}]}
+    assert entry.size_bytes == 20
+
+
+@pytest.mark.asyncio
+async def test_sqlite_backend_expiry_and_sweep(tmp_path):
+    backend = SqliteCacheBackend(str(tmp_path / "c.sqlite3"), max_bytes=10_000)
+    await backend.set("expired", _entry(ttl_seconds=-1))
+    await backend.set("stale", _entry(ttl_seconds=-1))
+    await backend.set("live", _entry())
+
+    assert await backend.get("missing", NOW) is None
+    assert await backend.get("expired", NOW) is None  # dropped on read
+    assert await backend.sweep(NOW) == 1  # only "stale" was left to sweep
+    assert (await backend.get("live", NOW)) is not None
+    await backend.close()
+    await backend.close()  # idempotent
+
+
+@pytest.mark.asyncio
+async def test_sqlite_backend_evicts_least_recently_accessed_over_budget(tmp_path, monkeypatch):
+    clock = iter(range(1, 100))
+    monkeypatch.setattr(
+        svc, "utcnow", lambda: datetime.fromtimestamp(next(clock), tz=timezone.utc)
+    )
+    backend = SqliteCacheBackend(str(tmp_path / "c.sqlite3"), max_bytes=25)
+    await backend.set("a", _entry(size=10))
+    await backend.set("b", _entry(size=10))
+    await backend.get("a", NOW)  # touch "a" well after both writes
+
+    await backend.set("c", _entry(size=10))
+
+    assert await backend.get("b", NOW) is None
+    assert await backend.get("a", NOW) is not None
+    await backend.close()
+
+
+@pytest.mark.asyncio
+async def test_tiered_backend_promotes_shared_hits(tmp_path):
+    shared = SqliteCacheBackend(str(tmp_path / "c.sqlite3"), max_bytes=10_000)
+    await shared.set("k", _entry({"items": [1]}))
+    memory = MemoryCacheBackend(max_entries=10, max_bytes=10_000)
+    tiered = TieredCacheBackend(memory, shared)
+
+    assert (await tiered.get("k", NOW)).result == {"items": [1]}
+    assert "k" in memory
+    assert (await tiered.get("k", NOW)).result == {"items": [1]}  # memory hit
+    assert await tiered.get("missing", NOW) is None
+
+    await tiered.set("new", _entry(ttl_seconds=-1))
+    assert "new" in memory
+    assert await tiered.sweep(NOW) == 2
+    await tiered.close()
+
+
+# ---------------------------------------------------------------------------
+# Backend selection, sweeper, shutdown
+# ---------------------------------------------------------------------------
+
+
+def test_get_cache_backend_builds_memory_by_default(monkeypatch):
+    monkeypatch.setattr(svc, "_backend", None)
+    monkeypatch.setattr(svc.settings, "EXTRACTION_CACHE_BACKEND", "memory")
+
+    assert isinstance(svc.get_cache_backend(), MemoryCacheBackend)
+    assert svc.get_cache_backend() is svc.get_cache_backend()
+
+
+def test_get_cache_backend_builds_tiered_sqlite(monkeypatch, tmp_path):
+    monkeypatch.setattr(svc, "_backend", None)
+    monkeypatch.setattr(svc.settings, "EXTRACTION_CACHE_BACKEND", " SQLite ")
+    monkeypatch.setattr(svc.settings, "EXTRACTION_CACHE_SQLITE_PATH", str(tmp_path / "c.db"))
+
+    backend = svc.get_cache_backend()
+
+    assert isinstance(backend, TieredCacheBackend)
+    assert backend.shared.path == str(tmp_path / "c.db")
+    assert ExtractionCacheService.stats()["entries"] == 0
+
+
+def test_sqlite_relative_path_resolves_under_backend_dir(monkeypatch):
+    monkeypatch.setattr(svc.settings, "EXTRACTION_CACHE_SQLITE_PATH", "cache/x.sqlite3")
+
+    assert svc._sqlite_path() == str(svc._BACKEND_DIR / "cache" / "x.sqlite3")
+
+
+@pytest.mark.asyncio
+async def test_sweep_loop_sweeps_then_stops_on_cancel(monkeypatch, memory_backend):
+    monkeypatch.setattr(svc.settings, "EXTRACTION_CACHE_SWEEP_INTERVAL_SECONDS", 0)
+    monkeypatch.setattr(svc, "utcnow", lambda: FROZEN_NOW)
+    await memory_backend.set("old", _entry(ttl_seconds=-1))
+    sweeps = []
+    real_sweep = memory_backend.sweep
+
+    async def _sweep(now):
+        sweeps.append(now)
+        if len(sweeps) == 2:
+            raise RuntimeError("disk full")  # logged, loop keeps running
+        return await real_sweep(now)
+
+    monkeypatch.setattr(memory_backend, "sweep", _sweep)
+    task = asyncio.create_task(ExtractionCacheService._sweep_loop())
+    while len(sweeps) < 3:
+        await asyncio.sleep(0)
+    task.cancel()
+    await task
+
+    assert "old" not in memory_backend
+
+
+@pytest.mark.asyncio
+async def test_ensure_sweeper_task_and_close(monkeypatch):
+    monkeypatch.undo()  # restore the real _ensure_sweeper_task
+    backend = MemoryCacheBackend(max_entries=10, max_bytes=100)
+    monkeypatch.setattr(svc, "_backend", backend)
+    monkeypatch.setattr(svc, "_sweeper_task", None)
+
+    ExtractionCacheService._ensure_sweeper_task()
+    task = svc._sweeper_task
+    ExtractionCacheService._ensure_sweeper_task()
+    assert svc._sweeper_task is task  # already running: not restarted
+
+    await svc.close_extraction_cache()
+
+    assert task.cancelled() or task.done()
+    assert svc._backend is None and svc._sweeper_task is None
+    await svc.close_extraction_cache()  # idempotent
@@ -6,6 +6,7 @@ mirroring how test_ai_provider_service.py mocks httpx for the OpenAI-compatible
 provider.
 """
 
+import asyncio
 import base64
 import time
 from types import SimpleNamespace
@@ -15,6 +16,7 @@ import pytest
 from google.genai import errors as genai_errors
 from google.genai import types
 
+from app.core.config import settings
 from app.core.exceptions import AIServiceError
 from app.services.ai_provider_interface import AIProvider, ChatMessage
 from app.services.gemini_provider import (
@@ -24,8 +26,11 @@ from app.services.gemini_provider import (
     _hash_api_key,
     _is_safe_remote_url,
     _latch_daily_quota,
+    _pacer_for,
+    _pacers,
     classify_gemini_error,
     clear_daily_quota_latch,
+    clear_rate_pacers,
 )
 
 
@@ -138,6 +143,7 @@ class TestChat:
 
         class FakeResponse:
             headers = {"content-type": "image/png"}
+            is_redirect = False
 
             def raise_for_status(self):
                 pass
@@ -164,7 +170,7 @@ class TestChat:
             def stream(self, *args, **kwargs):
                 return FakeResponse()
 
-        with patch("app.services.gemini_provider.httpx.AsyncClient", FakeClient), _patched_client(provider, gen):
+        with patch("app.services.remote_image_fetcher.httpx.AsyncClient", FakeClient), _patched_client(provider, gen):
             result = await provider.chat_with_vision("describe", ["https://signed.example/image"])
         assert result.text == "a shirt"
         image_part = gen.call_args.kwargs["contents"][0].parts[1]
@@ -657,63 +663,120 @@ class TestDailyQuotaCircuitBreaker:
 
 
 class TestRateLimiter:
-    """AI_GEMINI_MAX_REQUESTS_PER_MINUTE spacing (free-tier quota bursts,
-    observed 2026-08-01: 8 parallel 429 RESOURCE_EXHAUSTED)."""
+    """AI_GEMINI_MAX_REQUESTS_PER_MINUTE pacing (free-tier quota bursts,
+    observed 2026-08-01: 8 parallel 429 RESOURCE_EXHAUSTED). The pacer is
+    process-wide per key + model: provider instances are built per request."""
+
+    @pytest.fixture(autouse=True)
+    def _fresh_pacers(self):
+        clear_rate_pacers()
+        yield
+        clear_rate_pacers()
 
     @pytest.mark.asyncio
     async def test_rate_limiter_disabled_by_default(self):
         provider = GeminiProvider(_make_config())  # max_requests_per_minute=0
-        with patch("asyncio.sleep", new=AsyncMock()) as fake_sleep:
-            await provider._wait_for_rate_slot()
-        fake_sleep.assert_not_awaited()
+        for _ in range(5):
+            await asyncio.wait_for(provider._wait_for_rate_slot("m"), timeout=0.1)
+        # Nothing to pace: no pacer is kept for the key/model.
+        assert len(_pacers) == 0
+
+    @pytest.mark.asyncio
+    async def test_unlimited_pacer_is_dropped_once_its_pause_ends(self):
+        pacer = _pacer_for("test-key", "m", 0, pausing=True)
+        pacer.pause_until(time.monotonic() + 60)
+        assert _pacer_for("test-key", "m", 0) is pacer
+
+        pacer._paused_until = 0.0  # the advised delay has passed
+        assert _pacer_for("test-key", "m", 0) is None
+        assert len(_pacers) == 0
+
+    def test_pacers_are_bounded_and_only_idle_ones_evicted(self, monkeypatch):
+        monkeypatch.setattr(settings, "AI_GEMINI_RATE_PACER_MAX_ENTRIES", 2)
+        paused = _pacer_for("key-A", "m", 60)
+        paused.pause_until(time.monotonic() + 60)
+        _pacer_for("key-B", "m", 60)
+        _pacer_for("key-C", "m", 60)
+        _pacer_for("key-D", "m", 60)
+
+        # key-B and key-C were idle and least recently used; the paused
+        # key-A pacer survives past the cap.
+        assert list(_pacers) == [
+            (_hash_api_key("key-A"), "m"),
+            (_hash_api_key("key-D"), "m"),
+        ]
+        assert _pacer_for("key-A", "m", 60) is paused
+
+    @pytest.mark.asyncio
+    async def test_pacing_is_shared_across_provider_instances(self):
+        first = GeminiProvider(_make_config(max_requests_per_minute=60))
+        second = GeminiProvider(_make_config(max_requests_per_minute=60))
+
+        await first._wait_for_rate_slot("m")  # the bucket's one token
+        waiting = asyncio.create_task(second._wait_for_rate_slot("m"))
+        await asyncio.sleep(0.05)
+        assert not waiting.done()  # a fresh instance does not get a fresh bucket
+        assert _pacers[(_hash_api_key("test-key"), "m")].waiting == 1
+
+        # A different model has its own quota, hence its own bucket.
+        await asyncio.wait_for(second._wait_for_rate_slot("other-model"), timeout=0.1)
+        waiting.cancel()
+
+    @pytest.mark.asyncio
+    async def test_chat_waits_for_the_shared_bucket(self):
+        provider = GeminiProvider(_make_config(max_requests_per_minute=6000))  # 10ms
+        gen = AsyncMock(return_value=_fake_response(text="ok"))
+        with _patched_client(provider, gen):
+            started = time.monotonic()
+            results = await asyncio.gather(*[
+                provider.chat(messages=[ChatMessage(role="user", content="hi")], max_tokens=10)
+                for _ in range(4)
+            ])
+        assert [r.text for r in results] == ["ok"] * 4
+        assert time.monotonic() - started >= 0.025  # 3 refills after the first token
 
     @pytest.mark.asyncio
-    async def test_rate_limiter_waits_when_bucket_empty(self):
-        import time
-
-        provider = GeminiProvider(_make_config(max_requests_per_minute=60))
-        provider._next_allowed_at = time.monotonic() + 10
-        with patch("asyncio.sleep", new=AsyncMock()) as fake_sleep:
-            await provider._wait_for_rate_slot()
-        fake_sleep.assert_awaited_once()
-        wait = fake_sleep.await_args.args[0]
-        assert 9.5 <= wait <= 10.5
+    async def test_per_minute_quota_pauses_every_caller_until_retry_delay(self):
+        provider = GeminiProvider(_make_config())
+        error = TestDailyQuotaCircuitBreaker()._per_minute_quota_error()
+        gen = AsyncMock(side_effect=error)
+        with _patched_client(provider, gen):
+            with pytest.raises(AIServiceError):
+                await provider.chat(messages=[ChatMessage(role="user", content="hi")])
 
-    @pytest.mark.asyncio
-    async def test_rate_limiter_spaces_back_to_back_requests(self):
-        import time
+        # Another instance (another request) fails over without a Gemini call.
+        other = GeminiProvider(_make_config())
+        other_gen = AsyncMock(return_value=_fake_response(text="ok"))
+        with _patched_client(other, other_gen):
+            with pytest.raises(AIServiceError) as exc_info:
+                await other.chat(messages=[ChatMessage(role="user", content="hi")])
+        assert exc_info.value.retryable is True
+        assert exc_info.value.error_kind == "upstream_quota"
+        assert 9 <= exc_info.value.retry_after_seconds <= 10  # retryDelay: 10s
+        other_gen.assert_not_awaited()
+        assert _hash_api_key("test-key") not in _daily_quota_reset_at
 
-        provider = GeminiProvider(_make_config(max_requests_per_minute=60))  # 1 req/s
-        provider._next_allowed_at = time.monotonic() - 1  # slot already available
-        with patch("asyncio.sleep", new=AsyncMock()) as fake_sleep:
-            await provider._wait_for_rate_slot()  # first: no wait
-            await provider._wait_for_rate_slot()  # second: waits ~1s
-        assert fake_sleep.await_count == 1
-        wait = fake_sleep.await_args.args[0]
-        assert 0.9 <= wait <= 1.1
+        # The pause is per key: a different key is unaffected.
+        third = GeminiProvider(_make_config(api_key="key-B"))
+        with _patched_client(third, AsyncMock(return_value=_fake_response(text="ok"))):
+            result = await third.chat(messages=[ChatMessage(role="user", content="hi")])
+        assert result.text == "ok"
 
     @pytest.mark.asyncio
-    async def test_chat_spaces_requests_when_rpm_configured(self):
-        """chat() honours the limiter BEFORE sending (patched sleep, no real
-        waiting) and still returns the parsed response."""
-        import time
+    async def test_pacing_queues_by_request_user(self):
+        from app.core.middleware import clear_log_context, set_log_context
 
         provider = GeminiProvider(_make_config(max_requests_per_minute=60))
-        provider._next_allowed_at = time.monotonic() + 5  # bucket currently empty
-
-        async def fake_generate_content(**kwargs):
-            return _fake_response(text="ok")
-
-        with _patched_client(provider, fake_generate_content), patch(
-            "asyncio.sleep", new=AsyncMock()
-        ) as fake_sleep:
-            response = await provider.chat(
-                messages=[ChatMessage(role="user", content="hi")], max_tokens=10
-            )
-        assert response.text == "ok"
-        fake_sleep.assert_awaited_once()
-        wait = fake_sleep.await_args.args[0]
-        assert 4.5 <= wait <= 5.5
+        pacer = _pacer_for("test-key", "m", 60)
+        pacer.tokens = 0.0
+        try:
+            set_log_context(user_id="user-a")
+            waiting = asyncio.create_task(provider._wait_for_rate_slot("m"))
+            await asyncio.sleep(0)
+            assert list(pacer._queues) == ["user-a"]
+            waiting.cancel()
+        finally:
+            clear_log_context()
 
 
 class TestRemoteUrlSafety:
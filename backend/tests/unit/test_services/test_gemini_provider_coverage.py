@@ -27,6 +27,7 @@ from app.services.gemini_provider import (
     clear_daily_quota_latch,
 )
 import app.services.gemini_provider as gp_module
+from app.services import remote_image_fetcher
 
 
 @pytest.fixture(autouse=True)
@@ -57,6 +58,8 @@ class _FakeRemoteClient:
 
 def _remote_response(headers=None, chunks=()):
     class _Response:
+        is_redirect = False
+
         def raise_for_status(self):
             pass
 
@@ -123,18 +126,18 @@ def test_get_client_creates_real_sdk_client_once():
 
 @pytest.mark.asyncio
 async def test_decode_image_part_rejects_oversized_content_length(monkeypatch):
-    monkeypatch.setattr(gp_module, "_MAX_REMOTE_IMAGE_BYTES", 100)
+    monkeypatch.setattr(remote_image_fetcher, "MAX_REMOTE_IMAGE_BYTES", 100)
     response = _remote_response(headers={"content-length": "200"}, chunks=(b"x",))
-    with patch("app.services.gemini_provider.httpx.AsyncClient", lambda *a, **k: _FakeRemoteClient(response)):
+    with patch("app.services.remote_image_fetcher.httpx.AsyncClient", lambda *a, **k: _FakeRemoteClient(response)):
         with pytest.raises(ValueError, match="size limit"):
             await GeminiProvider._decode_image_part("https://remote.example.com/x.png")
 
 
 @pytest.mark.asyncio
 async def test_decode_image_part_rejects_oversized_stream(monkeypatch):
-    monkeypatch.setattr(gp_module, "_MAX_REMOTE_IMAGE_BYTES", 100)
+    monkeypatch.setattr(remote_image_fetcher, "MAX_REMOTE_IMAGE_BYTES", 100)
     response = _remote_response(chunks=(b"x" * 60, b"y" * 60))
-    with patch("app.services.gemini_provider.httpx.AsyncClient", lambda *a, **k: _FakeRemoteClient(response)):
+    with patch("app.services.remote_image_fetcher.httpx.AsyncClient", lambda *a, **k: _FakeRemoteClient(response)):
         with pytest.raises(ValueError, match="size limit"):
             await GeminiProvider._decode_image_part("https://remote.example.com/x.png")
 
@@ -142,10 +145,11 @@ async def test_decode_image_part_rejects_oversized_stream(monkeypatch):
 @pytest.mark.asyncio
 async def test_decode_image_part_converts_avif_to_jpeg():
     response = _remote_response(headers={"content-type": "image/avif"}, chunks=(b"\x00\x00\x00\x18ftypavif",))
-    with patch("app.services.gemini_provider.httpx.AsyncClient", lambda *a, **k: _FakeRemoteClient(response)), \
+    with patch("app.services.remote_image_fetcher.httpx.AsyncClient", lambda *a, **k: _FakeRemoteClient(response)), \
          patch("app.services.gemini_provider.sniff_image_mime_from_magic", return_value="image/avif"), \
-         patch("app.services.gemini_provider.ensure_provider_safe_base64", side_effect=lambda s: s):
+         patch("app.services.gemini_provider.ensure_provider_safe_bytes", side_effect=lambda raw, mime: (raw, "image/jpeg")) as safe:
         part = await GeminiProvider._decode_image_part("https://remote.example.com/x.avif")
+    safe.assert_called_once_with(b"\x00\x00\x00\x18ftypavif", "image/avif")
     assert part.inline_data.mime_type == "image/jpeg"
     assert part.inline_data.data == b"\x00\x00\x00\x18ftypavif"
 
@@ -1,6 +1,8 @@
 """Tests for the Google Play Developer API service."""
+import asyncio
 import base64
 import json
+import logging
 import time
 from unittest.mock import AsyncMock, Mock, patch
 
@@ -111,8 +113,8 @@ async def test_get_access_token_exchanges_jwt_and_caches(rsa_pem):
     assert second == "tok-1"
     assert client.post_calls == 1  # cached after the first exchange
     # The assertion JWT must carry the service account + scope.
-    assert GooglePlayService._token_cache is not None
-    GooglePlayService._token_cache = None
+    assert GooglePlayService._token_cache.value == "tok-1"
+    GooglePlayService.reset_credential_caches()
 
 
 @pytest.mark.asyncio
@@ -122,7 +124,7 @@ async def test_get_access_token_raises_on_failed_exchange(rsa_pem):
         with patch("httpx.AsyncClient", return_value=client):
             with pytest.raises(GooglePlayVerificationError, match="HTTP 401"):
                 await GooglePlayService.get_access_token()
-    GooglePlayService._token_cache = None
+    GooglePlayService.reset_credential_caches()
 
 
 @pytest.mark.asyncio
@@ -219,6 +221,116 @@ def test_subscription_to_entitlement_user_cancelled_without_expiry(rsa_pem):
     assert entitlement["cancel_at_period_end"] is True
 
 
+# ---------------------------------------------------------------------------
+# Credential cache: coalescing, refresh-ahead, rotation
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture()
+def fresh_credentials():
+    GooglePlayService.reset_credential_caches()
+    yield
+    GooglePlayService.reset_credential_caches()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_token_misses_share_one_exchange(fresh_credentials):
+    calls = 0
+
+    async def exchange():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "tok-1", time.time() + 3600
+
+    with patch.object(GooglePlayService, "_fetch_access_token", new=exchange):
+        tokens = await asyncio.gather(*(GooglePlayService.get_access_token() for _ in range(8)))
+
+    assert tokens == ["tok-1"] * 8
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_the_shared_exchange(fresh_credentials):
+    started = asyncio.Event()
+
+    async def exchange():
+        started.set()
+        await asyncio.sleep(0.01)
+        return "tok-1", time.time() + 3600
+
+    with patch.object(GooglePlayService, "_fetch_access_token", new=exchange):
+        impatient = asyncio.create_task(GooglePlayService.get_access_token())
+        await started.wait()
+        impatient.cancel()
+        assert await GooglePlayService.get_access_token() == "tok-1"
+
+
+@pytest.mark.asyncio
+async def test_token_near_expiry_is_served_while_refreshing_in_background(fresh_credentials):
+    cache = GooglePlayService._token_cache
+    cache.value, cache.expires_at = "old", time.time() + 10
+
+    with patch.object(
+        GooglePlayService, "_fetch_access_token", new=AsyncMock(return_value=("new", time.time() + 3600))
+    ) as exchange:
+        assert await GooglePlayService.get_access_token() == "old"
+        await cache._inflight
+
+    exchange.assert_awaited_once()
+    assert await GooglePlayService.get_access_token() == "new"
+
+
+@pytest.mark.asyncio
+async def test_failed_background_refresh_keeps_serving_current_token(fresh_credentials, caplog):
+    cache = GooglePlayService._token_cache
+    cache.value, cache.expires_at = "old", time.time() + 10
+
+    with patch.object(
+        GooglePlayService,
+        "_fetch_access_token",
+        new=AsyncMock(side_effect=GooglePlayVerificationError("HTTP 503")),
+    ):
+        with caplog.at_level(logging.WARNING):
+            assert await GooglePlayService.get_access_token() == "old"
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+
+    assert cache.value == "old"
+    assert any("OAuth token refresh failed" in r.getMessage() for r in caplog.records)
+
+
+@pytest.mark.asyncio
+async def test_oidc_certs_honor_cache_control_max_age(fresh_credentials):
+    response = Mock(status_code=200, json=lambda: {"k1": "pem1"}, headers={"cache-control": "public, max-age=20000"})
+    client = _FakeAsyncClient(post_response=None, get_response=response)
+    with patch("httpx.AsyncClient", return_value=client):
+        before = time.time()
+        await GooglePlayService._fetch_oidc_certs()
+
+    assert GooglePlayService._certs_cache.expires_at >= before + 20000
+
+
+@pytest.mark.asyncio
+async def test_unknown_kid_refetches_rotated_certs_once(rsa_pem, fresh_credentials):
+    key = serialization.load_pem_private_key(rsa_pem.encode(), password=None)
+    token = _rtdn_token(rsa_pem, "projects/test-project/topics/rtdn", kid="pk-2")
+    cache = GooglePlayService._certs_cache
+    cache.value, cache.expires_at = {"pk-1": "stale"}, time.time() + 3600
+    download = AsyncMock(return_value=({"pk-2": make_rsa_public_pem(key)}, time.time() + 3600))
+
+    with patch.multiple(settings, **_google_settings(rsa_pem)):
+        with patch.object(GooglePlayService, "_download_oidc_certs", new=download):
+            claims = await GooglePlayService.verify_rtdn_authorization(f"Bearer {token}")
+            # Just refreshed: another unknown kid must not trigger a second fetch.
+            junk = _rtdn_token(rsa_pem, "projects/test-project/topics/rtdn", kid="junk")
+            with pytest.raises(GooglePlayVerificationError, match="No Google OIDC cert matches"):
+                await GooglePlayService.verify_rtdn_authorization(f"Bearer {junk}")
+
+    assert claims["aud"] == "projects/test-project/topics/rtdn"
+    download.assert_awaited_once()
+
+
 # ---------------------------------------------------------------------------
 # RTDN authorization (OIDC bearer token)
 # ---------------------------------------------------------------------------
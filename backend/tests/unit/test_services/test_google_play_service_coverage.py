@@ -87,11 +87,9 @@ class _FakeHttpClient:
 
 @pytest.fixture(autouse=True)
 def _reset_google_caches():
-    GooglePlayService._token_cache = None
-    GooglePlayService._certs_cache = None
+    GooglePlayService.reset_credential_caches()
     yield
-    GooglePlayService._token_cache = None
-    GooglePlayService._certs_cache = None
+    GooglePlayService.reset_credential_caches()
 
 
 # ---------------------------------------------------------------------------
@@ -217,12 +215,12 @@ def test_decode_pubsub_message_rejects_invalid_json():
 @pytest.mark.asyncio
 async def test_fetch_oidc_certs_fetches_and_caches():
     client = _FakeHttpClient(
-        get_response=Mock(status_code=200, json=lambda: {"k1": "pem1"})
+        get_response=Mock(status_code=200, json=lambda: {"k1": "pem1"}, headers={})
     )
     with patch("httpx.AsyncClient", return_value=client):
         certs = await GooglePlayService._fetch_oidc_certs()
     assert certs == {"k1": "pem1"}
-    assert GooglePlayService._certs_cache is not None
+    assert GooglePlayService._certs_cache.value == {"k1": "pem1"}
 
     # Cache hit: no HTTP round trip.
     with patch("httpx.AsyncClient", side_effect=AssertionError("network must not be hit")):
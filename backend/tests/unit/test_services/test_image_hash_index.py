@@ -0,0 +1,139 @@
+"""Tests for the per-user image hash index (image_hash_index.py).
+
+Covers:
+- Loading a user's non-deleted item hashes (paginated) into a BK-tree.
+- Score/threshold clamping and the negative-distance kill switch.
+- Cached trees, invalidation, and a load that raced a write is not stored.
+- Concurrent misses for one user share a single load; LRU bound by users.
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.services import image_hash_index
+from app.services.image_hash_index import ImageHashIndex
+from tests.utils.fake_db import FakeDB
+
+USER = "user-1"
+STORED = "f0e1d2c3b4a59687"
+
+
+def _item(item_id, *hashes, user_id=USER, is_deleted=False):
+    return {
+        "id": item_id,
+        "user_id": user_id,
+        "is_deleted": is_deleted,
+        "item_images": [{"image_hash": h} for h in hashes],
+    }
+
+
+def _db(*items):
+    return FakeDB(rows={"items": list(items)})
+
+
+@pytest.mark.asyncio
+async def test_finds_near_hashes_of_the_users_live_items(monkeypatch):
+    monkeypatch.setattr(image_hash_index, "_PAGE_SIZE", 2)  # force pagination
+    db = _db(
+        _item("a", STORED, None),
+        _item("b", "0000000000000000"),
+        _item("c", "f0e1d2c3b4a59686"),  # 1 bit from STORED
+        _item("gone", STORED, is_deleted=True),
+        _item("theirs", STORED, user_id="someone-else"),
+        _item("bad", "not-hex"),
+    )
+    matches = await ImageHashIndex().find_similar(db, USER, int(STORED, 16), min_score=0.75)
+
+    assert [(m["item_id"], m["distance"]) for m in matches] == [("a", 0), ("c", 1)]
+    assert matches[1]["score"] == 1 - 1 / 64
+
+
+@pytest.mark.asyncio
+async def test_threshold_and_setting_bound_the_search_radius(monkeypatch):
+    db = _db(_item("a", "f0e1d2c3b4a596ff"))  # 4 bits from STORED
+    index = ImageHashIndex()
+    query = int(STORED, 16)
+
+    assert await index.find_similar(db, USER, query, min_score=0.75)
+    # 0.95 allows at most int(0.05 * 64) = 3 bits.
+    assert await index.find_similar(db, USER, query, min_score=0.95) == []
+
+    monkeypatch.setattr(settings, "DUPLICATE_IMAGE_HASH_MAX_DISTANCE", 3)
+    assert await index.find_similar(db, USER, query, min_score=0.75) == []
+
+    monkeypatch.setattr(settings, "DUPLICATE_IMAGE_HASH_MAX_DISTANCE", -1)
+    selects = len(db.selects)
+    assert await index.find_similar(db, USER, query, min_score=0.75) == []
+    assert len(db.selects) == selects  # disabled: no load at all
+
+
+@pytest.mark.asyncio
+async def test_tree_is_cached_until_invalidated():
+    db = _db(_item("a", STORED))
+    index = ImageHashIndex()
+    query = int(STORED, 16)
+
+    await index.find_similar(db, USER, query, min_score=0.75)
+    await index.find_similar(db, USER, query, min_score=0.75)
+    assert len(db.selects) == 1
+
+    db.rows["items"].append(_item("new", STORED))
+    index.invalidate(USER)
+    matches = await index.find_similar(db, USER, query, min_score=0.75)
+    assert {m["item_id"] for m in matches} == {"a", "new"}
+    assert len(db.selects) == 2
+
+
+@pytest.mark.asyncio
+async def test_zero_ttl_disables_caching(monkeypatch):
+    monkeypatch.setattr(settings, "DUPLICATE_HASH_INDEX_TTL_SECONDS", 0)
+    db = _db(_item("a", STORED))
+    index = ImageHashIndex()
+    await index.find_similar(db, USER, 0, min_score=0.75)
+    await index.find_similar(db, USER, 0, min_score=0.75)
+    assert len(db.selects) == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_load_and_a_racing_write_wins(monkeypatch):
+    release = asyncio.Event()
+    loads = []
+    real_load = ImageHashIndex._load
+
+    async def slow_load(self, db, user_id):
+        loads.append(user_id)
+        await release.wait()
+        return await real_load(self, db, user_id)
+
+    monkeypatch.setattr(ImageHashIndex, "_load", slow_load)
+    db = _db(_item("a", STORED))
+    index = ImageHashIndex()
+    callers = [
+        asyncio.create_task(index.find_similar(db, USER, int(STORED, 16), min_score=0.75))
+        for _ in range(3)
+    ]
+    await asyncio.sleep(0)
+    index.invalidate("another-user")  # a write during the load
+    release.set()
+    results = await asyncio.gather(*callers)
+
+    assert loads == [USER]
+    assert all(r[0]["item_id"] == "a" for r in results)
+    # The load read the DB before the write: served, but not cached.
+    assert index._trees == {}
+    assert index._inflight == {}
+
+
+@pytest.mark.asyncio
+async def test_cache_is_bounded_by_users(monkeypatch):
+    monkeypatch.setattr(settings, "DUPLICATE_HASH_INDEX_MAX_USERS", 2)
+    db = _db(_item("a", STORED, user_id="u1"), _item("b", STORED, user_id="u2"))
+    index = ImageHashIndex()
+    for user_id in ("u1", "u2", "u3"):
+        await index.find_similar(db, user_id, 0, min_score=0.75)
+    assert list(index._trees) == ["u2", "u3"]
+
+    index.clear()
+    assert len(index._trees) == 0
@@ -796,6 +796,125 @@ async def test_generate_prompts_falls_back_on_invalid_response_type():
     assert len(prompts) == 2
 
 
+# --------------------------------------------------------------------------- #
+# generate_prompts: scene-plan cache
+# --------------------------------------------------------------------------- #
+
+
+def _passthrough_downscale():
+    return (
+        patch(
+            "app.core.image_executor.run_image_op",
+            new=AsyncMock(side_effect=lambda fn, *args, **kwargs: fn(*args, **kwargs)),
+        ),
+        patch("app.utils.image_processing.downscale_base64_image", side_effect=lambda raw: raw),
+    )
+
+
+@pytest.mark.asyncio
+async def test_generate_prompts_reuses_cached_plan_for_same_photo_and_preset():
+    ai = _PromptAI(_valid_prompts_json(2))
+    run_op, downscale = _passthrough_downscale()
+    with (
+        patch("app.services.ai_provider_service.get_ai_service", new=AsyncMock(return_value=ai)),
+        run_op,
+        downscale,
+    ):
+        first = await PhotoshootService.generate_prompts(
+            use_case=PhotoshootUseCase.LINKEDIN,
+            num_prompts=2,
+            reference_photo="data:image/jpeg;base64,aGVsbG8=",
+        )
+        first[0].full_prompt = "mutated by caller"
+        # Same payload without the data: prefix is the same photo.
+        second = await PhotoshootService.generate_prompts(
+            use_case=PhotoshootUseCase.LINKEDIN,
+            num_prompts=2,
+            reference_photo="aGVsbG8=",
+        )
+
+    assert len(ai.chat_kwargs) == 1
+    assert [p.index for p in second] == [0, 1]
+    # Callers get copies: mutating one result does not poison the cache.
+    assert "Scene body 0" in second[0].full_prompt
+
+
+@pytest.mark.asyncio
+async def test_generate_prompts_cache_key_covers_photo_count_and_custom_prompt():
+    ai = _PromptAI(*[_valid_prompts_json(3)] * 4)
+    run_op, downscale = _passthrough_downscale()
+    with (
+        patch("app.services.ai_provider_service.get_ai_service", new=AsyncMock(return_value=ai)),
+        run_op,
+        downscale,
+    ):
+        for photo, count, custom in [
+            ("aGVsbG8=", 2, "Beach  Party"),
+            ("d29ybGQ=", 2, "Beach  Party"),  # different photo
+            ("aGVsbG8=", 3, "Beach  Party"),  # different count
+            ("aGVsbG8=", 2, "rooftop"),  # different theme
+            ("aGVsbG8=", 2, " beach party "),  # normalized: hit
+        ]:
+            await PhotoshootService.generate_prompts(
+                use_case=PhotoshootUseCase.CUSTOM,
+                num_prompts=count,
+                custom_prompt=custom,
+                reference_photo=photo,
+            )
+
+    assert len(ai.chat_kwargs) == 4
+
+
+@pytest.mark.asyncio
+async def test_generate_prompts_does_not_cache_fallback_plans():
+    ai = _PromptAI("", "", _valid_prompts_json(1))
+    with patch("app.services.ai_provider_service.get_ai_service", new=AsyncMock(return_value=ai)):
+        fallback = await PhotoshootService.generate_prompts(
+            use_case=PhotoshootUseCase.LINKEDIN, num_prompts=1
+        )
+        planned = await PhotoshootService.generate_prompts(
+            use_case=PhotoshootUseCase.LINKEDIN, num_prompts=1
+        )
+
+    assert "Use case: linkedin." in fallback[0].full_prompt
+    assert "Scene body 0" in planned[0].full_prompt
+    assert len(ai.chat_kwargs) == 3
+
+
+@pytest.mark.asyncio
+async def test_generate_prompts_cache_disabled_and_expired(monkeypatch):
+    from app.services import photoshoot_service as module
+
+    ai = _PromptAI(*[_valid_prompts_json(1)] * 3)
+    with patch("app.services.ai_provider_service.get_ai_service", new=AsyncMock(return_value=ai)):
+        monkeypatch.setattr(module.settings, "PHOTOSHOOT_PROMPT_CACHE_TTL_SECONDS", 0)
+        await PhotoshootService.generate_prompts(use_case=PhotoshootUseCase.LINKEDIN, num_prompts=1)
+        assert len(module._prompt_plan_cache) == 0
+
+        monkeypatch.setattr(module.settings, "PHOTOSHOOT_PROMPT_CACHE_TTL_SECONDS", 60)
+        await PhotoshootService.generate_prompts(use_case=PhotoshootUseCase.LINKEDIN, num_prompts=1)
+        now = module.time.monotonic()
+        monkeypatch.setattr(module.time, "monotonic", lambda: now + 61)
+        await PhotoshootService.generate_prompts(use_case=PhotoshootUseCase.LINKEDIN, num_prompts=1)
+
+    assert len(ai.chat_kwargs) == 3
+
+
+def test_prompt_plan_cache_evicts_least_recently_used(monkeypatch):
+    from app.services import photoshoot_service as module
+
+    monkeypatch.setattr(module.settings, "PHOTOSHOOT_PROMPT_CACHE_MAX_ENTRIES", 2)
+    cache = module._PromptPlanCache()
+    cache.put(("a",), [_prompt(0)])
+    cache.put(("b",), [_prompt(1)])
+    assert cache.get(("a",)) is not None  # "b" is now least recent
+    cache.put(("c",), [_prompt(2)])
+
+    assert cache.get(("b",)) is None
+    assert cache.get(("a",)) is not None
+    assert len(cache) == 2
+
+
 # --------------------------------------------------------------------------- #
 # generate_images
 # --------------------------------------------------------------------------- #
@@ -1508,6 +1627,67 @@ async def test_generate_images_streaming_demo_batches_success():
         await _cleanup_job(job.job_id)
 
 
+@pytest.mark.asyncio
+async def test_generate_images_streaming_shares_global_scheduler_across_jobs(monkeypatch):
+    """Two jobs running at once stay under the process-wide photoshoot cap."""
+    from app.core.concurrency import FairScheduler
+    from app.services import photoshoot_service as module
+
+    monkeypatch.setattr(module, "PHOTOSHOOT_SCHEDULER", FairScheduler(2, "test"))
+    # Job admission is a separate cap; make room for this test's two jobs.
+    monkeypatch.setattr(
+        "app.services.photoshoot_job_service.MAX_CONCURRENT_PHOTOSHOOT_JOBS", 100
+    )
+    in_flight = 0
+    peak = 0
+
+    class _SlowImageAI(_ImageAI):
+        async def chat(self, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return await super().chat(**kwargs)
+
+    jobs = [
+        await PhotoshootJobService.create_job(
+            user_id=f"demo_{n}",
+            photos=["plain-ref"],
+            use_case="aesthetic",
+            num_images=3,
+            batch_size=3,
+        )
+        for n in range(2)
+    ]
+    try:
+        with (
+            patch(
+                "app.services.ai_provider_service.get_ai_service",
+                new=AsyncMock(side_effect=lambda: _SlowImageAI(["img"], ["img"], ["img"])),
+            ),
+            patch(
+                "app.core.image_executor.run_image_op",
+                new=AsyncMock(side_effect=lambda fn, *args, **kwargs: fn(*args, **kwargs)),
+            ),
+            patch("app.utils.image_processing.downscale_base64_image", side_effect=lambda raw: raw),
+        ):
+            await asyncio.gather(
+                *(
+                    PhotoshootStreamingService(
+                        user_id=job.user_id, db=None, is_demo=True
+                    )._generate_images_streaming(job, [_prompt(0), _prompt(1), _prompt(2)])
+                    for job in jobs
+                )
+            )
+
+        assert [job.generated_count for job in jobs] == [3, 3]
+        assert peak == 2
+    finally:
+        for job in jobs:
+            await _cleanup_job(job.job_id)
+
+
 @pytest.mark.asyncio
 async def test_generate_images_streaming_skips_downscale_when_photos_empty():
     ai = _ImageAI(["img-b64"])
@@ -1597,6 +1777,10 @@ async def test_generate_single_image_persists_durable_url():
         history = await PhotoshootJobService.get_event_history(job.job_id)
         complete = [e for e in history if e["type"] == "image_complete"]
         assert complete[0]["data"]["image_url"] == "https://cdn.example/x.png"
+        # Persisted: the base64 is dropped right away, not at job end.
+        assert image.image_base64 is None
+        assert image.image_url == "https://cdn.example/x.png"
+        assert job.generated_images[0]["image_base64"] is None
     finally:
         await _cleanup_job(job.job_id)
 
@@ -0,0 +1,257 @@
+"""Tests for the shared remote image fetcher (remote_image_fetcher.py).
+
+Covers:
+- The SSRF guard runs before any request and on every redirect hop;
+  redirects are capped.
+- One pooled client; repeat fetches of a URL are served from the cache.
+- TTL expiry, entry/byte bounds, and the 0-TTL kill switch.
+- Concurrent misses share one download; a cancelled caller does not cancel it.
+- Failures (HTTP, oversize) are not cached.
+- Concurrent downloads are capped by REMOTE_IMAGE_FETCH_CONCURRENCY.
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.services import remote_image_fetcher
+from app.services.remote_image_fetcher import RemoteImageFetcher
+
+URL = "https://cdn.example.com/u/items/a.png?X-Amz-Signature=abc"
+PNG = b"\x89PNG\r\n\x1a\nremote"
+
+
+class _Response:
+    def __init__(self, chunks, headers=None, status_error=None, redirect_to=None):
+        self._chunks = chunks
+        self.headers = headers or {}
+        self._status_error = status_error
+        self.is_redirect = redirect_to is not None
+        if redirect_to is not None:
+            self.headers["location"] = redirect_to
+
+    def raise_for_status(self):
+        if self._status_error is not None:
+            raise self._status_error
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return None
+
+    async def aiter_bytes(self):
+        for chunk in self._chunks:
+            await asyncio.sleep(0)
+            yield chunk
+
+
+class _FakeClient:
+    """httpx.AsyncClient stand-in; records every instance and GET."""
+
+    instances = []
+
+    def __init__(self, *args, **kwargs):
+        self.kwargs = kwargs
+        self.requests = []
+        self.responder = lambda url: _Response([PNG], {"content-type": "image/png; q=1"})
+        self.closed = False
+        _FakeClient.instances.append(self)
+
+    def stream(self, method, url):
+        self.requests.append(url)
+        return self.responder(url)
+
+    async def aclose(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fetcher():
+    _FakeClient.instances = []
+    with patch("app.services.remote_image_fetcher.httpx.AsyncClient", _FakeClient):
+        yield RemoteImageFetcher()
+
+
+@pytest.mark.asyncio
+async def test_unsafe_url_is_refused_before_any_request(fetcher):
+    with pytest.raises(ValueError, match="not fetchable"):
+        await fetcher.fetch("http://169.254.169.254/latest/meta-data/")
+    assert _FakeClient.instances == []
+
+
+def _redirects(hops):
+    """Responder that answers URLs in ``hops`` with a redirect to their value."""
+    def respond(url):
+        if url in hops:
+            return _Response([], redirect_to=hops[url])
+        return _Response([PNG], {"content-type": "image/png"})
+    return respond
+
+
+@pytest.mark.asyncio
+async def test_redirects_are_followed_through_the_ssrf_guard(fetcher):
+    await fetcher.fetch("https://cdn.example.com/warm.png")
+    client = _FakeClient.instances[0]
+    client.requests.clear()
+
+    client.responder = _redirects({URL: "/moved/a.png"})
+    assert await fetcher.fetch(URL) == (PNG, "image/png")
+    assert client.requests == [URL, "https://cdn.example.com/moved/a.png"]
+
+    client.requests.clear()
+    client.responder = _redirects({
+        "https://cdn.example.com/b.png": "http://169.254.169.254/latest/meta-data/"
+    })
+    with pytest.raises(ValueError, match="redirect is not fetchable"):
+        await fetcher.fetch("https://cdn.example.com/b.png")
+    assert client.requests == ["https://cdn.example.com/b.png"]
+
+
+@pytest.mark.asyncio
+async def test_redirect_chains_are_capped(fetcher):
+    await fetcher.fetch("https://cdn.example.com/warm.png")
+    client = _FakeClient.instances[0]
+    client.requests.clear()
+    client.responder = lambda url: _Response([], redirect_to=url + "x")
+
+    with pytest.raises(ValueError, match="redirect limit"):
+        await fetcher.fetch("https://cdn.example.com/c")
+    assert len(client.requests) == remote_image_fetcher.MAX_REMOTE_IMAGE_REDIRECTS + 1
+
+
+@pytest.mark.asyncio
+async def test_repeat_fetch_is_served_from_cache_on_one_pooled_client(fetcher):
+    first = await fetcher.fetch(URL)
+    second = await fetcher.fetch(URL)
+    await fetcher.fetch("https://cdn.example.com/u/items/b.png")
+
+    assert first == second == (PNG, "image/png")
+    (client,) = _FakeClient.instances
+    assert client.requests == [URL, "https://cdn.example.com/u/items/b.png"]
+    assert client.kwargs["follow_redirects"] is False
+
+    await fetcher.close()
+    assert client.closed
+    await fetcher.close()  # idempotent
+
+
+@pytest.mark.asyncio
+async def test_a_different_signature_is_a_different_entry(fetcher):
+    await fetcher.fetch(URL)
+    await fetcher.fetch(URL.replace("abc", "def"))
+    assert len(_FakeClient.instances[0].requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_expired_entries_are_refetched(fetcher):
+    await fetcher.fetch(URL)
+    _, value = fetcher._cache._entries[URL]
+    fetcher._cache._entries[URL] = (0.0, value)  # expired
+    await fetcher.fetch(URL)
+    assert len(_FakeClient.instances[0].requests) == 2
+    assert fetcher._cache.total_bytes == len(PNG)
+
+
+@pytest.mark.asyncio
+async def test_zero_ttl_disables_caching(fetcher, monkeypatch):
+    monkeypatch.setattr(settings, "REMOTE_IMAGE_CACHE_TTL_SECONDS", 0)
+    await fetcher.fetch(URL)
+    await fetcher.fetch(URL)
+    assert len(_FakeClient.instances[0].requests) == 2
+    assert len(fetcher._cache) == 0
+
+
+def test_cache_evicts_by_entries_and_bytes(monkeypatch):
+    cache = remote_image_fetcher._FetchCache()
+    monkeypatch.setattr(settings, "REMOTE_IMAGE_CACHE_MAX_ENTRIES", 2)
+    monkeypatch.setattr(settings, "REMOTE_IMAGE_CACHE_MAX_BYTES", 10)
+
+    cache.put("a", (b"1234", None))
+    cache.put("b", (b"1234", None))
+    assert cache.get("a") == (b"1234", None)  # a is now most recent
+    cache.put("c", (b"12", None))
+    assert cache.get("b") is None
+    assert len(cache) == 2
+
+    cache.put("d", (b"123456", None))  # 4 + 2 + 6 > 10: evict oldest until it fits
+    assert cache.get("a") is None
+    assert cache.total_bytes <= 10
+
+    cache.put("d", (b"1", None))  # replacing an entry re-accounts its bytes
+    assert cache.total_bytes == 3
+
+    cache.put("huge", (b"x" * 11, None))  # larger than the whole budget
+    assert cache.get("huge") is None
+
+    cache.clear()
+    assert len(cache) == 0 and cache.total_bytes == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_download(fetcher):
+    release = asyncio.Event()
+
+    class _Slow(_Response):
+        async def aiter_bytes(self):
+            await release.wait()
+            yield PNG
+
+    fetcher._get_client().responder = lambda url: _Slow([])
+    callers = [asyncio.create_task(fetcher.fetch(URL)) for _ in range(3)]
+    await asyncio.sleep(0)
+    callers[0].cancel()
+    release.set()
+    results = await asyncio.gather(*callers, return_exceptions=True)
+
+    assert isinstance(results[0], asyncio.CancelledError)
+    assert results[1:] == [(PNG, None), (PNG, None)]
+    assert len(_FakeClient.instances[0].requests) == 1
+    assert fetcher._inflight == {}
+
+
+@pytest.mark.asyncio
+async def test_failures_are_not_cached(fetcher, monkeypatch):
+    client = fetcher._get_client()
+    request = httpx.Request("GET", URL)
+    client.responder = lambda url: _Response(
+        [], status_error=httpx.HTTPStatusError("403", request=request, response=httpx.Response(403))
+    )
+    with pytest.raises(httpx.HTTPStatusError):
+        await fetcher.fetch(URL)
+
+    monkeypatch.setattr(remote_image_fetcher, "MAX_REMOTE_IMAGE_BYTES", 4)
+    client.responder = lambda url: _Response([b"12", b"345"])
+    with pytest.raises(ValueError, match="size limit"):
+        await fetcher.fetch(URL)
+    client.responder = lambda url: _Response([b"1"], {"content-length": "5"})
+    with pytest.raises(ValueError, match="size limit"):
+        await fetcher.fetch(URL)
+
+    assert len(fetcher._cache) == 0
+    assert fetcher._inflight == {}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_downloads_are_capped(fetcher, monkeypatch):
+    monkeypatch.setattr(settings, "REMOTE_IMAGE_FETCH_CONCURRENCY", 2)
+    active = 0
+    peak = 0
+
+    class _Counting(_Response):
+        async def aiter_bytes(self):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            yield PNG
+
+    fetcher._get_client().responder = lambda url: _Counting([])
+    await asyncio.gather(
+        *(fetcher.fetch(f"https://cdn.example.com/{i}.png") for i in range(5))
+    )
+    assert peak == 2
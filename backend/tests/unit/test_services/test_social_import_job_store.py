@@ -427,53 +427,104 @@ async def test_update_photo_returns_none_when_missing(fake_db):
 
 
 @pytest.mark.asyncio
-async def test_claim_next_queued_photo_returns_none_without_queued(fake_db):
-    fake_db.rows["social_import_photos"] = [
-        _photo_row(status=SocialImportPhotoStatus.PROCESSING.value)
-    ]
+async def test_claim_queued_photos_calls_rpc_and_orders_by_ordinal():
+    db = Mock()
+    db.rpc.return_value.execute.return_value = Mock(
+        data=[_photo_row(id="photo-2", ordinal=2), _photo_row(id="photo-1", ordinal=1)]
+    )
 
-    claimed = await SocialImportJobStore.claim_next_queued_photo(
-        fake_db, job_id=JOB_ID, user_id=USER_ID
+    claimed = await SocialImportJobStore.claim_queued_photos(
+        db, job_id=JOB_ID, user_id=USER_ID, limit=8
     )
 
-    assert claimed is None
-    assert fake_db.updates == []
+    assert [p["id"] for p in claimed] == ["photo-1", "photo-2"]
+    db.rpc.assert_called_once_with(
+        "claim_social_import_photos",
+        {"p_job_id": JOB_ID, "p_user_id": USER_ID, "p_limit": 8},
+    )
 
 
 @pytest.mark.asyncio
-async def test_claim_next_queued_photo_cas_update_succeeds(fake_db):
-    fake_db.rows["social_import_photos"] = [_photo_row()]
+async def test_claim_queued_photos_skips_rpc_for_non_positive_limit():
+    db = Mock()
 
-    claimed = await SocialImportJobStore.claim_next_queued_photo(
-        fake_db, job_id=JOB_ID, user_id=USER_ID
+    claimed = await SocialImportJobStore.claim_queued_photos(
+        db, job_id=JOB_ID, user_id=USER_ID, limit=0
     )
 
-    assert claimed["id"] == "photo-1"
-    assert claimed["status"] == SocialImportPhotoStatus.PROCESSING.value
-    assert claimed["processing_started_at"]
-    payload = fake_db.updates[-1][1]
-    assert payload["status"] == SocialImportPhotoStatus.PROCESSING.value
+    assert claimed == []
+    db.rpc.assert_not_called()
 
 
 @pytest.mark.asyncio
-async def test_claim_next_queued_photo_returns_none_when_cas_loses(fake_db, monkeypatch):
-    """A concurrent writer flipping the row between list and update means the
-    CAS update matches zero rows - the claim is abandoned."""
+async def test_release_claimed_photos_requeues_only_processing_rows(fake_db):
     fake_db.rows["social_import_photos"] = [
-        _photo_row(status=SocialImportPhotoStatus.PROCESSING.value)
+        _photo_row(id="photo-1", status=SocialImportPhotoStatus.PROCESSING.value),
+        _photo_row(id="photo-2", status=SocialImportPhotoStatus.AWAITING_REVIEW.value),
     ]
 
-    async def fake_list_photos(db, *, job_id, user_id, statuses=None, limit=None):
-        # Stale read: the row was queued at list time but is processing now.
-        return [{"id": "photo-1", "status": SocialImportPhotoStatus.QUEUED.value}]
+    await SocialImportJobStore.release_claimed_photos(
+        fake_db, job_id=JOB_ID, user_id=USER_ID, photo_ids=["photo-1", "photo-2"]
+    )
 
-    monkeypatch.setattr(SocialImportJobStore, "list_photos", staticmethod(fake_list_photos))
+    statuses = {p["id"]: p["status"] for p in fake_db.rows["social_import_photos"]}
+    assert statuses == {
+        "photo-1": SocialImportPhotoStatus.QUEUED.value,
+        "photo-2": SocialImportPhotoStatus.AWAITING_REVIEW.value,
+    }
+    payload = fake_db.updates[-1][1]
+    assert payload["processing_started_at"] is None
 
-    claimed = await SocialImportJobStore.claim_next_queued_photo(
-        fake_db, job_id=JOB_ID, user_id=USER_ID
+
+@pytest.mark.asyncio
+async def test_release_claimed_photos_noop_without_ids(fake_db):
+    await SocialImportJobStore.release_claimed_photos(
+        fake_db, job_id=JOB_ID, user_id=USER_ID, photo_ids=[]
+    )
+
+    assert fake_db.updates == []
+
+
+@pytest.mark.asyncio
+async def test_requeue_processing_photos_returns_only_stale_claims(fake_db):
+    stale = "2026-10-19T08:00:00+00:00"
+    live = "2026-10-19T09:00:00+00:00"
+    fake_db.rows["social_import_photos"] = [
+        _photo_row(
+            id="photo-1", status=SocialImportPhotoStatus.PROCESSING.value,
+            processing_started_at=stale,
+        ),
+        _photo_row(
+            id="photo-2", status=SocialImportPhotoStatus.PROCESSING.value,
+            processing_started_at=stale,
+        ),
+        # Claimed after the cutoff: possibly a live runner on another worker.
+        _photo_row(
+            id="photo-live", status=SocialImportPhotoStatus.PROCESSING.value,
+            processing_started_at=live,
+        ),
+        _photo_row(id="photo-3", status=SocialImportPhotoStatus.AWAITING_REVIEW.value),
+        _photo_row(
+            id="other-job",
+            job_id="job-2",
+            status=SocialImportPhotoStatus.PROCESSING.value,
+            processing_started_at=stale,
+        ),
+    ]
+
+    requeued = await SocialImportJobStore.requeue_processing_photos(
+        fake_db, job_id=JOB_ID, user_id=USER_ID, claimed_before="2026-10-19T08:30:00+00:00"
     )
 
-    assert claimed is None
+    assert requeued == 2
+    statuses = {p["id"]: p["status"] for p in fake_db.rows["social_import_photos"]}
+    assert statuses == {
+        "photo-1": SocialImportPhotoStatus.QUEUED.value,
+        "photo-2": SocialImportPhotoStatus.QUEUED.value,
+        "photo-live": SocialImportPhotoStatus.PROCESSING.value,
+        "photo-3": SocialImportPhotoStatus.AWAITING_REVIEW.value,
+        "other-job": SocialImportPhotoStatus.PROCESSING.value,
+    }
 
 
 @pytest.mark.asyncio
@@ -16,12 +16,14 @@ patched).
 from __future__ import annotations
 
 import asyncio
+from datetime import datetime, timedelta, timezone
 from types import SimpleNamespace
 
 import httpx
 import pytest
 
 import app.services.social_import_pipeline_service as pipeline_mod
+from app.core.config import settings
 from app.core.exceptions import (
     SocialImportAuthRequiredError,
     SocialImportJobNotFoundError,
@@ -794,6 +796,114 @@ async def test_discover_all_photos_hits_max_photo_cap(monkeypatch):
     assert "discovery_cursor" not in final_update["metadata"]
 
 
+@pytest.mark.asyncio
+async def test_discover_all_photos_prefetches_next_page_while_storing(monkeypatch):
+    """Page 2 is requested while page 1's photos are still being stored."""
+    patch_event(monkeypatch)
+    page_two_requested = asyncio.Event()
+    cursors = []
+
+    async def fake_get_job(db, *, job_id, user_id):
+        return make_job()
+
+    async def fake_get_active_session(db, *, job_id, user_id):
+        return None
+
+    async def fake_discover(normalized_url, platform, auth_session, cursor):
+        cursors.append(cursor)
+        if cursor is None:
+            return make_discovery_result(
+                photos=[SimpleNamespace(model_dump=lambda: {"id": "p1"})],
+                next_cursor="cursor-2",
+                exhausted=False,
+            )
+        page_two_requested.set()
+        return make_discovery_result(
+            photos=[SimpleNamespace(model_dump=lambda: {"id": "p2"})],
+            next_cursor=None,
+            exhausted=True,
+        )
+
+    async def fake_add_discovered_photos(db, *, job_id, user_id, start_ordinal, photos):
+        if start_ordinal == 1:
+            # Would time out if the next page were only fetched afterwards.
+            await asyncio.wait_for(page_two_requested.wait(), timeout=1)
+        return [{"id": p["id"]} for p in photos]
+
+    patch_store(
+        monkeypatch,
+        get_job=fake_get_job,
+        set_job_status=_noop_async,
+        update_job=_noop_async,
+        add_discovered_photos=fake_add_discovered_photos,
+    )
+    monkeypatch.setattr(SocialAuthService, "get_active_session", staticmethod(fake_get_active_session))
+    monkeypatch.setattr(
+        SocialScraperService, "discover_profile_photos", staticmethod(fake_discover)
+    )
+    monkeypatch.setattr(
+        SocialImportPipelineService, "_persist_scraper_session_from_payload",
+        lambda self, **kwargs: _noop(),
+    )
+
+    await make_service()._discover_all_photos("job-1")
+
+    assert cursors == [None, "cursor-2"]
+
+
+@pytest.mark.asyncio
+async def test_discover_all_photos_cancels_prefetch_when_storing_fails(monkeypatch):
+    """A page that fails to store cancels the page fetched ahead of it."""
+    patch_event(monkeypatch)
+    prefetch_started = asyncio.Event()
+    prefetch_cancelled = asyncio.Event()
+
+    async def fake_get_job(db, *, job_id, user_id):
+        return make_job()
+
+    async def fake_get_active_session(db, *, job_id, user_id):
+        return None
+
+    async def fake_discover(normalized_url, platform, auth_session, cursor):
+        if cursor == "cursor-2":
+            prefetch_started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                prefetch_cancelled.set()
+                raise
+        return make_discovery_result(
+            photos=[SimpleNamespace(model_dump=lambda: {"id": "p1"})],
+            next_cursor="cursor-2",
+            exhausted=False,
+        )
+
+    async def fake_add_discovered_photos(db, *, job_id, user_id, start_ordinal, photos):
+        await prefetch_started.wait()
+        raise RuntimeError("db down")
+
+    patch_store(
+        monkeypatch,
+        get_job=fake_get_job,
+        set_job_status=_noop_async,
+        update_job=_noop_async,
+        add_discovered_photos=fake_add_discovered_photos,
+    )
+    monkeypatch.setattr(SocialAuthService, "get_active_session", staticmethod(fake_get_active_session))
+    monkeypatch.setattr(
+        SocialScraperService, "discover_profile_photos", staticmethod(fake_discover)
+    )
+    monkeypatch.setattr(
+        SocialImportPipelineService, "_persist_scraper_session_from_payload",
+        lambda self, **kwargs: _noop(),
+    )
+
+    with pytest.raises(RuntimeError, match="db down"):
+        await make_service()._discover_all_photos("job-1")
+
+    assert prefetch_cancelled.is_set()
+
+
 # ---------------------------------------------------------------------------
 # _persist_scraper_session_from_payload
 # ---------------------------------------------------------------------------
@@ -899,9 +1009,10 @@ def patch_queue_collaborators(monkeypatch, job, slots, *, claimed=None, processe
     patch_store(
         monkeypatch,
         set_job_status=_async_value(None),
+        requeue_processing_photos=_async_value(0),
         get_job=_async_value(job),
         get_slots=_async_value(slots),
-        claim_next_queued_photo=_async_value(claimed),
+        claim_queued_photos=_async_value([claimed] if claimed else []),
         update_photo=_async_value(None),
         get_photo_with_items=_async_value(None),
     )
@@ -922,7 +1033,11 @@ async def test_run_queue_capacity_exhausted_schedules_retry(monkeypatch):
     service._capacity_exhausted = True
     monkeypatch.setattr(service, "_sync_job_counters", _noop_async)
     monkeypatch.setattr(service, "_schedule_capacity_retry", fake_retry)
-    patch_store(monkeypatch, set_job_status=_async_value(None))
+    patch_store(
+        monkeypatch,
+        set_job_status=_async_value(None),
+        requeue_processing_photos=_async_value(0),
+    )
 
     await service._run_queue("job-1")
     assert retried == ["job-1"]
@@ -933,6 +1048,7 @@ async def test_run_queue_job_missing_returns(monkeypatch):
     patch_store(
         monkeypatch,
         set_job_status=_async_value(None),
+        requeue_processing_photos=_async_value(0),
         get_job=_async_value(None),
     )
     service = make_service()
@@ -950,6 +1066,7 @@ async def test_run_queue_terminal_statuses_return(monkeypatch):
         patch_store(
             monkeypatch,
             set_job_status=_async_value(None),
+            requeue_processing_photos=_async_value(0),
             get_job=_async_value(make_job(status=status.value)),
         )
         service = make_service()
@@ -957,33 +1074,52 @@ async def test_run_queue_terminal_statuses_return(monkeypatch):
 
 
 @pytest.mark.asyncio
-async def test_run_queue_processes_processing_slot(monkeypatch):
+async def test_run_queue_requeues_stale_claims_before_claiming(monkeypatch):
+    """Photos left in processing by a run that died mid-batch (no finally)
+    go back to the queue first, so the claim picks them up again."""
     processed = []
-    patch_event(monkeypatch)
-    get_calls = {"n": 0}
+    order = []
+    cutoffs = []
 
-    async def fake_process(job_id, photo):
-        processed.append(photo["id"])
+    async def fake_requeue(db, *, job_id, user_id, claimed_before):
+        order.append("requeue")
+        cutoffs.append(claimed_before)
+        return 3
 
-    async def fake_get_job(db, *, job_id, user_id):
-        get_calls["n"] += 1
-        if get_calls["n"] > 1:
-            # After the processing slot is handled, stop pumping.
-            return make_job(status=SocialImportJobStatus.CANCELLED.value)
-        return make_job()
+    batches = [[make_photo(id="stale-1")]]
+
+    async def fake_claim(db, *, job_id, user_id, limit):
+        order.append("claim")
+        return batches.pop(0) if batches else []
+
+    async def fake_process(job_id, photo, review_slot_taken=None):
+        processed.append(photo["id"])
+        return SocialImportPhotoStatus.AWAITING_REVIEW.value
 
     patch_store(
         monkeypatch,
-        get_job=fake_get_job,
+        set_job_status=_async_value(None),
+        requeue_processing_photos=fake_requeue,
+        get_job=_async_value(make_job()),
         get_slots=_async_value(
-            {"awaiting": None, "buffered": None, "processing": make_photo()}
+            {"awaiting": None, "buffered": None, "processing": None}
         ),
-        set_job_status=_async_value(None),
+        claim_queued_photos=fake_claim,
     )
     service = make_service()
     monkeypatch.setattr(service, "_process_single_photo", fake_process)
+    monkeypatch.setattr(service, "_sync_job_counters", _noop_async)
+    monkeypatch.setattr(service, "_is_job_complete", _async_value(False))
     await service._run_queue("job-1")
-    assert processed == ["photo-1"]
+
+    assert order == ["requeue", "claim", "claim"]
+    assert processed == ["stale-1"]
+    # Only claims older than the staleness window: a live runner on another
+    # worker keeps its own.
+    age = datetime.now(timezone.utc) - datetime.fromisoformat(cutoffs[0])
+    assert abs(age - timedelta(minutes=settings.SOCIAL_IMPORT_STALE_CLAIM_MINUTES)) < timedelta(
+        minutes=1
+    )
 
 
 @pytest.mark.asyncio
@@ -997,6 +1133,7 @@ async def test_run_queue_waits_when_queue_full(monkeypatch):
     patch_store(
         monkeypatch,
         set_job_status=_async_value(None),
+        requeue_processing_photos=_async_value(0),
         get_job=_async_value(make_job()),
         get_slots=_async_value(
             {
@@ -1027,6 +1164,7 @@ async def test_run_queue_promotes_buffered_photo(monkeypatch):
     patch_store(
         monkeypatch,
         set_job_status=_async_value(None),
+        requeue_processing_photos=_async_value(0),
         get_job=_async_value(make_job()),
         get_slots=_async_value(
             {
@@ -1037,9 +1175,11 @@ async def test_run_queue_promotes_buffered_photo(monkeypatch):
         ),
         update_photo=fake_update_photo,
         get_photo_with_items=fake_get_photo_with_items,
+        claim_queued_photos=_async_value([]),
     )
     service = make_service()
     monkeypatch.setattr(service, "_sync_job_counters", _noop_async)
+    monkeypatch.setattr(service, "_is_job_complete", _async_value(False))
     await service._run_queue("job-1")
 
     assert updated == [("photo-2", {"status": SocialImportPhotoStatus.AWAITING_REVIEW.value})]
@@ -1052,7 +1192,7 @@ async def test_run_queue_claims_and_processes_when_no_awaiting(monkeypatch):
     processed = []
     get_calls = {"n": 0}
 
-    async def fake_process(job_id, photo):
+    async def fake_process(job_id, photo, review_slot_taken=None):
         processed.append(photo["id"])
 
     async def fake_get_job(db, *, job_id, user_id):
@@ -1065,11 +1205,12 @@ async def test_run_queue_claims_and_processes_when_no_awaiting(monkeypatch):
     patch_store(
         monkeypatch,
         set_job_status=_async_value(None),
+        requeue_processing_photos=_async_value(0),
         get_job=fake_get_job,
         get_slots=_async_value(
             {"awaiting": None, "buffered": None, "processing": None}
         ),
-        claim_next_queued_photo=_async_value(make_photo()),
+        claim_queued_photos=_async_value([make_photo()]),
     )
     service = make_service()
     monkeypatch.setattr(service, "_process_single_photo", fake_process)
@@ -1082,7 +1223,7 @@ async def test_run_queue_claims_background_photo_while_awaiting(monkeypatch):
     processed = []
     get_calls = {"n": 0}
 
-    async def fake_process(job_id, photo):
+    async def fake_process(job_id, photo, review_slot_taken=None):
         processed.append(photo["id"])
 
     async def fake_get_job(db, *, job_id, user_id):
@@ -1094,6 +1235,7 @@ async def test_run_queue_claims_background_photo_while_awaiting(monkeypatch):
     patch_store(
         monkeypatch,
         set_job_status=_async_value(None),
+        requeue_processing_photos=_async_value(0),
         get_job=fake_get_job,
         get_slots=_async_value(
             {
@@ -1102,7 +1244,7 @@ async def test_run_queue_claims_background_photo_while_awaiting(monkeypatch):
                 "processing": None,
             }
         ),
-        claim_next_queued_photo=_async_value(make_photo(id="photo-b")),
+        claim_queued_photos=_async_value([make_photo(id="photo-b")]),
     )
     service = make_service()
     monkeypatch.setattr(service, "_process_single_photo", fake_process)
@@ -1121,11 +1263,12 @@ async def test_run_queue_completes_job(monkeypatch):
     patch_store(
         monkeypatch,
         set_job_status=_async_value(None),
+        requeue_processing_photos=_async_value(0),
         get_job=_async_value(make_job(discovery_completed=True)),
         get_slots=_async_value(
             {"awaiting": None, "buffered": None, "processing": None}
         ),
-        claim_next_queued_photo=_async_value(None),
+        claim_queued_photos=_async_value([]),
     )
     service = make_service()
     monkeypatch.setattr(service, "_is_job_complete", _async_value(True))
@@ -1145,11 +1288,12 @@ async def test_run_queue_syncs_and_returns_when_not_complete(monkeypatch):
     patch_store(
         monkeypatch,
         set_job_status=_async_value(None),
+        requeue_processing_photos=_async_value(0),
         get_job=_async_value(make_job(discovery_completed=True)),
         get_slots=_async_value(
             {"awaiting": None, "buffered": None, "processing": None}
         ),
-        claim_next_queued_photo=_async_value(None),
+        claim_queued_photos=_async_value([]),
     )
     service = make_service()
     monkeypatch.setattr(service, "_is_job_complete", _async_value(False))
@@ -1158,6 +1302,305 @@ async def test_run_queue_syncs_and_returns_when_not_complete(monkeypatch):
     assert synced == ["job-1"]
 
 
+def _queued_photos(count):
+    return [make_photo(id=f"q{i}", ordinal=i) for i in range(1, count + 1)]
+
+
+def patch_batch_queue(monkeypatch, *, queued, slots=None, job_statuses=None):
+    """Fakes for the batched _run_queue: a claimable queue plus call logs."""
+    calls = {"get_job": 0, "get_slots": 0, "claim_limits": [], "released": []}
+    statuses = list(job_statuses or [])
+
+    async def fake_get_job(db, *, job_id, user_id):
+        calls["get_job"] += 1
+        status = statuses.pop(0) if statuses else SocialImportJobStatus.PROCESSING.value
+        return make_job(status=status, discovery_completed=True)
+
+    async def fake_get_slots(db, *, job_id, user_id):
+        calls["get_slots"] += 1
+        return {"awaiting": None, "buffered": None, "processing": None, **(slots or {})}
+
+    async def fake_claim(db, *, job_id, user_id, limit):
+        calls["claim_limits"].append(limit)
+        batch = queued[:limit]
+        del queued[:limit]
+        return batch
+
+    async def fake_release(db, *, job_id, user_id, photo_ids):
+        calls["released"].extend(photo_ids)
+
+    patch_store(
+        monkeypatch,
+        set_job_status=_async_value(None),
+        requeue_processing_photos=_async_value(0),
+        get_job=fake_get_job,
+        get_slots=fake_get_slots,
+        claim_queued_photos=fake_claim,
+        release_claimed_photos=fake_release,
+    )
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_run_queue_claims_in_batches_and_tracks_slots_locally(monkeypatch):
+    patch_event(monkeypatch)
+    calls = patch_batch_queue(monkeypatch, queued=_queued_photos(12))
+    outcomes = {
+        "q4": SocialImportPhotoStatus.AWAITING_REVIEW.value,
+        "q5": SocialImportPhotoStatus.BUFFERED_READY.value,
+    }
+    processed = []
+
+    async def fake_process(job_id, photo, review_slot_taken=None):
+        processed.append((photo["id"], review_slot_taken))
+        return outcomes.get(photo["id"], SocialImportPhotoStatus.FAILED.value)
+
+    service = make_service()
+    monkeypatch.setattr(service, "_process_single_photo", fake_process)
+    monkeypatch.setattr(service, "_sync_job_counters", _noop_async)
+    await service._run_queue("job-1")
+
+    # Failed photos take no review slot, so the loop keeps pumping until q4
+    # (awaiting) and q5 (buffered) fill the queue.
+    assert processed == [
+        ("q1", False),
+        ("q2", False),
+        ("q3", False),
+        ("q4", False),
+        ("q5", True),
+    ]
+    # First claim fills the two free slots; after a failure, full batches.
+    assert calls["claim_limits"] == [2, SocialImportPipelineService.QUEUE_CLAIM_BATCH_SIZE]
+    # Job and slots read once for five photos; unstarted claims handed back.
+    assert calls["get_job"] == 1
+    assert calls["get_slots"] == 1
+    assert calls["released"] == ["q6", "q7", "q8", "q9", "q10"]
+
+
+@pytest.mark.asyncio
+async def test_run_queue_checkpoints_job_status(monkeypatch):
+    patch_event(monkeypatch)
+    calls = patch_batch_queue(
+        monkeypatch,
+        queued=_queued_photos(6),
+        job_statuses=[
+            SocialImportJobStatus.PROCESSING.value,
+            SocialImportJobStatus.CANCELLED.value,
+        ],
+    )
+    processed = []
+
+    async def fake_process(job_id, photo, review_slot_taken=None):
+        processed.append(photo["id"])
+        return SocialImportPhotoStatus.FAILED.value
+
+    service = make_service()
+    service.QUEUE_CHECKPOINT_INTERVAL_PHOTOS = 3
+    monkeypatch.setattr(service, "_process_single_photo", fake_process)
+    monkeypatch.setattr(service, "_sync_job_counters", _noop_async)
+    await service._run_queue("job-1")
+
+    # Cancelled elsewhere: noticed at the checkpoint after three photos.
+    assert processed == ["q1", "q2", "q3"]
+    assert calls["get_job"] == 2
+    assert calls["released"] == ["q4", "q5", "q6"]
+
+
+@pytest.mark.asyncio
+async def test_run_queue_rechecks_job_after_rate_limit_requeue(monkeypatch):
+    patch_event(monkeypatch)
+    calls = patch_batch_queue(
+        monkeypatch,
+        queued=_queued_photos(2),
+        job_statuses=[
+            SocialImportJobStatus.PROCESSING.value,
+            SocialImportJobStatus.PAUSED_RATE_LIMITED.value,
+        ],
+    )
+
+    async def fake_process(job_id, photo, review_slot_taken=None):
+        return SocialImportPhotoStatus.QUEUED.value
+
+    service = make_service()
+    monkeypatch.setattr(service, "_process_single_photo", fake_process)
+    await service._run_queue("job-1")
+
+    assert calls["get_job"] == 2
+    assert calls["released"] == ["q2"]
+
+
+@pytest.mark.asyncio
+async def test_run_queue_waits_on_full_queue_after_requeueing_stale_claims(monkeypatch):
+    patch_event(monkeypatch)
+    calls = patch_batch_queue(
+        monkeypatch,
+        queued=_queued_photos(3),
+        slots={"awaiting": make_photo(id="a"), "buffered": make_photo(id="b")},
+    )
+    requeued = []
+
+    async def fake_requeue(db, *, job_id, user_id, claimed_before):
+        requeued.append(job_id)
+        return 2
+
+    patch_store(monkeypatch, requeue_processing_photos=fake_requeue)
+    synced = []
+
+    async def fake_sync(job_id):
+        synced.append(job_id)
+
+    service = make_service()
+    monkeypatch.setattr(service, "_sync_job_counters", fake_sync)
+    await service._run_queue("job-1")
+
+    assert requeued == ["job-1"]
+    assert calls["claim_limits"] == []
+    assert synced == ["job-1"]
+
+
+@pytest.mark.asyncio
+async def test_counters_do_not_count_unstarted_claims(monkeypatch):
+    patch_event(monkeypatch)
+    patch_batch_queue(monkeypatch, queued=_queued_photos(8))
+    patch_store(
+        monkeypatch,
+        count_by_status=_async_value(
+            {
+                SocialImportPhotoStatus.FAILED.value: 2,
+                # The photo being processed plus the five still waiting in
+                # this run's claimed batch.
+                SocialImportPhotoStatus.PROCESSING.value: 6,
+            }
+        ),
+    )
+    updated = []
+
+    async def fake_update_job(db, *, job_id, user_id, updates):
+        updated.append(updates)
+
+    patch_store(monkeypatch, update_job=fake_update_job)
+    service = make_service()
+    service.COUNTER_SYNC_INTERVAL_SECONDS = 0
+    seen = []
+
+    async def fake_process(job_id, photo, review_slot_taken=None):
+        seen.append(photo["id"])
+        if photo["id"] == "q3":
+            await service._sync_job_counters(job_id)
+            return SocialImportPhotoStatus.AWAITING_REVIEW.value
+        return SocialImportPhotoStatus.FAILED.value
+
+    async def stop_after_q3(db, *, job_id, user_id):
+        return make_job(
+            status=SocialImportJobStatus.CANCELLED.value
+            if len(seen) >= 3
+            else SocialImportJobStatus.PROCESSING.value,
+            discovery_completed=True,
+        )
+
+    patch_store(monkeypatch, get_job=stop_after_q3)
+    service.QUEUE_CHECKPOINT_INTERVAL_PHOTOS = 3
+    monkeypatch.setattr(service, "_process_single_photo", fake_process)
+    await service._run_queue("job-1")
+
+    # q1/q2 failed, q3 started; q4-q8 were claimed but never started.
+    assert updated[0]["processed_photos"] == 3
+    assert updated[0]["total_photos"] == 8
+
+
+@pytest.mark.asyncio
+async def test_run_queue_release_failure_is_logged(monkeypatch):
+    patch_event(monkeypatch)
+    patch_batch_queue(monkeypatch, queued=_queued_photos(2))
+
+    async def failing_release(db, *, job_id, user_id, photo_ids):
+        raise RuntimeError("db down")
+
+    patch_store(monkeypatch, release_claimed_photos=failing_release)
+
+    async def fake_process(job_id, photo, review_slot_taken=None):
+        return None
+
+    async def fake_get_job(db, *, job_id, user_id):
+        fake_get_job.calls += 1
+        return make_job(
+            status=SocialImportJobStatus.CANCELLED.value
+            if fake_get_job.calls > 1
+            else SocialImportJobStatus.PROCESSING.value
+        )
+
+    fake_get_job.calls = 0
+    patch_store(monkeypatch, get_job=fake_get_job)
+    service = make_service()
+    monkeypatch.setattr(service, "_process_single_photo", fake_process)
+    # Must not raise: releasing is best-effort.
+    await service._run_queue("job-1")
+
+
+@pytest.mark.asyncio
+async def test_run_queue_coalesces_counter_syncs_while_processing(monkeypatch):
+    patch_event(monkeypatch)
+    patch_batch_queue(monkeypatch, queued=_queued_photos(4))
+    counted = []
+
+    async def fake_count(db, *, job_id, user_id):
+        counted.append(job_id)
+        return {}
+
+    patch_store(monkeypatch, count_by_status=fake_count, update_job=_noop_async)
+
+    service = make_service()
+
+    async def fake_process(job_id, photo, review_slot_taken=None):
+        # Every real outcome path syncs counters at least once.
+        await service._sync_job_counters(job_id)
+        await service._sync_job_counters(job_id)
+        return SocialImportPhotoStatus.FAILED.value
+
+    monkeypatch.setattr(service, "_process_single_photo", fake_process)
+    monkeypatch.setattr(service, "_is_job_complete", _async_value(False))
+    await service._run_queue("job-1")
+
+    # 8 in-loop sync requests: the first goes through, the rest are
+    # coalesced into the single sync on exit.
+    assert len(counted) == 2
+    assert service._counters_dirty is False
+
+
+@pytest.mark.asyncio
+async def test_run_queue_flushes_dirty_counters_on_early_exit(monkeypatch):
+    patch_event(monkeypatch)
+    patch_batch_queue(
+        monkeypatch,
+        queued=_queued_photos(2),
+        job_statuses=[
+            SocialImportJobStatus.PROCESSING.value,
+            SocialImportJobStatus.CANCELLED.value,
+        ],
+    )
+    counted = []
+
+    async def fake_count(db, *, job_id, user_id):
+        counted.append(job_id)
+        if len(counted) > 1:
+            raise RuntimeError("db down")
+        return {}
+
+    patch_store(monkeypatch, count_by_status=fake_count, update_job=_noop_async)
+    service = make_service()
+
+    async def fake_process(job_id, photo, review_slot_taken=None):
+        await service._sync_job_counters(job_id)
+        await service._sync_job_counters(job_id)
+        return None
+
+    monkeypatch.setattr(service, "_process_single_photo", fake_process)
+    # The exit flush fails; that is logged, not raised.
+    await service._run_queue("job-1")
+
+    assert len(counted) == 2
+
+
 # ---------------------------------------------------------------------------
 # _check_rate_limit_with_pause / _pause_for_rate_limit
 # ---------------------------------------------------------------------------
@@ -406,11 +406,12 @@ async def test_run_queue_claim_empty_while_awaiting_syncs_and_returns(monkeypatc
     patch_store(
         monkeypatch,
         set_job_status=_async_value(None),
+        requeue_processing_photos=_async_value(0),
         get_job=_async_value(make_job(discovery_completed=True)),
         get_slots=_async_value(
             {"awaiting": make_photo(), "buffered": None, "processing": None}
         ),
-        claim_next_queued_photo=_async_value(None),
+        claim_queued_photos=_async_value([]),
     )
     service = make_service()
     monkeypatch.setattr(service, "_is_job_complete", _async_value(False))
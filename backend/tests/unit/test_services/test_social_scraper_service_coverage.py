@@ -4,11 +4,13 @@ Sibling to the integration-level social import tests: this file exercises the
 statements the routes never reach — the pinned-address httpcore backends, the
 Instagram web login flow (including every error branch and 2FA completion),
 all response-parsing shapes, the Meta Graph API discovery paths, the offset
-cursor pagination semantics of discover_profile_photos, and the SSRF-safe
-image downloader in fetch_photo_as_base64. Everything runs against canned
+cursor pagination semantics of discover_profile_photos, the SSRF-safe
+image downloader in fetch_photo_as_base64, and the connection reuse of a
+job-scoped ScraperSession. Everything runs against canned
 httpx.Response objects with httpx.AsyncClient patched out — no sockets.
 """
 
+import asyncio
 import base64
 import socket
 from datetime import datetime, timezone
@@ -21,9 +23,11 @@ from app.core.exceptions import SocialImportError
 from app.models.social_import import DiscoverPhotosResult, ScrapedPhotoRef, SocialPlatform
 from app.services.social_scraper_service import (
     InstagramLoginResult,
+    ScraperSession,
     SocialScraperService,
     _PinnedAddressHTTPTransport,
     _PinnedAddressNetworkBackend,
+    scraper_session,
 )
 
 
@@ -1762,3 +1766,183 @@ async def test_fetch_photo_as_base64_empty_content():
     with _patch_resolver("93.184.216.34"), _patch_client(client):
         with pytest.raises(SocialImportError, match="Imported image is empty"):
             await SocialScraperService.fetch_photo_as_base64("https://example.com/a.jpg")
+
+
+# =============================================================================
+# ScraperSession / fetch_photos_as_base64
+# =============================================================================
+
+
+def _image_response(content=b"img", url="https://example.com/a.jpg"):
+    return _response(200, headers={"content-type": "image/jpeg"}, content=content, url=url)
+
+
+@pytest.mark.asyncio
+async def test_session_reuses_pinned_client_and_resolution_across_downloads():
+    client = _fake_client()
+    client.stream = Mock(
+        side_effect=[
+            _FakeStream(_image_response(b"one")),
+            _FakeStream(_image_response(b"two", url="https://example.com/b.jpg")),
+        ]
+    )
+    with _patch_resolver("93.184.216.34") as gai, _patch_client(client) as factory:
+        async with scraper_session():
+            first = await SocialScraperService.fetch_photo_as_base64("https://example.com/a.jpg")
+            second = await SocialScraperService.fetch_photo_as_base64("https://example.com/b.jpg")
+            client.aclose.assert_not_awaited()
+
+    assert (first, second) == (base64.b64encode(b"one").decode(), base64.b64encode(b"two").decode())
+    # One pinned client and one DNS lookup served both downloads.
+    assert factory.call_count == 1
+    assert gai.call_count == 1
+    client.aclose.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_session_still_validates_each_url():
+    client = _fake_client(stream=_image_response())
+    with _patch_resolver("93.184.216.34"), _patch_client(client):
+        async with scraper_session():
+            await SocialScraperService.fetch_photo_as_base64("https://example.com/a.jpg")
+            with pytest.raises(SocialImportError, match="cannot contain credentials"):
+                await SocialScraperService.fetch_photo_as_base64("https://user:pw@example.com/a.jpg")
+
+
+@pytest.mark.asyncio
+async def test_session_resolution_expires(monkeypatch):
+    monkeypatch.setattr(ScraperSession, "RESOLUTION_TTL_SECONDS", 0.0)
+    session = ScraperSession()
+    session.remember_resolution("example.com", 443, "93.184.216.34")
+
+    assert session.cached_resolution("example.com", 443) is None
+    assert session.cached_resolution("example.com", 443) is None
+
+
+@pytest.mark.asyncio
+async def test_session_evicts_idle_image_clients_beyond_cap(monkeypatch):
+    monkeypatch.setattr(ScraperSession, "MAX_IMAGE_CLIENTS", 1)
+    first, second = _fake_client(), _fake_client()
+    with patch("app.services.social_scraper_service.httpx.AsyncClient", side_effect=[first, second]):
+        session = ScraperSession()
+        async with session.image_client("a.example.com", "93.184.216.34") as client:
+            assert client is first
+            async with session.image_client("b.example.com", "93.184.216.35") as other:
+                assert other is second
+            # Over the cap: the idle client is closed, never the one with a
+            # download still in flight.
+            second.aclose.assert_awaited_once()
+            first.aclose.assert_not_awaited()
+        first.aclose.assert_not_awaited()
+
+        await session.aclose()
+    first.aclose.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_session_fetches_static_profile_once_across_offset_pages():
+    html = "".join(
+        f'"display_url":"https:\\/\\/cdn.example.com\\/{i}.jpg"' for i in range(3)
+    )
+    client = _fake_client(get=_response(200, text=html))
+    with _patch_client(client) as factory:
+        async with scraper_session():
+            pages = []
+            cursor = None
+            for _ in range(3):
+                result = await SocialScraperService.discover_profile_photos(
+                    normalized_url="https://www.instagram.com/example/",
+                    platform=SocialPlatform.INSTAGRAM,
+                    cursor=cursor,
+                    page_size=1,
+                )
+                pages.append([p.source_photo_url for p in result.photos])
+                cursor = result.next_cursor
+
+    assert pages == [[f"https://cdn.example.com/{i}.jpg"] for i in range(3)]
+    assert result.exhausted is True
+    assert factory.call_count == 1
+    assert client.get.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_session_does_not_cache_failed_profile_fetch():
+    client = _fake_client()
+    client.get = AsyncMock(side_effect=[_response(503, text="busy"), _response(200, text="")])
+    with _patch_client(client):
+        async with scraper_session():
+            for _ in range(2):
+                await SocialScraperService.discover_profile_photos(
+                    normalized_url="https://www.instagram.com/example/",
+                    platform=SocialPlatform.INSTAGRAM,
+                )
+
+    assert client.get.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_task_outliving_session_falls_back_to_one_shot_clients():
+    release = asyncio.Event()
+
+    async def late_fetch():
+        await release.wait()
+        return await SocialScraperService.fetch_photo_as_base64("https://example.com/a.jpg")
+
+    async with scraper_session() as session:
+        task = asyncio.create_task(late_fetch())
+
+    assert session.closed
+    client = _fake_client(stream=_image_response())
+    with _patch_resolver("93.184.216.34"), _patch_client(client):
+        release.set()
+        assert await task == base64.b64encode(b"img").decode()
+    # The one-shot client was used as a context manager, not pooled.
+    client.__aexit__.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_fetch_photos_as_base64_dedupes_bounds_and_degrades(monkeypatch):
+    in_flight = 0
+    peak = 0
+    calls = []
+
+    async def fake_fetch(url):
+        nonlocal in_flight, peak
+        calls.append(url)
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if url.endswith("blocked"):
+            raise SocialImportError("Imported image host is private or blocked")
+        if url.endswith("gone"):
+            raise httpx.HTTPStatusError(
+                "404", request=httpx.Request("GET", url), response=httpx.Response(404)
+            )
+        return f"b64:{url}"
+
+    monkeypatch.setattr(SocialScraperService, "fetch_photo_as_base64", staticmethod(fake_fetch))
+    urls = ["u1", "u2", "u1", "u3", "x-blocked", "x-gone"]
+    async with scraper_session(download_concurrency=2):
+        result = await SocialScraperService.fetch_photos_as_base64(urls)
+
+    assert result == {
+        "u1": "b64:u1",
+        "u2": "b64:u2",
+        "u3": "b64:u3",
+        "x-blocked": None,
+        "x-gone": None,
+    }
+    assert sorted(calls) == sorted(set(urls))
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_fetch_photos_as_base64_propagates_unexpected_errors(monkeypatch):
+    async def fake_fetch(url):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(SocialScraperService, "fetch_photo_as_base64", staticmethod(fake_fetch))
+
+    with pytest.raises(RuntimeError, match="boom"):
+        await SocialScraperService.fetch_photos_as_base64(["u1"])
@@ -14,7 +14,7 @@ requirement it created outlived it and is what these tests hold:
 """
 
 import io
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from PIL import Image
@@ -189,6 +189,29 @@ async def test_temp_generated_upload_sniffs_format_and_extension():
     assert captured["file_path"].endswith(".webp")
 
 
+@pytest.mark.asyncio
+async def test_storage_ready_generated_upload_skips_validate_and_normalize():
+    """A matted image was encoded to the storage profile in the matte pass."""
+    captured: dict = {}
+
+    async def fake_upload_file(*, db, file_data, file_path, content_type, **_):
+        captured.update(file_data=file_data, content_type=content_type)
+        return {"public_url": "https://x/" + file_path, "storage_path": file_path}
+
+    run = AsyncMock()
+    with (
+        patch.object(StorageService, "upload_file", fake_upload_file),
+        patch("app.services.storage_service.run_image_op", new=run),
+    ):
+        await StorageService.upload_temp_generated_image(
+            db=MagicMock(), user_id="u1", file_data=_webp_bytes(), storage_ready=True
+        )
+
+    run.assert_not_awaited()
+    assert captured["file_data"] == _webp_bytes()
+    assert captured["content_type"] == "image/webp"
+
+
 # =============================================================================
 # non-web-native formats are transcoded to WebP on the way in
 # =============================================================================
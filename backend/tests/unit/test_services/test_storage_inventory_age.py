@@ -177,6 +177,20 @@ def test_thumb_matches_its_parent_across_a_format_change(script):
         )
 
 
+def test_parent_stem_of_derived_covers_thumbs_and_avatar_references(script):
+    assert script.parent_stem_of_derived("u/items/abc_thumb.webp") == "u/items/abc"
+    # Prepared avatar references are always .jpg, whatever the avatar's format.
+    assert script.parent_stem_of_derived("u/avatars/abc_ref_v1.jpg") == "u/avatars/abc"
+    assert script.parent_stem_of_derived("u/avatars/abc_ref_v1.jpg") == script.key_stem(
+        "u/avatars/abc.webp"
+    )
+    # Only avatars get references; anything else is not derived.
+    assert script.parent_stem_of_derived("u/items/abc_ref_v1.jpg") is None
+    assert script.parent_stem_of_derived("u/avatars/abc.jpg") is None
+    assert script.parent_stem_of_derived("u/avatars/_ref_v1.jpg") is None
+    assert script.parent_stem_of_derived("abc_ref_v1.jpg") is None
+
+
 # --------------------------------------------------------------------------- #
 # per-category retention (generated/ is user-saved, not transient)
 # --------------------------------------------------------------------------- #
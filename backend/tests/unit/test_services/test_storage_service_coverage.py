@@ -163,24 +163,28 @@ def test_validate_image_rejects_invalid_bytes():
 
 def test_normalize_upload_bytes_keeps_original_when_transcode_fails():
     payload = b"heic-bytes"
-    with (
-        patch.object(
-            storage_module, "sniff_image_mime_from_magic", return_value="image/heic"
-        ),
-        patch.object(storage_module, "transcode_to_webp", return_value=None),
+    with patch.object(
+        storage_module, "sniff_image_mime_from_magic", return_value="image/heic"
     ):
         assert StorageService._normalize_upload_bytes(payload) == payload
 
 
-def test_normalize_upload_bytes_uses_transcoded_webp():
-    with (
-        patch.object(
-            storage_module, "sniff_image_mime_from_magic", return_value="image/tiff"
-        ),
-        patch.object(storage_module, "transcode_to_webp", return_value=b"WEBPDATA"),
-        patch.object(storage_module, "downscale_image_bytes_to_webp", return_value=None),
-    ):
-        assert StorageService._normalize_upload_bytes(b"raw") == b"WEBPDATA"
+def test_normalize_upload_bytes_always_reencodes_tiff():
+    buffer = io.BytesIO()
+    Image.new("RGB", (4, 4), (200, 10, 10)).save(buffer, format="TIFF")
+    out = StorageService._normalize_upload_bytes(buffer.getvalue())
+    assert out[:4] == b"RIFF" and out[8:12] == b"WEBP"
+
+
+def test_storage_renditions_encode_the_thumbnail_from_the_same_decode():
+    buffer = io.BytesIO()
+    Image.new("RGB", (1200, 600), (10, 120, 200)).save(buffer, format="PNG")
+    renditions = StorageService._storage_renditions(buffer.getvalue())
+    assert renditions.content_type == "image/webp"
+    with Image.open(io.BytesIO(renditions.thumbnail)) as thumb:
+        assert thumb.format == "WEBP"
+        assert max(thumb.size) == storage_module.THUMB_MAX_EDGE
+    assert StorageService._storage_renditions(buffer.getvalue(), thumbnail=False).thumbnail is None
 
 
 # --------------------------------------------------------------------------- #
@@ -525,13 +525,15 @@ async def test_no_thumb_object_is_written_when_encoding_fails():
 async def test_uploaded_thumb_is_webp_with_a_matching_content_type():
     backend = FakeS3Backend()
     with patch("app.services.storage_service.get_storage_backend", return_value=backend):
-        await StorageService.upload_item_image(
+        result = await StorageService.upload_item_image(
             db=MagicMock(),
             user_id="user-1",
             filename="cutout.png",
             file_data=_transparent_png_bytes(),
         )
 
+    # The perceptual hash for the duplicate check rides along (16 hex chars).
+    assert len(result["image_hash"]) == 16
     thumb_calls = [c for c in backend.upload_calls if "_thumb" in c["key"]]
     assert len(thumb_calls) == 1
     call = thumb_calls[0]
@@ -4,7 +4,7 @@ management and the module-level singleton.
 
 The Pinecone client is never constructed: ``service._pc`` / ``service._index``
 are injected as Mocks, and the ``pc``/``index`` property tests patch the
-``Pinecone`` class itself. All SDK calls run through ``asyncio.to_thread``, so
+``pinecone.Pinecone`` class itself (the SDK is imported on first use). All SDK calls run through ``asyncio.to_thread``, so
 plain Mocks are sufficient for the thread-offloaded calls.
 """
 
@@ -46,7 +46,7 @@ def _match(item_id: str, score: float = 0.9, metadata=None) -> SimpleNamespace:
 def test_pc_property_creates_pinecone_client_once(monkeypatch):
     monkeypatch.setattr(settings, "PINECONE_API_KEY", "test-pinecone-key")
     fake_pinecone = Mock()
-    monkeypatch.setattr(svc, "Pinecone", fake_pinecone)
+    monkeypatch.setattr("pinecone.Pinecone", fake_pinecone)
 
     service = VectorService()
     client = service.pc
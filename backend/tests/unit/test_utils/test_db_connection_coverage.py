@@ -102,3 +102,33 @@ async def test_db_dependency_helpers(monkeypatch):
     assert await connection.get_db() is service
     assert await connection.get_anon_db() is anon
     assert await connection.get_service_db() is service
+
+
+def test_db_target_labels_by_table_or_rpc():
+    assert connection._db_target("/rest/v1/items") == "items"
+    assert connection._db_target("/rest/v1/rpc/consume_quota/") == "rpc/consume_quota"
+    assert connection._db_target("/auth/v1/user") == "other"
+
+
+def test_real_client_records_postgrest_latency(monkeypatch):
+    """The hooks land on the real supabase-py PostgREST session and observe a
+    request end to end (transport mocked, so no network)."""
+    import httpx
+
+    _env(monkeypatch)
+    client = SupabaseDB.get_service_client()
+    session = client.postgrest.session
+    # A second accessor call must not stack a second pair of hooks.
+    SupabaseDB.get_service_client()
+    assert session.event_hooks["request"].count(connection._on_db_request) == 1
+
+    session._transport = httpx.MockTransport(lambda request: httpx.Response(200, json=[]))
+    before = connection.DB_REQUEST_SECONDS.count(target="items")
+    client.table("items").select("id").execute()
+    assert connection.DB_REQUEST_SECONDS.count(target="items") == before + 1
+
+
+def test_instrument_tolerates_clients_without_a_session():
+    broken = Mock()
+    type(broken).postgrest = property(lambda self: (_ for _ in ()).throw(RuntimeError("x")))
+    assert connection._instrument(broken) is broken
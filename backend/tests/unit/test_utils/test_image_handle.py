@@ -0,0 +1,69 @@
+"""
+Tests for ImageHandle, the binary image carrier used by the generation agent.
+
+Covers base64 / data-URL decoding (strict; URLs refused), lazy mime and dimension derivation, and
+that the base64 views are encoded per access rather than cached on the
+handle (the point of the type is one live copy of the image).
+"""
+
+import base64
+import io
+
+import pytest
+from PIL import Image
+
+from app.utils.image_handle import ImageHandle
+
+
+def _png(size=(6, 4)) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", size, (10, 20, 30)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_from_base64_decodes_bare_and_sniffs_mime():
+    png = _png()
+    handle = ImageHandle.from_base64(base64.b64encode(png).decode())
+    assert handle.data == png
+    assert len(handle) == len(png)
+    assert handle.mime == "image/png"
+    assert handle.dimensions == (6, 4)
+
+
+def test_from_base64_keeps_data_url_mime():
+    handle = ImageHandle.from_base64("data:image/webp;base64,ZmFrZQ==")
+    assert handle.data == b"fake"
+    assert handle.mime == "image/webp"
+    # The generic fallback is not trusted: sniffed from the bytes instead.
+    png = base64.b64encode(_png()).decode()
+    generic = ImageHandle.from_base64(f"data:application/octet-stream;base64,{png}")
+    assert generic.mime == "image/png"
+
+
+def test_from_base64_rejects_malformed_input():
+    with pytest.raises(ValueError, match="Invalid base64 image"):
+        ImageHandle.from_base64("b64")
+    # Non-alphabet characters are an error, not silently dropped.
+    with pytest.raises(ValueError, match="Invalid base64 image"):
+        ImageHandle.from_base64("Zm:Fr-ZQ==")
+
+
+def test_from_base64_rejects_urls():
+    for url in ("https://x.com/y.png", "http://cdn.example.com/a.png"):
+        with pytest.raises(ValueError, match="fetch it instead"):
+            ImageHandle.from_base64(url)
+
+
+def test_base64_views_are_derived_not_stored():
+    handle = ImageHandle(b"fake", "image/jpeg")
+    assert handle.base64 == "ZmFrZQ=="
+    assert handle.data_url == "data:image/jpeg;base64,ZmFrZQ=="
+    assert not hasattr(handle, "__dict__")
+    assert sorted(handle.__slots__) == ["_dimensions", "_mime", "data"]
+    assert repr(handle) == "ImageHandle(mime='image/jpeg', bytes=4)"
+
+
+def test_unreadable_bytes_have_no_dimensions():
+    handle = ImageHandle(b"not an image")
+    assert handle.dimensions is None
+    assert handle.mime == "application/octet-stream"
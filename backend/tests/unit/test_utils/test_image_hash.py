@@ -0,0 +1,91 @@
+"""Tests for app.utils.image_hash - dHash and the BK-tree behind the
+duplicate check's hash tier.
+
+Covers:
+- Re-encoding / resizing the same photo moves the hash by a few bits; a
+  different photo lands far away.
+- Transparent cutouts hash like the same garment on white.
+- BK-tree search returns exactly the brute-force answer.
+- Hex round trip and rejection of malformed values.
+"""
+
+import io
+import random
+
+from PIL import Image, ImageDraw
+
+from app.utils.image_hash import (
+    HashBKTree,
+    dhash,
+    hamming,
+    hash_to_hex,
+    hex_to_hash,
+)
+
+
+def _photo(seed: int) -> Image.Image:
+    rng = random.Random(seed)
+    img = Image.new("RGB", (640, 480), (rng.randrange(256), 120, 90))
+    draw = ImageDraw.Draw(img)
+    for _ in range(12):
+        x, y = rng.randrange(600), rng.randrange(440)
+        color = tuple(rng.randrange(256) for _ in range(3))
+        draw.ellipse((x, y, x + rng.randrange(40, 200), y + rng.randrange(40, 200)), fill=color)
+    return img
+
+
+def _reencoded(img: Image.Image, size, fmt: str, quality: int) -> Image.Image:
+    buffer = io.BytesIO()
+    img.resize(size).save(buffer, format=fmt, quality=quality)
+    return Image.open(io.BytesIO(buffer.getvalue()))
+
+
+def test_reencoded_copies_stay_close_and_other_photos_do_not():
+    original = _photo(1)
+    base = dhash(original)
+    assert hamming(base, dhash(_reencoded(original, (320, 240), "JPEG", 60))) <= 4
+    assert hamming(base, dhash(_reencoded(original, (1280, 960), "WEBP", 80))) <= 4
+    assert hamming(base, dhash(_photo(2))) > 12
+
+
+def test_transparent_cutout_hashes_like_the_garment_on_white():
+    on_white = Image.new("RGB", (400, 400), (255, 255, 255))
+    ImageDraw.Draw(on_white).rectangle((100, 60, 300, 340), fill=(20, 30, 80))
+    cutout = Image.new("RGBA", (400, 400), (0, 0, 0, 0))
+    ImageDraw.Draw(cutout).rectangle((100, 60, 300, 340), fill=(20, 30, 80, 255))
+    assert hamming(dhash(on_white), dhash(cutout)) <= 2
+    # Palette / CMYK sources are converted rather than rejected.
+    assert hamming(dhash(on_white), dhash(on_white.convert("CMYK"))) <= 2
+
+
+def test_bk_tree_search_matches_brute_force():
+    rng = random.Random(7)
+    stored = [(rng.getrandbits(64), f"item-{i % 150}") for i in range(400)]
+    # Near copies so small radii have something to find.
+    stored += [(value ^ (1 << rng.randrange(64)), item_id) for value, item_id in stored[:50]]
+    tree = HashBKTree()
+    for value, item_id in stored:
+        tree.add(value, item_id)
+    assert len(tree) == len(stored)
+
+    for query, _ in stored[:20]:
+        for radius in (0, 3, 10):
+            expected = {}
+            for value, item_id in stored:
+                distance = hamming(query, value)
+                if distance <= radius:
+                    expected[item_id] = min(distance, expected.get(item_id, 65))
+            found = tree.search(query, radius)
+            assert dict(found) == expected
+            assert [d for _, d in found] == sorted(d for _, d in found)
+
+    assert HashBKTree().search(0, 10) == []
+
+
+def test_hex_round_trip_and_malformed_values():
+    value = 0xF0E1D2C3B4A59687
+    assert hash_to_hex(value) == "f0e1d2c3b4a59687"
+    assert hex_to_hash(hash_to_hex(value)) == value
+    assert hash_to_hex(1) == "0000000000000001"
+    for bad in (None, "", "xyz", "F0E1D2C3B4A59687", "0" * 15):
+        assert hex_to_hash(bad) is None
@@ -0,0 +1,130 @@
+"""Tests for app.utils.image_pipeline - single-pass storage renditions.
+
+Covers:
+- One decode produces the main rendition, the thumbnail and the matte.
+- The output contract of the separate steps it replaced: keep-smaller,
+  GIF and within-bounds WebP passthrough, forced re-encode for formats
+  browsers cannot render.
+- The perceptual hash is taken from the same decode.
+- Undecodable input comes back unchanged, never raises.
+"""
+
+import io
+from unittest.mock import patch
+
+from PIL import Image, ImageDraw
+
+from app.utils.background_removal import STATUS_ERROR, STATUS_MATTED
+from app.utils.image_hash import dhash, hamming
+from app.utils.image_pipeline import build_renditions, hash_image_bytes
+
+PROFILE = {"max_edge": 2048, "quality": 82, "thumb_max_edge": 512, "thumb_quality": 75}
+
+
+def _encode(img: Image.Image, fmt: str, **kwargs) -> bytes:
+    buffer = io.BytesIO()
+    img.save(buffer, format=fmt, **kwargs)
+    return buffer.getvalue()
+
+
+def _photo(size=(3000, 2000)) -> bytes:
+    img = Image.effect_noise(size, 60).convert("RGB")
+    return _encode(img, "JPEG", quality=92)
+
+
+def _product_shot() -> bytes:
+    img = Image.new("RGB", (1024, 1024), (255, 255, 255))
+    ImageDraw.Draw(img).rectangle((300, 180, 724, 844), fill=(30, 40, 90))
+    return _encode(img, "PNG")
+
+
+def _open(data: bytes) -> Image.Image:
+    img = Image.open(io.BytesIO(data))
+    img.load()
+    return img
+
+
+def test_main_and_thumbnail_come_from_one_decode():
+    raw = _photo()
+    with patch.object(Image, "open", wraps=Image.open) as opened:
+        renditions = build_renditions(raw, **PROFILE)
+    assert opened.call_count == 1
+
+    assert renditions.decoded
+    assert renditions.content_type == "image/webp"
+    assert len(renditions.image_bytes) < len(raw)
+    main, thumb = _open(renditions.image_bytes), _open(renditions.thumbnail)
+    assert main.format == thumb.format == "WEBP"
+    assert max(main.size) == 2048
+    assert max(thumb.size) == 512
+    # The duplicate-check hash comes from the same (draft-reduced) decode.
+    assert hamming(renditions.image_hash, dhash(_open(raw))) <= 2
+
+
+def test_matte_runs_in_the_same_pass():
+    with patch.object(Image, "open", wraps=Image.open) as opened:
+        renditions = build_renditions(_product_shot(), matte=True, **PROFILE)
+    assert opened.call_count == 1
+
+    assert renditions.matte_status == STATUS_MATTED
+    assert renditions.transparent_fraction > 0.5
+    assert renditions.content_type == "image/webp"
+    main = _open(renditions.image_bytes)
+    assert main.mode == "RGBA"
+    assert main.getpixel((0, 0))[3] == 0
+    assert _open(renditions.thumbnail).getpixel((0, 0))[3] == 0
+
+
+def test_rejected_matte_falls_through_to_the_plain_rendition():
+    scene = _photo((800, 600))
+    renditions = build_renditions(scene, matte=True, **PROFILE)
+    assert renditions.matte_status != STATUS_MATTED
+    assert _open(renditions.image_bytes).mode == "RGB"
+
+
+def test_within_bounds_webp_and_gif_pass_through_unchanged():
+    webp = _encode(Image.new("RGBA", (300, 200), (200, 0, 0, 128)), "WEBP")
+    renditions = build_renditions(webp, **PROFILE)
+    assert renditions.image_bytes is webp
+    # Already a WebP within the thumbnail bound: it is its own thumbnail.
+    assert renditions.thumbnail is webp
+
+    gif = _encode(Image.new("P", (40, 40)), "GIF")
+    renditions = build_renditions(gif, **PROFILE)
+    assert renditions.image_bytes is gif
+    assert renditions.content_type == "image/gif"
+
+
+def test_keep_smaller_unless_the_format_must_be_reencoded():
+    flat_png = _encode(Image.new("1", (256, 256), 0), "PNG")
+    renditions = build_renditions(flat_png, **PROFILE)
+    assert renditions.image_bytes is flat_png
+    assert renditions.content_type == "image/png"
+
+    tiny_tiff = _encode(Image.new("RGB", (2, 2), (0, 0, 0)), "TIFF")
+    renditions = build_renditions(
+        tiny_tiff, force_reencode_mimes=frozenset({"image/tiff"}), **PROFILE
+    )
+    assert renditions.content_type == "image/webp"
+    assert _open(renditions.image_bytes).format == "WEBP"
+
+
+def test_no_thumbnail_unless_requested():
+    renditions = build_renditions(_photo((800, 600)), max_edge=2048, quality=82)
+    assert renditions.thumbnail is None
+
+
+def test_undecodable_input_is_returned_unchanged():
+    renditions = build_renditions(b"not an image", matte=True, **PROFILE)
+    assert not renditions.decoded
+    assert renditions.image_bytes == b"not an image"
+    assert renditions.thumbnail is None
+    assert renditions.matte_status == STATUS_ERROR
+    assert renditions.image_hash is None
+    assert hash_image_bytes(b"not an image") is None
+
+
+def test_hash_of_an_unstored_photo_matches_its_stored_hash():
+    raw = _product_shot()
+    stored = build_renditions(raw, **PROFILE).image_hash
+    assert hamming(hash_image_bytes(raw), stored) <= 2
@@ -19,6 +19,7 @@ from app.utils.image_processing import (
     downscale_image_bytes_to_base64,
     downscale_image_bytes_to_webp,
     ensure_provider_safe_base64,
+    ensure_provider_safe_bytes,
     make_base64_image_validator,
     sniff_image_mime,
     sniff_image_mime_from_magic,
@@ -162,6 +163,28 @@ def test_ensure_provider_safe_base64_bare_garbage_passthrough():
     assert ensure_provider_safe_base64(garbage) == garbage
 
 
+def test_ensure_provider_safe_bytes_passes_through_same_object():
+    buffer = io.BytesIO()
+    Image.new("RGB", (8, 8)).save(buffer, format="PNG")
+    png = buffer.getvalue()
+    safe, mime = ensure_provider_safe_bytes(png)
+    assert safe is png and mime == "image/png"
+    # Declared mime wins over sniffing; unknown bytes fall back to JPEG.
+    assert ensure_provider_safe_bytes(png, "image/webp") == (png, "image/webp")
+    assert ensure_provider_safe_bytes(b"raw") == (b"raw", "image/jpeg")
+
+
+def test_ensure_provider_safe_bytes_reencodes_avif():
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 64)).save(buffer, format="AVIF")
+    safe, mime = ensure_provider_safe_bytes(buffer.getvalue())
+    assert mime == "image/jpeg"
+    assert safe.startswith(b"\xff\xd8")
+    # Undecodable avif: best-effort passthrough with its declared mime.
+    bogus = b"\x00\x00\x00\x18ftypavif" + b"\x00" * 40
+    assert ensure_provider_safe_bytes(bogus) == (bogus, "image/avif")
+
+
 # ---------------------------------------------------------------------------
 # downscale bytes / mode conversions
 # ---------------------------------------------------------------------------
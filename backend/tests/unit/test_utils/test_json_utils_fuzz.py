@@ -0,0 +1,164 @@
+"""Differential fuzz + latency harness for app.utils.json_utils.
+
+``extract_json_block`` used to re-scan the rest of the response from every
+'{' / '[' (quadratic on long malformed output). The single-pass scanner
+must return exactly what that per-start scan returned, so this module keeps
+the old implementation as a reference and compares both over a corpus of
+captured model-output shapes plus seeded random mutations of them
+(truncation, stray delimiters, quotes and backslashes spliced into prose).
+"""
+
+import json
+import random
+import re
+import time
+
+import pytest
+
+from app.utils.json_utils import extract_json_block
+
+
+def _reference_extract_json_block(text: str) -> str:
+    """The pre-2026-10 per-start scan, kept verbatim as the oracle."""
+    if not text:
+        raise ValueError("Empty model response")
+    fenced = re.search(r"```(?:json)?\s*([\s\S]*?)\s*```", text, re.IGNORECASE)
+    if fenced:
+        text = fenced.group(1)
+    for start, ch in enumerate(text):
+        if ch not in "{[":
+            continue
+        close_char = "}" if ch == "{" else "]"
+        depth = 0
+        in_string = False
+        escaped = False
+        block = None
+        for i in range(start, len(text)):
+            c = text[i]
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif c == "\\":
+                    escaped = True
+                elif c == '"':
+                    in_string = False
+                continue
+            if c == '"':
+                in_string = True
+            elif c == ch:
+                depth += 1
+            elif c == close_char:
+                depth -= 1
+                if depth == 0:
+                    block = text[start : i + 1]
+                    break
+        if block is None:
+            continue
+        try:
+            json.loads(block)
+        except json.JSONDecodeError:
+            continue
+        return block
+    raise ValueError("Model response did not contain JSON")
+
+
+# Shapes captured from extraction / photoshoot-planning responses (PII and
+# long descriptions trimmed).
+CAPTURED_OUTPUTS = [
+    '```json\n{"items": [{"name": "Denim jacket", "category": "outerwear", '
+    '"colors": ["blue"], "bbox": [0.1, 0.2, 0.5, 0.9]}]}\n```',
+    'Here are the detected garments:\n[{"name": "White tee", "description": '
+    '"Crew neck, logo reads \\"{LOGO}\\""}, {"name": "Chinos", "pattern": "solid"}]',
+    '{"subject_lock": "Model is 5\'10\\" with curly hair", "scenes": [{"setting": '
+    '"rooftop at dusk", "pose": "three-quarter turn"}, {"setting": "cafe", '
+    '"pose": "seated"}]}',
+    'Sure! The model is 5\'10" tall. {"items": [], "note": "no garments {found}"}',
+    '{"items": [{"name": "Scarf", "description": "knit, fringe ends", "colors": '
+    '["red", "cream"]}, {"name": "Boots", "description": "leather, 2\\" heel"',
+    "I could not find any clothing in this image.",
+    '[{"prompt": "studio shot, white backdrop", "label": "Studio"}]\n'
+    'Let me know if you want more {variations}.',
+    '```\n[\n  {"name": "Blazer", "tags": ["work", "formal"]},\n  {"name": "Loafers"}\n]\n```',
+]
+
+_NOISE = ['{', '}', '[', ']', '"', '\\', '\\"', ' ', 'x', ':', ',', '\n', "'"]
+
+
+def _mutate(rng: random.Random, text: str) -> str:
+    op = rng.randrange(4)
+    if op == 0 and text:
+        return text[: rng.randrange(len(text))]
+    if op == 1:
+        pos = rng.randrange(len(text) + 1)
+        noise = "".join(rng.choice(_NOISE) for _ in range(rng.randint(1, 6)))
+        return text[:pos] + noise + text[pos:]
+    if op == 2:
+        return rng.choice(CAPTURED_OUTPUTS) + rng.choice(_NOISE) + text
+    chars = list(text)
+    for _ in range(rng.randint(1, 4)):
+        if chars:
+            chars[rng.randrange(len(chars))] = rng.choice(_NOISE)
+    return "".join(chars)
+
+
+def _outcome(fn, text):
+    try:
+        return ("ok", fn(text))
+    except ValueError as exc:
+        return ("error", str(exc))
+
+
+@pytest.mark.parametrize("text", CAPTURED_OUTPUTS)
+def test_captured_outputs_match_reference(text):
+    assert _outcome(extract_json_block, text) == _outcome(
+        _reference_extract_json_block, text
+    )
+
+
+def test_random_mutations_match_reference():
+    rng = random.Random(20261019)
+    for _ in range(3000):
+        text = rng.choice(CAPTURED_OUTPUTS)
+        for _ in range(rng.randint(1, 4)):
+            text = _mutate(rng, text)
+        assert _outcome(extract_json_block, text) == _outcome(
+            _reference_extract_json_block, text
+        ), text
+
+
+def test_random_delimiter_soup_matches_reference():
+    rng = random.Random(7)
+    alphabet = '{}[]"\\:,1 '
+    for _ in range(3000):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 40)))
+        assert _outcome(extract_json_block, text) == _outcome(
+            _reference_extract_json_block, text
+        ), text
+
+
+def test_nesting_past_recursion_limit_is_a_value_error():
+    # The per-start scan let json's RecursionError escape to the caller.
+    with pytest.raises(ValueError, match="nested too deeply"):
+        extract_json_block("[1, " * 10_000 + "oops" + "]" * 10_000)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "[" * 20_000,
+        "{" * 20_000 + '{"ok": 1}',
+        '{"items": [' + '{"name": "x", "d": "y"}, ' * 2_000,
+        'prose "' + '{"a": "b' * 5_000,
+        '[{"a": 1}, ' * 300 + "oops" + "]" * 300,
+    ],
+    ids=["open-brackets", "open-braces", "truncated-array", "open-strings", "nested-bad"],
+)
+def test_pathological_inputs_stay_linear(text):
+    """Each input made the per-start scan run for seconds; budget is generous
+    so a loaded CI box cannot flake, but far below the quadratic cost."""
+    started = time.perf_counter()
+    try:
+        extract_json_block(text)
+    except ValueError:
+        pass
+    assert time.perf_counter() - started < 1.0
@@ -0,0 +1,105 @@
+"""Tests for app.utils.metrics: the in-process registry behind GET /metrics.
+
+Pins the Prometheus text format (HELP/TYPE lines, cumulative buckets, label
+escaping) and the isolation rules: label sets are validated, and a broken
+callback drops only its own metric from the scrape.
+"""
+
+import pytest
+
+from app.utils import metrics
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    fresh = metrics._Registry()
+    monkeypatch.setattr(metrics, "REGISTRY", fresh)
+    return fresh
+
+
+def test_counter_and_gauge_render_with_labels(registry):
+    counter = metrics.Counter("t_total", "Things.", ("kind",))
+    gauge = metrics.Gauge("t_depth", "Depth.")
+    counter.inc(kind="a")
+    counter.inc(2, kind="a")
+    gauge.set(5)
+    gauge.dec()
+
+    text = metrics.render_latest()
+
+    assert "# HELP t_total Things.\n# TYPE t_total counter\n" in text
+    assert 't_total{kind="a"} 3\n' in text
+    assert "# TYPE t_depth gauge\nt_depth 4\n" in text
+    assert counter.value(kind="a") == 3
+    assert gauge.value() == 4
+
+
+def test_histogram_buckets_are_cumulative(registry):
+    hist = metrics.Histogram("t_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        hist.observe(value, route="/x")
+
+    lines = metrics.render_latest().splitlines()
+
+    assert 't_seconds_bucket{route="/x",le="0.1"} 1' in lines
+    assert 't_seconds_bucket{route="/x",le="1"} 3' in lines
+    assert 't_seconds_bucket{route="/x",le="+Inf"} 4' in lines
+    assert 't_seconds_sum{route="/x"} 4.05' in lines
+    assert 't_seconds_count{route="/x"} 4' in lines
+    assert hist.count(route="/x") == 4
+
+
+def test_label_values_are_escaped(registry):
+    counter = metrics.Counter("t_total", "Line one\nline two.", ("path",))
+    counter.inc(path='a"b\\c')
+
+    text = metrics.render_latest()
+
+    assert "# HELP t_total Line one\\nline two." in text
+    assert 't_total{path="a\\"b\\\\c"} 1' in text
+
+
+def test_wrong_label_set_is_rejected(registry):
+    counter = metrics.Counter("t_total", "Things.", ("kind",))
+    with pytest.raises(ValueError, match="expects labels"):
+        counter.inc(other="x")
+
+
+def test_callback_metrics_read_live_state(registry):
+    state = {"depth": 2}
+    metrics.Gauge("t_depth", "Depth.", callback=lambda: state["depth"])
+    metrics.Gauge("t_free", "Free.", ("pool",), callback=lambda: {("a",): 1, ("b",): 0})
+    metrics.Gauge("t_unknown", "Unmeasurable here.", callback=lambda: None)
+    state["depth"] = 7
+
+    text = metrics.render_latest()
+
+    assert "t_depth 7\n" in text
+    assert 't_free{pool="a"} 1\nt_free{pool="b"} 0\n' in text
+    assert "# TYPE t_unknown gauge\n" in text
+    assert "\nt_unknown " not in text
+
+
+def test_broken_callback_only_drops_its_own_metric(registry):
+    metrics.Gauge("t_broken", "Broken.", callback=lambda: 1 / 0)
+    metrics.Gauge("t_fine", "Fine.", callback=lambda: 1)
+
+    text = metrics.render_latest()
+
+    assert "t_broken" not in text
+    assert "t_fine 1\n" in text
+
+
+def test_reregistering_a_name_replaces_the_metric(registry):
+    metrics.Counter("t_total", "Old.")
+    metrics.Counter("t_total", "New.")
+
+    assert metrics.render_latest().count("# TYPE t_total") == 1
+    assert "# HELP t_total New." in metrics.render_latest()
+
+
+def test_special_float_values():
+    assert metrics._format_value(float("inf")) == "+Inf"
+    assert metrics._format_value(float("-inf")) == "-Inf"
+    assert metrics._format_value(float("nan")) == "NaN"
+    assert metrics._format_value(0.25) == "0.25"
@@ -0,0 +1,176 @@
+"""Tests for the bounded worker pool behind the parallel helpers.
+
+The helpers used to create one gather task per input: a 500-item list put
+500 coroutines in flight at once and a failing parallel_map left its
+siblings running after the exception surfaced.
+"""
+
+import asyncio
+import contextlib
+
+import pytest
+
+from app.utils.parallel import (
+    ParallelAbortedError,
+    parallel_map,
+    parallel_map_settled,
+    parallel_stream,
+    parallel_with_retry,
+)
+
+
+class _Gauge:
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+
+    async def run(self, value, delay=0.001):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(delay)
+            return value
+        finally:
+            self.active -= 1
+
+
+@pytest.mark.asyncio
+async def test_concurrency_caps_in_flight_items():
+    gauge = _Gauge()
+
+    results = await parallel_map(list(range(40)), gauge.run, concurrency=4)
+
+    assert results == list(range(40))
+    assert gauge.peak == 4
+
+
+@pytest.mark.asyncio
+async def test_concurrency_none_runs_every_item_at_once():
+    gauge = _Gauge()
+
+    await parallel_map_settled(list(range(10)), gauge.run, concurrency=None)
+
+    assert gauge.peak == 10
+
+
+@pytest.mark.asyncio
+async def test_unordered_results_arrive_in_completion_order():
+    async def fn(item):
+        await asyncio.sleep(item / 100)
+        return item
+
+    results = await parallel_map_settled([3, 1, 2], fn, ordered=False)
+
+    assert [r.data for r in results] == [1, 2, 3]
+    assert [r.index for r in results] == [1, 2, 0]
+
+
+@pytest.mark.asyncio
+async def test_ordered_results_wait_for_predecessors():
+    async def fn(item, index):
+        await asyncio.sleep(item / 100)
+        return item
+
+    seen = [pair async for pair in parallel_stream([3, 1, 2], fn, ordered=True)]
+
+    assert seen == [(0, 3), (1, 1), (2, 2)]
+
+
+@pytest.mark.asyncio
+async def test_empty_input_yields_nothing():
+    async def fn(item, index):  # pragma: no cover - never called
+        return item
+
+    assert [pair async for pair in parallel_stream([], fn)] == []
+    assert await parallel_map([], lambda item: fn(item, 0)) == []
+
+
+@pytest.mark.asyncio
+async def test_parallel_map_cancels_siblings_on_first_failure():
+    cancelled = []
+    started = []
+
+    async def fn(item):
+        started.append(item)
+        if item == 0:
+            raise RuntimeError("boom")
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(item)
+            raise
+
+    with pytest.raises(RuntimeError, match="boom"):
+        await parallel_map(list(range(10)), fn, concurrency=3)
+
+    assert sorted(cancelled) == [1, 2]
+    # The pool stopped: items past the first window were never started.
+    assert sorted(started) == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_fatal_error_aborts_remaining_items():
+    async def fn(item):
+        if item == 1:
+            raise PermissionError("revoked key")
+        await asyncio.sleep(0 if item == 0 else 10)
+        return item
+
+    results = await parallel_map_settled(
+        list(range(6)),
+        fn,
+        concurrency=3,
+        is_fatal=lambda e: isinstance(e, PermissionError),
+    )
+
+    assert [r.index for r in results] == list(range(6))
+    assert results[0].success and results[0].data == 0
+    assert isinstance(results[1].error, PermissionError)
+    for r in results[2:]:
+        assert not r.success
+        assert isinstance(r.error, ParallelAbortedError)
+        assert isinstance(r.error.cause, PermissionError)
+
+
+@pytest.mark.asyncio
+async def test_non_fatal_failures_do_not_abort():
+    async def fn(item, index):
+        if item % 2:
+            raise ValueError("odd")
+        return item
+
+    results = await parallel_with_retry(
+        list(range(6)),
+        fn,
+        max_retries=0,
+        concurrency=2,
+        ordered=False,
+        is_fatal=lambda e: isinstance(e, PermissionError),
+    )
+
+    assert sorted(r.index for r in results) == list(range(6))
+    assert [r.success for r in sorted(results, key=lambda r: r.index)] == [
+        True, False, True, False, True, False,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_closing_stream_early_cancels_the_pool():
+    cancelled = []
+
+    async def fn(item, index):
+        if item == 0:
+            return item
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(item)
+            raise
+
+    async with contextlib.aclosing(parallel_stream(list(range(4)), fn, concurrency=3)) as stream:
+        async for index, _ in stream:
+            assert index == 0
+            break
+
+    # Item 0's worker moved on to item 3 before the consumer closed.
+    assert sorted(cancelled) == [1, 2, 3]
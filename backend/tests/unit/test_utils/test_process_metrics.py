@@ -92,3 +92,44 @@ def test_total_failure_returns_none(monkeypatch):
         lambda who: (_ for _ in ()).throw(RuntimeError("no resource")),
     )
     assert get_rss_mb() is None
+
+
+# ---------------------------------------------------------------------------
+# Startup phase timings
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+def _fresh_timings(monkeypatch):
+    monkeypatch.setattr(process_metrics, "_startup_timings", {})
+
+
+def test_startup_phase_records_duration_even_on_error(_fresh_timings):
+    with process_metrics.startup_phase("ok"):
+        pass
+    with pytest.raises(RuntimeError):
+        with process_metrics.startup_phase("boom"):
+            raise RuntimeError("boom")
+
+    timings = process_metrics.get_startup_timings()
+    assert list(timings) == ["ok", "boom"]
+    assert all(seconds >= 0 for seconds in timings.values())
+
+
+def test_record_startup_phase_skips_unmeasurable(_fresh_timings):
+    process_metrics.record_startup_phase("boot_to_lifespan", None)
+    process_metrics.record_startup_phase("lifespan_setup", 0.12345)
+
+    assert process_metrics.get_startup_timings() == {"lifespan_setup": 0.123}
+
+
+def test_process_uptime_seconds_reads_proc():
+    uptime = process_metrics.process_uptime_seconds()
+    if uptime is None:  # pragma: no cover - non-Linux dev machine
+        pytest.skip("/proc unavailable")
+    assert uptime >= 0
+
+
+def test_process_uptime_seconds_without_proc(monkeypatch):
+    _no_proc(monkeypatch)
+    assert process_metrics.process_uptime_seconds() is None
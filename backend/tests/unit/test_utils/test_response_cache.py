@@ -0,0 +1,75 @@
+"""Tests for app.utils.response_cache: TTL/LRU bounds, the invalidation
+generation guard, and If-None-Match matching."""
+
+import pytest
+
+from app.utils import response_cache
+from app.utils.response_cache import ResponseCache, compute_etag, etag_matches
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = {"t": 1000.0}
+    monkeypatch.setattr(response_cache.time, "monotonic", lambda: now["t"])
+    return now
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = ResponseCache(ttl_seconds=60, max_entries=8)
+    entry = cache.put("k", {"data": 1})
+
+    assert cache.get("k") is entry
+    clock["t"] += 60
+    assert cache.get("k") is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = ResponseCache(ttl_seconds=60, max_entries=2)
+    cache.put("a", {"v": "a"})
+    cache.put("b", {"v": "b"})
+    cache.get("a")
+    cache.put("c", {"v": "c"})
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_put_across_a_clear_is_returned_but_not_stored():
+    cache = ResponseCache(ttl_seconds=60, max_entries=8)
+    generation = cache.generation
+    cache.clear()
+
+    entry = cache.put("k", {"data": "stale"}, generation=generation)
+
+    assert entry.payload == {"data": "stale"}
+    assert cache.get("k") is None
+
+
+def test_zero_ttl_disables_caching():
+    cache = ResponseCache(ttl_seconds=0, max_entries=8)
+    cache.put("k", {"data": 1})
+    assert cache.get("k") is None
+
+
+def test_etag_is_stable_and_content_addressed():
+    assert compute_etag({"b": 1, "a": [1, 2]}) == compute_etag({"a": [1, 2], "b": 1})
+    assert compute_etag({"a": 1}) != compute_etag({"a": 2})
+    assert compute_etag({"a": 1}).startswith('"')
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (None, False),
+        ("", False),
+        ('"abc"', True),
+        ('W/"abc"', True),
+        ('"zzz", "abc"', True),
+        ('"zzz"', False),
+        ("*", True),
+    ],
+)
+def test_if_none_match_comparison(header, expected):
+    assert etag_matches(header, '"abc"') is expected
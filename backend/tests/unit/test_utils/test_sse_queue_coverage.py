@@ -135,3 +135,36 @@ def test_fanout_drops_subscriber_on_queue_full():
     assert dropped == [queue]
     assert queue.qsize() == 1
     assert queue.get_nowait()[0]["type"] == STREAM_OVERFLOW
+
+
+def test_dropped_subscribers_are_counted_by_reason():
+    counter = sse_queue.SSE_SUBSCRIBERS_DROPPED
+    by_events, by_bytes = counter.value(reason="events"), counter.value(reason="bytes")
+
+    full = asyncio.Queue(maxsize=1)
+    full.put_nowait(("stuck", 10))
+    fanout({"data": {"x": "y"}}, [full])
+    heavy = asyncio.Queue()
+    note_put(heavy, sse_queue.SSE_QUEUE_MAX_BUFFERED_BYTES)
+    fanout({"data": {"x": "y"}}, [heavy])
+
+    assert counter.value(reason="events") == by_events + 1
+    assert counter.value(reason="bytes") == by_bytes + 1
+
+
+def test_backlog_gauges_read_the_ledger():
+    from app.utils.metrics import REGISTRY
+
+    def sample(name):
+        return REGISTRY.get(name)._callback()
+
+    events, size = sample("fitcheck_sse_buffered_events"), sample("fitcheck_sse_buffered_bytes")
+    queue = asyncio.Queue()
+    fanout({"data": {"image_base64": "abcd"}}, [queue])
+    fanout({"data": {"image_base64": "ef"}}, [queue])
+    try:
+        assert sample("fitcheck_sse_buffered_events") == events + 2
+        assert sample("fitcheck_sse_buffered_bytes") == size + 6
+        assert sample("fitcheck_sse_max_queue_depth") >= 2
+    finally:
+        discard_subscriber(queue)
@@ -21,6 +21,7 @@ from app.services.social_import_job_store import SocialImportJobStore
 from app.services.social_import_pipeline_service import SocialImportPipelineService
 from app.services.social_scraper_service import SocialScraperService
 from app.services.storage_service import StorageService
+from app.utils.image_handle import ImageHandle
 
 
 def make_job(**overrides):
@@ -138,7 +139,7 @@ def patch_process_collaborators(monkeypatch, *, reserve=True, gen_reserve=True,
 
         async def generate_product_image(self, **kwargs):
             self.calls.append(kwargs)
-            return SimpleNamespace(image_base64="aGVsbG8=")
+            return SimpleNamespace(image=ImageHandle(b"hello"), storage_ready=False)
 
     fake_extraction = FakeExtractionAgent()
     fake_generation = FakeGenerationAgent()
@@ -160,7 +161,7 @@ def patch_process_collaborators(monkeypatch, *, reserve=True, gen_reserve=True,
     async def fake_upload_source(db, user_id, file_data, extension):
         return {"image_url": "https://src", "storage_path": "src-path"}
 
-    async def fake_upload_temp(db, user_id, file_data, source):
+    async def fake_upload_temp(db, user_id, file_data, source, storage_ready=False):
         return {"image_url": "https://gen", "thumbnail_url": "https://thumb", "storage_path": "gen-path"}
 
     monkeypatch.setattr(StorageService, "upload_source_image", staticmethod(fake_upload_source))
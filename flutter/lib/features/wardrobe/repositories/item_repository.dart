@@ -375,9 +375,23 @@ class ItemRepository {
   }
 
   /// Check for duplicates
-  Future<List<ItemModel>> checkDuplicates(CreateItemRequest request) async {
+  ///
+  /// Pass the new item's photo ([image], not uploaded yet, or the
+  /// [imageStoragePath] of an uploaded/temp one) so the backend can match a
+  /// re-uploaded photo by its perceptual hash without spending embedding
+  /// quota.
+  Future<List<ItemModel>> checkDuplicates(
+    CreateItemRequest request, {
+    File? image,
+    String? imageStoragePath,
+  }) async {
     try {
       final payload = _normalizeCreateItemPayload(request.toJson());
+      if (imageStoragePath != null && imageStoragePath.isNotEmpty) {
+        payload['image_storage_path'] = imageStoragePath;
+      } else if (image != null) {
+        payload['image_base64'] = base64Encode(await image.readAsBytes());
+      }
       final response = await _apiClient.post(
         '${ApiConstants.items}/check-duplicates',
         data: payload,
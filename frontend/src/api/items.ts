@@ -44,6 +44,7 @@ export async function uploadItemImages(formData: FormData, config?: AxiosRequest
     image_url?: string;
     thumbnail_url?: string;
     storage_path?: string;
+    image_hash?: string;
     filename?: string;
   }>;
 }> {
@@ -57,6 +58,7 @@ export async function uploadItemImages(formData: FormData, config?: AxiosRequest
           image_url?: string;
           thumbnail_url?: string;
           storage_path?: string;
+          image_hash?: string;
           filename?: string;
         }>;
       }>
@@ -215,6 +217,12 @@ export interface DuplicateCheckRequest {
   sub_category?: string;
   material?: string;
   tags?: string[];
+  /** Perceptual hash of the photo (from POST /items/upload), if already uploaded. */
+  image_hash?: string;
+  /** Owned storage key or bucket URL of a not-yet-saved photo; hashed server-side. */
+  image_storage_path?: string;
+  /** Not-yet-uploaded photo as base64 / data URL; hashed server-side. */
+  image_base64?: string;
 }
 
 /**
@@ -240,6 +248,9 @@ async function checkDuplicates(
         sub_category: request.sub_category || null,
         material: request.material || null,
         tags: request.tags || [],
+        image_hash: request.image_hash || null,
+        image_storage_path: request.image_storage_path || null,
+        image_base64: request.image_base64 || null,
       },
       { signal: options?.signal }
     );
@@ -589,7 +589,12 @@ export function BatchExtractionFlow({
           : sourceFileFor(item);
 
         let uploadedImage:
-          | { image_url?: string; thumbnail_url?: string; storage_path?: string }
+          | {
+              image_url?: string;
+              thumbnail_url?: string;
+              storage_path?: string;
+              image_hash?: string;
+            }
           | undefined;
 
         if (imageFile) {
@@ -633,6 +638,8 @@ export function BatchExtractionFlow({
               image_url: uploadedImage.image_url,
               thumbnail_url: uploadedImage.thumbnail_url,
               storage_path: uploadedImage.storage_path,
+              // Seeds the duplicate check's hash tier for later uploads.
+              image_hash: uploadedImage.image_hash,
               is_primary: true,
             },
           ],
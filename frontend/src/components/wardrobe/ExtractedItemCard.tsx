@@ -104,11 +104,20 @@ export function ExtractedItemCard({
   // Studio photo first; fall back to crop / uploaded photo while it polishes.
   const imageSrc = item.generatedImageUrl || item.sourcePreviewUrl
 
-  // Check for duplicates when item has name and category
+  // Check for duplicates when item has name and category. While the studio
+  // photo is still generating, wait for it: sent along, it lets the backend
+  // match a re-upload by photo hash without spending embedding quota.
   useEffect(() => {
     if (!item.name || !item.category || item.status === 'deleted') return
+    if (isGenerating) return
     const name = item.name
     const category = item.category
+    const photo = item.generatedImageUrl
+    const photoFields = photo
+      ? photo.startsWith('data:')
+        ? { image_base64: photo }
+        : { image_storage_path: photo }
+      : {}
 
     const signature = [name, category, item.brand ?? '', item.colors.join(',')]
       .join('|')
@@ -127,6 +136,7 @@ export function ExtractedItemCard({
           brand: item.brand,
           sub_category: item.sub_category,
           material: item.material,
+          ...photoFields,
         }, { threshold: 0.7, limit: 3, signal: controller.signal })
 
         setDuplicates(result.duplicates)
@@ -145,7 +155,7 @@ export function ExtractedItemCard({
       clearTimeout(timeoutId)
       controller.abort()
     }
-  }, [item.tempId, item.name, item.category, item.colors, item.brand, item.sub_category, item.material, item.status])
+  }, [item.tempId, item.name, item.category, item.colors, item.brand, item.sub_category, item.material, item.status, item.generatedImageUrl, isGenerating])
 
   const toggleColor = (color: string) => {
     const colors = item.colors.includes(color)
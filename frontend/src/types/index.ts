@@ -154,6 +154,8 @@ export interface ItemImageBase {
   is_primary?: boolean;
   width?: number;
   height?: number;
+  /** Perceptual hash from POST /items/upload; feeds the duplicate check. */
+  image_hash?: string;
 }
 
 export interface ExtractedItem {